@@ -1,5 +1,8 @@
 """AI provider package for Null terminal."""
 
+import importlib
+from typing import TYPE_CHECKING, Any
+
 from .base import (
     KNOWN_MODEL_CONTEXTS,
     MODEL_PRICING,
@@ -14,13 +17,24 @@ from .base import (
     get_model_context_size,
     get_model_pricing,
 )
-from .factory import AIFactory
-from .fallback import (
-    FallbackConfig,
-    FallbackEvent,
-    ProviderFallback,
-    get_fallback_config_from_settings,
-)
+
+if TYPE_CHECKING:
+    from .factory import AIFactory
+    from .fallback import (
+        FallbackConfig,
+        FallbackEvent,
+        ProviderFallback,
+        get_fallback_config_from_settings,
+    )
+
+# Imported on first access to keep ``import ai`` cheap
+_LAZY_IMPORTS = {
+    "AIFactory": ".factory",
+    "FallbackConfig": ".fallback",
+    "FallbackEvent": ".fallback",
+    "ProviderFallback": ".fallback",
+    "get_fallback_config_from_settings": ".fallback",
+}
 
 __all__ = [
     "KNOWN_MODEL_CONTEXTS",
@@ -41,3 +55,12 @@ __all__ = [
     "get_model_context_size",
     "get_model_pricing",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_IMPORTS:
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,3 +1,4 @@
+import asyncio
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -621,6 +622,23 @@ class LLMProvider(ABC):
         """
         return None
 
+    async def embed_batch(self, texts: list[str]) -> list[list[float] | None]:
+        """Get vector embeddings for several texts.
+
+        Providers with a batch embedding endpoint override this to embed all
+        texts in one request. The default embeds each text concurrently via
+        embed_text.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            One vector (or None on failure) per input text, in input order
+        """
+        if not texts:
+            return []
+        return list(await asyncio.gather(*(self.embed_text(t) for t in texts)))
+
     @abstractmethod
     async def validate_connection(self) -> bool:
         """Check if the provider is reachable."""
@@ -1,12 +1,14 @@
 import asyncio
 import json
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Callable, Iterable
 from concurrent.futures import ThreadPoolExecutor
+from contextlib import aclosing
 from typing import Any
 
 import boto3
 
 from .base import LLMProvider, Message, StreamChunk, TokenUsage, ToolCallData
+from .stream_bridge import iterate_in_thread
 
 
 class BedrockProvider(LLMProvider):
@@ -23,7 +25,8 @@ class BedrockProvider(LLMProvider):
         )
         self.bedrock = boto3.client("bedrock", region_name=region_name, config=config)
         self.model = model
-        self._executor = ThreadPoolExecutor(max_workers=2)
+        # Each open stream holds a worker until it finishes
+        self._executor = ThreadPoolExecutor(max_workers=4)
 
     def supports_tools(self) -> bool:
         """Only Claude models on Bedrock support tool calling."""
@@ -128,6 +131,93 @@ class BedrockProvider(LLMProvider):
         claude_messages.append({"role": "user", "content": prompt})
         return claude_messages
 
+    def _convert_converse_tools(self, tools: list[dict[str, Any]]) -> dict[str, Any]:
+        """Convert OpenAI tool format to a Converse ``toolConfig``."""
+        return {
+            "tools": [
+                {
+                    "toolSpec": {
+                        "name": tool["name"],
+                        "description": tool["description"],
+                        "inputSchema": {"json": tool["input_schema"]},
+                    }
+                }
+                for tool in self._convert_tools(tools)
+            ]
+        }
+
+    def _build_converse_messages(
+        self, prompt: str, messages: list[Message]
+    ) -> list[dict[str, Any]]:
+        """Build messages for the Converse API.
+
+        Converse wants content blocks and strictly alternating roles, so
+        consecutive messages from one role (e.g. several tool results) are
+        merged into a single message.
+        """
+        converse_messages: list[dict[str, Any]] = []
+
+        def add(role: str, blocks: list[dict[str, Any]]) -> None:
+            if not blocks:
+                return
+            if converse_messages and converse_messages[-1]["role"] == role:
+                converse_messages[-1]["content"].extend(blocks)
+            else:
+                converse_messages.append({"role": role, "content": blocks})
+
+        for msg in messages:
+            role = msg.get("role", "user")
+            if role == "system":
+                continue  # System handled separately
+
+            msg_content: Any = msg.get("content", "")
+
+            if role == "tool":
+                add(
+                    "user",
+                    [
+                        {
+                            "toolResult": {
+                                "toolUseId": msg.get("tool_call_id", ""),
+                                "content": [{"text": msg_content or "(no output)"}],
+                            }
+                        }
+                    ],
+                )
+                continue
+
+            blocks: list[dict[str, Any]] = []
+            if msg_content:
+                blocks.append({"text": msg_content})
+            if role == "assistant":
+                for tc in msg.get("tool_calls", []):
+                    func = tc.get("function", {})
+                    try:
+                        args = json.loads(func.get("arguments", "{}"))
+                    except json.JSONDecodeError:
+                        args = {}
+                    blocks.append(
+                        {
+                            "toolUse": {
+                                "toolUseId": tc.get("id", ""),
+                                "name": func.get("name", ""),
+                                "input": args,
+                            }
+                        }
+                    )
+            add(role, blocks)
+
+        # Agent follow-up iterations continue from tool results with no prompt
+        if prompt:
+            add("user", [{"text": prompt}])
+        return converse_messages
+
+    def _stream(
+        self, open_stream: Callable[[], Iterable[dict[str, Any]]]
+    ) -> aclosing[AsyncGenerator[dict[str, Any], None]]:
+        """Iterate a boto3 event stream without blocking the event loop."""
+        return aclosing(iterate_in_thread(open_stream, self._executor))
+
     async def generate(
         self, prompt: str, messages: list[Message], system_prompt: str | None = None
     ) -> AsyncGenerator[str, None]:
@@ -168,19 +258,15 @@ class BedrockProvider(LLMProvider):
             yield "Error: Unsupported model family for auto-formatting."
             return
 
-        try:
-            # Run blocking boto3 call in executor
-            loop = asyncio.get_running_loop()
-            response = await loop.run_in_executor(
-                self._executor,
-                lambda: self.client.invoke_model_with_response_stream(
-                    modelId=self.model, body=body
-                ),
+        def open_stream() -> Any:
+            response = self.client.invoke_model_with_response_stream(
+                modelId=self.model, body=body
             )
+            return response.get("body") or []
 
-            stream = response.get("body")
-            if stream:
-                for event in stream:
+        try:
+            async with self._stream(open_stream) as events:
+                async for event in events:
                     chunk = event.get("chunk")
                     if chunk:
                         chunk_json = json.loads(chunk.get("bytes").decode())
@@ -217,88 +303,48 @@ class BedrockProvider(LLMProvider):
         if not system_prompt:
             system_prompt = "You are a helpful AI assistant."
 
-        try:
-            claude_messages = self._build_claude_messages(prompt, messages)
-
-            # Build request body with tools
-            request_body: dict[str, Any] = {
-                "anthropic_version": "bedrock-2023-05-31",
-                "max_tokens": 4096,
-                "system": system_prompt,
-                "messages": claude_messages,
-            }
-
-            # Add tools if provided
-            if tools:
-                request_body["tools"] = self._convert_tools(tools)
+        request: dict[str, Any] = {
+            "modelId": self.model,
+            "messages": self._build_converse_messages(prompt, messages),
+            "system": [{"text": system_prompt}],
+            "inferenceConfig": {"maxTokens": 4096},
+        }
+        if tools:
+            request["toolConfig"] = self._convert_converse_tools(tools)
 
-            body = json.dumps(request_body)
+        def open_stream() -> Any:
+            return self.client.converse_stream(**request).get("stream") or []
 
-            # Run blocking boto3 call in executor
-            loop = asyncio.get_running_loop()
-            response = await loop.run_in_executor(
-                self._executor,
-                lambda: self.client.invoke_model_with_response_stream(
-                    modelId=self.model, body=body
-                ),
-            )
-
-            # Track tool calls and response
+        try:
             tool_calls: list[ToolCallData] = []
             current_tool_use: dict[str, Any] | None = None
             usage_data: TokenUsage | None = None
-            text_buffer = ""
-
-            stream = response.get("body")
-            if stream:
-                for event in stream:
-                    chunk = event.get("chunk")
-                    if not chunk:
-                        continue
-
-                    chunk_json = json.loads(chunk.get("bytes").decode())
-                    event_type = chunk_json.get("type", "")
 
-                    # Message start - may contain usage info
-                    if event_type == "message_start":
-                        msg = chunk_json.get("message", {})
-                        usage = msg.get("usage", {})
-                        if usage:
-                            usage_data = TokenUsage(
-                                input_tokens=usage.get("input_tokens", 0),
-                                output_tokens=0,
-                            )
-
-                    # Content block start - might be text or tool_use
-                    elif event_type == "content_block_start":
-                        content_block = chunk_json.get("content_block", {})
-                        block_type = content_block.get("type", "")
-
-                        if block_type == "tool_use":
+            async with self._stream(open_stream) as events:
+                async for event in events:
+                    # Content block start - only tool use blocks announce themselves
+                    if "contentBlockStart" in event:
+                        start = event["contentBlockStart"].get("start", {})
+                        tool_use = start.get("toolUse")
+                        if tool_use:
                             current_tool_use = {
-                                "id": content_block.get("id", ""),
-                                "name": content_block.get("name", ""),
+                                "id": tool_use.get("toolUseId", ""),
+                                "name": tool_use.get("name", ""),
                                 "input_json": "",
                             }
 
-                    # Content block delta - text or tool input
-                    elif event_type == "content_block_delta":
-                        delta = chunk_json.get("delta", {})
-                        delta_type = delta.get("type", "")
-
-                        if delta_type == "text_delta":
-                            text = delta.get("text", "")
-                            if text:
-                                text_buffer += text
-                                yield StreamChunk(text=text)
-
-                        elif delta_type == "input_json_delta":
-                            if current_tool_use:
-                                json_chunk = delta.get("partial_json", "")
-                                current_tool_use["input_json"] += json_chunk
+                    # Content block delta - text or a piece of tool input JSON
+                    elif "contentBlockDelta" in event:
+                        delta = event["contentBlockDelta"].get("delta", {})
+                        if delta.get("text"):
+                            yield StreamChunk(text=delta["text"])
+                        elif "toolUse" in delta and current_tool_use:
+                            current_tool_use["input_json"] += delta["toolUse"].get(
+                                "input", ""
+                            )
 
                     # Content block stop - finalize tool use
-                    elif event_type == "content_block_stop":
+                    elif "contentBlockStop" in event:
                         if current_tool_use:
                             try:
                                 args = (
@@ -318,19 +364,20 @@ class BedrockProvider(LLMProvider):
                             )
                             current_tool_use = None
 
-                    # Message delta - may contain stop reason and usage
-                    elif event_type == "message_delta":
-                        delta = chunk_json.get("delta", {})
-                        usage = chunk_json.get("usage", {})
-                        if usage and usage_data:
+                    # Metadata - token usage for the whole response
+                    elif "metadata" in event:
+                        usage = event["metadata"].get("usage", {})
+                        if usage:
                             usage_data = TokenUsage(
-                                input_tokens=usage_data.input_tokens,
-                                output_tokens=usage.get("output_tokens", 0),
+                                input_tokens=usage.get("inputTokens", 0),
+                                output_tokens=usage.get("outputTokens", 0),
                             )
 
-                    # Message stop - final event
-                    elif event_type == "message_stop":
-                        pass  # Will yield final chunk after loop
+                    # Errors raised mid-stream arrive as events
+                    else:
+                        for key, value in event.items():
+                            if key.endswith("Exception"):
+                                raise Exception(value.get("message", key))
 
             # Final chunk with all tool calls
             yield StreamChunk(
@@ -1,19 +1,40 @@
 """AI provider factory."""
 
+import importlib
 from typing import Any, ClassVar
 
-from .anthropic import AnthropicProvider
-from .antigravity import AntigravityProvider
-from .azure import AzureProvider
 from .base import LLMProvider
-from .bedrock import BedrockProvider
-from .claude_oauth import ClaudeOAuthProvider
-from .cohere import CohereProvider
-from .google_ai import GoogleAIProvider
-from .google_vertex import GoogleVertexProvider
-from .nvidia import NVIDIAProvider
-from .ollama import OllamaProvider
-from .openai_compat import OpenAICompatibleProvider
+
+# Module and class implementing each provider type. Modules are imported on
+# first use, so startup doesn't pay for SDKs (openai, boto3, ...) that the
+# configured provider never touches.
+_PROVIDER_CLASSES: dict[str, tuple[str, str]] = {
+    "AnthropicProvider": (".anthropic", "AnthropicProvider"),
+    "AntigravityProvider": (".antigravity", "AntigravityProvider"),
+    "AzureProvider": (".azure", "AzureProvider"),
+    "BedrockProvider": (".bedrock", "BedrockProvider"),
+    "ClaudeOAuthProvider": (".claude_oauth", "ClaudeOAuthProvider"),
+    "CohereProvider": (".cohere", "CohereProvider"),
+    "GoogleAIProvider": (".google_ai", "GoogleAIProvider"),
+    "GoogleVertexProvider": (".google_vertex", "GoogleVertexProvider"),
+    "NVIDIAProvider": (".nvidia", "NVIDIAProvider"),
+    "OllamaProvider": (".ollama", "OllamaProvider"),
+    "OpenAICompatibleProvider": (".openai_compat", "OpenAICompatibleProvider"),
+}
+
+
+def _load_provider_class(name: str) -> type[LLMProvider]:
+    """Import a provider class by name."""
+    module_name, class_name = _PROVIDER_CLASSES[name]
+    module = importlib.import_module(module_name, __package__)
+    return getattr(module, class_name)
+
+
+def __getattr__(name: str) -> Any:
+    # Keeps ``from ai.factory import OllamaProvider`` working
+    if name in _PROVIDER_CLASSES:
+        return _load_provider_class(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class AIFactory:
@@ -217,7 +238,7 @@ class AIFactory:
         # Local / Self-hosted
         # =====================================================================
         if provider_name == "ollama":
-            return OllamaProvider(
+            return _load_provider_class("OllamaProvider")(
                 endpoint=get("endpoint", "http://localhost:11434"),
                 model=get("model", "llama3.2"),
             )
@@ -227,7 +248,7 @@ class AIFactory:
             # Ensure /v1 suffix for OpenAI-compatible API
             if endpoint and not endpoint.rstrip("/").endswith("/v1"):
                 endpoint = endpoint.rstrip("/") + "/v1"
-            return OpenAICompatibleProvider(
+            return _load_provider_class("OpenAICompatibleProvider")(
                 api_key="lm-studio",
                 base_url=endpoint,
                 model=get("model", "local-model"),
@@ -237,42 +258,42 @@ class AIFactory:
         # Major Cloud Providers
         # =====================================================================
         elif provider_name == "openai":
-            return OpenAICompatibleProvider(
+            return _load_provider_class("OpenAICompatibleProvider")(
                 api_key=config.get("api_key", ""), model=get("model", "gpt-4o-mini")
             )
 
         elif provider_name == "anthropic":
-            return AnthropicProvider(
+            return _load_provider_class("AnthropicProvider")(
                 api_key=config.get("api_key", ""),
                 model=get("model", "claude-3-5-sonnet-20241022"),
             )
 
         elif provider_name == "antigravity":
-            return AntigravityProvider(
+            return _load_provider_class("AntigravityProvider")(
                 model=get("model", "claude-sonnet-4-5"),
             )
 
         elif provider_name == "claude_oauth":
-            return ClaudeOAuthProvider(
+            return _load_provider_class("ClaudeOAuthProvider")(
                 model=get("model", "claude-sonnet-4-20250514"),
                 mode=get("mode", "max"),
             )
 
         elif provider_name == "google":
-            return GoogleAIProvider(
+            return _load_provider_class("GoogleAIProvider")(
                 api_key=config.get("api_key", ""),
                 model=get("model", "gemini-2.0-flash"),
             )
 
         elif provider_name == "google_vertex":
-            return GoogleVertexProvider(
+            return _load_provider_class("GoogleVertexProvider")(
                 project_id=config.get("project_id", ""),
                 location=get("location", "us-central1"),
                 model=get("model", "gemini-2.0-flash"),
             )
 
         elif provider_name == "azure":
-            return AzureProvider(
+            return _load_provider_class("AzureProvider")(
                 endpoint=config.get("endpoint", ""),
                 api_key=config.get("api_key", ""),
                 api_version=get("api_version", "2024-02-01"),
@@ -280,7 +301,7 @@ class AIFactory:
             )
 
         elif provider_name == "bedrock":
-            return BedrockProvider(
+            return _load_provider_class("BedrockProvider")(
                 region_name=get("region", "us-east-1"),
                 model=get("model", "anthropic.claude-3-sonnet-20240229-v1:0"),
             )
@@ -289,69 +310,69 @@ class AIFactory:
         # OpenAI-Compatible API Providers
         # =====================================================================
         elif provider_name == "groq":
-            return OpenAICompatibleProvider(
+            return _load_provider_class("OpenAICompatibleProvider")(
                 api_key=config.get("api_key", ""),
                 base_url="https://api.groq.com/openai/v1",
                 model=get("model", "llama-3.3-70b-versatile"),
             )
 
         elif provider_name == "mistral":
-            return OpenAICompatibleProvider(
+            return _load_provider_class("OpenAICompatibleProvider")(
                 api_key=config.get("api_key", ""),
                 base_url="https://api.mistral.ai/v1",
                 model=get("model", "mistral-large-latest"),
             )
 
         elif provider_name == "together":
-            return OpenAICompatibleProvider(
+            return _load_provider_class("OpenAICompatibleProvider")(
                 api_key=config.get("api_key", ""),
                 base_url="https://api.together.xyz/v1",
                 model=get("model", "meta-llama/Llama-3.3-70B-Instruct-Turbo"),
             )
 
         elif provider_name == "nvidia":
-            return NVIDIAProvider(
+            return _load_provider_class("NVIDIAProvider")(
                 api_key=config.get("api_key", ""),
                 model=get("model", "meta/llama-3.1-8b-instruct"),
             )
 
         elif provider_name == "xai":
-            return OpenAICompatibleProvider(
+            return _load_provider_class("OpenAICompatibleProvider")(
                 api_key=config.get("api_key", ""),
                 base_url="https://api.x.ai/v1",
                 model=get("model", "grok-beta"),
             )
 
         elif provider_name == "openrouter":
-            return OpenAICompatibleProvider(
+            return _load_provider_class("OpenAICompatibleProvider")(
                 api_key=config.get("api_key", ""),
                 base_url="https://openrouter.ai/api/v1",
                 model=get("model", "openai/gpt-4o-mini"),
             )
 
         elif provider_name == "fireworks":
-            return OpenAICompatibleProvider(
+            return _load_provider_class("OpenAICompatibleProvider")(
                 api_key=config.get("api_key", ""),
                 base_url="https://api.fireworks.ai/inference/v1",
                 model=get("model", "accounts/fireworks/models/llama-v3p3-70b-instruct"),
             )
 
         elif provider_name == "deepseek":
-            return OpenAICompatibleProvider(
+            return _load_provider_class("OpenAICompatibleProvider")(
                 api_key=config.get("api_key", ""),
                 base_url="https://api.deepseek.com/v1",
                 model=get("model", "deepseek-chat"),
             )
 
         elif provider_name == "perplexity":
-            return OpenAICompatibleProvider(
+            return _load_provider_class("OpenAICompatibleProvider")(
                 api_key=config.get("api_key", ""),
                 base_url="https://api.perplexity.ai",
                 model=get("model", "llama-3.1-sonar-large-128k-online"),
             )
 
         elif provider_name == "custom":
-            return OpenAICompatibleProvider(
+            return _load_provider_class("OpenAICompatibleProvider")(
                 api_key=config.get("api_key", ""),
                 base_url=get("endpoint", "http://localhost:8000/v1"),
                 model=get("model", "custom-model"),
@@ -359,7 +380,7 @@ class AIFactory:
 
         elif provider_name == "cloudflare":
             account_id = config.get("account_id", "")
-            return OpenAICompatibleProvider(
+            return _load_provider_class("OpenAICompatibleProvider")(
                 api_key=config.get("api_key", ""),
                 base_url=f"https://api.cloudflare.com/client/v4/accounts/{account_id}/ai/v1",
                 model=get("model", "@cf/meta/llama-3-8b-instruct"),
@@ -367,7 +388,7 @@ class AIFactory:
 
         elif provider_name == "huggingface":
             model_id = get("model", "meta-llama/Meta-Llama-3-8B-Instruct")
-            return OpenAICompatibleProvider(
+            return _load_provider_class("OpenAICompatibleProvider")(
                 api_key=config.get("api_key", ""),
                 base_url=f"https://api-inference.huggingface.co/models/{model_id}/v1",
                 model=model_id,
@@ -377,35 +398,35 @@ class AIFactory:
             endpoint = get("endpoint", "http://localhost:8000/v1")
             if endpoint and not endpoint.rstrip("/").endswith("/v1"):
                 endpoint = endpoint.rstrip("/") + "/v1"
-            return OpenAICompatibleProvider(
+            return _load_provider_class("OpenAICompatibleProvider")(
                 api_key="token-not-needed",
                 base_url=endpoint,
                 model=get("model", "default"),
             )
 
         elif provider_name == "cerebras":
-            return OpenAICompatibleProvider(
+            return _load_provider_class("OpenAICompatibleProvider")(
                 api_key=config.get("api_key", ""),
                 base_url="https://api.cerebras.ai/v1",
                 model=get("model", "llama-3.3-70b"),
             )
 
         elif provider_name == "sambanova":
-            return OpenAICompatibleProvider(
+            return _load_provider_class("OpenAICompatibleProvider")(
                 api_key=config.get("api_key", ""),
                 base_url="https://api.sambanova.ai/v1",
                 model=get("model", "Meta-Llama-3.3-70B-Instruct"),
             )
 
         elif provider_name == "lepton":
-            return OpenAICompatibleProvider(
+            return _load_provider_class("OpenAICompatibleProvider")(
                 api_key=config.get("api_key", ""),
                 base_url="https://llama3-1-405b.lepton.run/api/v1",
                 model=get("model", "llama3-1-405b"),
             )
 
         elif provider_name == "anyscale":
-            return OpenAICompatibleProvider(
+            return _load_provider_class("OpenAICompatibleProvider")(
                 api_key=config.get("api_key", ""),
                 base_url="https://api.endpoints.anyscale.com/v1",
                 model=get("model", "meta-llama/Meta-Llama-3.1-70B-Instruct"),
@@ -415,14 +436,14 @@ class AIFactory:
             endpoint = get("endpoint", "http://localhost:8000/v1")
             if endpoint and not endpoint.rstrip("/").endswith("/v1"):
                 endpoint = endpoint.rstrip("/") + "/v1"
-            return OpenAICompatibleProvider(
+            return _load_provider_class("OpenAICompatibleProvider")(
                 api_key="token-not-needed",
                 base_url=endpoint,
                 model=get("model", "default"),
             )
 
         elif provider_name == "cohere":
-            return CohereProvider(
+            return _load_provider_class("CohereProvider")(
                 api_key=config.get("api_key", ""), model=get("model", "command-r-plus")
             )
 
@@ -180,6 +180,29 @@ class OllamaProvider(LLMProvider):
             pass
         return None
 
+    async def embed_batch(self, texts: list[str]) -> list[list[float] | None]:
+        """Embed all texts with one /api/embed request.
+
+        Falls back to per-text /api/embeddings calls on Ollama versions that
+        predate the batch endpoint.
+        """
+        if not texts:
+            return []
+        client = await self._get_client()
+        payload = {"model": self.model, "input": texts}
+
+        try:
+            response = await client.post("/api/embed", json=payload)
+            if response.status_code == 200:
+                embeddings = response.json().get("embeddings") or []
+                if len(embeddings) == len(texts):
+                    return [e or None for e in embeddings]
+            elif response.status_code == 404:
+                return await super().embed_batch(texts)
+        except Exception:
+            pass
+        return [None] * len(texts)
+
     async def list_models(self) -> list[str]:
         client = await self._get_client()
         url = "/api/tags"
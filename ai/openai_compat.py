@@ -208,17 +208,38 @@ class OpenAICompatibleProvider(LLMProvider):
         except Exception as e:
             yield StreamChunk(text=f"Error: {e!s}", is_complete=True)
 
+    def _embedding_model(self) -> str:
+        if "embed" in self.model.lower():
+            return self.model
+        return "text-embedding-3-small"
+
     async def embed_text(self, text: str) -> list[float] | None:
         try:
-            model = "text-embedding-3-small"
-            if "embed" in self.model.lower():
-                model = self.model
-
-            response = await self.client.embeddings.create(input=text, model=model)
+            response = await self.client.embeddings.create(
+                input=text, model=self._embedding_model()
+            )
             return response.data[0].embedding
         except Exception:
             return None
 
+    async def embed_batch(self, texts: list[str]) -> list[list[float] | None]:
+        """Embed all texts in a single embeddings request."""
+        if not texts:
+            return []
+        try:
+            response = await self.client.embeddings.create(
+                input=texts, model=self._embedding_model()
+            )
+        except Exception:
+            return [None] * len(texts)
+
+        vectors: list[list[float] | None] = [None] * len(texts)
+        for i, item in enumerate(response.data):
+            index = getattr(item, "index", i)
+            if isinstance(index, int) and 0 <= index < len(texts):
+                vectors[index] = item.embedding
+        return vectors
+
     async def list_models(self) -> list[str]:
         try:
             models_response = await self.client.models.list()
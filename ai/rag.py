@@ -2,11 +2,21 @@
 
 import asyncio
 import fnmatch
+import hashlib
 import json
-import math
-from dataclasses import dataclass
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterator
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import TypedDict
+from typing import TYPE_CHECKING, TypedDict
+
+if TYPE_CHECKING:
+    from ai.vector_index import VectorIndex
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -24,13 +34,88 @@ class IndexStats(TypedDict):
     index_size_mb: float
 
 
+def hash_file(path: Path, chunk_size: int = 8192) -> str:
+    """Return the SHA256 hex digest of a file ("" if it cannot be read)."""
+    hasher = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            while chunk := f.read(chunk_size):
+                hasher.update(chunk)
+    except OSError:
+        return ""
+    return hasher.hexdigest()
+
+
 class VectorStore:
-    """Simple in-memory vector store with JSON persistence."""
+    """Vector store backed by a memory-mapped float32 matrix.
+
+    ``path`` holds a small JSON manifest. Vectors live in a raw float32 file
+    next to it (``<stem>.vectors``) and chunk metadata in a JSON-lines sidecar
+    (``<stem>.meta.jsonl``). Both sidecars are append-only; the manifest's
+    counts mark how much of each is committed. Removing a source compacts
+    both. Legacy indexes that stored every chunk and vector in one JSON list
+    are migrated on load.
+
+    The mtime and hash of each indexed file are kept in ``<stem>.files.json``
+    so rebuilds can skip unchanged files. Reads, writes and reloads share a
+    lock, so searches and writes can each run in their own worker thread.
+    """
+
+    FORMAT_VERSION = 1
 
     def __init__(self, path: Path):
         self.path = path
+        self.vectors_path = path.with_suffix(".vectors")
+        self.meta_path = path.with_suffix(".meta.jsonl")
+        self.files_path = path.with_suffix(".files.json")
         self.chunks: list[DocumentChunk] = []
+        # Chunk index for each matrix row
+        self._row_chunks: list[int] = []
+        # path -> (mtime, hash) of indexed files
+        self._files: dict[str, tuple[float, str]] = {}
+        self._lock = threading.RLock()
+        self.index = self._open_index()
         self._load()
+        self._load_files()
+        self._signature = self._manifest_signature()
+
+    def _open_index(self, dim: int = 0, rows: int = 0) -> "VectorIndex":
+        # Imported here: NumPy is too slow to load on the startup path
+        from ai.vector_index import VectorIndex
+
+        return VectorIndex(self.vectors_path, dim, rows)
+
+    def _manifest_signature(self) -> tuple[int, int] | None:
+        """(mtime_ns, size) of the manifest, which is rewritten on every change."""
+        try:
+            st = self.path.stat()
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def reload_if_changed(self) -> bool:
+        """Reload the index if another process rewrote it since it was loaded.
+
+        Returns:
+            True if the index was reloaded.
+        """
+        with self._lock:
+            signature = self._manifest_signature()
+            if signature == self._signature:
+                return False
+            self.index.close()
+            self.index = self._open_index()
+            self.chunks = []
+            self._row_chunks = []
+            self._files = {}
+            self._load()
+            self._load_files()
+            self._signature = self._manifest_signature()
+            return True
+
+    def has_vectors(self) -> bool:
+        """Check whether any chunk has a stored vector."""
+        return len(self.index) > 0
 
     def _load(self):
         if not self.path.exists():
@@ -38,75 +123,250 @@ class VectorStore:
 
         try:
             data = json.loads(self.path.read_text())
-            for item in data:
+        except Exception as e:
+            logger.warning("Failed to read vector index %s: %s", self.path, e)
+            return
+
+        if isinstance(data, list):
+            self._migrate_legacy(data)
+            return
+
+        try:
+            dim = int(data.get("dim", 0))
+            chunk_count = int(data.get("chunks", 0))
+            row_count = int(data.get("rows", 0))
+            lines = []
+            if self.meta_path.exists():
+                with open(self.meta_path, encoding="utf-8") as f:
+                    lines = f.readlines()
+            for line in lines[:chunk_count]:
+                item = json.loads(line)
+                row = item.pop("row", -1)
+                if row >= 0:
+                    self._row_chunks.append(len(self.chunks))
                 self.chunks.append(DocumentChunk(**item))
-        except Exception:
-            pass
+            if len(lines) > chunk_count:
+                # Drop metadata from an interrupted add
+                self._write_meta()
+            self.index = self._open_index(dim, row_count)
+            del self._row_chunks[len(self.index) :]
+        except Exception as e:
+            logger.warning("Failed to load vector index %s: %s", self.path, e)
+            self.chunks = []
+            self._row_chunks = []
+            self.index = self._open_index()
+
+    def _load_files(self):
+        if not self.files_path.exists():
+            return
+        try:
+            data = json.loads(self.files_path.read_text())
+            self._files = {path: (mtime, h) for path, (mtime, h) in data.items()}
+        except Exception as e:
+            logger.warning("Failed to read file index %s: %s", self.files_path, e)
+            self._files = {}
+
+    def _write_files(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.files_path.write_text(json.dumps(self._files))
+
+    def _migrate_legacy(self, data: list):
+        """Convert a legacy JSON list index into the binary format."""
+        try:
+            chunks = [DocumentChunk(**item) for item in data]
+        except Exception as e:
+            logger.warning("Failed to migrate vector index %s: %s", self.path, e)
+            return
+        self.add(chunks)
+
+    def _write_meta(self):
+        rows = {chunk_idx: row for row, chunk_idx in enumerate(self._row_chunks)}
+        with open(self.meta_path, "w", encoding="utf-8") as f:
+            for i, chunk in enumerate(self.chunks):
+                f.write(self._meta_line(chunk, rows.get(i, -1)))
+
+    def _meta_line(self, chunk: DocumentChunk, row: int) -> str:
+        item = {
+            "id": chunk.id,
+            "content": chunk.content,
+            "source": chunk.source,
+            "row": row,
+        }
+        return json.dumps(item) + "\n"
+
+    def _write_manifest(self):
+        manifest = {
+            "version": self.FORMAT_VERSION,
+            "dim": self.index.dim,
+            "chunks": len(self.chunks),
+            "rows": len(self.index),
+        }
+        self.path.write_text(json.dumps(manifest))
+        self._signature = self._manifest_signature()
 
     def save(self):
+        """Rewrite the metadata sidecar and manifest."""
         self.path.parent.mkdir(parents=True, exist_ok=True)
-        data = [
-            {"id": c.id, "content": c.content, "source": c.source, "vector": c.vector}
-            for c in self.chunks
-        ]
-        self.path.write_text(json.dumps(data))
+        self._write_meta()
+        self._write_manifest()
 
     def clear(self):
-        self.chunks = []
-        if self.path.exists():
-            self.path.unlink()
+        with self._lock:
+            self.index.close()
+            self.index = self._open_index()
+            self.chunks = []
+            self._row_chunks = []
+            self._files = {}
+            for file_path in (
+                self.path,
+                self.vectors_path,
+                self.meta_path,
+                self.files_path,
+            ):
+                if file_path.exists():
+                    file_path.unlink()
+            self._signature = None
 
     def add(self, chunks: list[DocumentChunk]):
-        self.chunks.extend(chunks)
-        self.save()
+        """Append chunks, writing only the new rows and metadata lines."""
+        with self._lock:
+            if not chunks:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+
+            dim = self.index.dim or next((len(c.vector) for c in chunks if c.vector), 0)
+            vectors = []
+            lines = []
+            for chunk in chunks:
+                vector = chunk.vector
+                if vector and len(vector) != dim:
+                    logger.warning(
+                        "Skipping vector for %s: dimension %d != index dimension %d",
+                        chunk.id,
+                        len(vector),
+                        dim,
+                    )
+                    vector = None
+
+                row = -1
+                if vector:
+                    row = len(self.index) + len(vectors)
+                    self._row_chunks.append(len(self.chunks))
+                    vectors.append(vector)
+                # Vectors are kept in the matrix, not on the chunk objects
+                self.chunks.append(
+                    DocumentChunk(
+                        id=chunk.id, content=chunk.content, source=chunk.source
+                    )
+                )
+                lines.append(self._meta_line(chunk, row))
 
-    def search(
-        self, query_vector: list[float], limit: int = 5
-    ) -> list[tuple[DocumentChunk, float]]:
-        """Cosine similarity search."""
-        if not self.chunks or not query_vector:
-            return []
+            self.index.add(vectors)
+            with open(self.meta_path, "a", encoding="utf-8") as f:
+                f.writelines(lines)
+            self._write_manifest()
 
-        results = []
+    def remove_sources(self, sources: list[str]) -> int:
+        """Delete every chunk from the given sources and forget those files.
 
-        # Pure Python cosine similarity to avoid heavy dependencies like numpy
-        # Optimization: pre-calculate magnitude of query_vector
-        q_mag = math.sqrt(sum(x * x for x in query_vector))
-        if q_mag == 0:
-            return []
+        Returns:
+            Number of chunks removed.
+        """
+        with self._lock:
+            sources = set(sources)
+            forgotten = [s for s in sources if self._files.pop(s, None) is not None]
+            if not any(chunk.source in sources for chunk in self.chunks):
+                if forgotten:
+                    self._write_files()
+                return 0
+
+            rows = {chunk_idx: row for row, chunk_idx in enumerate(self._row_chunks)}
+            chunks: list[DocumentChunk] = []
+            row_chunks: list[int] = []
+            keep_rows: list[int] = []
+            for i, chunk in enumerate(self.chunks):
+                if chunk.source in sources:
+                    continue
+                row = rows.get(i)
+                if row is not None:
+                    keep_rows.append(row)
+                    row_chunks.append(len(chunks))
+                chunks.append(chunk)
 
-        for chunk in self.chunks:
-            if not chunk.vector:
-                continue
+            removed = len(self.chunks) - len(chunks)
+            self.index.compact(keep_rows)
+            self.chunks = chunks
+            self._row_chunks = row_chunks
+            self.save()
+            self._write_files()
+            return removed
 
-            # Dot product
-            dot = sum(a * b for a, b in zip(query_vector, chunk.vector, strict=False))
+    def get_indexed_files(self) -> dict[str, tuple[float, str]]:
+        """Return the recorded (mtime, hash) of every indexed file."""
+        return dict(self._files)
 
-            # Magnitude of chunk vector
-            c_mag = math.sqrt(sum(x * x for x in chunk.vector))
+    def optimize(self) -> int:
+        """Nothing to tune: the flat matrix is always scored in full.
 
-            if c_mag == 0:
-                similarity = 0.0
-            else:
-                similarity = dot / (q_mag * c_mag)
+        Returns:
+            Always 0 (SQLiteVectorStore compatibility).
+        """
+        return 0
+
+    def mark_indexed_many(self, entries: list[tuple[str, float, str]]):
+        """Record (path, mtime, hash) for files that are fully indexed."""
+        with self._lock:
+            if not entries:
+                return
+            for path, mtime, file_hash in entries:
+                self._files[path] = (mtime, file_hash)
+            self._write_files()
+
+    def iter_chunks(self) -> Iterator[DocumentChunk]:
+        """Yield stored chunks with their (normalized) vectors attached."""
+        with self._lock:
+            rows = {chunk_idx: row for row, chunk_idx in enumerate(self._row_chunks)}
+            chunks = []
+            for i, chunk in enumerate(self.chunks):
+                row = rows.get(i)
+                chunks.append(
+                    DocumentChunk(
+                        id=chunk.id,
+                        content=chunk.content,
+                        source=chunk.source,
+                        vector=self.index.row(row) if row is not None else None,
+                    )
+                )
+        yield from chunks
 
-            results.append((chunk, similarity))
+    def search(
+        self, query_vector: list[float], limit: int = 5
+    ) -> list[tuple[DocumentChunk, float]]:
+        """Cosine similarity search."""
+        with self._lock:
+            if not self.chunks or not query_vector:
+                return []
 
-        # Sort by similarity desc
-        results.sort(key=lambda x: x[1], reverse=True)
-        return results[:limit]
+            return [
+                (self.chunks[self._row_chunks[row]], score)
+                for row, score in self.index.search(query_vector, limit)
+            ]
 
     def stats(self) -> IndexStats:
-        size_bytes = self.path.stat().st_size if self.path.exists() else 0
-        vectors = sum(1 for c in self.chunks if c.vector)
-        unique_docs = len({c.source for c in self.chunks})
-
-        return {
-            "total_documents": unique_docs,
-            "total_chunks": len(self.chunks),
-            "total_vectors": vectors,
-            "index_size_mb": round(size_bytes / (1024 * 1024), 2),
-        }
+        with self._lock:
+            size_bytes = sum(
+                p.stat().st_size
+                for p in (self.path, self.vectors_path, self.meta_path)
+                if p.exists()
+            )
+            unique_docs = len({c.source for c in self.chunks})
+
+            return {
+                "total_documents": unique_docs,
+                "total_chunks": len(self.chunks),
+                "total_vectors": len(self.index),
+                "index_size_mb": round(size_bytes / (1024 * 1024), 2),
+            }
 
 
 class Chunker:
@@ -152,15 +412,79 @@ class Chunker:
         return chunks
 
 
+@dataclass
+class _IndexProgress:
+    """Counters shared by the indexing pipeline stages."""
+
+    total_files: int
+    files_indexed: int = 0
+    files_unchanged: int = 0
+    files_removed: int = 0
+    chunks_embedded: int = 0
+    embedding_errors: int = 0
+    last_update: float = 0.0
+    # Chunks still waiting for an embedding, per file
+    remaining: dict[Path, int] = field(default_factory=dict)
+    # Files with at least one failed chunk; they are retried on the next build
+    failed: set[Path] = field(default_factory=set)
+
+    def message(self, queued: int) -> str:
+        error_msg = f" ({self.embedding_errors} errs)" if self.embedding_errors else ""
+        queued_msg = f", {queued} queued" if queued else ""
+        skipped = []
+        if self.files_unchanged:
+            skipped.append(f"{self.files_unchanged} unchanged")
+        if self.files_removed:
+            skipped.append(f"{self.files_removed} removed")
+        skipped_msg = f" ({', '.join(skipped)})" if skipped else ""
+        return (
+            f"Indexing... {self.files_indexed}/{self.total_files} files{skipped_msg}, "
+            f"{self.chunks_embedded} chunks{queued_msg}{error_msg}"
+        )
+
+
+@dataclass
+class _IndexPlan:
+    """Files an incremental build has to touch."""
+
+    # (path, mtime, hash) of new or modified files
+    changed: list[tuple[Path, float, str]]
+    # Indexed paths that no longer exist (or are now ignored)
+    removed: list[str]
+    # Files whose mtime moved but content did not
+    touched: list[tuple[str, float, str]]
+    unchanged: int
+
+
 class RAGManager:
-    """Manages indexing and retrieval."""
+    """Manages indexing and retrieval.
 
-    def __init__(self, use_sqlite: bool = False):
+    Query embeddings are kept in a small LRU so repeated or retried prompts
+    skip the embedding round trip.
+    """
+
+    QUERY_CACHE_SIZE = 128
+
+    def __init__(
+        self,
+        use_sqlite: bool = False,
+        embed_batch_size: int = 32,
+        embed_concurrency: int = 4,
+    ):
         """Initialize RAG manager.
 
         Args:
             use_sqlite: If True, use SQLiteVectorStore instead of JSON VectorStore
+            embed_batch_size: Chunks sent per embedding request while indexing
+            embed_concurrency: Embedding requests in flight while indexing
         """
+        self.embed_batch_size = embed_batch_size
+        self.embed_concurrency = embed_concurrency
+        # Builds on the shared manager must not plan the same files twice
+        self._index_lock = asyncio.Lock()
+        self._query_vectors: OrderedDict[tuple[str, str, str], list[float]] = (
+            OrderedDict()
+        )
         if use_sqlite:
             try:
                 from ai.rag_sqlite import SQLiteVectorStore
@@ -186,79 +510,287 @@ class RAGManager:
             "*.svg",
         ]
 
-    async def index_directory(self, path: Path, provider, status_callback=None) -> int:
-        """Index a directory recursively (async non-blocking)."""
-        import time
+    async def index_directory(
+        self, path: Path, provider, status_callback=None, incremental: bool = True
+    ) -> int:
+        """Index a directory recursively (async non-blocking).
+
+        Runs as a streaming pipeline: a reader stage loads files in a thread,
+        a chunker stage splits them, and ``embed_concurrency`` workers embed
+        chunks in batches of ``embed_batch_size``. Bounded queues between the
+        stages provide backpressure so memory stays flat on large trees.
 
-        files_indexed = 0
-        chunks_to_add = []
-        last_update = 0.0
-        embedding_errors = 0
+        Builds are incremental: files whose mtime (or, failing that, content
+        hash) matches the store's file index are skipped, chunks of deleted
+        files are removed, and only new or modified files are re-embedded.
 
+        Builds are serialized: a build started while another one runs waits
+        for it and then plans against the updated file index.
+
+        Args:
+            path: Directory to index
+            provider: LLM provider used for embeddings
+            status_callback: Optional callable receiving progress messages
+            incremental: If False, re-embed every file
+
+        Returns:
+            Number of files (re-)indexed
+        """
+        async with self._index_lock:
+            return await self._index_directory(
+                path, provider, status_callback, incremental
+            )
+
+    @property
+    def is_indexing(self) -> bool:
+        """Whether a build is running."""
+        return self._index_lock.locked()
+
+    async def _index_directory(
+        self, path: Path, provider, status_callback, incremental: bool
+    ) -> int:
         if not path.exists():
             return 0
+        path = await asyncio.to_thread(path.resolve)
 
-        # Collect files in thread to prevent blocking on large trees
+        # Collect and diff files in thread to prevent blocking on large trees
         files = await asyncio.to_thread(self._collect_files, path)
-
-        for file_path in files:
-            try:
-                # Read and chunk in thread
-                content = await asyncio.to_thread(file_path.read_text, errors="ignore")
-                if not content.strip():
+        plan = await asyncio.to_thread(self._plan_index, path, files, incremental)
+
+        stale = plan.removed + [str(f) for f, _, _ in plan.changed]
+        if stale:
+            await asyncio.to_thread(self.store.remove_sources, stale)
+        if plan.touched:
+            await asyncio.to_thread(self.store.mark_indexed_many, plan.touched)
+
+        workers = max(1, self.embed_concurrency)
+        texts: asyncio.Queue[tuple[Path, str] | None] = asyncio.Queue(
+            maxsize=workers * 2
+        )
+        pending: asyncio.Queue[tuple[Path, int, str] | None] = asyncio.Queue(
+            maxsize=self.embed_batch_size * workers * 2
+        )
+        progress = _IndexProgress(
+            total_files=len(plan.changed),
+            files_unchanged=plan.unchanged,
+            files_removed=len(plan.removed),
+        )
+        to_store: list[DocumentChunk] = []
+        store_lock = asyncio.Lock()
+        store_failed = False
+        completed: list[Path] = []
+
+        def report(force: bool = False) -> None:
+            now = time.monotonic()
+            if status_callback and (force or now - progress.last_update > 1.0):
+                status_callback(progress.message(pending.qsize()))
+                progress.last_update = now
+
+        async def flush(force: bool = False) -> None:
+            nonlocal store_failed
+            async with store_lock:
+                if not to_store or (not force and len(to_store) < 256):
+                    return
+                batch = list(to_store)
+                to_store.clear()
+                try:
+                    await asyncio.to_thread(self.store.add, batch)
+                except Exception as e:
+                    store_failed = True
+                    logger.warning("Failed to store %d chunks: %s", len(batch), e)
+
+        def file_done(file_path: Path) -> None:
+            progress.files_indexed += 1
+            if file_path not in progress.failed:
+                completed.append(file_path)
+
+        async def read_files() -> None:
+            for file_path, _, _ in plan.changed:
+                try:
+                    content = await asyncio.to_thread(
+                        file_path.read_text, errors="ignore"
+                    )
+                except Exception:
                     continue
+                if content.strip():
+                    await texts.put((file_path, content))
+                else:
+                    file_done(file_path)
+            await texts.put(None)
 
-                chunks = await asyncio.to_thread(self.chunker.split_text, content)
-
-                for i, chunk_text in enumerate(chunks):
-                    vector = await provider.embed_text(chunk_text)
+        async def chunk_files() -> None:
+            try:
+                while (item := await texts.get()) is not None:
+                    file_path, content = item
+                    chunks = await asyncio.to_thread(self.chunker.split_text, content)
+                    if not chunks:
+                        file_done(file_path)
+                        continue
+                    progress.remaining[file_path] = len(chunks)
+                    for i, chunk_text in enumerate(chunks):
+                        await pending.put((file_path, i, chunk_text))
+            finally:
+                for _ in range(workers):
+                    await pending.put(None)
+
+        async def embed_worker() -> None:
+            finished = False
+            while not finished:
+                item = await pending.get()
+                if item is None:
+                    break
+                batch = [item]
+                while len(batch) < self.embed_batch_size:
+                    try:
+                        item = pending.get_nowait()
+                    except asyncio.QueueEmpty:
+                        break
+                    if item is None:
+                        finished = True
+                        break
+                    batch.append(item)
+
+                vectors = await self._embed_batch(provider, [b[2] for b in batch])
+                for (file_path, i, chunk_text), vector in zip(
+                    batch, vectors, strict=True
+                ):
                     if vector:
-                        chunks_to_add.append(
+                        to_store.append(
                             DocumentChunk(
-                                id=f"{file_path.name}:{i}",
+                                id=f"{file_path}:{i}",
                                 content=chunk_text,
                                 source=str(file_path),
                                 vector=vector,
                             )
                         )
+                        progress.chunks_embedded += 1
                     else:
-                        embedding_errors += 1
+                        progress.embedding_errors += 1
+                        progress.failed.add(file_path)
+                    progress.remaining[file_path] -= 1
+                    if progress.remaining[file_path] == 0:
+                        file_done(file_path)
+
+                await flush()
+                report()
+
+        await asyncio.gather(
+            read_files(), chunk_files(), *(embed_worker() for _ in range(workers))
+        )
+        await flush(force=True)
+        report(force=True)
+
+        # Record files only once all their chunks are stored, so an
+        # interrupted or failed build retries them next time
+        if completed and not store_failed:
+            hashes = {f: (mtime, h) for f, mtime, h in plan.changed}
+            await asyncio.to_thread(
+                self.store.mark_indexed_many,
+                [(str(f), *hashes[f]) for f in completed],
+            )
 
-                    await asyncio.sleep(0.001)
+        if progress.chunks_embedded:
+            try:
+                await asyncio.to_thread(self.store.optimize)
+            except Exception as e:
+                logger.warning("Failed to optimize vector index: %s", e)
 
-                files_indexed += 1
+        if status_callback and progress.embedding_errors > 0:
+            status_callback(
+                f"Warning: {progress.embedding_errors} embedding failures - check provider supports embeddings"
+            )
 
-                # Incrementally save every 10 files to keep status updated
-                if len(chunks_to_add) > 50 or files_indexed % 10 == 0:
-                    batch = list(chunks_to_add)  # Copy
-                    chunks_to_add.clear()
-                    await asyncio.to_thread(self.store.add, batch)
+        return progress.files_indexed
 
-                # Throttle updates to once per second
-                now = time.time()
-                if status_callback and (now - last_update > 1.0):
-                    error_msg = (
-                        f" ({embedding_errors} errs)" if embedding_errors else ""
-                    )
-                    status_callback(
-                        f"Indexing... {files_indexed}/{len(files)} files{error_msg}"
-                    )
-                    last_update = now
-                    # Force a UI refresh cycle
-                    await asyncio.sleep(0.01)
+    def _plan_index(
+        self, root: Path, files: list[Path], incremental: bool = True
+    ) -> _IndexPlan:
+        """Diff collected files against the store's file index (run in thread)."""
+        indexed = self.store.get_indexed_files()
+        plan = _IndexPlan(changed=[], removed=[], touched=[], unchanged=0)
 
-            except Exception:
+        for file_path in files:
+            try:
+                mtime = file_path.stat().st_mtime
+            except OSError:
+                continue
+            entry = indexed.get(str(file_path))
+            if incremental and entry and entry[0] == mtime:
+                plan.unchanged += 1
                 continue
+            file_hash = hash_file(file_path)
+            if incremental and entry and entry[1] == file_hash:
+                plan.touched.append((str(file_path), mtime, file_hash))
+                plan.unchanged += 1
+                continue
+            plan.changed.append((file_path, mtime, file_hash))
 
-        if chunks_to_add:
-            await asyncio.to_thread(self.store.add, chunks_to_add)
+        present = {str(f) for f in files}
+        plan.removed = [
+            p for p in indexed if p not in present and Path(p).is_relative_to(root)
+        ]
+        return plan
 
-        if status_callback and embedding_errors > 0:
-            status_callback(
-                f"Warning: {embedding_errors} embedding failures - check provider supports embeddings"
-            )
+    async def watch_directory(
+        self, path: Path, provider, status_callback=None, interval: float = 2.0
+    ) -> None:
+        """Keep the index of ``path`` fresh until cancelled.
 
-        return files_indexed
+        Polls a cheap (path, mtime, size) snapshot of the tree every
+        ``interval`` seconds and runs an incremental build whenever it changes.
+
+        Args:
+            path: Directory to watch
+            provider: LLM provider used for embeddings
+            status_callback: Optional callable receiving progress messages
+            interval: Seconds between snapshots
+        """
+        snapshot = None
+        while True:
+            current = await asyncio.to_thread(self._snapshot, path)
+            if current != snapshot:
+                if snapshot is not None and status_callback:
+                    status_callback(f"Changes detected in {path}, re-indexing...")
+                try:
+                    await self.index_directory(
+                        path, provider, status_callback=status_callback
+                    )
+                except Exception as e:
+                    logger.warning("Incremental re-index of %s failed: %s", path, e)
+                snapshot = current
+            await asyncio.sleep(interval)
+
+    def _snapshot(self, path: Path) -> dict[str, tuple[float, int]]:
+        """Return (mtime, size) for each indexable file (run in thread)."""
+        snapshot = {}
+        for file_path in self._collect_files(path):
+            try:
+                stat = file_path.stat()
+            except OSError:
+                continue
+            snapshot[str(file_path)] = (stat.st_mtime, stat.st_size)
+        return snapshot
+
+    @staticmethod
+    async def _embed_batch(provider, texts: list[str]) -> list[list[float] | None]:
+        """Embed texts with the provider's batch endpoint when it has one."""
+        embed_batch = getattr(provider, "embed_batch", None)
+        if embed_batch is not None:
+            try:
+                vectors = await embed_batch(texts)
+                if isinstance(vectors, list) and len(vectors) == len(texts):
+                    return vectors
+            except Exception:
+                return [None] * len(texts)
+
+        # Duck-typed providers without embed_batch
+        async def embed_one(text: str) -> list[float] | None:
+            try:
+                return await provider.embed_text(text)
+            except Exception:
+                return None
+
+        return list(await asyncio.gather(*(embed_one(t) for t in texts)))
 
     def _collect_files(self, path: Path) -> list[Path]:
         """Helper to collect files synchronously (run in thread)."""
@@ -269,24 +801,78 @@ class RAGManager:
             if any(fnmatch.fnmatch(file_path.name, p) for p in self.ignore_patterns):
                 continue
             # Skip hidden directories (like .git) manually if rglob didn't catch them
-            if any(p.startswith(".") for p in file_path.parts):
+            if any(p.startswith(".") for p in file_path.relative_to(path).parts):
                 continue
             if file_path.stat().st_size > 1_000_000:
                 continue
             files.append(file_path)
         return files
 
-    async def search(self, query: str, provider, limit: int = 5) -> list[DocumentChunk]:
-        """Search the index."""
+    async def embed_query(self, query: str, provider) -> list[float] | None:
+        """Embed a search query, reusing cached vectors for repeated queries."""
+        key = (type(provider).__name__, str(getattr(provider, "model", "")), query)
+        vector = self._query_vectors.get(key)
+        if vector is not None:
+            self._query_vectors.move_to_end(key)
+            return vector
+
         vector = await provider.embed_text(query)
+        if vector:
+            self._query_vectors[key] = vector
+            if len(self._query_vectors) > self.QUERY_CACHE_SIZE:
+                self._query_vectors.popitem(last=False)
+        return vector
+
+    async def search(self, query: str, provider, limit: int = 5) -> list[DocumentChunk]:
+        """Search the index.
+
+        The index is reloaded first if another process rebuilt it, and the
+        query is not embedded at all when the index is empty.
+        """
+        has_vectors = await asyncio.to_thread(self._refresh)
+        if not has_vectors:
+            return []
+
+        vector = await self.embed_query(query, provider)
         if not vector:
             return []
 
-        results = self.store.search(vector, limit)
+        # The store lock may be held by an index build, and the SQLite store
+        # reloads its matrix after writes; neither should stall the UI
+        results = await asyncio.to_thread(self.store.search, vector, limit)
         return [r[0] for r in results]
 
+    def _refresh(self) -> bool:
+        """Pick up external index changes; return whether any vectors exist."""
+        self.store.reload_if_changed()
+        return self.store.has_vectors()
+
     def get_stats(self) -> IndexStats | dict:
         return self.store.stats()
 
     def clear(self):
         self.store.clear()
+
+
+_rag_manager: RAGManager | None = None
+_rag_manager_lock = threading.Lock()
+
+
+def get_rag_manager() -> RAGManager:
+    """Get the process-wide RAG manager.
+
+    The index is loaded once and kept warm for the session instead of being
+    re-read for every prompt.
+    """
+    global _rag_manager
+    with _rag_manager_lock:
+        if _rag_manager is None:
+            _rag_manager = RAGManager()
+        return _rag_manager
+
+
+def reset_rag_manager() -> None:
+    """Reset the process-wide RAG manager (for testing)."""
+    global _rag_manager
+    with _rag_manager_lock:
+        _rag_manager = None
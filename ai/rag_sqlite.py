@@ -3,13 +3,26 @@
 import asyncio
 import hashlib
 import json
+import logging
 import math
 import sqlite3
+import threading
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
-from ai.rag import DocumentChunk
+from ai.rag import DocumentChunk, hash_file
+from ai.vector_index import (
+    VectorIndex,
+    pack_vector,
+    train_centroids,
+    unpack_vector,
+)
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -24,7 +37,29 @@ class Document:
 
 
 class SQLiteVectorStore:
-    """SQLite-based vector store with FTS5 for hybrid search."""
+    """SQLite-based vector store with FTS5 for hybrid search.
+
+    Embeddings are stored as packed little-endian float32 BLOBs. Vector search
+    runs against an in-process matrix that is loaded once and reloaded only
+    when the ``embeddings_version`` counter (bumped by triggers) changes.
+    After :meth:`build_ivf`, each embedding is assigned to a coarse bucket and
+    queries only score rows in the ``ivf_probes`` nearest buckets.
+    :meth:`optimize` builds the buckets once the store is large enough for
+    pruning to pay off and retrains them as it grows.
+
+    The store holds one WAL-mode connection for its lifetime. Access is
+    serialized with a lock so methods can be offloaded with asyncio.to_thread.
+    """
+
+    # 1: JSON-encoded vectors, 2: packed float32 vectors with IVF buckets
+    SCHEMA_VERSION = 2
+
+    # Below this many embeddings a full matmul is cheap, so IVF pruning would
+    # only cost recall
+    IVF_MIN_EMBEDDINGS = 20_000
+    # Retrain the buckets once the store has grown by this factor since the
+    # last build
+    IVF_REBUILD_GROWTH = 2
 
     SCHEMA = """
     CREATE TABLE IF NOT EXISTS documents (
@@ -38,7 +73,8 @@ class SQLiteVectorStore:
     CREATE TABLE IF NOT EXISTS embeddings (
         doc_id TEXT PRIMARY KEY REFERENCES documents(id),
         vector BLOB NOT NULL,
-        model TEXT NOT NULL
+        model TEXT NOT NULL,
+        bucket INTEGER
     );
 
     CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
@@ -60,41 +96,151 @@ class SQLiteVectorStore:
         mtime REAL,
         hash TEXT
     );
+
+    CREATE TABLE IF NOT EXISTS ivf_centroids (
+        bucket INTEGER PRIMARY KEY,
+        vector BLOB NOT NULL
+    );
+
+    CREATE TABLE IF NOT EXISTS store_meta (
+        key TEXT PRIMARY KEY,
+        value INTEGER NOT NULL
+    );
     """
 
-    def __init__(self, db_path: Path | None = None):
+    # Created after migrations, since older databases lack embeddings.bucket
+    VERSION_TRIGGERS = """
+    CREATE INDEX IF NOT EXISTS idx_embeddings_bucket ON embeddings(bucket);
+
+    CREATE TRIGGER IF NOT EXISTS embeddings_version_insert
+    AFTER INSERT ON embeddings BEGIN
+        INSERT INTO store_meta (key, value) VALUES ('embeddings_version', 1)
+        ON CONFLICT(key) DO UPDATE SET value = value + 1;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS embeddings_version_update
+    AFTER UPDATE OF vector ON embeddings BEGIN
+        INSERT INTO store_meta (key, value) VALUES ('embeddings_version', 1)
+        ON CONFLICT(key) DO UPDATE SET value = value + 1;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS embeddings_version_delete
+    AFTER DELETE ON embeddings BEGIN
+        INSERT INTO store_meta (key, value) VALUES ('embeddings_version', 1)
+        ON CONFLICT(key) DO UPDATE SET value = value + 1;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS centroids_version_insert
+    AFTER INSERT ON ivf_centroids BEGIN
+        INSERT INTO store_meta (key, value) VALUES ('centroids_version', 1)
+        ON CONFLICT(key) DO UPDATE SET value = value + 1;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS centroids_version_delete
+    AFTER DELETE ON ivf_centroids BEGIN
+        INSERT INTO store_meta (key, value) VALUES ('centroids_version', 1)
+        ON CONFLICT(key) DO UPDATE SET value = value + 1;
+    END;
+    """
+
+    def __init__(self, db_path: Path | None = None, ivf_probes: int = 8):
         """Initialize SQLite vector store.
 
         Args:
             db_path: Path to SQLite database. Defaults to ~/.null/rag.db
+            ivf_probes: Number of nearest IVF buckets scored per query
         """
         self.db_path = db_path or Path.home() / ".null" / "rag.db"
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.ivf_probes = ivf_probes
+
+        # In-process matrix cache, keyed by (embeddings_version,
+        # centroids_version, dimension)
+        self._matrix: VectorIndex | None = None
+        self._matrix_key: tuple[int, int, int] | None = None
+        self._matrix_ids: list[str] = []
+        self._bucket_rows: dict[int | None, list[int]] = {}
+        self._centroids: VectorIndex | None = None
+        self._centroids_version: int | None = None
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
         self._init_db()
 
     def _init_db(self) -> None:
-        """Initialize database schema."""
-        with sqlite3.connect(self.db_path) as conn:
+        """Initialize database schema and migrate older layouts."""
+        with self._transaction() as conn:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
             conn.executescript(self.SCHEMA)
-            conn.commit()
+            if version < self.SCHEMA_VERSION:
+                self._migrate(conn, version)
+            conn.executescript(self.VERSION_TRIGGERS)
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run a block on the shared connection as a single transaction."""
+        with self._lock, self._conn:
+            yield self._conn
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _migrate(self, conn: sqlite3.Connection, version: int) -> None:
+        """Upgrade the database from ``version`` to SCHEMA_VERSION."""
+        if version < 2:
+            try:
+                conn.execute("ALTER TABLE embeddings ADD COLUMN bucket INTEGER")
+            except sqlite3.OperationalError:
+                # Column already exists - fresh database
+                pass
+
+            # Re-encode JSON vectors as packed float32
+            rows = conn.execute("SELECT doc_id, vector FROM embeddings").fetchall()
+            converted = []
+            for doc_id, blob in rows:
+                if not blob or not bytes(blob).lstrip().startswith(b"["):
+                    continue
+                try:
+                    vector = json.loads(bytes(blob).decode("utf-8"))
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    logger.warning("Dropping unreadable embedding for %s", doc_id)
+                    conn.execute("DELETE FROM embeddings WHERE doc_id = ?", (doc_id,))
+                    continue
+                converted.append((pack_vector(vector), doc_id))
+            if converted:
+                logger.info("Migrating %d embeddings to float32", len(converted))
+                conn.executemany(
+                    "UPDATE embeddings SET vector = ? WHERE doc_id = ?", converted
+                )
+
+        conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
 
     def add(self, chunks: list) -> None:
         """Add DocumentChunk objects to the store (VectorStore compatibility).
 
+        All documents, FTS rows and embeddings are written in one transaction.
+
         Args:
             chunks: List of DocumentChunk objects
         """
-        for chunk in chunks:
-            doc = Document(
+        docs = [
+            Document(
                 id=chunk.id,
                 source=chunk.source,
                 content=chunk.content,
                 chunk_index=0,
                 embedding=chunk.vector,
             )
-            self.add_document(doc)
-            if chunk.vector:
-                self.add_embedding(chunk.id, chunk.vector, "unknown")
+            for chunk in chunks
+        ]
+        embeddings = [(chunk.id, chunk.vector) for chunk in chunks if chunk.vector]
+        with self._transaction() as conn:
+            self._write_documents(conn, docs)
+            self._write_embeddings(conn, embeddings, "unknown")
 
     def add_document(self, doc: Document) -> None:
         """Add or update a document in the store.
@@ -102,22 +248,16 @@ class SQLiteVectorStore:
         Args:
             doc: Document to add
         """
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                """
-                INSERT OR REPLACE INTO documents (id, source, content, chunk_index)
-                VALUES (?, ?, ?, ?)
-                """,
-                (doc.id, doc.source, doc.content, doc.chunk_index),
-            )
-            conn.execute(
-                """
-                INSERT OR REPLACE INTO documents_fts (rowid, content)
-                SELECT rowid, content FROM documents WHERE id = ?
-                """,
-                (doc.id,),
-            )
-            conn.commit()
+        self.add_documents([doc])
+
+    def add_documents(self, docs: list[Document]) -> None:
+        """Add or update several documents in one transaction.
+
+        Args:
+            docs: Documents to add
+        """
+        with self._transaction() as conn:
+            self._write_documents(conn, docs)
 
     def add_embedding(self, doc_id: str, vector: list[float], model: str) -> None:
         """Add or update embedding for a document.
@@ -127,18 +267,239 @@ class SQLiteVectorStore:
             vector: Embedding vector as list of floats
             model: Model name used to generate embedding
         """
-        # Convert vector to binary blob
-        vector_bytes = json.dumps(vector).encode("utf-8")
+        self.add_embeddings([(doc_id, vector)], model)
 
-        with sqlite3.connect(self.db_path) as conn:
+    def add_embeddings(
+        self, embeddings: list[tuple[str, list[float]]], model: str
+    ) -> None:
+        """Add or update several embeddings in one transaction.
+
+        Args:
+            embeddings: (doc_id, vector) pairs
+            model: Model name used to generate the embeddings
+        """
+        with self._transaction() as conn:
+            self._write_embeddings(conn, embeddings, model)
+
+    @staticmethod
+    def _write_documents(conn: sqlite3.Connection, docs: list[Document]) -> None:
+        """Upsert documents and keep the external-content FTS index in sync."""
+        if not docs:
+            return
+        ids = [(doc.id,) for doc in docs]
+
+        # Remove the old FTS entries before their content changes
+        conn.executemany(
+            """
+            INSERT INTO documents_fts (documents_fts, rowid, content)
+            SELECT 'delete', rowid, content FROM documents WHERE id = ?
+            """,
+            ids,
+        )
+        conn.executemany(
+            """
+            INSERT INTO documents (id, source, content, chunk_index)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                source = excluded.source,
+                content = excluded.content,
+                chunk_index = excluded.chunk_index,
+                updated_at = CURRENT_TIMESTAMP
+            """,
+            [(doc.id, doc.source, doc.content, doc.chunk_index) for doc in docs],
+        )
+        conn.executemany(
+            """
+            INSERT INTO documents_fts (rowid, content)
+            SELECT rowid, content FROM documents WHERE id = ?
+            """,
+            ids,
+        )
+
+    def _write_embeddings(
+        self,
+        conn: sqlite3.Connection,
+        embeddings: list[tuple[str, list[float]]],
+        model: str,
+    ) -> None:
+        if not embeddings:
+            return
+        centroids = self._get_centroids(conn)
+        conn.executemany(
+            """
+            INSERT OR REPLACE INTO embeddings (doc_id, vector, model, bucket)
+            VALUES (?, ?, ?, ?)
+            """,
+            [
+                (
+                    doc_id,
+                    pack_vector(vector),
+                    model,
+                    self._assign_bucket(centroids, vector),
+                )
+                for doc_id, vector in embeddings
+            ],
+        )
+
+    @staticmethod
+    def _get_version(conn: sqlite3.Connection, key: str) -> int:
+        row = conn.execute(
+            "SELECT value FROM store_meta WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def _get_centroids(self, conn: sqlite3.Connection) -> VectorIndex | None:
+        """Load IVF centroids, cached until centroids_version changes."""
+        version = self._get_version(conn, "centroids_version")
+        if version != self._centroids_version:
+            blobs = conn.execute(
+                "SELECT vector FROM ivf_centroids ORDER BY bucket"
+            ).fetchall()
+            self._centroids = None
+            if blobs:
+                dim = len(blobs[0][0]) // 4
+                self._centroids = VectorIndex.from_bytes(
+                    b"".join(bytes(b[0]) for b in blobs), dim
+                )
+            self._centroids_version = version
+        return self._centroids
+
+    @staticmethod
+    def _assign_bucket(
+        centroids: VectorIndex | None, vector: list[float]
+    ) -> int | None:
+        """Return the nearest IVF bucket for a vector, if buckets exist."""
+        if centroids is None or centroids.dim != len(vector):
+            return None
+        best = centroids.search(vector, 1)
+        return best[0][0] if best else None
+
+    def _get_matrix(self, conn: sqlite3.Connection, dim: int) -> VectorIndex:
+        """Return the cached embedding matrix for ``dim``-sized vectors."""
+        key = (
+            self._get_version(conn, "embeddings_version"),
+            self._get_version(conn, "centroids_version"),
+            dim,
+        )
+        if self._matrix is not None and key == self._matrix_key:
+            return self._matrix
+
+        cursor = conn.execute(
+            """
+            SELECT doc_id, vector, bucket FROM embeddings
+            WHERE length(vector) = ?
+            ORDER BY rowid
+            """,
+            (dim * 4,),
+        )
+        ids: list[str] = []
+        blobs: list[bytes] = []
+        buckets: dict[int | None, list[int]] = {}
+        for row, (doc_id, blob, bucket) in enumerate(cursor):
+            ids.append(doc_id)
+            blobs.append(bytes(blob))
+            buckets.setdefault(bucket, []).append(row)
+
+        self._matrix = VectorIndex.from_bytes(b"".join(blobs), dim, normalize=True)
+        self._matrix_ids = ids
+        self._bucket_rows = buckets
+        self._matrix_key = key
+        return self._matrix
+
+    def _candidate_rows(
+        self, conn: sqlite3.Connection, query_vector: list[float], limit: int
+    ) -> list[int] | None:
+        """Rows in the nearest IVF buckets, or None to score every row."""
+        centroids = self._get_centroids(conn)
+        if centroids is None or centroids.dim != len(query_vector):
+            return None
+        probes = centroids.search(query_vector, self.ivf_probes)
+        rows = list(self._bucket_rows.get(None, []))
+        for bucket, _ in probes:
+            rows.extend(self._bucket_rows.get(bucket, []))
+        if len(rows) < limit:
+            return None
+        return rows
+
+    def build_ivf(self, n_buckets: int | None = None, iterations: int = 10) -> int:
+        """Cluster embeddings into coarse buckets for pruned vector search.
+
+        Args:
+            n_buckets: Number of buckets. Defaults to sqrt(embedding count).
+            iterations: k-means iterations
+
+        Returns:
+            Number of buckets created (0 if there are no embeddings).
+        """
+        with self._transaction() as conn:
+            sizes = Counter(
+                row[0] for row in conn.execute("SELECT length(vector) FROM embeddings")
+            )
+            if not sizes:
+                return 0
+            dim = sizes.most_common(1)[0][0] // 4
+            matrix = self._get_matrix(conn, dim)
+            if n_buckets is None:
+                n_buckets = max(1, int(math.sqrt(len(matrix))))
+
+            centroids = train_centroids(matrix, n_buckets, iterations)
+            assignment = centroids.nearest(matrix)
+
+            conn.execute("DELETE FROM ivf_centroids")
+            conn.executemany(
+                "INSERT INTO ivf_centroids (bucket, vector) VALUES (?, ?)",
+                [
+                    (bucket, pack_vector(centroids.row(bucket)))
+                    for bucket in range(len(centroids))
+                ],
+            )
+            conn.execute("UPDATE embeddings SET bucket = NULL")
+            conn.executemany(
+                "UPDATE embeddings SET bucket = ? WHERE doc_id = ?",
+                [
+                    (bucket, doc_id)
+                    for bucket, doc_id in zip(assignment, self._matrix_ids, strict=True)
+                ],
+            )
             conn.execute(
                 """
-                INSERT OR REPLACE INTO embeddings (doc_id, vector, model)
-                VALUES (?, ?, ?)
+                INSERT INTO store_meta (key, value) VALUES ('ivf_rows', ?)
+                ON CONFLICT(key) DO UPDATE SET value = excluded.value
                 """,
-                (doc_id, vector_bytes, model),
+                (len(matrix),),
             )
-            conn.commit()
+
+        return len(centroids)
+
+    def optimize(self) -> int:
+        """Build or retrain IVF buckets if the store has grown enough.
+
+        Returns:
+            Number of buckets built (0 if the buckets were left as they are).
+        """
+        with self._transaction() as conn:
+            count = conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            trained = self._get_version(conn, "ivf_rows")
+        if count < self.IVF_MIN_EMBEDDINGS:
+            return 0
+        if trained and count < trained * self.IVF_REBUILD_GROWTH:
+            return 0
+        logger.info("Building IVF buckets for %d embeddings", count)
+        return self.build_ivf()
+
+    def reload_if_changed(self) -> bool:
+        """Nothing to reload: the vector matrix is re-read when its version moves.
+
+        Returns:
+            Always False (VectorStore compatibility).
+        """
+        return False
+
+    def has_vectors(self) -> bool:
+        """Check whether any embeddings are stored."""
+        with self._transaction() as conn:
+            row = conn.execute("SELECT EXISTS (SELECT 1 FROM embeddings)").fetchone()
+        return bool(row[0])
 
     def search_fts(self, query: str, limit: int = 10) -> list[Document]:
         """Full-text search using FTS5.
@@ -150,12 +511,12 @@ class SQLiteVectorStore:
         Returns:
             List of matching documents
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._transaction() as conn:
             cursor = conn.execute(
                 """
                 SELECT d.id, d.source, d.content, d.chunk_index
                 FROM documents d
-                WHERE d.id IN (
+                WHERE d.rowid IN (
                     SELECT rowid FROM documents_fts WHERE documents_fts MATCH ?
                 )
                 LIMIT ?
@@ -211,50 +572,40 @@ class SQLiteVectorStore:
         if not query_vector:
             return []
 
-        # Pre-calculate query magnitude
-        q_mag = math.sqrt(sum(x * x for x in query_vector))
-        if q_mag == 0:
-            return []
+        with self._transaction() as conn:
+            matrix = self._get_matrix(conn, len(query_vector))
+            rows = self._candidate_rows(conn, query_vector, limit)
+            top = matrix.search(query_vector, limit, rows=rows)
+            if not top:
+                return []
 
-        with sqlite3.connect(self.db_path) as conn:
+            ids = [self._matrix_ids[row] for row, _ in top]
+            placeholders = ",".join("?" * len(ids))
             cursor = conn.execute(
-                """
+                f"""
                 SELECT d.id, d.source, d.content, d.chunk_index, e.vector
                 FROM documents d
-                LEFT JOIN embeddings e ON d.id = e.doc_id
-                WHERE e.vector IS NOT NULL
-                """
+                JOIN embeddings e ON d.id = e.doc_id
+                WHERE d.id IN ({placeholders})
+                """,
+                ids,
             )
-
-            results = []
-            for row in cursor:
-                doc_id, source, content, chunk_index, vector_bytes = row
-                try:
-                    vector = json.loads(vector_bytes.decode("utf-8"))
-                except (json.JSONDecodeError, AttributeError):
-                    continue
-
-                # Cosine similarity
-                dot = sum(a * b for a, b in zip(query_vector, vector, strict=False))
-                c_mag = math.sqrt(sum(x * x for x in vector))
-
-                if c_mag == 0:
-                    similarity = 0.0
-                else:
-                    similarity = dot / (q_mag * c_mag)
-
-                doc = Document(
-                    id=doc_id,
-                    source=source,
-                    content=content,
-                    chunk_index=chunk_index,
-                    embedding=vector,
+            docs = {
+                row[0]: Document(
+                    id=row[0],
+                    source=row[1],
+                    content=row[2],
+                    chunk_index=row[3],
+                    embedding=unpack_vector(bytes(row[4])),
                 )
-                results.append((doc, similarity))
+                for row in cursor
+            }
 
-            # Sort by similarity descending
-            results.sort(key=lambda x: x[1], reverse=True)
-            return results[:limit]
+        return [
+            (docs[doc_id], score)
+            for doc_id, (_, score) in zip(ids, top, strict=True)
+            if doc_id in docs
+        ]
 
     def hybrid_search(
         self,
@@ -318,7 +669,7 @@ class SQLiteVectorStore:
         """
         query_hash = hashlib.sha256(query.encode()).hexdigest()
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._transaction() as conn:
             cursor = conn.execute(
                 """
                 SELECT results FROM query_cache WHERE query_hash = ?
@@ -335,7 +686,6 @@ class SQLiteVectorStore:
                     """,
                     (query_hash,),
                 )
-                conn.commit()
 
                 try:
                     return json.loads(row[0])
@@ -354,7 +704,7 @@ class SQLiteVectorStore:
         query_hash = hashlib.sha256(query.encode()).hexdigest()
         results_json = json.dumps(results)
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._transaction() as conn:
             conn.execute(
                 """
                 INSERT OR REPLACE INTO query_cache (query_hash, query_text, results)
@@ -362,7 +712,6 @@ class SQLiteVectorStore:
                 """,
                 (query_hash, query, results_json),
             )
-            conn.commit()
 
     def needs_reindex(self, path: str) -> bool:
         """Check if file needs reindexing based on mtime/hash.
@@ -378,9 +727,8 @@ class SQLiteVectorStore:
             return False
 
         current_mtime = file_path.stat().st_mtime
-        current_hash = self._hash_file(file_path)
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._transaction() as conn:
             cursor = conn.execute(
                 """
                 SELECT mtime, hash FROM file_index WHERE path = ?
@@ -389,11 +737,14 @@ class SQLiteVectorStore:
             )
             row = cursor.fetchone()
 
-            if not row:
-                return True
+        if not row:
+            return True
 
-            stored_mtime, stored_hash = row
-            return current_mtime != stored_mtime or current_hash != stored_hash
+        stored_mtime, stored_hash = row
+        if current_mtime == stored_mtime:
+            return False
+        # Only hash when the mtime moved; a touch without edits is not a change
+        return self._hash_file(file_path) != stored_hash
 
     def mark_indexed(self, path: str, mtime: float, file_hash: str) -> None:
         """Mark file as indexed.
@@ -403,15 +754,69 @@ class SQLiteVectorStore:
             mtime: File modification time
             file_hash: File content hash
         """
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
+        self.mark_indexed_many([(path, mtime, file_hash)])
+
+    def mark_indexed_many(self, entries: list[tuple[str, float, str]]) -> None:
+        """Mark several files as indexed in one transaction.
+
+        Args:
+            entries: (path, mtime, hash) tuples
+        """
+        if not entries:
+            return
+        with self._transaction() as conn:
+            conn.executemany(
                 """
                 INSERT OR REPLACE INTO file_index (path, mtime, hash)
                 VALUES (?, ?, ?)
                 """,
-                (path, mtime, file_hash),
+                entries,
             )
-            conn.commit()
+
+    def get_indexed_files(self) -> dict[str, tuple[float, str]]:
+        """Get the recorded mtime and hash of every indexed file.
+
+        Returns:
+            Mapping of path to (mtime, hash)
+        """
+        with self._transaction() as conn:
+            rows = conn.execute("SELECT path, mtime, hash FROM file_index").fetchall()
+        return {path: (mtime, file_hash) for path, mtime, file_hash in rows}
+
+    def remove_sources(self, sources: list[str]) -> int:
+        """Delete all documents and embeddings from the given sources.
+
+        The sources are also dropped from the file index.
+
+        Args:
+            sources: Source file paths
+
+        Returns:
+            Number of documents removed
+        """
+        if not sources:
+            return 0
+        params = [(source,) for source in sources]
+        with self._transaction() as conn:
+            conn.executemany(
+                """
+                INSERT INTO documents_fts (documents_fts, rowid, content)
+                SELECT 'delete', rowid, content FROM documents WHERE source = ?
+                """,
+                params,
+            )
+            conn.executemany(
+                """
+                DELETE FROM embeddings
+                WHERE doc_id IN (SELECT id FROM documents WHERE source = ?)
+                """,
+                params,
+            )
+            removed = conn.executemany(
+                "DELETE FROM documents WHERE source = ?", params
+            ).rowcount
+            conn.executemany("DELETE FROM file_index WHERE path = ?", params)
+        return removed
 
     @staticmethod
     def _hash_file(path: Path, chunk_size: int = 8192) -> str:
@@ -424,23 +829,20 @@ class SQLiteVectorStore:
         Returns:
             Hex digest of file hash
         """
-        hasher = hashlib.sha256()
-        try:
-            with open(path, "rb") as f:
-                while chunk := f.read(chunk_size):
-                    hasher.update(chunk)
-        except OSError:
-            return ""
-        return hasher.hexdigest()
+        return hash_file(path, chunk_size)
 
     def clear(self) -> None:
         """Clear all data from the store."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO documents_fts (documents_fts) VALUES ('delete-all')"
+            )
             conn.execute("DELETE FROM documents")
             conn.execute("DELETE FROM embeddings")
             conn.execute("DELETE FROM query_cache")
             conn.execute("DELETE FROM file_index")
-            conn.commit()
+            conn.execute("DELETE FROM ivf_centroids")
+            conn.execute("DELETE FROM store_meta WHERE key = 'ivf_rows'")
 
     def stats(self) -> dict[str, Any]:
         """Get store statistics.
@@ -448,14 +850,18 @@ class SQLiteVectorStore:
         Returns:
             Dictionary with store statistics
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._transaction() as conn:
             chunk_count = conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
             vector_count = conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
             unique_sources = conn.execute(
                 "SELECT COUNT(DISTINCT source) FROM documents"
             ).fetchone()[0]
 
-        size_bytes = self.db_path.stat().st_size if self.db_path.exists() else 0
+        # Recent writes live in the WAL file until the next checkpoint
+        wal_path = self.db_path.with_name(self.db_path.name + "-wal")
+        size_bytes = sum(
+            p.stat().st_size for p in (self.db_path, wal_path) if p.exists()
+        )
 
         return {
             "total_documents": unique_sources,
@@ -511,7 +917,7 @@ class SemanticCache:
             return cached
 
         # Then try semantic similarity on cached queries
-        with sqlite3.connect(self.store.db_path) as conn:
+        with self.store._transaction() as conn:
             cursor = conn.execute(
                 """
                 SELECT query_text, results FROM query_cache
@@ -590,7 +996,22 @@ def migrate_json_to_sqlite(json_path: Path, sqlite_store: SQLiteVectorStore) ->
     except (json.JSONDecodeError, OSError):
         return 0
 
-    migrated = 0
+    if isinstance(data, dict):
+        # Binary VectorStore index: read chunks and vectors through the store
+        from ai.rag import VectorStore
+
+        data = [
+            {
+                "id": chunk.id,
+                "content": chunk.content,
+                "source": chunk.source,
+                "vector": chunk.vector,
+            }
+            for chunk in VectorStore(json_path).iter_chunks()
+        ]
+
+    docs = []
+    embeddings = []
     for item in data:
         try:
             # Convert DocumentChunk format to Document format
@@ -601,14 +1022,13 @@ def migrate_json_to_sqlite(json_path: Path, sqlite_store: SQLiteVectorStore) ->
                 chunk_index=0,
                 embedding=item.get("vector"),
             )
-
-            sqlite_store.add_document(doc)
-
             if doc.embedding:
-                sqlite_store.add_embedding(doc.id, doc.embedding, "unknown")
-
-            migrated += 1
-        except (KeyError, TypeError, ValueError):
+                embeddings.append((doc.id, [float(x) for x in doc.embedding]))
+            docs.append(doc)
+        except (KeyError, TypeError, ValueError, AttributeError):
             continue
 
-    return migrated
+    sqlite_store.add_documents(docs)
+    sqlite_store.add_embeddings(embeddings, "unknown")
+
+    return len(docs)
@@ -0,0 +1,91 @@
+"""Bridge blocking SDK streams onto the event loop."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections.abc import AsyncGenerator, Callable, Iterable
+from concurrent.futures import Executor
+from typing import Any
+
+# Items read ahead of the consumer before the producer thread waits
+DEFAULT_MAX_BUFFER = 64
+# How often a producer blocked on a full buffer checks for cancellation
+_POLL_SECONDS = 0.1
+
+_ITEM, _DONE, _ERROR = range(3)
+
+
+def _close(iterator: Any) -> None:
+    close = getattr(iterator, "close", None)
+    if close is not None:
+        try:
+            close()
+        except Exception:
+            pass
+
+
+async def iterate_in_thread[T](
+    open_stream: Callable[[], Iterable[T]],
+    executor: Executor | None = None,
+    max_buffer: int = DEFAULT_MAX_BUFFER,
+) -> AsyncGenerator[T, None]:
+    """Iterate a blocking stream from a worker thread.
+
+    ``open_stream`` is called in the thread too, so the request that opens
+    the stream doesn't block the loop either. The thread reads at most
+    ``max_buffer`` items ahead of the consumer. When the consumer stops
+    early (break, cancellation or an error) the thread is told to stop and
+    the stream is closed if it has a ``close()`` method.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue[tuple[int, Any]] = asyncio.Queue()
+    slots = threading.Semaphore(max_buffer)
+    stop = threading.Event()
+    stream: list[Any] = []
+
+    def send(kind: int, value: Any) -> None:
+        try:
+            loop.call_soon_threadsafe(queue.put_nowait, (kind, value))
+        except RuntimeError:
+            pass  # the loop is gone; nobody is listening
+
+    def produce() -> None:
+        try:
+            iterable = open_stream()
+            stream.append(iterable)
+            if stop.is_set():
+                # The consumer left while the stream was opening and found
+                # nothing to close; don't wait on the first read
+                return
+            for item in iterable:
+                while not slots.acquire(timeout=_POLL_SECONDS):
+                    if stop.is_set():
+                        return
+                if stop.is_set():
+                    return
+                send(_ITEM, item)
+        except BaseException as e:
+            if not stop.is_set():
+                send(_ERROR, e)
+        else:
+            send(_DONE, None)
+        finally:
+            if stream:
+                _close(stream[0])
+
+    loop.run_in_executor(executor, produce)
+    try:
+        while True:
+            kind, value = await queue.get()
+            if kind == _DONE:
+                return
+            if kind == _ERROR:
+                raise value
+            slots.release()
+            yield value
+    finally:
+        stop.set()
+        # Unblock a thread waiting on the network rather than on the buffer
+        if stream:
+            _close(stream[0])
@@ -7,10 +7,14 @@ Different LLM families handle "thinking" or "reasoning" differently:
 - Local models: Best with explicit XML tag prompting
 """
 
+from __future__ import annotations
+
 import json
 import re
 from abc import ABC, abstractmethod
 
+JSON_THINKING_PREFIX = '{"thinking"'
+
 
 class ThinkingStrategy(ABC):
     """Base strategy for extracting thinking from model responses."""
@@ -55,6 +59,10 @@ class ThinkingStrategy(ABC):
         thinking_complete = bool(thinking and remaining)
         return thinking, remaining, thinking_complete
 
+    def create_stream_parser(self) -> ThinkingStreamParser:
+        """Create a push parser for splitting a streamed response."""
+        return ThinkingStreamParser(self)
+
 
 class XMLTagStrategy(ThinkingStrategy):
     """Uses <think>...</think> XML tags for reasoning.
@@ -110,6 +118,9 @@ Then provide your response or tool calls. Always use the think tags to show your
 
         return "", text, False
 
+    def create_stream_parser(self) -> ThinkingStreamParser:
+        return XMLTagStreamParser()
+
 
 class JSONStructuredStrategy(ThinkingStrategy):
     """Uses JSON structured output for thinking.
@@ -127,33 +138,42 @@ Before each action, output your reasoning as a JSON object on its own line:
 Then proceed with your response or tool calls. The thinking JSON should be on a separate line from your main response.
 """
 
+    @staticmethod
+    def parse_line(line: str) -> tuple[str | None, str | None]:
+        """Split one line into a thinking part and the text left over.
+
+        Returns:
+            Tuple of (thinking_part, remaining_line); either may be None
+        """
+        stripped = line.strip()
+
+        # Try to parse as thinking JSON
+        if stripped.startswith(JSON_THINKING_PREFIX):
+            try:
+                # Handle potential trailing content
+                json_end = stripped.find("}") + 1
+                if json_end > 0:
+                    json_str = stripped[:json_end]
+                    data = json.loads(json_str)
+                    if "thinking" in data:
+                        # Keep any content after the JSON
+                        after_json = stripped[json_end:].strip()
+                        return data["thinking"], after_json or None
+            except json.JSONDecodeError:
+                pass
+
+        return None, line
+
     def extract_thinking(self, text: str) -> tuple[str, str]:
-        lines = text.split("\n")
         thinking_parts: list[str] = []
         remaining_lines: list[str] = []
 
-        for line in lines:
-            stripped = line.strip()
-
-            # Try to parse as thinking JSON
-            if stripped.startswith('{"thinking"'):
-                try:
-                    # Handle potential trailing content
-                    json_end = stripped.find("}") + 1
-                    if json_end > 0:
-                        json_str = stripped[:json_end]
-                        data = json.loads(json_str)
-                        if "thinking" in data:
-                            thinking_parts.append(data["thinking"])
-                            # Keep any content after the JSON
-                            after_json = stripped[json_end:].strip()
-                            if after_json:
-                                remaining_lines.append(after_json)
-                            continue
-                except json.JSONDecodeError:
-                    pass
-
-            remaining_lines.append(line)
+        for line in text.split("\n"):
+            part, remaining = self.parse_line(line)
+            if part is not None:
+                thinking_parts.append(part)
+            if remaining is not None:
+                remaining_lines.append(remaining)
 
         thinking = "\n".join(thinking_parts)
         remaining = "\n".join(remaining_lines).strip()
@@ -163,6 +183,9 @@ Then proceed with your response or tool calls. The thinking JSON should be on a
         # JSON extraction works better on complete lines
         return True
 
+    def create_stream_parser(self) -> ThinkingStreamParser:
+        return JSONLineStreamParser()
+
 
 class NativeThinkingStrategy(ThinkingStrategy):
     """For models with native thinking support.
@@ -188,6 +211,9 @@ class NativeThinkingStrategy(ThinkingStrategy):
     def extract_thinking_streaming(self, text: str) -> tuple[str, str, bool]:
         return XMLTagStrategy().extract_thinking_streaming(text)
 
+    def create_stream_parser(self) -> ThinkingStreamParser:
+        return XMLTagStreamParser()
+
 
 class MinimalThinkingStrategy(ThinkingStrategy):
     """Lightweight strategy for models that don't support structured thinking well.
@@ -211,6 +237,264 @@ class MinimalThinkingStrategy(ThinkingStrategy):
     def extract_thinking_streaming(self, text: str) -> tuple[str, str, bool]:
         return "", text, True
 
+    def create_stream_parser(self) -> ThinkingStreamParser:
+        return PassthroughStreamParser()
+
+
+class ThinkingStreamParser:
+    """Push parser that splits streamed text into thinking and answer.
+
+    ``feed`` takes the newly streamed text and returns the
+    ``(thinking_delta, answer_delta)`` it produced; the accumulated results
+    are available as ``thinking`` and ``answer``. Call ``finish`` once the
+    stream ends to flush any text held back at a chunk boundary.
+
+    This base implementation re-runs ``extract_thinking`` on the whole text
+    and is only used by strategies without an incremental parser.
+    """
+
+    def __init__(self, strategy: ThinkingStrategy | None = None):
+        self._strategy = strategy
+        self._raw: list[str] = []
+        self._thinking: list[str] = []
+        self._answer: list[str] = []
+
+    @property
+    def thinking(self) -> str:
+        if len(self._thinking) > 1:
+            self._thinking[:] = ["".join(self._thinking)]
+        return self._thinking[0] if self._thinking else ""
+
+    @property
+    def answer(self) -> str:
+        if len(self._answer) > 1:
+            self._answer[:] = ["".join(self._answer)]
+        return self._answer[0] if self._answer else ""
+
+    def feed(self, delta: str) -> tuple[str, str]:
+        """Consume a chunk of streamed text.
+
+        Returns:
+            Tuple of (thinking_delta, answer_delta)
+        """
+        thinking_delta, answer_delta = self._feed(delta)
+        return self._append(thinking_delta, answer_delta)
+
+    def finish(self) -> tuple[str, str]:
+        """Flush held-back text at the end of the stream.
+
+        Returns:
+            Tuple of (thinking_delta, answer_delta)
+        """
+        thinking_delta, answer_delta = self._finish()
+        return self._append(thinking_delta, answer_delta)
+
+    def _append(self, thinking_delta: str, answer_delta: str) -> tuple[str, str]:
+        if thinking_delta:
+            self._thinking.append(thinking_delta)
+        if answer_delta:
+            self._answer.append(answer_delta)
+        return thinking_delta, answer_delta
+
+    def _feed(self, delta: str) -> tuple[str, str]:
+        assert self._strategy is not None
+        self._raw.append(delta)
+        thinking, answer = self._strategy.extract_thinking("".join(self._raw))
+        return (
+            _snapshot_delta(self._thinking, self.thinking, thinking),
+            _snapshot_delta(self._answer, self.answer, answer),
+        )
+
+    def _finish(self) -> tuple[str, str]:
+        return "", ""
+
+
+def _snapshot_delta(parts: list[str], old: str, new: str) -> str:
+    """Delta from ``old`` to ``new``; a snapshot that rewrites ``old`` replaces it."""
+    if new.startswith(old):
+        return new[len(old) :]
+    parts.clear()
+    return new
+
+
+class _StrippedText:
+    """Emits text as it reads after ``str.strip()``.
+
+    Leading whitespace is dropped and trailing whitespace is held back until
+    more non-whitespace text follows it.
+    """
+
+    def __init__(self):
+        self.started = False
+        self._pending = ""
+
+    def push(self, text: str) -> str:
+        if not self.started:
+            text = text.lstrip()
+            if not text:
+                return ""
+            self.started = True
+        body = text.rstrip()
+        if not body:
+            self._pending += text
+            return ""
+        out = self._pending + body
+        self._pending = text[len(body) :]
+        return out
+
+
+class XMLTagStreamParser(ThinkingStreamParser):
+    """Incremental equivalent of ``XMLTagStrategy.extract_thinking``.
+
+    Text inside ``<think>`` tags is thinking, everything else is answer.
+    Tags are matched case-insensitively; a partial tag at the end of a chunk
+    is held back until the next chunk decides it. A think block that is never
+    closed is reported as thinking, and the answer is always stripped of
+    surrounding whitespace.
+    """
+
+    OPEN_TAG = "<think>"
+    CLOSE_TAG = "</think>"
+
+    def __init__(self):
+        super().__init__()
+        self._in_think = False
+        self._held = ""
+        self._answer_text = _StrippedText()
+        self._part = _StrippedText()
+        self._has_thinking = False
+
+    def _feed(self, delta: str) -> tuple[str, str]:
+        text = self._held + delta
+        self._held = ""
+        thinking: list[str] = []
+        answer: list[str] = []
+
+        while text:
+            tag = self.CLOSE_TAG if self._in_think else self.OPEN_TAG
+            index = text.lower().find(tag)
+            if index == -1:
+                keep = _partial_tag_length(text, tag)
+                self._held = text[len(text) - keep :]
+                self._emit(text[: len(text) - keep], thinking, answer)
+                break
+
+            self._emit(text[:index], thinking, answer)
+            text = text[index + len(tag) :]
+            self._in_think = not self._in_think
+            if self._in_think:
+                self._part = _StrippedText()
+
+        return "".join(thinking), "".join(answer)
+
+    def _finish(self) -> tuple[str, str]:
+        thinking: list[str] = []
+        answer: list[str] = []
+        self._emit(self._held, thinking, answer)
+        self._held = ""
+        return "".join(thinking), "".join(answer)
+
+    def _emit(self, text: str, thinking: list[str], answer: list[str]) -> None:
+        if not text:
+            return
+        if not self._in_think:
+            answer.append(self._answer_text.push(text))
+            return
+
+        first = not self._part.started
+        out = self._part.push(text)
+        if out and first and self._has_thinking:
+            out = "\n\n" + out
+        if out:
+            self._has_thinking = True
+            thinking.append(out)
+
+
+def _partial_tag_length(text: str, tag: str) -> int:
+    """Length of the longest suffix of ``text`` that starts ``tag``."""
+    for size in range(min(len(tag) - 1, len(text)), 0, -1):
+        if tag.startswith(text[-size:].lower()):
+            return size
+    return 0
+
+
+class JSONLineStreamParser(ThinkingStreamParser):
+    """Incremental equivalent of ``JSONStructuredStrategy.extract_thinking``.
+
+    Lines that start with ``{"thinking"`` are held until complete and parsed;
+    any other line is streamed to the answer as soon as its start rules out a
+    thinking object.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._line = ""
+        self._line_is_answer = False
+        self._answer_text = _StrippedText()
+        self._answer_lines = 0
+        self._thinking_parts = 0
+
+    def _feed(self, delta: str) -> tuple[str, str]:
+        thinking: list[str] = []
+        answer: list[str] = []
+
+        while delta:
+            newline = delta.find("\n")
+            piece = delta if newline == -1 else delta[:newline]
+            delta = "" if newline == -1 else delta[newline + 1 :]
+
+            if self._line_is_answer:
+                answer.append(self._answer_text.push(piece))
+            else:
+                self._line += piece
+                start = self._line.lstrip()
+                if start and not (
+                    JSON_THINKING_PREFIX.startswith(start)
+                    or start.startswith(JSON_THINKING_PREFIX)
+                ):
+                    self._start_answer_line(self._line, answer)
+
+            if newline != -1:
+                self._end_line(thinking, answer)
+
+        return "".join(thinking), "".join(answer)
+
+    def _finish(self) -> tuple[str, str]:
+        thinking: list[str] = []
+        answer: list[str] = []
+        if self._line:
+            self._end_line(thinking, answer)
+        return "".join(thinking), "".join(answer)
+
+    def _start_answer_line(self, text: str, answer: list[str]) -> None:
+        separator = "\n" if self._answer_lines else ""
+        self._answer_lines += 1
+        self._line_is_answer = True
+        self._line = ""
+        answer.append(self._answer_text.push(separator + text))
+
+    def _end_line(self, thinking: list[str], answer: list[str]) -> None:
+        if self._line_is_answer:
+            self._line_is_answer = False
+            return
+
+        line, self._line = self._line, ""
+        part, remaining = JSONStructuredStrategy.parse_line(line)
+        if part is not None:
+            separator = "\n" if self._thinking_parts else ""
+            self._thinking_parts += 1
+            thinking.append(separator + part)
+        if remaining is not None:
+            self._start_answer_line(remaining, answer)
+            self._line_is_answer = False
+
+
+class PassthroughStreamParser(ThinkingStreamParser):
+    """Reports all streamed text as answer."""
+
+    def _feed(self, delta: str) -> tuple[str, str]:
+        return "", delta
+
 
 # Model patterns that indicate native thinking support
 NATIVE_THINKING_MODELS = [
@@ -0,0 +1,263 @@
+"""Contiguous float32 vector index with memory-mapped persistence.
+
+Vectors are L2-normalized on insert so cosine similarity reduces to a dot
+product. The matrix is memory-mapped from disk with NumPy and searched with a
+single matmul plus ``argpartition``.
+
+Importing NumPy takes about 100ms, so callers on the startup path import
+this module on first use.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# On-disk rows are always little-endian float32
+_FLOAT_SIZE = 4
+
+
+def pack_vector(vector: Sequence[float]) -> bytes:
+    """Pack a vector as little-endian float32 bytes."""
+    return np.asarray(vector, dtype="<f4").tobytes()
+
+
+def unpack_vector(data: bytes) -> list[float]:
+    """Unpack little-endian float32 bytes into a list of floats."""
+    return np.frombuffer(data, dtype="<f4").tolist()
+
+
+class VectorIndex:
+    """Matrix of pre-normalized float32 vectors with top-k cosine search.
+
+    If ``path`` is given, rows are appended to that raw float32 file in place
+    and the matrix is re-mapped from it, so adding vectors never rewrites
+    existing rows.
+    """
+
+    def __init__(self, path: Path | None = None, dim: int = 0, rows: int = 0):
+        self.path = path
+        self.dim = dim
+        self._rows = 0
+        self._matrix: Any = None
+        if path is not None and dim and rows:
+            self._map(rows)
+
+    def __len__(self) -> int:
+        return self._rows
+
+    @classmethod
+    def from_bytes(cls, data: bytes, dim: int, normalize: bool = False) -> VectorIndex:
+        """Build an in-memory index from packed float32 rows.
+
+        Args:
+            data: Concatenated little-endian float32 rows.
+            dim: Vector dimension.
+            normalize: Normalize rows on load (set when rows are raw vectors).
+        """
+        index = cls(dim=dim)
+        if not data or not dim:
+            return index
+        rows = len(data) // (dim * _FLOAT_SIZE)
+        data = data[: rows * dim * _FLOAT_SIZE]
+        matrix = np.frombuffer(data, dtype="<f4").reshape(rows, dim)
+        if normalize:
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            matrix = (matrix / norms).astype(np.float32)
+        index._matrix = matrix
+        index._rows = rows
+        return index
+
+    @property
+    def nbytes(self) -> int:
+        return self._rows * self.dim * _FLOAT_SIZE
+
+    def _map(self, rows: int) -> None:
+        """Map the first ``rows`` rows of the backing file."""
+        assert self.path is not None
+        row_bytes = self.dim * _FLOAT_SIZE
+        try:
+            available = self.path.stat().st_size // row_bytes
+        except OSError:
+            available = 0
+        if available < rows:
+            logger.warning(
+                "Vector file %s has %d rows, expected %d", self.path, available, rows
+            )
+            rows = available
+
+        self._rows = rows
+        if rows == 0:
+            self._matrix = None
+            return
+
+        self._matrix = np.memmap(
+            self.path, dtype="<f4", mode="r", shape=(rows, self.dim)
+        )
+
+    def add(self, vectors: Sequence[Sequence[float]]) -> int:
+        """Normalize and append vectors.
+
+        Returns:
+            Row number of the first appended vector.
+
+        Raises:
+            ValueError: If a vector's dimension does not match the index.
+        """
+        first_row = self._rows
+        if not vectors:
+            return first_row
+        if not self.dim:
+            self.dim = len(vectors[0])
+        for vector in vectors:
+            if len(vector) != self.dim:
+                raise ValueError(
+                    f"Vector dimension {len(vector)} does not match index dimension {self.dim}"
+                )
+
+        block = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(block, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        block = (block / norms).astype("<f4")
+
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Drop the old mapping before writing so platforms with mandatory
+            # file locks can extend the file
+            self._matrix = None
+            mode = "r+b" if self.path.exists() else "wb"
+            with open(self.path, mode) as f:
+                # Overwrite any partial rows left behind by an interrupted write
+                f.seek(self.nbytes)
+                f.write(block.tobytes())
+                f.truncate()
+            self._map(first_row + len(vectors))
+        else:
+            if self._matrix is None:
+                self._matrix = block
+            else:
+                self._matrix = np.concatenate([self._matrix, block])
+            self._rows += len(vectors)
+
+        return first_row
+
+    def row(self, row: int) -> list[float]:
+        """Return the normalized vector stored at ``row``."""
+        return [float(x) for x in self._matrix[row]]
+
+    def search(
+        self,
+        query_vector: Sequence[float],
+        limit: int = 5,
+        rows: Sequence[int] | None = None,
+    ) -> list[tuple[int, float]]:
+        """Return up to ``limit`` (row, cosine similarity) pairs, best first.
+
+        Args:
+            query_vector: Query embedding (need not be normalized).
+            limit: Maximum results to return.
+            rows: Optional candidate rows; only these are scored.
+        """
+        # The mapping is swapped while rows are appended or compacted, so
+        # work from one snapshot of it
+        matrix = self._matrix
+        if matrix is None or not query_vector or limit <= 0:
+            return []
+        if rows is not None and not rows:
+            return []
+        if len(query_vector) != self.dim:
+            logger.debug(
+                "Query dimension %d does not match index dimension %d",
+                len(query_vector),
+                self.dim,
+            )
+            return []
+
+        q = np.asarray(query_vector, dtype=np.float32)
+        q_mag = float(np.linalg.norm(q))
+        if q_mag == 0:
+            return []
+        if rows is None:
+            candidates = None
+            scores = matrix @ (q / q_mag)
+        else:
+            candidates = np.asarray(rows, dtype=np.intp)
+            scores = matrix[candidates] @ (q / q_mag)
+        n = scores.shape[0]
+        k = min(limit, n)
+        if k < n:
+            top = np.argpartition(scores, -k)[-k:]
+        else:
+            top = np.arange(n)
+        top = top[np.argsort(-scores[top], kind="stable")]
+        if candidates is None:
+            return [(int(i), float(scores[i])) for i in top]
+        return [(int(candidates[i]), float(scores[i])) for i in top]
+
+    def nearest(self, vectors: VectorIndex) -> list[int]:
+        """Return the best-matching row of this index for each row of ``vectors``."""
+        if not self._rows or not len(vectors):
+            return []
+        return [int(i) for i in np.argmax(vectors._matrix @ self._matrix.T, axis=1)]
+
+    def compact(self, keep: Sequence[int]) -> None:
+        """Keep only the given rows (in order), rewriting the backing file."""
+        if self._matrix is None or not keep:
+            data = b""
+        else:
+            data = np.ascontiguousarray(
+                self._matrix[np.asarray(keep, dtype=np.intp)], dtype="<f4"
+            ).tobytes()
+
+        if self.path is None:
+            compacted = VectorIndex.from_bytes(data, self.dim)
+            self._matrix = compacted._matrix
+            self._rows = len(compacted)
+            return
+
+        self._matrix = None
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp_path.write_bytes(data)
+        tmp_path.replace(self.path)
+        self._map(len(keep))
+
+    def close(self) -> None:
+        """Release the memory mapping."""
+        self._matrix = None
+        self._rows = 0
+
+
+def train_centroids(index: VectorIndex, k: int, iterations: int = 10) -> VectorIndex:
+    """Cluster the rows of ``index`` into ``k`` buckets with spherical k-means.
+
+    Returns:
+        In-memory index holding the normalized centroids.
+    """
+    rows = len(index)
+    k = min(k, rows)
+    if k <= 0:
+        return VectorIndex(dim=index.dim)
+
+    # Deterministic initialization from evenly spaced rows
+    centroids = VectorIndex()
+    centroids.add([index.row(i * rows // k) for i in range(k)])
+
+    for _ in range(iterations):
+        assignment = centroids.nearest(index)
+        sums = np.zeros((k, index.dim), dtype=np.float32)
+        np.add.at(sums, np.asarray(assignment), index._matrix)
+        counts = np.bincount(assignment, minlength=k)
+        # Keep the previous centroid for buckets that lost all members
+        for bucket in np.flatnonzero(counts == 0):
+            sums[bucket] = centroids._matrix[bucket]
+        centroids = VectorIndex()
+        centroids.add(sums.tolist())
+
+    return centroids
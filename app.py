@@ -15,7 +15,7 @@ from textual.widgets import DirectoryTree, Label, TextArea
 
 from ai.factory import AIFactory
 from ai.manager import AIManager
-from config import Config, get_settings
+from config import DEFAULT_SESSION_PAGE_SIZE, Config, get_settings
 from handlers import ExecutionHandler, InputHandler, SlashCommandHandler
 from managers import AgentManager, BranchManager, ProcessManager, VoiceManager
 from mcp import MCPManager
@@ -87,11 +87,10 @@ class NullApp(App):
             self.theme = "null-dark"
 
         self.blocks = []
+        self._loading_older_blocks = False
 
         # Initialize Storage
-        from config import StorageManager
-
-        self.storage = StorageManager()
+        self.storage = Config._get_storage()
 
         # self.executor removed - executor is now per-process
         self.process_manager = ProcessManager()
@@ -221,7 +220,8 @@ class NullApp(App):
 
             self.push_screen(DisclaimerScreen(), on_disclaimer_accepted)
 
-        saved_blocks = storage.load_session()
+        # Restore the latest page now; older blocks load on scroll-back
+        saved_blocks = storage.load_session(limit=DEFAULT_SESSION_PAGE_SIZE)
 
         if saved_blocks:
             self.blocks = saved_blocks
@@ -335,9 +335,9 @@ class NullApp(App):
 
     def action_toggle_agent_mode(self):
         """Toggle agent mode on/off."""
-        current = Config.get("ai.agent_mode") or False
-        new_value = not current
-        Config.set("ai.agent_mode", new_value)
+        current = str(Config.get("ai.agent_mode") or "false").lower()
+        new_value = current not in ("true", "1", "yes")
+        Config.set("ai.agent_mode", "true" if new_value else "false")
         try:
             status_bar = self.query_one("#status-bar", StatusBar)
             status_bar.set_agent_mode(new_value)
@@ -450,13 +450,22 @@ class NullApp(App):
         """Perform the actual exit, optionally clearing the session."""
         if hasattr(self, "ai_manager"):
             await self.ai_manager.close_all()
+        if hasattr(self, "execution_handler"):
+            await asyncio.to_thread(self.execution_handler.close_shell_sessions)
 
+        storage = Config._get_storage()
         if clear_session:
             try:
                 # Clear the saved session
-                Config._get_storage().save_current_session([])
+                await asyncio.to_thread(storage.clear_current_session)
             except Exception:
                 pass  # Non-critical: session clear on exit can safely fail
+        else:
+            try:
+                # Let the journal finish writing before the process ends
+                await asyncio.to_thread(storage.flush_session)
+            except Exception:
+                pass
         self.exit()
 
     def is_busy(self) -> bool:
@@ -744,6 +753,30 @@ class NullApp(App):
         except Exception:
             pass  # Container may not be mounted yet
 
+    def on_history_viewport_reached_top(self, message: HistoryViewport.ReachedTop):
+        if self._loading_older_blocks or not self.storage.has_older_blocks():
+            return
+        self._loading_older_blocks = True
+        self.run_worker(self._load_older_blocks())
+
+    async def _load_older_blocks(self):
+        """Load the previous page of the restored session above the history."""
+        try:
+            older = await asyncio.to_thread(
+                self.storage.load_older_blocks, DEFAULT_SESSION_PAGE_SIZE
+            )
+            if not older:
+                return
+            for block in older:
+                block.is_running = False
+            self.blocks[:0] = older
+            history_vp = self.query_one("#history", HistoryViewport)
+            await history_vp.prepend_blocks([BlockWidget(b) for b in older])
+        except Exception as e:
+            self.log(f"Loading older blocks failed: {e}")
+        finally:
+            self._loading_older_blocks = False
+
     def on_history_search_selected(self, message: HistorySearch.Selected):
         """Handle history search selection."""
         input_ctrl = self.query_one("#input", InputController)
@@ -1091,7 +1124,11 @@ class NullApp(App):
             status_bar.set_mode(input_ctrl.mode)
 
             # Get FRESH config values (Config.get reads from storage)
-            agent_mode = Config.get("ai.agent_mode") or False
+            agent_mode = str(Config.get("ai.agent_mode") or "false").lower() in (
+                "true",
+                "1",
+                "yes",
+            )
             status_bar.set_agent_mode(agent_mode)
 
             from context import ContextManager
@@ -1192,7 +1229,8 @@ class NullApp(App):
             return
 
         try:
-            filepath = save_export(self.blocks, format)
+            blocks = Config._get_storage().with_older_blocks(self.blocks)
+            filepath = save_export(blocks, format)
             self.notify(f"Exported to {filepath}")
         except Exception as e:
             self.notify(f"Export failed: {e}", severity="error")
@@ -9,6 +9,7 @@ if TYPE_CHECKING:
 
 from ai.factory import AIFactory
 from config import Config
+from config.defaults import DEFAULT_AGENT_TOOL_PARALLELISM
 from models import BlockState, BlockType
 
 from .base import CommandMixin
@@ -530,11 +531,13 @@ Use /agent off or /agent again to disable."""
                 f"max_iterations:    {ai_config.get('agent_max_iterations', 10)}",
                 f"approval_mode:     {ai_config.get('agent_approval_mode', 'auto')}",
                 f"thinking_visible:  {ai_config.get('agent_thinking_visible', True)}",
+                f"tool_parallelism:  {ai_config.get('agent_tool_parallelism', DEFAULT_AGENT_TOOL_PARALLELISM)}",
                 "",
                 "Usage: /agent config <key> <value>",
                 "  max_iterations   1-50     Maximum tool iterations",
                 "  approval_mode    auto|per_tool|per_iteration",
                 "  thinking_visible true|false  Show thinking process",
+                "  tool_parallelism 1-16     Read-only tool calls run at once",
             ]
             await self.show_output("/agent config", "\n".join(lines))
             return
@@ -576,6 +579,18 @@ Use /agent off or /agent again to disable."""
             self.app.config = Config.load_all()
             self.notify(f"thinking_visible set to {value.lower()}")
 
+        elif key == "tool_parallelism":
+            try:
+                val = int(value)
+                if not 1 <= val <= 16:
+                    self.notify("tool_parallelism must be 1-16", severity="error")
+                    return
+                Config.set("ai.agent_tool_parallelism", str(val))
+                self.app.config = Config.load_all()
+                self.notify(f"tool_parallelism set to {val}")
+            except ValueError:
+                self.notify("tool_parallelism must be a number", severity="error")
+
         else:
             self.notify(f"Unknown config key: {key}", severity="error")
 
@@ -442,6 +442,7 @@ class SlashCommandHandler:
                     "Manage MCP servers",
                     subcommands=[
                         ("list", "List configured MCP servers"),
+                        ("status", "Show server status and result cache stats"),
                         ("catalog", "Browse MCP server catalog"),
                         ("add", "Add a new MCP server manually"),
                         ("edit <name>", "Edit an MCP server config"),
@@ -25,6 +25,8 @@ class MCPCommands(CommandMixin):
 
         if subcommand == "list":
             await self._mcp_list()
+        elif subcommand == "status":
+            await self._mcp_status()
         elif subcommand == "catalog":
             await self._mcp_catalog()
         elif subcommand == "tools":
@@ -49,7 +51,7 @@ class MCPCommands(CommandMixin):
             await self._mcp_profile(args[1:])
         else:
             self.notify(
-                "Usage: /mcp [list|catalog|tools|profile|...]",
+                "Usage: /mcp [list|status|catalog|tools|profile|...]",
                 severity="warning",
             )
 
@@ -184,6 +186,40 @@ class MCPCommands(CommandMixin):
             lines.append(f"  {name:20} {state:12} {tools} tools")
         await self.show_output("/mcp list", "\n".join(lines))
 
+    async def _mcp_status(self):
+        manager = self.app.mcp_manager
+        lines = ["Servers:"]
+        for name, info in manager.get_status().items():
+            state = (
+                "connected"
+                if info["connected"]
+                else ("disabled" if not info["enabled"] else "disconnected")
+            )
+            lines.append(
+                f"  {name:20} {state:12} {info['tools']} tools, "
+                f"{info['resources']} resources"
+            )
+        if len(lines) == 1:
+            lines.append("  (none configured)")
+
+        stats = manager.deduplicator.get_stats()
+        lookups = stats["hits"] + stats["misses"] + stats["coalesced"]
+        hit_rate = (stats["hits"] + stats["coalesced"]) / lookups if lookups else 0.0
+        lines.extend(
+            [
+                "",
+                "Result cache:",
+                f"  Hits:       {stats['hits']}",
+                f"  Misses:     {stats['misses']}",
+                f"  Coalesced:  {stats['coalesced']}",
+                f"  Hit rate:   {hit_rate:.0%}",
+                f"  Entries:    {stats['entries']} ({stats['bytes'] / 1024:.1f} KB)",
+                f"  Evictions:  {stats['evictions']}",
+                f"  In flight:  {stats['in_flight']}",
+            ]
+        )
+        await self.show_output("/mcp status", "\n".join(lines))
+
     async def _mcp_catalog(self):
         from screens import MCPCatalogScreen
 
@@ -2,7 +2,7 @@
 
 from pathlib import Path
 
-from ai.rag import RAGManager
+from ai.rag import get_rag_manager
 from managers.recall import RecallManager
 
 from .base import CommandMixin
@@ -13,8 +13,10 @@ class RAGCommands(CommandMixin):
 
     def __init__(self, app):
         self.app = app
-        self.rag = RAGManager()
+        self.rag = get_rag_manager()
         self.recall = RecallManager()
+        self._watch_worker = None
+        self._watch_path: Path | None = None
 
     async def cmd_recall(self, args: list[str]):
         """Search interaction history.
@@ -49,10 +51,13 @@ class RAGCommands(CommandMixin):
         """Manage knowledge base index.
 
         Usage:
-            /index status       Show index statistics
-            /index build [path] Index current or specified directory
-            /index search <q>   Test search retrieval
-            /index clear        Clear the index
+            /index status              Show index statistics
+            /index build [path]        Index new and changed files
+            /index build [path] --full Re-embed every file
+            /index watch [path]        Re-index automatically on changes
+            /index watch stop          Stop watching
+            /index search <q>          Test search retrieval
+            /index clear               Clear the index
         """
         if not args:
             await self._show_status()
@@ -64,8 +69,17 @@ class RAGCommands(CommandMixin):
             await self._show_status()
 
         elif subcmd == "build":
+            full = "--full" in args[1:]
+            rest = [a for a in args[1:] if a != "--full"]
+            path = Path(rest[0]) if rest else Path.cwd()
+            await self._build_index(path, incremental=not full)
+
+        elif subcmd == "watch":
+            if len(args) > 1 and args[1] == "stop":
+                self._stop_watch()
+                return
             path = Path(args[1]) if len(args) > 1 else Path.cwd()
-            await self._build_index(path)
+            await self._start_watch(path)
 
         elif subcmd == "search":
             if len(args) < 2:
@@ -89,22 +103,32 @@ class RAGCommands(CommandMixin):
             f"- Chunks: {stats['total_chunks']}",
             f"- Vectors: {stats['total_vectors']}",
             f"- Size: {stats['index_size_mb']} MB",
+        ]
+        if self._watch_worker is not None:
+            output.append(f"- Watching: {self._watch_path}")
+        output += [
             "",
             "Use `/index build` to index current directory.",
         ]
         await self.show_output("Index Status", "\n".join(output))
 
-    async def _build_index(self, path: Path):
+    async def _build_index(self, path: Path, incremental: bool = True):
         provider = self.app.ai_provider
         if not provider:
             self.notify("No AI provider connected", severity="error")
             return
 
-        self.notify(f"Indexing {path} in background...")
+        if self.rag.is_indexing:
+            self.notify(f"Indexing {path} after the running build finishes...")
+        else:
+            self.notify(f"Indexing {path} in background...")
 
         async def do_index():
             count = await self.rag.index_directory(
-                path, provider, status_callback=lambda msg: self.app.notify(msg)
+                path,
+                provider,
+                status_callback=lambda msg: self.app.notify(msg),
+                incremental=incremental,
             )
             stats = self.rag.get_stats()
             if stats["total_chunks"] == 0:
@@ -119,6 +143,32 @@ class RAGCommands(CommandMixin):
 
         self.app.run_worker(do_index())
 
+    async def _start_watch(self, path: Path):
+        provider = self.app.ai_provider
+        if not provider:
+            self.notify("No AI provider connected", severity="error")
+            return
+
+        self._stop_watch(quiet=True)
+        self._watch_path = path
+        self._watch_worker = self.app.run_worker(
+            self.rag.watch_directory(
+                path, provider, status_callback=lambda msg: self.app.notify(msg)
+            )
+        )
+        self.notify(f"Watching {path} for changes")
+
+    def _stop_watch(self, quiet: bool = False):
+        if self._watch_worker is None:
+            if not quiet:
+                self.notify("Not watching any directory")
+            return
+        self._watch_worker.cancel()
+        if not quiet:
+            self.notify(f"Stopped watching {self._watch_path}")
+        self._watch_worker = None
+        self._watch_path = None
+
     async def _search_index(self, query: str):
         provider = self.app.ai_provider
         if not provider:
@@ -26,6 +26,7 @@ from .defaults import (
     DEFAULT_RAG_BATCH_YIELD,
     DEFAULT_RAG_PROGRESS_INTERVAL,
     DEFAULT_RATE_LIMITER_BACKOFF,
+    DEFAULT_SESSION_PAGE_SIZE,
     DEFAULT_SHELL,
     DEFAULT_SIDEBAR_UPDATE_INTERVAL,
     DEFAULT_SSH_RECONNECT_DELAY,
@@ -62,6 +63,9 @@ from .storage import (
     KEYRING_SERVICE_NAME,
     SecurityManager,
     StorageManager,
+    get_storage,
+    reset_storage,
+    set_storage,
 )
 
 from .timing import (
@@ -92,6 +96,7 @@ __all__ = [
     "DEFAULT_RAG_BATCH_YIELD",
     "DEFAULT_RAG_PROGRESS_INTERVAL",
     "DEFAULT_RATE_LIMITER_BACKOFF",
+    "DEFAULT_SESSION_PAGE_SIZE",
     "DEFAULT_SHELL",
     "DEFAULT_SIDEBAR_UPDATE_INTERVAL",
     "DEFAULT_SSH_RECONNECT_DELAY",
@@ -119,10 +124,13 @@ __all__ = [
     "VoiceSettings",
     "get_keybinding_manager",
     "get_settings",
+    "get_storage",
     "get_timing_config",
     "is_sensitive_key",
     "reload_keybindings",
+    "reset_storage",
     "reset_timing_config",
     "save_settings",
+    "set_storage",
     "set_timing_config",
 ]
@@ -2,6 +2,7 @@
 
 from .defaults import (
     DEFAULT_AGENT_APPROVAL_TIMEOUT,
+    DEFAULT_AGENT_TOOL_PARALLELISM,
     DEFAULT_AI_ACTIVE_PROMPT,
     DEFAULT_AI_ENDPOINT,
     DEFAULT_AI_MODEL,
@@ -10,20 +11,21 @@ from .defaults import (
     DEFAULT_THEME,
 )
 from .keys import is_sensitive_key
-from .storage import StorageManager
+from .storage import StorageManager, get_storage
 
 
 class Config:
     """Main configuration class for AI/LLM settings.
 
     Provides static methods for getting and setting configuration values
-    stored in SQLite database with encryption for sensitive keys.
+    stored in SQLite database with encryption for sensitive keys. Reads are
+    served from the shared storage manager's in-memory config cache.
     """
 
     @staticmethod
     def _get_storage() -> StorageManager:
-        """Get the storage manager instance."""
-        return StorageManager()
+        """Get the shared storage manager instance."""
+        return get_storage()
 
     @staticmethod
     def load_all() -> dict:
@@ -51,6 +53,12 @@ class Config:
             )
         )
 
+        agent_tool_parallelism = int(
+            sm.get_config(
+                "ai.agent_tool_parallelism", str(DEFAULT_AGENT_TOOL_PARALLELISM)
+            )
+        )
+
         embedding_provider = sm.get_config("ai.embedding_provider", "")
         embedding_model = sm.get_config(
             f"ai.embedding.{embedding_provider}.model", "nomic-embed-text"
@@ -75,6 +83,7 @@ class Config:
                 "agent_approval_mode": agent_approval_mode,
                 "agent_approval_timeout": agent_approval_timeout,
                 "agent_thinking_visible": agent_thinking_visible,
+                "agent_tool_parallelism": agent_tool_parallelism,
                 "embedding_provider": embedding_provider,
                 "embedding_model": embedding_model,
                 "embedding_endpoint": embedding_endpoint,
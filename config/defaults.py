@@ -23,6 +23,9 @@ DEFAULT_TEMPERATURE = 0.7
 # Agent approval defaults
 DEFAULT_AGENT_APPROVAL_TIMEOUT = 60  # seconds
 
+# Maximum read-only tool calls run at once within one model turn
+DEFAULT_AGENT_TOOL_PARALLELISM = 4
+
 # Connection pool defaults
 DEFAULT_POOL_MAX_CONNECTIONS = 100
 DEFAULT_POOL_MAX_KEEPALIVE = 20
@@ -30,6 +33,9 @@ DEFAULT_POOL_KEEPALIVE_EXPIRY = 30.0
 DEFAULT_POOL_CONNECT_TIMEOUT = 10.0
 DEFAULT_POOL_READ_TIMEOUT = 120.0
 
+# Blocks restored at startup, and loaded per page when scrolling back
+DEFAULT_SESSION_PAGE_SIZE = 50
+
 # Model cache defaults
 DEFAULT_MODEL_CACHE_TTL = 300.0  # 5 minutes in seconds
 
@@ -1,16 +1,34 @@
 """In-memory index for fast command history search."""
 
+import bisect
 import logging
-import re
-from collections import defaultdict
+import math
+from array import array
 from dataclasses import dataclass, field
+from itertools import islice
+from operator import attrgetter
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
     from config.storage import StorageManager
 
 logger = logging.getLogger(__name__)
 
+# Ranking, in units of history entries: a command run 2**k times ranks as if
+# it were last used FREQUENCY_WEIGHT * k entries later, and one whose last
+# run failed as if FAILED_PENALTY entries earlier
+FREQUENCY_WEIGHT = 50.0
+FAILED_PENALTY = 100.0
+
+GRAM = 3
+
+# Candidates a search checks outright; with more it first walks up to
+# WALK_BUDGET of the best-ranked commands looking for hits
+MAX_RANKED = 2048
+WALK_BUDGET = 1024
+
 
 @dataclass
 class HistoryEntry:
@@ -22,21 +40,52 @@ class HistoryEntry:
     exit_code: int
 
 
+@dataclass(slots=True)
+class _Command:
+    """Every run of one distinct command."""
+
+    gid: int
+    lower: str
+    latest: HistoryEntry
+    count: int = 0
+    score: float = 0.0
+
+    def rescore(self) -> None:
+        self.score = self.latest.id + FREQUENCY_WEIGHT * math.log2(self.count)
+        if self.latest.exit_code != 0:
+            self.score -= FAILED_PENALTY
+
+
+_SCORE = attrgetter("score")
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[i : i + GRAM] for i in range(len(text) - GRAM + 1)}
+
+
 @dataclass
 class HistoryIndex:
     """In-memory index for fast command history and session search.
 
-    Builds inverted indexes for command text to enable fast substring
-    and token-based searching without repeated database queries.
+    Each distinct command is indexed once, under the trigrams of its
+    lowercased text (for substring search) and in a sorted array (for
+    prefix search). Results are one entry per command, ranked by recency,
+    how often it was run and whether its last run succeeded.
     """
 
     _entries: dict[int, HistoryEntry] = field(default_factory=dict)
-    _token_index: dict[str, set[int]] = field(default_factory=lambda: defaultdict(set))
     _storage: "StorageManager | None" = field(default=None, repr=False)
-
-    def __post_init__(self):
-        if self._token_index is None:
-            self._token_index = defaultdict(set)
+    _commands: dict[str, _Command] = field(default_factory=dict, repr=False)
+    _by_gid: list[_Command] = field(default_factory=list, repr=False)
+    # Lowercased commands by gid, for tight substring checks
+    _lowers: list[str] = field(default_factory=list, repr=False)
+    # Trigram -> ascending command gids
+    _postings: dict[str, array] = field(default_factory=dict, repr=False)
+    # (lowercased command, gid), sorted
+    _sorted: list[tuple[str, int]] = field(default_factory=list, repr=False)
+    # Commands ordered by ascending score, with their scores alongside
+    _ranked: list[_Command] = field(default_factory=list, repr=False)
+    _ranked_scores: list[float] = field(default_factory=list, repr=False)
 
     @classmethod
     def from_storage(cls, storage: "StorageManager") -> "HistoryIndex":
@@ -51,13 +100,13 @@ class HistoryIndex:
         Returns:
             Number of entries indexed.
         """
-        self._entries.clear()
-        self._token_index.clear()
+        self.clear()
 
         if self._storage is None:
             logger.warning("No storage manager attached, index will be empty")
             return 0
 
+        self._storage.flush_history()
         cursor = self._storage.conn.cursor()
         cursor.execute(
             "SELECT id, command, timestamp, exit_code FROM history ORDER BY id"
@@ -77,20 +126,41 @@ class HistoryIndex:
         logger.debug("Rebuilt history index with %d entries", count)
         return count
 
-    def _tokenize(self, text: str) -> list[str]:
-        """Split text into searchable tokens."""
-        # Split on whitespace and common separators, lowercase
-        tokens = re.split(r"[\s/\\|:;,.\-_=]+", text.lower())
-        return [t for t in tokens if t and len(t) >= 2]
-
     def _add_to_index(self, entry: HistoryEntry) -> None:
         """Add an entry to the in-memory index."""
         self._entries[entry.id] = entry
 
-        # Index by tokens
-        tokens = self._tokenize(entry.command)
-        for token in tokens:
-            self._token_index[token].add(entry.id)
+        cmd = self._commands.get(entry.command)
+        if cmd is None:
+            cmd = _Command(
+                gid=len(self._by_gid), lower=entry.command.lower(), latest=entry
+            )
+            self._commands[entry.command] = cmd
+            self._by_gid.append(cmd)
+            self._lowers.append(cmd.lower)
+            for gram in _trigrams(cmd.lower):
+                postings = self._postings.get(gram)
+                if postings is None:
+                    postings = self._postings[gram] = array("i")
+                postings.append(cmd.gid)
+            bisect.insort(self._sorted, (cmd.lower, cmd.gid))
+        else:
+            self._unrank(cmd)
+            if entry.id >= cmd.latest.id:
+                cmd.latest = entry
+
+        cmd.count += 1
+        cmd.rescore()
+        pos = bisect.bisect_right(self._ranked_scores, cmd.score)
+        self._ranked.insert(pos, cmd)
+        self._ranked_scores.insert(pos, cmd.score)
+
+    def _unrank(self, cmd: _Command) -> None:
+        pos = bisect.bisect_left(self._ranked_scores, cmd.score)
+        while self._ranked[pos] is not cmd:
+            pos += 1
+        del self._ranked[pos]
+        del self._ranked_scores[pos]
 
     def add_entry(self, command: str, exit_code: int = 0) -> int | None:
         """Add a new entry to both storage and index.
@@ -111,107 +181,95 @@ class HistoryIndex:
             if self._entries[last_id].command == command:
                 return None
 
-        # Add to storage
-        self._storage.add_history(command, exit_code)
+        # Storage assigns the id up front; the row is written in the background
+        entry = self._storage.add_history(command, exit_code)
+        if entry is None:
+            return None
+        self._add_to_index(entry)
+        return entry.id
+
+    def _rank(self, gids: "Iterable[int]", limit: int) -> list[HistoryEntry]:
+        """Latest entries of the best-ranked commands among ``gids``."""
+        found = sorted(map(self._by_gid.__getitem__, gids), key=_SCORE, reverse=True)
+        return [cmd.latest for cmd in found[:limit]]
 
-        # Get the newly added entry
-        cursor = self._storage.conn.cursor()
-        cursor.execute(
-            "SELECT id, command, timestamp, exit_code FROM history ORDER BY id DESC LIMIT 1"
-        )
-        row = cursor.fetchone()
-        if row and row["command"] == command:
-            entry = HistoryEntry(
-                id=row["id"],
-                command=row["command"],
-                timestamp=row["timestamp"],
-                exit_code=row["exit_code"],
-            )
-            self._add_to_index(entry)
-            return entry.id
+    def _walk(
+        self, needle: str, prefix: bool, limit: int, budget: int | None = None
+    ) -> list[HistoryEntry] | None:
+        """Check commands from the best score down until ``limit`` match.
 
-        return None
+        Returns None if ``budget`` commands were checked first.
+        """
+        results: list[HistoryEntry] = []
+        if limit <= 0:
+            return results
+        ranked = reversed(self._ranked)
+        for cmd in ranked if budget is None else islice(ranked, budget):
+            text = cmd.lower
+            if text.startswith(needle) if prefix else needle in text:
+                results.append(cmd.latest)
+                if len(results) == limit:
+                    return results
+        if budget is not None and len(self._ranked) > budget:
+            return None
+        return results
 
     def search(self, query: str, limit: int = 20) -> list[HistoryEntry]:
-        """Search for commands matching query.
-
-        Uses token-based matching for fast lookup, then filters by substring.
+        """Search for commands containing query, case-insensitively.
 
         Args:
             query: Search query string.
             limit: Maximum results to return.
 
         Returns:
-            List of matching HistoryEntry objects, newest first.
+            The latest entry of each matching command, best-ranked first.
         """
         if not query.strip():
-            # Return most recent entries
-            entries = sorted(self._entries.values(), key=lambda e: e.id, reverse=True)
-            return entries[:limit]
-
+            return self._walk("", True, limit) or []
         query_lower = query.lower()
-        tokens = self._tokenize(query)
-
-        if not tokens:
-            # Fallback to substring search on all entries
-            matches = [
-                e for e in self._entries.values() if query_lower in e.command.lower()
-            ]
-            matches.sort(key=lambda e: e.id, reverse=True)
-            return matches[:limit]
-
-        # Find candidate IDs from token index
-        candidate_ids: set[int] | None = None
-        for token in tokens:
-            # Find all tokens that contain this token as substring
-            matching_ids: set[int] = set()
-            for indexed_token, ids in self._token_index.items():
-                if token in indexed_token:
-                    matching_ids.update(ids)
-
-            if candidate_ids is None:
-                candidate_ids = matching_ids
-            else:
-                candidate_ids &= matching_ids
-
-            if not candidate_ids:
-                break
-
-        if not candidate_ids:
-            return []
-
-        # Filter candidates by full substring match and sort
-        matches = []
-        for entry_id in candidate_ids:
-            entry = self._entries.get(entry_id)
-            if entry and query_lower in entry.command.lower():
-                matches.append(entry)
-
-        matches.sort(key=lambda e: e.id, reverse=True)
-        return matches[:limit]
+        if len(query_lower) < GRAM:
+            return self._walk(query_lower, False, limit) or []
+
+        # Every hit contains every trigram of the query, so the rarest
+        # trigram's commands are the only candidates
+        rarest = None
+        for gram in _trigrams(query_lower):
+            postings = self._postings.get(gram)
+            if postings is None:
+                return []
+            if rarest is None or len(postings) < len(rarest):
+                rarest = postings
+        assert rarest is not None
+
+        if len(rarest) > MAX_RANKED:
+            # A broad query usually hits among the best-ranked commands
+            results = self._walk(query_lower, False, limit, budget=WALK_BUDGET)
+            if results is not None:
+                return results
+        lowers = self._lowers
+        return self._rank([g for g in rarest if query_lower in lowers[g]], limit)
 
     def search_prefix(self, prefix: str, limit: int = 10) -> list[HistoryEntry]:
-        """Search for commands starting with prefix.
+        """Search for commands starting with prefix, case-insensitively.
 
         Args:
             prefix: Command prefix to match.
             limit: Maximum results to return.
 
         Returns:
-            List of matching HistoryEntry objects, newest first.
+            The latest entry of each matching command, best-ranked first.
         """
+        prefix_lower = prefix.lower()
         if not prefix:
-            entries = sorted(self._entries.values(), key=lambda e: e.id, reverse=True)
-            return entries[:limit]
+            return self._walk("", True, limit) or []
 
-        prefix_lower = prefix.lower()
-        matches = [
-            e
-            for e in self._entries.values()
-            if e.command.lower().startswith(prefix_lower)
-        ]
-        matches.sort(key=lambda e: e.id, reverse=True)
-        return matches[:limit]
+        start = bisect.bisect_left(self._sorted, (prefix_lower,))
+        end = bisect.bisect_left(self._sorted, (prefix_lower + "\U0010ffff",), start)
+        if end - start > MAX_RANKED:
+            results = self._walk(prefix_lower, True, limit, budget=WALK_BUDGET)
+            if results is not None:
+                return results
+        return self._rank((gid for _, gid in self._sorted[start:end]), limit)
 
     def get_recent(self, limit: int = 50) -> list[HistoryEntry]:
         """Get most recent history entries.
@@ -228,7 +286,13 @@ class HistoryIndex:
     def clear(self) -> None:
         """Clear the in-memory index."""
         self._entries.clear()
-        self._token_index.clear()
+        self._commands.clear()
+        self._by_gid.clear()
+        self._lowers.clear()
+        self._postings.clear()
+        self._sorted.clear()
+        self._ranked.clear()
+        self._ranked_scores.clear()
 
     @property
     def count(self) -> int:
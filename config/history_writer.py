@@ -0,0 +1,123 @@
+"""Background writer for command history.
+
+Commands are queued by the UI and inserted by a worker thread, which
+writes everything queued since its last wakeup in one transaction on its
+own connection. Rows arrive with their ids already assigned, so the
+oldest rows past the history limit are found by id instead of counting
+the table after every insert.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import queue
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# (id, command, timestamp, exit_code)
+HistoryRow = tuple[int, str, str, int]
+
+_CLOSE = object()
+
+
+class HistoryWriter:
+    """Writes history rows in batches and keeps the table within ``limit``."""
+
+    def __init__(self, db_path: Path, limit: int):
+        self.db_path = db_path
+        self.limit = limit
+        self._queue: queue.Queue[Any] = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._registered = False
+        # Set when another process took ids this one had handed out
+        self.ids_stale = False
+        # Writer side: every row with an id up to here has been trimmed
+        self._trimmed_through = 0
+
+    def add(self, rows: list[HistoryRow]) -> None:
+        """Queue rows for insertion."""
+        if rows:
+            self._submit(rows)
+
+    def flush(self) -> None:
+        """Block until queued rows are committed."""
+        if self._thread is not None:
+            self._queue.join()
+
+    def close(self) -> None:
+        """Write what is queued and stop the writer thread."""
+        thread = self._thread
+        if thread is None:
+            return
+        self._queue.put(_CLOSE)
+        thread.join()
+
+    def _submit(self, item: Any) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run, name="history-writer", daemon=True
+            )
+            self._thread.start()
+            if not self._registered:
+                atexit.register(self.close)
+                self._registered = True
+        self._queue.put(item)
+
+    # Writer side
+
+    def _run(self) -> None:
+        conn = sqlite3.connect(self.db_path)
+        try:
+            while True:
+                items = [self._queue.get()]
+                while True:
+                    try:
+                        items.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+                rows = [row for item in items if item is not _CLOSE for row in item]
+                try:
+                    self._write(conn, rows)
+                except sqlite3.Error as e:
+                    logger.error("Failed to write command history: %s", e)
+                finally:
+                    for _ in items:
+                        self._queue.task_done()
+
+                if _CLOSE in items:
+                    return
+        finally:
+            conn.close()
+            self._thread = None
+
+    def _write(self, conn: sqlite3.Connection, rows: list[HistoryRow]) -> None:
+        if not rows:
+            return
+        with conn:
+            try:
+                conn.executemany(
+                    "INSERT INTO history (id, command, timestamp, exit_code) "
+                    "VALUES (?, ?, ?, ?)",
+                    rows,
+                )
+            except sqlite3.IntegrityError:
+                # Another instance wrote history since the ids were assigned
+                logger.debug("History ids taken; letting SQLite assign them")
+                self.ids_stale = True
+                conn.executemany(
+                    "INSERT INTO history (command, timestamp, exit_code) "
+                    "VALUES (?, ?, ?)",
+                    [row[1:] for row in rows],
+                )
+
+            last_id = conn.execute("SELECT MAX(id) FROM history").fetchone()[0]
+            floor = (last_id or 0) - self.limit
+            if floor > self._trimmed_through:
+                conn.execute("DELETE FROM history WHERE id <= ?", (floor,))
+                self._trimmed_through = floor
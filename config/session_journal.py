@@ -0,0 +1,420 @@
+"""Append-only journal for the current session.
+
+The file starts with MAGIC, followed by records. Each record has a
+fixed header (payload length, op, id length), the block id and a
+payload: the block as compact JSON, encrypted JSON, or nothing for a
+delete. Replaying the records in order rebuilds the session, so an
+auto-save only appends the blocks that changed. A torn record at the
+end of the file, left by a crash mid-write, is dropped on load.
+
+Loading scans only the headers to index where each block's latest
+record is, then decodes the most recent blocks; older ones are read on
+demand. Blocks are encrypted one by one, so nothing has to decrypt the
+whole session at once.
+
+Writes happen on a background thread, which fsyncs at most every
+FSYNC_INTERVAL seconds and rewrites the file once superseded records
+outnumber the live ones.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import os
+import queue
+import struct
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, BinaryIO
+
+if TYPE_CHECKING:
+    from models import BlockState
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"NULLJ\x00\x01\n"
+_HEADER = struct.Struct(">IcH")
+_PUT, _PUT_ENCRYPTED, _DELETE = b"P", b"E", b"D"
+
+# Longest a written record waits before it is fsynced
+FSYNC_INTERVAL = 1.0
+# Compact once the journal holds this many records per live block...
+COMPACT_RATIO = 4
+# ...and at least this many records in total
+COMPACT_MIN_RECORDS = 256
+
+_CLOSE = object()
+
+
+def _encode(op: bytes, block_id: str, payload: bytes = b"") -> bytes:
+    key = block_id.encode("utf-8")
+    return _HEADER.pack(len(payload), op, len(key)) + key + payload
+
+
+class SessionJournal:
+    """Incremental, crash-safe storage for the current session's blocks.
+
+    ``encrypt`` and ``decrypt`` map text to text; when ``encrypt`` is set
+    every block written is encrypted with it.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        encrypt: Callable[[str], str] | None = None,
+        decrypt: Callable[[str], str] | None = None,
+    ):
+        self.path = path
+        self._encrypt = encrypt
+        self._decrypt = decrypt
+        self._lock = threading.Lock()
+        self._queue: queue.Queue[Any] = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._registered = False
+        # Caller side: what has been queued for writing
+        self._saved: dict[str, int] = {}  # block id -> revision
+        self._saved_ids: list[str] = []
+        # Saved blocks older than any the caller has loaded, oldest first
+        self._unloaded: list[str] = []
+        self._first_loaded: str | None = None
+        # Writer side: the latest put record of each live block
+        self._file: BinaryIO | None = None
+        self._live: dict[str, tuple[int, int]] = {}  # id -> (offset, length)
+        self._records = 0
+        self._size = 0
+
+    # Caller side
+
+    @property
+    def unloaded_count(self) -> int:
+        """Saved blocks older than those returned so far."""
+        return len(self._unloaded)
+
+    def load(self, limit: int | None = None) -> list[dict[str, Any]]:
+        """Index the journal and return its most recent blocks.
+
+        Returns up to ``limit`` blocks (all of them when None), oldest
+        first. The rest stay on disk until read_older() asks for them.
+        """
+        with self._lock:
+            try:
+                self._index()
+            except FileNotFoundError:
+                return []
+            ids = list(self._live)
+            split = max(0, len(ids) - limit) if limit is not None else 0
+            self._unloaded = ids[:split]
+            self._saved_ids = ids
+            return self._read_blocks(ids[split:])
+
+    def read_older(self, count: int) -> list[dict[str, Any]]:
+        """Return up to ``count`` blocks preceding those already loaded."""
+        with self._lock:
+            split = max(0, len(self._unloaded) - count)
+            ids = self._unloaded[split:]
+            del self._unloaded[split:]
+            return self._read_blocks(ids)
+
+    def peek_older(self, blocks: list[BlockState]) -> list[dict[str, Any]]:
+        """Return the blocks preceding ``blocks`` that are not loaded yet.
+
+        Unlike read_older() this leaves them unloaded. Returns nothing
+        unless ``blocks`` still starts with the oldest loaded block.
+        """
+        if not blocks or blocks[0].id != self._first_loaded:
+            return []
+        with self._lock:
+            return self._read_blocks(list(self._unloaded))
+
+    def mark_saved(self, blocks: list[BlockState]) -> None:
+        """Record that ``blocks`` match what the journal holds."""
+        for block in blocks:
+            self._saved[block.id] = block.revision
+        if blocks:
+            self._first_loaded = blocks[0].id
+
+    def sync(self, blocks: list[BlockState]) -> int:
+        """Queue the blocks changed since the last sync for writing.
+
+        ``blocks`` are the loaded blocks; unloaded older blocks are kept
+        as long as ``blocks`` still starts with the oldest loaded one.
+        Only changed blocks are serialized here; encoding and disk I/O
+        happen on the writer thread. Returns the number of blocks queued.
+        """
+        loaded = [block.id for block in blocks]
+        if self._unloaded and loaded[:1] != [self._first_loaded]:
+            # The history was cleared, replaced or trimmed from the front
+            self._unloaded = []
+        ids = self._unloaded + loaded
+
+        changed = []
+        for block in blocks:
+            if block.is_running or self._saved.get(block.id) != block.revision:
+                changed.append(block.to_dict())
+                self._saved[block.id] = block.revision
+
+        if not changed and ids == self._saved_ids:
+            return 0
+        if len(self._saved) != len(loaded):
+            self._saved = {block_id: self._saved[block_id] for block_id in loaded}
+        self._saved_ids = ids
+        self._first_loaded = loaded[0] if loaded else None
+        self._submit(("sync", ids, changed))
+        return len(changed)
+
+    def flush(self) -> None:
+        """Block until queued writes are on disk."""
+        if self._thread is None:
+            return
+        done = threading.Event()
+        self._submit(("flush", done))
+        done.wait()
+
+    def clear(self) -> None:
+        """Delete the journal, waiting for the writer to let go of it."""
+        self._saved = {}
+        self._saved_ids = []
+        self._unloaded = []
+        self._first_loaded = None
+        if self._thread is None:
+            with self._lock:
+                self._reset()
+            return
+        done = threading.Event()
+        self._submit(("clear", done))
+        done.wait()
+
+    def close(self) -> None:
+        """Write what is queued and stop the writer thread."""
+        thread = self._thread
+        if thread is None:
+            return
+        self._queue.put(_CLOSE)
+        thread.join()
+
+    def _submit(self, item: tuple[Any, ...]) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run, name="session-journal", daemon=True
+            )
+            self._thread.start()
+            if not self._registered:
+                atexit.register(self.close)
+                self._registered = True
+        self._queue.put(item)
+
+    def _index(self) -> None:
+        """Scan the record headers for the latest record of each block."""
+        live: dict[str, tuple[int, int]] = {}
+        records = 0
+        with open(self.path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size and f.read(len(MAGIC)) != MAGIC:
+                self._set_aside()
+                return
+            offset = len(MAGIC) if size else 0
+            while offset + _HEADER.size <= size:
+                length, op, key_length = _HEADER.unpack(f.read(_HEADER.size))
+                end = offset + _HEADER.size + key_length + length
+                if end > size or op not in (_PUT, _PUT_ENCRYPTED, _DELETE):
+                    break
+                block_id = f.read(key_length).decode("utf-8", errors="replace")
+                f.seek(length, os.SEEK_CUR)
+                live.pop(block_id, None)
+                if op != _DELETE:
+                    live[block_id] = (offset, end - offset)
+                records += 1
+                offset = end
+
+        if offset < size:
+            logger.warning(
+                "Dropping %d bytes of incomplete session journal in %s",
+                size - offset,
+                self.path,
+            )
+            with open(self.path, "r+b") as f:
+                f.truncate(offset)
+
+        self._live = live
+        self._records = records
+        self._size = offset
+
+    def _set_aside(self) -> None:
+        # Not a journal this version can read; keep it rather than lose it
+        aside = self.path.with_suffix(".unreadable")
+        logger.warning("Unrecognized session journal moved to %s", aside)
+        os.replace(self.path, aside)
+        self._live = {}
+        self._records = 0
+        self._size = 0
+
+    def _read_blocks(self, ids: list[str]) -> list[dict[str, Any]]:
+        blocks = []
+        if not ids:
+            return blocks
+        with open(self.path, "rb") as f:
+            for block_id in ids:
+                offset, length = self._live[block_id]
+                f.seek(offset)
+                record = f.read(length)
+                _, op, key_length = _HEADER.unpack_from(record)
+                payload = record[_HEADER.size + key_length :]
+                try:
+                    blocks.append(self._decode(op, payload))
+                except ValueError as e:
+                    logger.error(
+                        "Skipping unreadable session block %s: %s", block_id, e
+                    )
+        return blocks
+
+    def _decode(self, op: bytes, payload: bytes) -> dict[str, Any]:
+        text = payload.decode("utf-8")
+        if op == _PUT_ENCRYPTED:
+            if self._decrypt is None:
+                raise ValueError("block is encrypted")
+            text = self._decrypt(text)
+        return json.loads(text)
+
+    # Writer side
+
+    def _run(self) -> None:
+        unsynced = False
+        last_fsync = time.monotonic()
+        while True:
+            timeout = None
+            if unsynced:
+                timeout = max(0.0, last_fsync + FSYNC_INTERVAL - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is _CLOSE:
+                with self._lock:
+                    self._fsync()
+                    if self._file is not None:
+                        self._file.close()
+                        self._file = None
+                self._thread = None
+                return
+
+            with self._lock:
+                try:
+                    if item is not None and item[0] == "sync":
+                        self._apply(item[1], item[2])
+                        unsynced = True
+                    elif item is not None and item[0] == "clear":
+                        self._reset()
+                        unsynced = False
+                except OSError as e:
+                    logger.error("Failed to write session journal: %s", e)
+
+                due = time.monotonic() - last_fsync >= FSYNC_INTERVAL
+                if unsynced and (due or item is None or item[0] == "flush"):
+                    self._fsync()
+                    unsynced = False
+                    last_fsync = time.monotonic()
+
+            if item is not None and item[0] in ("flush", "clear"):
+                item[1].set()
+
+    def _open(self) -> BinaryIO:
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "ab")
+            if self._file.tell() == 0:
+                self._file.write(MAGIC)
+            self._size = self._file.tell()
+        return self._file
+
+    def _apply(self, ids: list[str], changed: list[dict[str, Any]]) -> None:
+        f = self._open()
+        buffer = bytearray()
+        written: dict[str, tuple[int, int]] = {}
+        for block in changed:
+            text = json.dumps(block, separators=(",", ":"))
+            if self._encrypt is not None:
+                record = _encode(
+                    _PUT_ENCRYPTED, block["id"], self._encrypt(text).encode("ascii")
+                )
+            else:
+                record = _encode(_PUT, block["id"], text.encode("utf-8"))
+            written[block["id"]] = (self._size + len(buffer), len(record))
+            buffer += record
+        keep = set(ids)
+        removed = [block_id for block_id in self._live if block_id not in keep]
+        for block_id in removed:
+            buffer += _encode(_DELETE, block_id)
+        f.write(buffer)
+        f.flush()
+
+        self._size += len(buffer)
+        self._records += len(changed) + len(removed)
+        for block_id in removed:
+            del self._live[block_id]
+        self._live.update(written)
+
+        if list(self._live) != ids:
+            # Blocks were inserted or reordered; replay order can't express it
+            self._compact([block_id for block_id in ids if block_id in self._live])
+        elif self._records > max(COMPACT_MIN_RECORDS, COMPACT_RATIO * len(ids)):
+            self._compact(ids)
+
+    def _compact(self, order: list[str]) -> None:
+        """Rewrite the journal with only the latest record of each block."""
+        tmp = self.path.with_suffix(".tmp")
+        live: dict[str, tuple[int, int]] = {}
+        offset = len(MAGIC)
+        with open(self.path, "rb") as src, open(tmp, "wb") as dst:
+            dst.write(MAGIC)
+            for block_id in order:
+                start, length = self._live[block_id]
+                src.seek(start)
+                dst.write(src.read(length))
+                live[block_id] = (offset, length)
+                offset += length
+            dst.flush()
+            os.fsync(dst.fileno())
+
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        os.replace(tmp, self.path)
+        self._fsync_dir()
+        self._live = live
+        self._records = len(order)
+        self._open()
+
+    def _reset(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self.path.unlink(missing_ok=True)
+        self._live = {}
+        self._records = 0
+        self._size = 0
+
+    def _fsync(self) -> None:
+        if self._file is None:
+            return
+        try:
+            os.fsync(self._file.fileno())
+        except OSError as e:
+            logger.warning("Failed to fsync session journal: %s", e)
+
+    def _fsync_dir(self) -> None:
+        # Make the rename itself durable; not every platform allows this
+        try:
+            fd = os.open(self.path.parent, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
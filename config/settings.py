@@ -63,6 +63,8 @@ class TerminalSettings:
     confirm_on_exit: bool = True
     auto_save_session: bool = True
     auto_save_interval: int = 30  # seconds
+    # Keep one interactive shell per branch instead of one per command
+    persistent_shell: bool = False
 
     # New settings
     cursor_style: str = "block"  # block, beam, underline
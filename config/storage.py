@@ -4,13 +4,19 @@ import json
 import logging
 import os
 import sqlite3
-from datetime import datetime
+import threading
+from collections.abc import Callable
+from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
 
 import keyring
 from cryptography.fernet import Fernet, InvalidToken
 
+from config.history_index import HistoryEntry
+from config.history_writer import HistoryWriter
+from config.session_journal import SessionJournal
+
 logger = logging.getLogger(__name__)
 
 DB_PATH = Path.home() / ".null" / "null.db"
@@ -21,6 +27,15 @@ KEYRING_SERVICE_NAME = "null-terminal-encryption-key"
 HISTORY_LIMIT = 1000  # Maximum number of commands to store
 
 
+def _fts_phrase(text: str) -> str:
+    """Quote text as an FTS5 phrase.
+
+    With the trigram tokenizer a phrase matches as a case-insensitive
+    substring, like LIKE '%text%'.
+    """
+    return '"' + text.replace('"', '""') + '"'
+
+
 class SecurityManager:
     """Manages encryption/decryption of sensitive configuration values."""
 
@@ -113,6 +128,19 @@ class StorageManager:
         else:
             self.db_path = db_path
         self.security = SecurityManager()
+        self.closed = False
+        # Write-through cache of decrypted config values, loaded on first read
+        self._config_cache: dict[str, Any] | None = None
+        self._config_lock = threading.RLock()
+        self._config_listeners: list[Callable[[str, Any], None]] = []
+        self._session_journal: SessionJournal | None = None
+        self._history_writer: HistoryWriter | None = None
+        # Caller-side history state, loaded on first use: the id the next
+        # command gets and the last command (for the duplicate check)
+        self._history_lock = threading.Lock()
+        self._next_history_id: int | None = None
+        self._last_history_command: str | None = None
+        self._interactions_fts = False
         self._init_db()
 
     def _init_db(self):
@@ -169,6 +197,8 @@ class StorageManager:
             )
         """)
 
+        self._interactions_fts = self._create_search_table(cursor)
+
         # Migration: Add jump_host if missing
         try:
             cursor.execute("ALTER TABLE ssh_hosts ADD COLUMN jump_host TEXT")
@@ -181,16 +211,98 @@ class StorageManager:
 
         self.conn.commit()
 
+    def _create_search_table(self, cursor: sqlite3.Cursor) -> bool:
+        """Create an FTS5 trigram index over interactions.
+
+        Returns False if this SQLite lacks FTS5 or the trigram tokenizer;
+        searches then fall back to LIKE scans.
+        """
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'interactions_fts'")
+        existed = cursor.fetchone() is not None
+        try:
+            cursor.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS interactions_fts USING fts5(
+                    input, output, content='interactions', content_rowid='id',
+                    tokenize='trigram'
+                )
+            """)
+        except sqlite3.OperationalError as e:
+            logger.debug("Full-text search unavailable: %s", e)
+            return False
+
+        cursor.executescript("""
+            CREATE TRIGGER IF NOT EXISTS interactions_fts_insert
+            AFTER INSERT ON interactions BEGIN
+                INSERT INTO interactions_fts (rowid, input, output)
+                VALUES (new.id, new.input, new.output);
+            END;
+            CREATE TRIGGER IF NOT EXISTS interactions_fts_delete
+            AFTER DELETE ON interactions BEGIN
+                INSERT INTO interactions_fts (interactions_fts, rowid, input, output)
+                VALUES ('delete', old.id, old.input, old.output);
+            END;
+            CREATE TRIGGER IF NOT EXISTS interactions_fts_update
+            AFTER UPDATE ON interactions BEGIN
+                INSERT INTO interactions_fts (interactions_fts, rowid, input, output)
+                VALUES ('delete', old.id, old.input, old.output);
+                INSERT INTO interactions_fts (rowid, input, output)
+                VALUES (new.id, new.input, new.output);
+            END;
+        """)
+        if not existed:
+            # Index interactions recorded before the table existed
+            cursor.execute(
+                "INSERT INTO interactions_fts (interactions_fts) VALUES ('rebuild')"
+            )
+        return True
+
+    def _load_config_cache(self) -> dict[str, Any]:
+        """Load every config row into memory, decrypting sensitive values once."""
+        with self._config_lock:
+            if self._config_cache is None:
+                cursor = self.conn.cursor()
+                cursor.execute("SELECT key, value, is_sensitive FROM config")
+                cache: dict[str, Any] = {}
+                for row in cursor.fetchall():
+                    val = row["value"]
+                    if row["is_sensitive"]:
+                        val = self.security.decrypt(val)
+                    cache[row["key"]] = val
+                self._config_cache = cache
+            return self._config_cache
+
+    def invalidate_config_cache(self):
+        """Drop cached config values so the next read reloads from the database."""
+        with self._config_lock:
+            self._config_cache = None
+
+    def add_config_listener(self, callback: Callable[[str, Any], None]) -> None:
+        """Register callback for config changes.
+
+        Args:
+            callback: Function called with (key, new_value); new_value is None
+                when the key was deleted.
+        """
+        self._config_listeners.append(callback)
+
+    def remove_config_listener(self, callback: Callable[[str, Any], None]) -> None:
+        """Remove a config change callback."""
+        if callback in self._config_listeners:
+            self._config_listeners.remove(callback)
+
+    def _notify_config_change(self, key: str, value: Any) -> None:
+        """Notify all listeners of a config change."""
+        for callback in list(self._config_listeners):
+            try:
+                callback(key, value)
+            except Exception as e:
+                logger.warning("Config listener failed for key '%s': %s", key, e)
+
     def get_config(self, key: str, default: Any = None) -> Any:
         """Get a configuration value, decrypting if sensitive."""
-        cursor = self.conn.cursor()
-        cursor.execute("SELECT value, is_sensitive FROM config WHERE key = ?", (key,))
-        row = cursor.fetchone()
-        if row:
-            val = row["value"]
-            if row["is_sensitive"]:
-                return self.security.decrypt(val)
-            return val
+        cache = self._load_config_cache()
+        if key in cache:
+            return cache[key]
         return default
 
     def set_config(self, key: str, value: str, is_sensitive: bool = False):
@@ -208,69 +320,112 @@ class StorageManager:
             """,
                 (key, stored_val, is_sensitive),
             )
+            if not is_sensitive:
+                # The TEXT column coerces non-str values (True -> '1'), so
+                # cache what a fresh read from the database would return
+                cursor.execute("SELECT value FROM config WHERE key = ?", (key,))
+                value = cursor.fetchone()["value"]
             self.conn.commit()
         except sqlite3.Error as e:
             logger.error("Failed to save config key '%s': %s", key, e)
             raise
 
+        with self._config_lock:
+            if self._config_cache is not None:
+                self._config_cache[key] = value
+        self._notify_config_change(key, value)
+
     def delete_config(self, key: str):
         """Delete a config key from the database."""
         cursor = self.conn.cursor()
         cursor.execute("DELETE FROM config WHERE key = ?", (key,))
         self.conn.commit()
 
+        with self._config_lock:
+            if self._config_cache is not None:
+                self._config_cache.pop(key, None)
+        self._notify_config_change(key, None)
+
     def delete_config_prefix(self, prefix: str):
         """Delete all config keys starting with a prefix."""
+        removed = [k for k in self._load_config_cache() if k.startswith(prefix)]
         cursor = self.conn.cursor()
         cursor.execute("DELETE FROM config WHERE key LIKE ?", (f"{prefix}%",))
         self.conn.commit()
 
+        # LIKE matching differs subtly from str.startswith, so reload lazily
+        self.invalidate_config_cache()
+        for key in removed:
+            self._notify_config_change(key, None)
+
     def list_config(self) -> dict[str, str]:
         """List all configuration key-value pairs."""
-        cursor = self.conn.cursor()
-        cursor.execute("SELECT key, value, is_sensitive FROM config")
-        result = {}
-        for row in cursor.fetchall():
-            key = row["key"]
-            val = row["value"]
-            if row["is_sensitive"]:
-                val = self.security.decrypt(val)
-            result[key] = val
-        return result
-
-    def add_history(self, command: str, exit_code: int = 0):
-        """Add a command to history with deduplication and limit enforcement."""
-        if not command.strip():
+        return dict(self._load_config_cache())
+
+    def _get_history_writer(self) -> HistoryWriter:
+        if self._history_writer is None:
+            self._history_writer = HistoryWriter(self.db_path, HISTORY_LIMIT)
+        return self._history_writer
+
+    def _load_history_state(self) -> None:
+        """Read the next history id and the last command; needs _history_lock."""
+        writer = self._history_writer
+        if writer is not None and writer.ids_stale:
+            writer.flush()
+            writer.ids_stale = False
+            self._next_history_id = None
+        if self._next_history_id is not None:
             return
-
         cursor = self.conn.cursor()
-
-        # Check for consecutive duplicate (don't add if last command is identical)
-        cursor.execute("SELECT command FROM history ORDER BY id DESC LIMIT 1")
+        cursor.execute("SELECT id, command FROM history ORDER BY id DESC LIMIT 1")
         row = cursor.fetchone()
-        if row and row["command"] == command:
-            return  # Skip consecutive duplicate
+        # AUTOINCREMENT never reuses ids, even those of deleted rows
+        cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = 'history'")
+        seq = cursor.fetchone()
+        last_id = max(row["id"] if row else 0, seq["seq"] if seq else 0)
+        self._next_history_id = last_id + 1
+        self._last_history_command = row["command"] if row else None
+
+    def _queue_history(self, commands: list[tuple[str, int]]) -> list[HistoryEntry]:
+        """Assign ids to commands and hand them to the writer; needs _history_lock."""
+        assert self._next_history_id is not None
+        timestamp = datetime.now(UTC).strftime("%Y-%m-%d %H:%M:%S")
+        entries = []
+        for command, exit_code in commands:
+            entries.append(
+                HistoryEntry(self._next_history_id, command, timestamp, exit_code)
+            )
+            self._next_history_id += 1
+        if entries:
+            self._last_history_command = entries[-1].command
+            self._get_history_writer().add(
+                [(e.id, e.command, e.timestamp, e.exit_code) for e in entries]
+            )
+        return entries
 
-        # Insert new command
-        cursor.execute(
-            "INSERT INTO history (command, exit_code) VALUES (?, ?)",
-            (command, exit_code),
-        )
+    def add_history(self, command: str, exit_code: int = 0) -> HistoryEntry | None:
+        """Add a command to history, skipping consecutive duplicates.
 
-        # Enforce history limit - delete oldest entries if over limit
-        cursor.execute("SELECT COUNT(*) as cnt FROM history")
-        count = cursor.fetchone()["cnt"]
-        if count > HISTORY_LIMIT:
-            excess = count - HISTORY_LIMIT
-            cursor.execute(
-                "DELETE FROM history WHERE id IN (SELECT id FROM history ORDER BY id ASC LIMIT ?)",
-                (excess,),
-            )
+        The row is written in the background; readers of history flush
+        pending writes first. Returns the new entry, or None if skipped.
+        """
+        if not command.strip():
+            return None
 
-        self.conn.commit()
+        with self._history_lock:
+            self._load_history_state()
+            if command == self._last_history_command:
+                return None  # Skip consecutive duplicate
+            return self._queue_history([(command, exit_code)])[0]
+
+    def flush_history(self) -> None:
+        """Block until queued history writes are committed."""
+        if self._history_writer is not None:
+            self._history_writer.flush()
 
     def get_last_history(self, limit: int = 50) -> list[str]:
         """Get recent command history."""
+        self.flush_history()
         cursor = self.conn.cursor()
         cursor.execute("SELECT command FROM history ORDER BY id DESC LIMIT ?", (limit,))
         # Return reversed so latest is last in list (for easy up/cycling)
@@ -295,25 +450,9 @@ class StorageManager:
         Args:
             commands: List of commands to save.
         """
-        cursor = self.conn.cursor()
-        for command in commands:
-            if command.strip():
-                cursor.execute(
-                    "INSERT INTO history (command, exit_code) VALUES (?, ?)",
-                    (command, 0),
-                )
-        self.conn.commit()
-
-        # Enforce limit after bulk insert
-        cursor.execute("SELECT COUNT(*) as cnt FROM history")
-        count = cursor.fetchone()["cnt"]
-        if count > HISTORY_LIMIT:
-            excess = count - HISTORY_LIMIT
-            cursor.execute(
-                "DELETE FROM history WHERE id IN (SELECT id FROM history ORDER BY id ASC LIMIT ?)",
-                (excess,),
-            )
-            self.conn.commit()
+        with self._history_lock:
+            self._load_history_state()
+            self._queue_history([(c, 0) for c in commands if c.strip()])
 
     def clear_history(self) -> int:
         """Clear all command history.
@@ -321,21 +460,27 @@ class StorageManager:
         Returns:
             Number of commands deleted.
         """
-        cursor = self.conn.cursor()
-        cursor.execute("SELECT COUNT(*) as cnt FROM history")
-        count = cursor.fetchone()["cnt"]
-        cursor.execute("DELETE FROM history")
-        self.conn.commit()
+        with self._history_lock:
+            self.flush_history()
+            cursor = self.conn.cursor()
+            cursor.execute("SELECT COUNT(*) as cnt FROM history")
+            count = cursor.fetchone()["cnt"]
+            cursor.execute("DELETE FROM history")
+            self.conn.commit()
+            self._last_history_command = None
         return count
 
     def get_history_count(self) -> int:
         """Get the number of commands in history."""
+        self.flush_history()
         cursor = self.conn.cursor()
         cursor.execute("SELECT COUNT(*) as cnt FROM history")
         return cursor.fetchone()["cnt"]
 
     def search_history(self, query: str, limit: int = 20) -> list[str]:
         """Search history for commands matching query."""
+        self.flush_history()
+        # HISTORY_LIMIT short rows scan faster than a trigram index looks up
         cursor = self.conn.cursor()
         cursor.execute(
             "SELECT DISTINCT command FROM history WHERE command LIKE ? ORDER BY id DESC LIMIT ?",
@@ -351,9 +496,23 @@ class StorageManager:
         return sessions_dir
 
     def _get_current_session_file(self) -> Path:
-        """Get path to current session file."""
+        """Get path to current session journal."""
+        return self._get_sessions_dir() / "current.journal"
+
+    def _get_legacy_session_file(self) -> Path:
+        """Get path to the full-JSON current session used before the journal."""
         return self._get_sessions_dir() / "current.json"
 
+    def _get_session_journal(self) -> SessionJournal:
+        if self._session_journal is None:
+            encrypt = self.security.encrypt if self._should_encrypt_sessions() else None
+            self._session_journal = SessionJournal(
+                self._get_current_session_file(),
+                encrypt=encrypt,
+                decrypt=self.security.decrypt,
+            )
+        return self._session_journal
+
     def _is_encrypted_session(self, data: dict) -> bool:
         """Check if session data is in encrypted format.
         
@@ -454,7 +613,10 @@ class StorageManager:
 
         data = {
             "saved_at": datetime.now().isoformat(),
-            "blocks": [b.to_dict() if isinstance(b, BlockState) else b for b in blocks],
+            "blocks": [
+                b.to_dict() if isinstance(b, BlockState) else b
+                for b in self.with_older_blocks(blocks)
+            ],
         }
 
         filepath = sessions_dir / filename
@@ -464,44 +626,44 @@ class StorageManager:
             logger.error("Failed to save session to %s: %s", filepath, e)
             raise
 
-        try:
-            self._get_current_session_file().write_text(
-                json.dumps(data, indent=2), encoding="utf-8"
-            )
-        except OSError as e:
-            logger.warning("Failed to update current session file: %s", e)
+        self.save_current_session([b for b in blocks if isinstance(b, BlockState)])
 
         return filepath
 
     def save_current_session(self, blocks: list[Any]):
-        """Quick save to current session (for auto-save)."""
-        from models import BlockState
+        """Quick save to current session (for auto-save).
 
+        Only blocks changed since the last save are serialized; the
+        journal writes them on its own thread.
+        """
         if not blocks:
             return
 
-        data = {
-            "saved_at": datetime.now().isoformat(),
-            "blocks": [b.to_dict() if isinstance(b, BlockState) else b for b in blocks],
-        }
+        self._get_session_journal().sync(blocks)
 
-        try:
-            self._get_current_session_file().write_text(
-                json.dumps(data, indent=2), encoding="utf-8"
-            )
-        except OSError as e:
-            logger.error("Failed to auto-save current session: %s", e)
+    def flush_session(self):
+        """Wait until the current session's pending writes are on disk."""
+        if self._session_journal is not None:
+            self._session_journal.flush()
+
+    def load_session(
+        self, name: str | None = None, limit: int | None = None
+    ) -> list[Any]:
+        """Load session from JSON file, or the current session's journal.
 
-    def load_session(self, name: str | None = None) -> list[Any]:
-        """Load session from JSON file."""
+        For the current session, ``limit`` caps how many of the most recent
+        blocks are loaded; load_older_blocks() fetches the rest.
+        """
         from models import BlockState
 
         sessions_dir = self._get_sessions_dir()
 
         if name:
             filepath = sessions_dir / f"session-{name}.json"
+        elif self._get_current_session_file().exists():
+            return self._load_current_session(limit)
         else:
-            filepath = self._get_current_session_file()
+            filepath = self._get_legacy_session_file()
 
         if not filepath.exists():
             return []
@@ -509,7 +671,6 @@ class StorageManager:
         try:
             data = json.loads(filepath.read_text(encoding="utf-8"))
             blocks = [BlockState.from_dict(b) for b in data.get("blocks", [])]
-            return blocks
         except json.JSONDecodeError as e:
             logger.error("Failed to parse session file %s: %s", filepath, e)
             return []
@@ -520,6 +681,66 @@ class StorageManager:
             logger.error("Invalid session data in %s: %s", filepath, e)
             return []
 
+        if not name and blocks:
+            # Move the old full-JSON session into the journal
+            journal = self._get_session_journal()
+            journal.sync(blocks)
+            journal.flush()
+            filepath.unlink(missing_ok=True)
+        return blocks
+
+    def load_older_blocks(self, count: int) -> list[Any]:
+        """Load up to ``count`` current-session blocks older than those loaded."""
+        return self._load_current_session(count, older=True)
+
+    def with_older_blocks(self, blocks: list[Any]) -> list[Any]:
+        """``blocks`` preceded by the current-session blocks not loaded yet.
+
+        After a paged restore the app holds only the latest blocks; saving
+        or exporting them alone would drop the rest of the session.
+        """
+        from models import BlockState
+
+        journal = self._session_journal
+        if journal is None or not journal.unloaded_count:
+            return list(blocks)
+        loaded = [b for b in blocks if isinstance(b, BlockState)]
+        try:
+            older = [BlockState.from_dict(b) for b in journal.peek_older(loaded)]
+        except OSError as e:
+            logger.error("Failed to read session journal: %s", e)
+            return list(blocks)
+        except (KeyError, TypeError, ValueError) as e:
+            logger.error("Invalid session data in journal: %s", e)
+            return list(blocks)
+        return older + list(blocks)
+
+    def has_older_blocks(self) -> bool:
+        """Whether the current session has blocks not loaded yet."""
+        journal = self._session_journal
+        return journal is not None and journal.unloaded_count > 0
+
+    def _load_current_session(
+        self, limit: int | None, older: bool = False
+    ) -> list[Any]:
+        from models import BlockState
+
+        journal = self._get_session_journal()
+        try:
+            if older:
+                data = journal.read_older(limit or 0)
+            else:
+                data = journal.load(limit)
+            blocks = [BlockState.from_dict(b) for b in data]
+        except OSError as e:
+            logger.error("Failed to read session journal: %s", e)
+            return []
+        except (KeyError, TypeError, ValueError) as e:
+            logger.error("Invalid session data in journal: %s", e)
+            return []
+        journal.mark_saved(blocks)
+        return blocks
+
     def list_sessions(self) -> list[dict[str, Any]]:
         """List all saved sessions."""
         sessions = []
@@ -546,9 +767,8 @@ class StorageManager:
 
     def clear_current_session(self):
         """Delete current session file."""
-        current = self._get_current_session_file()
-        if current.exists():
-            current.unlink()
+        self._get_session_journal().clear()
+        self._get_legacy_session_file().unlink(missing_ok=True)
 
     # SSH Management
     def add_ssh_host(
@@ -626,14 +846,65 @@ class StorageManager:
         return cursor.lastrowid
 
     def search_interactions(self, query: str, limit: int = 20) -> list[dict[str, Any]]:
-        """Search interactions by input content."""
+        """Search interactions by input or output content, newest first."""
         cursor = self.conn.cursor()
-        cursor.execute(
-            "SELECT * FROM interactions WHERE input LIKE ? OR output LIKE ? ORDER BY id DESC LIMIT ?",
-            (f"%{query}%", f"%{query}%", limit),
-        )
+        # The trigram index can't serve queries shorter than a trigram
+        if self._interactions_fts and len(query) >= 3:
+            cursor.execute(
+                """
+                SELECT * FROM interactions
+                WHERE id IN (
+                    SELECT rowid FROM interactions_fts WHERE interactions_fts MATCH ?
+                )
+                ORDER BY id DESC LIMIT ?
+                """,
+                (_fts_phrase(query), limit),
+            )
+        else:
+            cursor.execute(
+                "SELECT * FROM interactions WHERE input LIKE ? OR output LIKE ? ORDER BY id DESC LIMIT ?",
+                (f"%{query}%", f"%{query}%", limit),
+            )
         return [dict(row) for row in cursor.fetchall()]
 
     def close(self):
         """Close the database connection."""
+        if self._session_journal is not None:
+            self._session_journal.close()
+        if self._history_writer is not None:
+            self._history_writer.close()
         self.conn.close()
+        self.closed = True
+
+
+# Global storage instance
+_storage: StorageManager | None = None
+_storage_lock = threading.Lock()
+
+
+def get_storage() -> StorageManager:
+    """Get the process-wide storage manager.
+
+    The instance is created on first use and kept for the session so the
+    database connection, schema setup and encryption key lookup happen once.
+    A new instance is created if the previous one was closed or DB_PATH moved.
+    """
+    global _storage
+    with _storage_lock:
+        if _storage is None or _storage.closed or _storage.db_path != DB_PATH:
+            _storage = StorageManager()
+        return _storage
+
+
+def set_storage(storage: StorageManager) -> None:
+    """Set the process-wide storage manager (for testing)."""
+    global _storage
+    with _storage_lock:
+        _storage = storage
+
+
+def reset_storage() -> None:
+    """Reset the process-wide storage manager (for testing)."""
+    global _storage
+    with _storage_lock:
+        _storage = None
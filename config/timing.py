@@ -15,11 +15,12 @@ class TimingConfig:
     """
 
     # Executor timing (executor.py)
-    executor_poll_interval: float = 0.01  # Polling interval when waiting for data
-    executor_yield_interval: float = 0.0  # Yield to event loop after reading data
     executor_cancel_grace_period: float = (
         0.1  # Wait before force killing cancelled process
     )
+    executor_session_cancel_grace: float = (
+        2.0  # Wait for a persistent shell to return from Ctrl+C
+    )
 
     # Sidebar timing (widgets/sidebar.py)
     sidebar_update_interval: float = 2.0  # Interval for periodic process list updates
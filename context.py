@@ -1,8 +1,18 @@
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left
 from dataclasses import dataclass
-from typing import Any
+from typing import TYPE_CHECKING, Any, ClassVar
 
 from models import BlockState, BlockType
 
+if TYPE_CHECKING:
+    from ai.token_counter import TokenCounter
+
+# Rough characters per token, used when no TokenCounter is supplied
+CHARS_PER_TOKEN = 4
+
 
 @dataclass
 class ContextInfo:
@@ -18,7 +28,142 @@ class ContextInfo:
     original_message_count: int = 0
 
 
+@dataclass
+class _BlockEntry:
+    """A history block converted to its message, with the message's size."""
+
+    block_type: BlockType
+    content_input: str
+    content_output: str
+    message: dict[str, Any] | None
+    chars: int
+    tokens: int
+
+    def matches(self, block: BlockState) -> bool:
+        # Identity checks: any edit to a block replaces its content strings
+        return (
+            not block.is_running
+            and self.block_type is block.type
+            and self.content_input is block.content_input
+            and self.content_output is block.content_output
+        )
+
+
+@dataclass
+class _ContextSnapshot:
+    """Messages for a history, with prefix sums of their sizes."""
+
+    messages: list[dict[str, Any]]
+    chars: list[int]  # chars[i] = total chars of messages[:i]
+    costs: list[int]  # same, in tokens (or chars without a TokenCounter)
+    chars_per_unit: int
+
+    @property
+    def total_cost(self) -> int:
+        return self.costs[-1]
+
+    def fit_start(self, limit: int, lo: int = 0) -> int:
+        """First index >= lo such that messages[index:] fit within limit."""
+        return max(lo, bisect_left(self.costs, self.total_cost - limit))
+
+
+class ContextIndex:
+    """Incremental message form of the block history.
+
+    Finished blocks are converted to messages and measured once, then
+    reused until their content changes; running blocks are converted on
+    every call. Prefix sums of message sizes are kept across calls and
+    only recomputed from the first block that changed, so appending to a
+    long session costs little and fitting it into a window is a bisect.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: dict[str, _BlockEntry] = {}
+        self._counter_key: tuple[str, str] | None = None
+        self._sequence: list[_BlockEntry] = []
+        self._message_ends: list[int] = []  # messages after each entry
+        self._messages: list[dict[str, Any]] = []
+        self._chars: list[int] = [0]
+        self._costs: list[int] = [0]
+
+    def _reset(self) -> None:
+        self._entries.clear()
+        self._sequence.clear()
+        self._message_ends.clear()
+        self._messages.clear()
+        self._chars[1:] = []
+        self._costs[1:] = []
+
+    @staticmethod
+    def _convert(block: BlockState, counter: TokenCounter | None) -> _BlockEntry:
+        message = ContextManager._block_to_message(block)
+        chars = len(message["content"]) if message else 0
+        tokens = 0
+        if message and counter is not None:
+            tokens = counter.count_message_tokens(message)  # type: ignore[arg-type]
+        return _BlockEntry(
+            block_type=block.type,
+            content_input=block.content_input,
+            content_output=block.content_output,
+            message=message,
+            chars=chars,
+            tokens=tokens,
+        )
+
+    def snapshot(
+        self, blocks: list[BlockState], counter: TokenCounter | None = None
+    ) -> _ContextSnapshot:
+        """Messages and size prefix sums for ``blocks``."""
+        with self._lock:
+            key = (counter.provider, counter.model) if counter else None
+            if key != self._counter_key:
+                self._reset()
+                self._counter_key = key
+
+            entries: dict[str, _BlockEntry] = {}
+            sequence: list[_BlockEntry] = []
+            unchanged = 0
+            for i, block in enumerate(blocks):
+                entry = self._entries.get(block.id)
+                if entry is None or not entry.matches(block):
+                    entry = self._convert(block, counter)
+                if not block.is_running:
+                    entries[block.id] = entry
+                if unchanged == i and i < len(self._sequence):
+                    if self._sequence[i] is entry:
+                        unchanged += 1
+                sequence.append(entry)
+
+            # Keep the prefix sums for the unchanged leading blocks
+            kept = self._message_ends[unchanged - 1] if unchanged else 0
+            del self._messages[kept:]
+            del self._chars[kept + 1 :]
+            del self._costs[kept + 1 :]
+            del self._message_ends[unchanged:]
+            for entry in sequence[unchanged:]:
+                if entry.message is not None:
+                    self._messages.append(entry.message)
+                    self._chars.append(self._chars[-1] + entry.chars)
+                    cost = entry.tokens if counter is not None else entry.chars
+                    self._costs.append(self._costs[-1] + cost)
+                self._message_ends.append(len(self._messages))
+
+            self._entries = entries
+            self._sequence = sequence
+            return _ContextSnapshot(
+                # Copies, so callers can't edit the cached messages
+                messages=[dict(m) for m in self._messages],
+                chars=list(self._chars),
+                costs=list(self._costs),
+                chars_per_unit=1 if counter is None else CHARS_PER_TOKEN,
+            )
+
+
 class ContextManager:
+    # Shared across prompts so finished blocks are converted only once
+    _index: ClassVar[ContextIndex] = ContextIndex()
+
     @staticmethod
     def get_context(history_blocks: list[BlockState], limit_chars: int = 4000) -> str:
         """
@@ -41,36 +186,50 @@ class ContextManager:
         max_tokens: int = 4096,
         reserve_tokens: int = 1024,
         keep_recent: int = 5,
+        token_counter: TokenCounter | None = None,
     ) -> ContextInfo:
+        """Build the messages for a prompt from the block history.
+
+        Sizes are measured with ``token_counter`` when given, otherwise
+        estimated at CHARS_PER_TOKEN characters per token.
+        """
         available_tokens = max_tokens - reserve_tokens
-        char_limit = available_tokens * 4
+        snapshot = ContextManager._index.snapshot(history_blocks, token_counter)
+        # Budget in the snapshot's units: tokens, or chars without a counter
+        limit = available_tokens * (CHARS_PER_TOKEN // snapshot.chars_per_unit)
 
-        all_messages = ContextManager._blocks_to_messages(history_blocks)
+        all_messages = snapshot.messages
         original_count = len(all_messages)
-        total_chars = sum(len(m["content"]) for m in all_messages)
 
-        if total_chars <= char_limit:
+        if snapshot.total_cost <= limit:
             return ContextInfo(
                 messages=all_messages,
-                total_chars=total_chars,
-                estimated_tokens=total_chars // 4,
+                total_chars=snapshot.chars[-1],
+                estimated_tokens=ContextManager._to_tokens(
+                    snapshot, snapshot.total_cost
+                ),
                 message_count=len(all_messages),
                 truncated=False,
                 summarized=False,
                 original_message_count=original_count,
             )
 
-        result = ContextManager._summarize_context(
-            all_messages, char_limit, keep_recent
-        )
+        result = ContextManager._summarize_context(snapshot, limit, keep_recent)
+        messages = result["messages"]
 
-        final_chars = sum(len(m["content"]) for m in result["messages"])
+        final_chars = sum(len(m["content"]) for m in messages)
+        final_cost = final_chars
+        if token_counter is not None:
+            final_cost = sum(
+                token_counter.count_message_tokens(m)  # type: ignore[arg-type]
+                for m in messages
+            )
 
         return ContextInfo(
-            messages=result["messages"],
+            messages=messages,
             total_chars=final_chars,
-            estimated_tokens=final_chars // 4,
-            message_count=len(result["messages"]),
+            estimated_tokens=ContextManager._to_tokens(snapshot, final_cost),
+            message_count=len(messages),
             truncated=result["truncated"],
             summarized=result["summarized"],
             summary_details=result["summary_details"],
@@ -78,74 +237,76 @@ class ContextManager:
         )
 
     @staticmethod
-    def _blocks_to_messages(history_blocks: list[BlockState]) -> list[dict[str, Any]]:
-        messages: list[dict[str, Any]] = []
+    def _to_tokens(snapshot: _ContextSnapshot, cost: int) -> int:
+        return cost if snapshot.chars_per_unit > 1 else cost // CHARS_PER_TOKEN
 
+    @staticmethod
+    def _blocks_to_messages(history_blocks: list[BlockState]) -> list[dict[str, Any]]:
+        messages = []
         for block in history_blocks:
-            if block.type == BlockType.COMMAND:
-                cmd_content = f"[Terminal Command]\n$ {block.content_input}"
-                if block.content_output:
-                    output = block.content_output
-                    if len(output) > 2000:
-                        output = output[:1000] + "\n...[truncated]...\n" + output[-500:]
-                    cmd_content += f"\n{output}"
-                messages.append({"role": "user", "content": cmd_content})
-
-            elif block.type == BlockType.AI_QUERY:
-                messages.append({"role": "user", "content": block.content_input})
-
-            elif block.type == BlockType.AI_RESPONSE:
-                if block.content_output:
-                    messages.append(
-                        {"role": "assistant", "content": block.content_output}
-                    )
-
-            elif block.type == BlockType.SYSTEM_MSG:
-                content = f"[{block.content_input}]\n{block.content_output}"
-                messages.append({"role": "user", "content": content})
-
+            message = ContextManager._block_to_message(block)
+            if message is not None:
+                messages.append(message)
         return messages
 
+    @staticmethod
+    def _block_to_message(block: BlockState) -> dict[str, Any] | None:
+        if block.type == BlockType.COMMAND:
+            cmd_content = f"[Terminal Command]\n$ {block.content_input}"
+            if block.content_output:
+                output = block.content_output
+                if len(output) > 2000:
+                    output = output[:1000] + "\n...[truncated]...\n" + output[-500:]
+                cmd_content += f"\n{output}"
+            return {"role": "user", "content": cmd_content}
+
+        elif block.type == BlockType.AI_QUERY:
+            return {"role": "user", "content": block.content_input}
+
+        elif block.type == BlockType.AI_RESPONSE:
+            if block.content_output:
+                return {"role": "assistant", "content": block.content_output}
+
+        elif block.type == BlockType.SYSTEM_MSG:
+            content = f"[{block.content_input}]\n{block.content_output}"
+            return {"role": "user", "content": content}
+
+        return None
+
     @staticmethod
     def _summarize_context(
-        all_messages: list[dict[str, Any]],
-        char_limit: int,
+        snapshot: _ContextSnapshot,
+        limit: int,
         keep_recent: int,
     ) -> dict[str, Any]:
-        if len(all_messages) <= keep_recent:
-            while (
-                all_messages
-                and sum(len(m["content"]) for m in all_messages) > char_limit
-            ):
-                all_messages.pop(0)
+        all_messages = snapshot.messages
+        count = len(all_messages)
+        if count <= keep_recent:
+            start = snapshot.fit_start(limit)
             return {
-                "messages": all_messages,
+                "messages": all_messages[start:],
                 "truncated": True,
                 "summarized": False,
                 "summary_details": "",
             }
 
-        recent_messages = all_messages[-keep_recent:]
-        older_messages = all_messages[:-keep_recent]
-
-        recent_chars = sum(len(m["content"]) for m in recent_messages)
-        available_for_summary = char_limit - recent_chars - 500
+        recent_start = count - keep_recent
+        recent_cost = snapshot.total_cost - snapshot.costs[recent_start]
+        # Headroom for the summary framing, in the snapshot's units
+        per_unit = snapshot.chars_per_unit
+        available_for_summary = limit - recent_cost - 500 // per_unit
 
-        if available_for_summary < 200:
-            while (
-                recent_messages
-                and sum(len(m["content"]) for m in recent_messages) > char_limit
-            ):
-                recent_messages.pop(0)
+        if available_for_summary < 200 // per_unit:
+            start = snapshot.fit_start(limit, recent_start)
             return {
-                "messages": recent_messages,
+                "messages": all_messages[start:],
                 "truncated": True,
                 "summarized": False,
                 "summary_details": "",
             }
 
         summary = ContextManager._generate_summary(
-            older_messages, available_for_summary
+            all_messages[:recent_start], available_for_summary * per_unit
         )
 
         summary_message: dict[str, Any] = {
@@ -154,7 +315,7 @@ class ContextManager:
         }
 
         return {
-            "messages": [summary_message, *recent_messages],
+            "messages": [summary_message, *all_messages[recent_start:]],
             "truncated": False,
             "summarized": True,
             "summary_details": summary["details"],
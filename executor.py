@@ -1,16 +1,32 @@
 import asyncio
 import codecs
 import fcntl
+import logging
 import os
 import pty
+import re
 import signal
 import struct
 import termios
+import threading
 from collections.abc import Callable
-from typing import Literal
+from typing import TYPE_CHECKING, Literal
 
 from config import get_settings, get_timing_config
 
+if TYPE_CHECKING:
+    from shell_session import ShellSession
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on bytes read per wakeup so a flood of output cannot starve the
+# UI; the reader stays registered and fires again on the next loop iteration
+MAX_DRAIN_BYTES = 1024 * 1024
+
+# Line endings as seen through a PTY ("\r\n", or "\r\r\n" for programs that
+# already write CRLF)
+_CRLF = re.compile(r"\r+\n")
+
 
 def _waitpid_nohang(pid: int) -> tuple[int, int]:
     """Wrapper for os.waitpid with WNOHANG to use in executor."""
@@ -46,6 +62,80 @@ TUI_EXIT_INDICATORS = [
 ]
 
 
+class LineFramer:
+    """Frame PTY output into complete lines.
+
+    Bytes accumulate in a ``bytearray``; each :meth:`feed` decodes every
+    complete line in one call through a ``memoryview`` and drops them from
+    the front of the buffer (which CPython does without copying the tail),
+    so a burst costs time linear in its size. Carriage returns before a
+    newline are stripped.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        # Incremental UTF-8 decoder to handle multibyte chars split across reads
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+    @property
+    def pending(self) -> bytearray:
+        """Bytes of the current incomplete line."""
+        return self._buffer
+
+    def feed(self, data: bytes) -> str:
+        """Append ``data`` and return all newly completed lines (may be "")."""
+        buffer = self._buffer
+        start = len(buffer)
+        buffer += data
+        end = buffer.rfind(b"\n", start)
+        if end < 0:
+            return ""
+        with memoryview(buffer) as view:
+            text = self._decoder.decode(view[: end + 1])
+        del buffer[: end + 1]
+        return _CRLF.sub("\n", text) if "\r" in text else text
+
+    def take_pending(self, final: bool = False) -> str:
+        """Decode and clear the incomplete line (e.g. a prompt)."""
+        text = self._decoder.decode(bytes(self._buffer), final=final)
+        self._buffer.clear()
+        return text
+
+    def discard(self) -> None:
+        """Drop the incomplete line without decoding it."""
+        self._buffer.clear()
+
+    def reset(self) -> None:
+        self._buffer.clear()
+        self._decoder.reset()
+
+
+def shell_env() -> dict[str, str]:
+    """Environment for commands run in a PTY, with color support."""
+    env = os.environ.copy()
+    env.setdefault("TERM", "xterm-256color")
+    env.setdefault("COLORTERM", "truecolor")
+    env.setdefault("CLICOLOR", "1")
+    env.setdefault("CLICOLOR_FORCE", "1")
+    env.setdefault("FORCE_COLOR", "1")
+    return env
+
+
+def _looks_like_prompt(pending: bytearray) -> bool:
+    """Whether an incomplete line is waiting for input (password, y/n...)."""
+    lower_buf = pending.lower()
+    return (
+        b"\r" in pending
+        or b"password" in lower_buf
+        or b"passphrase" in lower_buf
+        or b"[y/n]" in lower_buf
+        or b"(yes/no)" in lower_buf
+        or b"continue?" in lower_buf
+        or pending.rstrip().endswith(b":")
+        or pending.rstrip().endswith(b"?")
+    )
+
+
 class ExecutionEngine:
     """Engine for executing shell commands with PTY support for proper colors."""
 
@@ -55,10 +145,14 @@ class ExecutionEngine:
         self._cancelled = False
         self._in_tui_mode = False
         self._detection_buffer = b""
-        # Incremental UTF-8 decoder to handle multibyte chars split across reads
-        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
-        # Store exit status when reaped via WNOHANG to avoid losing it
+        self._framer = LineFramer()
+        # Store exit status when reaped by the exit watcher to avoid losing it
         self._reaped_status: int | None = None
+        # Wakes the read loop on output, child exit or cancel
+        self._wake: asyncio.Event | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        # Persistent shell the current command runs in, if any
+        self._session: ShellSession | None = None
 
     @property
     def pid(self) -> int | None:
@@ -118,34 +212,41 @@ class ExecutionEngine:
         mode_callback: Callable[[str, bytes], None] | None = None,
         raw_callback: Callable[[bytes], None] | None = None,
         ready_event: asyncio.Event | None = None,
+        session: "ShellSession | None" = None,
     ) -> int:
         """
         Runs command in a PTY, calls callback with output, returns exit code.
 
         Args:
             command: The shell command to run
-            callback: Called with decoded line output (for normal display)
+            callback: Called with decoded output for normal display. Each call
+                carries every line completed by one read burst (or a flushed
+                prompt), so it may contain many newlines
             mode_callback: Called when TUI mode changes ('enter'/'exit', raw_data)
             raw_callback: Called with raw bytes when in TUI mode (for pyte)
+            session: Persistent shell to run the command in. A busy or dead
+                session, or a command too long for it, falls back to a
+                one-shot ``$SHELL -c``
 
         Returns:
             Exit code, or -1 if cancelled.
         """
+        if session is not None and session.available:
+            line = session.encode(command)
+            if line is not None:
+                return await self._run_in_session(
+                    session, line, callback, mode_callback, raw_callback, ready_event
+                )
+
         settings = get_settings()
         shell = settings.terminal.shell or os.environ.get("SHELL", "/bin/bash")
         self._cancelled = False
         self._in_tui_mode = False
         self._detection_buffer = b""
         self._reaped_status = None
-        self._decoder.reset()
+        self._framer.reset()
 
-        # Build environment with color support
-        env = os.environ.copy()
-        env.setdefault("TERM", "xterm-256color")
-        env.setdefault("COLORTERM", "truecolor")
-        env.setdefault("CLICOLOR", "1")
-        env.setdefault("CLICOLOR_FORCE", "1")
-        env.setdefault("FORCE_COLOR", "1")
+        env = shell_env()
 
         try:
             # Create PTY
@@ -190,110 +291,88 @@ class ExecutionEngine:
             flags = fcntl.fcntl(master_fd, fcntl.F_GETFL)
             fcntl.fcntl(master_fd, fcntl.F_SETFL, flags | os.O_NONBLOCK)
 
-            # Read output asynchronously
+            # Read output as it arrives: the master fd and child exit are
+            # watched by the event loop, so an idle command costs no wakeups
             loop = asyncio.get_running_loop()
-            buffer = b""
-
-            while True:
-                if self._cancelled:
-                    break
+            framer = self._framer
+            wake = asyncio.Event()
+            exited = False
+            self._loop = loop
+            self._wake = wake
+
+            def on_exit() -> None:
+                nonlocal exited
+                exited = True
+                wake.set()
+
+            def drain() -> tuple[bool, bool]:
+                """Read pending output; return (data_read, eof)."""
+                lines: list[str] = []
+                try:
+                    return read_chunks(lines)
+                finally:
+                    # One callback per burst, in order with any mode switch
+                    if lines:
+                        callback("".join(lines))
 
-                # Optimistic read loop - drain the buffer before yielding
-                # This significantly improves throughput for large outputs (cat, ls -R)
+            def read_chunks(lines: list[str]) -> tuple[bool, bool]:
                 data_read = False
-                while True:
+                total = 0
+                while total < MAX_DRAIN_BYTES:
                     try:
-                        # Non-blocking read attempt
                         chunk = os.read(master_fd, 65536)  # Read up to 64KB
-                        if not chunk:
-                            # EOF detected during read loop
-                            break
-
-                        data_read = True
-
-                        # --- Processing Logic (Inline for speed) ---
-                        # Check for TUI mode changes
-                        check_data = self._detection_buffer + chunk
-                        mode_change = self._detect_screen_mode(check_data)
-
-                        if len(check_data) > 50:
-                            self._detection_buffer = check_data[-50:]
-                        else:
-                            self._detection_buffer = check_data
-
-                        if mode_change == "enter" and not self._in_tui_mode:
-                            self._in_tui_mode = True
-                            if mode_callback:
-                                mode_callback("enter", chunk)
-                            if raw_callback:
-                                raw_callback(chunk)
-                            buffer = b""
-                            continue
-                        elif mode_change == "exit" and self._in_tui_mode:
-                            self._in_tui_mode = False
-                            if mode_callback:
-                                mode_callback("exit", chunk)
-                            buffer = b""
-                            continue
-
-                        if self._in_tui_mode:
-                            if raw_callback:
-                                raw_callback(chunk)
-                            continue
-
-                        # Normal line buffering
-                        buffer += chunk
-                        while b"\n" in buffer:
-                            line, buffer = buffer.split(b"\n", 1)
-                            decoded = self._decoder.decode(line.rstrip(b"\r")) + "\n"
-                            callback(decoded)
-
-                        # Partial flush check happens after the burst
-
                     except BlockingIOError:
                         # No more data currently available
-                        break
+                        return data_read, False
                     except OSError:
-                        # PTY closed or error
-                        break
-
-                # After draining the buffer, check if we need to flush partials
-                if data_read and buffer:
-                    # Partial flush logic for prompts
-                    lower_buf = buffer.lower()
-                    is_prompt = (
-                        b"\r" in buffer
-                        or b"password" in lower_buf
-                        or b"passphrase" in lower_buf
-                        or b"[y/n]" in lower_buf
-                        or b"(yes/no)" in lower_buf
-                        or b"continue?" in lower_buf
-                        or buffer.rstrip().endswith(b":")
-                        or buffer.rstrip().endswith(b"?")
+                        # PTY closed (EIO once the slave side is gone)
+                        return data_read, True
+                    if not chunk:
+                        return data_read, True
+
+                    data_read = True
+                    total += len(chunk)
+                    self._handle_chunk(
+                        chunk, lines, callback, mode_callback, raw_callback
                     )
-                    if is_prompt:
-                        decoded = self._decoder.decode(buffer)
-                        callback(decoded)
-                        buffer = b""
+                return data_read, False
 
-                if not data_read:
-                    try:
-                        reaped_pid, status = os.waitpid(pid, os.WNOHANG)  # noqa: ASYNC222
-                        if reaped_pid != 0:
-                            self._reaped_status = status
-                            break
-                    except ChildProcessError:
+            loop.add_reader(master_fd, wake.set)
+            reading = True
+            stop_exit_watch = self._watch_child_exit(loop, pid, on_exit)
+            try:
+                while not self._cancelled:
+                    wake.clear()
+                    data_read, eof = drain()
+
+                    # After draining, check if we need to flush partials
+                    pending = framer.pending
+                    if data_read and pending and _looks_like_prompt(pending):
+                        callback(framer.take_pending())
+
+                    if eof and reading:
+                        # Stop watching a closed PTY; it would stay readable
+                        loop.remove_reader(master_fd)
+                        reading = False
+                    if exited and not data_read:
+                        # Output written before exit has been drained
                         break
-
-                    timing = get_timing_config()
-                    await asyncio.sleep(timing.executor_poll_interval)
-                else:
-                    timing = get_timing_config()
-                    await asyncio.sleep(timing.executor_yield_interval)
+                    if data_read and (exited or not reading):
+                        # No further event will announce the rest; keep draining
+                        await asyncio.sleep(0)
+                        continue
+
+                    await wake.wait()
+            finally:
+                if reading:
+                    loop.remove_reader(master_fd)
+                stop_exit_watch()
+                self._wake = None
+                self._loop = None
 
             # Output any remaining buffer
-            if buffer:
-                callback(self._decoder.decode(buffer, final=True))
+            if framer.pending:
+                callback(framer.take_pending(final=True))
 
             # Wait for process to finish and get exit code
             if self._cancelled:
@@ -343,9 +422,249 @@ class ExecutionEngine:
                     logger.debug("Failed to close master fd: %s", e)
                 self._master_fd = None
 
+    async def _run_in_session(
+        self,
+        session: "ShellSession",
+        line: bytes,
+        callback: Callable[[str], None],
+        mode_callback: Callable[[str, bytes], None] | None,
+        raw_callback: Callable[[bytes], None] | None,
+        ready_event: asyncio.Event | None,
+    ) -> int:
+        """Send an encoded command line to a persistent shell.
+
+        Output is read until the shell's end-of-command marker. The PTY
+        belongs to the session and stays open afterwards.
+        """
+        self._cancelled = False
+        self._in_tui_mode = False
+        self._detection_buffer = b""
+        self._framer.reset()
+
+        master_fd = session.master_fd
+        assert master_fd is not None
+        markers = session.markers
+        framer = self._framer
+        loop = asyncio.get_running_loop()
+        wake = asyncio.Event()
+
+        session.busy = True
+        self._session = session
+        self._pid = session.pid
+        self._master_fd = master_fd
+        self._loop = loop
+        self._wake = wake
+        try:
+            session.set_winsize(24, 120)
+            markers.begin(echo=line.replace(b"\n", b"\r\n"))
+            session.write(line)
+            if ready_event:
+                ready_event.set()
+
+            def read_chunks(lines: list[str]) -> tuple[bool, bool]:
+                data_read = False
+                total = 0
+                while total < MAX_DRAIN_BYTES and not markers.done:
+                    try:
+                        chunk = os.read(master_fd, 65536)
+                    except BlockingIOError:
+                        return data_read, False
+                    except OSError:
+                        return data_read, True
+                    if not chunk:
+                        return data_read, True
+                    total += len(chunk)
+                    if output := markers.feed(chunk):
+                        data_read = True
+                        self._handle_chunk(
+                            output, lines, callback, mode_callback, raw_callback
+                        )
+                return data_read, False
+
+            eof = False
+            cancel_deadline: float | None = None
+            loop.add_reader(master_fd, wake.set)
+            try:
+                while True:
+                    wake.clear()
+                    lines: list[str] = []
+                    try:
+                        data_read, eof = read_chunks(lines)
+                    finally:
+                        if lines:
+                            callback("".join(lines))
+
+                    pending = framer.pending
+                    if data_read and pending and _looks_like_prompt(pending):
+                        callback(framer.take_pending())
+
+                    if markers.done or eof:
+                        break
+                    if not self._cancelled:
+                        await wake.wait()
+                        continue
+
+                    # Ctrl+C was sent; give the shell a moment to get back
+                    # to its prompt before giving up on it
+                    if cancel_deadline is None:
+                        grace = get_timing_config().executor_session_cancel_grace
+                        cancel_deadline = loop.time() + grace
+                    remaining = cancel_deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        await asyncio.wait_for(wake.wait(), remaining)
+                    except TimeoutError:
+                        pass
+            finally:
+                loop.remove_reader(master_fd)
+                self._wake = None
+                self._loop = None
+
+            if framer.pending:
+                callback(framer.take_pending(final=True))
+
+            if eof:
+                # The shell itself exited (`exit`, or it was killed)
+                return await loop.run_in_executor(None, session.close)
+            if self._cancelled:
+                if not markers.done:
+                    await loop.run_in_executor(None, session.close)
+                callback("\n[Cancelled]\n")
+                return -1
+            if markers.cwd:
+                session.cwd = markers.cwd
+            return markers.exit_code or 0
+
+        except Exception as e:
+            callback(f"Error executing command: {e}\n")
+            session.close()
+            return 127
+        finally:
+            session.busy = False
+            self._session = None
+            self._pid = None
+            self._master_fd = None
+            self._in_tui_mode = False
+
+    def _handle_chunk(
+        self,
+        chunk: bytes,
+        lines: list[str],
+        callback: Callable[[str], None],
+        mode_callback: Callable[[str, bytes], None] | None,
+        raw_callback: Callable[[bytes], None] | None,
+    ) -> None:
+        """Route one read of PTY output to line framing or the TUI."""
+        framer = self._framer
+
+        # Check for TUI mode changes
+        check_data = self._detection_buffer + chunk
+        mode_change = self._detect_screen_mode(check_data)
+
+        if len(check_data) > 50:
+            self._detection_buffer = check_data[-50:]
+        else:
+            self._detection_buffer = check_data
+
+        if mode_change == "enter" and not self._in_tui_mode:
+            if lines:
+                callback("".join(lines))
+                lines.clear()
+            self._in_tui_mode = True
+            if mode_callback:
+                mode_callback("enter", chunk)
+            if raw_callback:
+                raw_callback(chunk)
+            framer.discard()
+            return
+        elif mode_change == "exit" and self._in_tui_mode:
+            self._in_tui_mode = False
+            if mode_callback:
+                mode_callback("exit", chunk)
+            framer.discard()
+            return
+
+        if self._in_tui_mode:
+            if raw_callback:
+                raw_callback(chunk)
+            return
+
+        # Normal line framing
+        if text := framer.feed(chunk):
+            lines.append(text)
+
+    def _watch_child_exit(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        pid: int,
+        on_exit: Callable[[], None],
+    ) -> Callable[[], None]:
+        """Call ``on_exit`` on the loop once the child exits.
+
+        Uses a pidfd registered with the loop where available (Linux 5.3+);
+        otherwise a daemon thread blocks in waitpid. The reaped status is
+        stored in ``_reaped_status``.
+
+        Returns:
+            Function that stops watching and releases the pidfd.
+        """
+        pidfd_open = getattr(os, "pidfd_open", None)
+        pidfd = None
+        if pidfd_open is not None:
+            try:
+                pidfd = pidfd_open(pid)
+            except OSError:
+                pidfd = None
+
+        if pidfd is not None:
+            fd = pidfd
+
+            def on_pidfd_readable() -> None:
+                loop.remove_reader(fd)
+                try:
+                    reaped_pid, status = _waitpid_nohang(pid)
+                    if reaped_pid != 0:
+                        self._reaped_status = status
+                except ChildProcessError:
+                    pass
+                on_exit()
+
+            def close_pidfd() -> None:
+                loop.remove_reader(fd)
+                os.close(fd)
+
+            loop.add_reader(fd, on_pidfd_readable)
+            return close_pidfd
+
+        def reaped(status: int | None) -> None:
+            if status is not None:
+                self._reaped_status = status
+            on_exit()
+
+        def wait() -> None:
+            try:
+                _, status = _waitpid_blocking(pid)
+            except ChildProcessError:
+                status = None
+            try:
+                loop.call_soon_threadsafe(reaped, status)
+            except RuntimeError:
+                # Loop already closed
+                pass
+
+        threading.Thread(target=wait, name=f"waitpid-{pid}", daemon=True).start()
+        return lambda: None
+
     def cancel(self) -> None:
         """Cancel the currently running process."""
         self._cancelled = True
+        if self._wake is not None and self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wake.set)
+        if self._session is not None:
+            # Interrupt the foreground job, not the shell
+            self._session.interrupt()
+            return
         if self._pid:
             try:
                 os.kill(self._pid, signal.SIGTERM)
@@ -5,14 +5,17 @@ from __future__ import annotations
 import asyncio
 import json
 import time
+from functools import partial
 from typing import TYPE_CHECKING, Any
 
 from ai.base import Message, TokenUsage
 from config import Config
+from handlers.common import UIBuffer
 from managers.agent import AgentState
 from models import AgentIteration, BlockState
 
 if TYPE_CHECKING:
+    from ai.thinking import ThinkingStreamParser
     from widgets import AgentResponseBlock, BaseBlockWidget, StatusBar
     from app import NullApp
     from handlers.ai.tool_runner import ToolRunner
@@ -119,6 +122,36 @@ class AgentLoop:
 
         self.tool_runner.reset_session_approvals()
 
+        def render_parsed(
+            parser: ThinkingStreamParser,
+            iteration: AgentIteration,
+            status_bar: StatusBar | None,
+            text: str | None,
+        ) -> None:
+            """Feed streamed text to the parser (None flushes it) and show it."""
+            nonlocal full_response
+            if text is None:
+                thinking_delta, answer_delta = parser.finish()
+            else:
+                thinking_delta, answer_delta = parser.feed(text)
+
+            if thinking_delta:
+                iteration.thinking = parser.thinking
+                if agent_widget:
+                    agent_widget.update_iteration(
+                        iteration.id, thinking=iteration.thinking
+                    )
+
+            # A new iteration replaces the previous iteration's answer
+            answer = parser.answer
+            if answer_delta or answer is not full_response:
+                full_response = answer
+                block_state.content_output = full_response
+                widget.update_output(full_response)
+
+            if status_bar:
+                status_bar.update_streaming_tokens(len(full_response))
+
         while iteration_num < max_iterations:
             if agent_manager.should_cancel():
                 full_response += "\n\n[Cancelled by user]"
@@ -156,51 +189,51 @@ class AgentLoop:
             if status_bar:
                 status_bar.start_streaming()
 
-            async for chunk in ai_provider.generate_with_tools(
-                prompt if iteration_num == 1 else "",
-                current_messages,
-                tools,
-                system_prompt=enhanced_prompt,
-            ):
-                if self.app._ai_cancelled:
-                    full_response += "\n\n[Cancelled]"
-                    block_state.content_output = full_response
-                    widget.update_output(full_response)
-                    iteration.status = "complete"
-                    if agent_widget:
-                        agent_widget.update_iteration(iteration.id, status="complete")
-                    break
-
-                if chunk.text:
-                    raw_response += chunk.text
-
-                    thinking, remaining = strategy.extract_thinking(raw_response)
+            parser = strategy.create_stream_parser()
+            # Parse and render once per frame rather than once per chunk
+            buffer = UIBuffer(
+                self.app, partial(render_parsed, parser, iteration, status_bar)
+            )
 
-                    if thinking:
-                        iteration.thinking = thinking
+            try:
+                async for chunk in ai_provider.generate_with_tools(
+                    prompt if iteration_num == 1 else "",
+                    current_messages,
+                    tools,
+                    system_prompt=enhanced_prompt,
+                ):
+                    if self.app._ai_cancelled:
+                        buffer.flush()
+                        full_response += "\n\n[Cancelled]"
+                        block_state.content_output = full_response
+                        widget.update_output(full_response)
+                        iteration.status = "complete"
                         if agent_widget:
                             agent_widget.update_iteration(
-                                iteration.id, thinking=thinking
+                                iteration.id, status="complete"
                             )
+                        break
 
-                    full_response = remaining if thinking else raw_response
-                    block_state.content_output = full_response
-                    widget.update_output(full_response)
+                    if chunk.text:
+                        raw_response += chunk.text
+                        buffer.write(chunk.text)
 
-                    if status_bar:
-                        status_bar.update_streaming_tokens(len(full_response))
+                    if chunk.tool_calls:
+                        pending_tool_calls.extend(chunk.tool_calls)
 
-                if chunk.tool_calls:
-                    pending_tool_calls.extend(chunk.tool_calls)
+                    if chunk.is_complete and chunk.usage:
+                        if total_usage is None:
+                            total_usage = chunk.usage
+                        else:
+                            total_usage = total_usage + chunk.usage
 
-                if chunk.is_complete and chunk.usage:
-                    if total_usage is None:
-                        total_usage = chunk.usage
-                    else:
-                        total_usage = total_usage + chunk.usage
+                    if chunk.is_complete:
+                        break
+            finally:
+                buffer.stop()
 
-                if chunk.is_complete:
-                    break
+            if not self.app._ai_cancelled:
+                render_parsed(parser, iteration, status_bar, None)
 
             if status_bar:
                 status_bar.stop_streaming()
@@ -264,10 +297,7 @@ class AgentLoop:
                 agent_widget.update_iteration(iteration.id, status="executing")
 
             # Add assistant message with tool calls to conversation
-            assistant_content = raw_response
-            thinking, remaining = strategy.extract_thinking(raw_response)
-            if remaining:
-                assistant_content = remaining
+            assistant_content = parser.answer or raw_response
 
             assistant_msg: Message = {
                 "role": "assistant",
@@ -2,10 +2,14 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any, ClassVar
 
+from config.defaults import DEFAULT_AGENT_TOOL_PARALLELISM
 from models import AgentIteration, BlockState, ToolCallState
 from tools import ToolCall, ToolRegistry, ToolResult
 from tools.streaming import StreamingToolCall
@@ -15,6 +19,15 @@ if TYPE_CHECKING:
     from widgets import AIResponseBlock, BaseBlockWidget
 
 
+@dataclass
+class _ToolOutcome:
+    """Result of one tool call, plus what is needed to display it."""
+
+    result: ToolResult
+    tool_state: ToolCallState | None  # None when the user rejected the call
+    duration: float
+
+
 class ToolRunner:
     """Handles tool execution, streaming, and approval."""
 
@@ -159,6 +172,143 @@ class ToolRunner:
         finally:
             self._active_streaming_calls.pop(tool_id, None)
 
+    def can_run_concurrently(self, tool_name: str, registry: ToolRegistry) -> bool:
+        """Whether a call may overlap others: read-only and needing no prompt."""
+        if not registry.is_read_only(tool_name):
+            return False
+        return not registry.requires_approval(
+            tool_name
+        ) or self.is_tool_session_approved(tool_name)
+
+    def _get_parallelism(self) -> int:
+        ai_config = self.app.config.get("ai", {})
+        try:
+            limit = int(
+                ai_config.get("agent_tool_parallelism", DEFAULT_AGENT_TOOL_PARALLELISM)
+            )
+        except (TypeError, ValueError):
+            limit = DEFAULT_AGENT_TOOL_PARALLELISM
+        return max(1, limit)
+
+    async def _run_scheduled(
+        self,
+        tool_calls: list,
+        registry: ToolRegistry,
+        execute: Callable[[Any], Awaitable[_ToolOutcome | None]],
+        finish: Callable[[Any, _ToolOutcome], None],
+    ) -> list[ToolResult]:
+        """Execute tool calls, overlapping consecutive read-only ones.
+
+        Calls that mutate state or may prompt for approval run one at a time,
+        after every earlier call has finished. ``execute`` returns None when
+        the user cancels. ``finish`` is called in ``tool_calls`` order, so
+        results line up with their tool_call_ids.
+        """
+        results: list[ToolResult] = []
+        semaphore = asyncio.Semaphore(self._get_parallelism())
+        pending: list[tuple[Any, asyncio.Task[_ToolOutcome | None]]] = []
+
+        async def execute_limited(tc: Any) -> _ToolOutcome | None:
+            async with semaphore:
+                return await execute(tc)
+
+        async def drain() -> None:
+            while pending:
+                tc, task = pending[0]
+                outcome = await task
+                pending.pop(0)
+                if outcome is not None:
+                    finish(tc, outcome)
+                    results.append(outcome.result)
+
+        try:
+            for tc in tool_calls:
+                if self.can_run_concurrently(tc.name, registry):
+                    task = asyncio.ensure_future(execute_limited(tc))
+                    pending.append((tc, task))
+                    continue
+
+                await drain()
+                outcome = await execute(tc)
+                if outcome is None:
+                    break
+                finish(tc, outcome)
+                results.append(outcome.result)
+
+            await drain()
+        finally:
+            for _, task in pending:
+                task.cancel()
+
+        return results
+
+    def _start_tool_call(
+        self,
+        tc: Any,
+        block_state: BlockState,
+        ai_widget: AIResponseBlock | None,
+    ) -> ToolCallState:
+        """Record a tool call as running and show it in the accordion."""
+        tool_state = ToolCallState(
+            id=tc.id,
+            tool_name=tc.name,
+            arguments=json.dumps(tc.arguments, indent=2)
+            if isinstance(tc.arguments, dict)
+            else str(tc.arguments),
+            status="running",
+        )
+        block_state.tool_calls.append(tool_state)
+
+        if ai_widget:
+            ai_widget.add_tool_call(
+                tool_id=tc.id,
+                tool_name=tc.name,
+                arguments=tool_state.arguments,
+                status="running",
+            )
+        return tool_state
+
+    async def _approve(self, tc: Any, registry: ToolRegistry) -> str:
+        """Ask for approval if the tool needs it.
+
+        Returns:
+            "approve", "reject" or "cancel". Cancelling sets
+            ``app._ai_cancelled``.
+        """
+        if not registry.requires_approval(tc.name):
+            return "approve"
+
+        approval_result = await self.request_approval([tc])
+        if approval_result == "cancel":
+            self.app._ai_cancelled = True
+        return approval_result
+
+    def _show_result(
+        self,
+        tc: Any,
+        outcome: _ToolOutcome,
+        ai_widget: AIResponseBlock | None,
+    ) -> None:
+        """Mark a finished tool call's state and accordion entry."""
+        result = outcome.result
+        tool_state = outcome.tool_state
+        assert tool_state is not None
+
+        tool_state.status = "error" if result.is_error else "success"
+        tool_state.output = result.content
+        tool_state.duration = outcome.duration
+
+        if ai_widget:
+            content_preview = (
+                result.content[:1000] if len(result.content) > 1000 else result.content
+            )
+            ai_widget.update_tool_call(
+                tool_id=tc.id,
+                status=tool_state.status,
+                output=content_preview,
+                duration=outcome.duration,
+            )
+
     async def process_chat_tools(
         self,
         tool_calls: list,
@@ -169,47 +319,23 @@ class ToolRunner:
         """Process tool calls in chat mode (non-agent)."""
         from widgets.blocks import AIResponseBlock
 
-        results: list[ToolResult] = []
         ai_widget: AIResponseBlock | None = (
             widget if isinstance(widget, AIResponseBlock) else None
         )
 
-        for tc in tool_calls:
+        async def execute(tc: Any) -> _ToolOutcome | None:
             tool_call = ToolCall(id=tc.id, name=tc.name, arguments=tc.arguments)
             start_time = time.time()
-
-            tool_state = ToolCallState(
-                id=tc.id,
-                tool_name=tc.name,
-                arguments=json.dumps(tc.arguments, indent=2)
-                if isinstance(tc.arguments, dict)
-                else str(tc.arguments),
-                status="running",
-            )
-            block_state.tool_calls.append(tool_state)
-
-            if ai_widget:
-                ai_widget.add_tool_call(
-                    tool_id=tc.id,
-                    tool_name=tc.name,
-                    arguments=tool_state.arguments,
-                    status="running",
+            tool_state = self._start_tool_call(tc, block_state, ai_widget)
+
+            approval_result = await self._approve(tc, registry)
+            if approval_result == "cancel":
+                return None
+            if approval_result == "reject":
+                rejected = ToolResult(
+                    tc.id, "Tool execution rejected by user.", is_error=True
                 )
-
-            needs_approval = registry.requires_approval(tc.name)
-            if needs_approval:
-                approval_result = await self.request_approval([tc])
-
-                if approval_result == "cancel":
-                    self.app._ai_cancelled = True
-                    break
-                elif approval_result == "reject":
-                    results.append(
-                        ToolResult(
-                            tc.id, "Tool execution rejected by user.", is_error=True
-                        )
-                    )
-                    continue
+                return _ToolOutcome(rejected, None, 0.0)
 
             try:
                 result = await registry.execute_tool(tool_call)
@@ -217,27 +343,14 @@ class ToolRunner:
                 result = ToolResult(
                     tc.id, f"Error executing tool: {e!s}", is_error=True
                 )
+            return _ToolOutcome(result, tool_state, time.time() - start_time)
 
-            results.append(result)
-            duration = time.time() - start_time
-
-            tool_state.status = "error" if result.is_error else "success"
-            tool_state.output = result.content
-            tool_state.duration = duration
-
-            if ai_widget:
-                content_preview = (
-                    result.content[:1000]
-                    if len(result.content) > 1000
-                    else result.content
-                )
-                ai_widget.update_tool_call(
-                    tool_id=tc.id,
-                    status=tool_state.status,
-                    output=content_preview,
-                    duration=duration,
-                )
+        def finish(tc: Any, outcome: _ToolOutcome) -> None:
+            if outcome.tool_state is None:
+                return
+            self._show_result(tc, outcome, ai_widget)
 
+            result = outcome.result
             result_display = (
                 f"\n**Result ({tc.name}):**\n```\n{result.content[:1000]}\n```\n"
             )
@@ -247,7 +360,7 @@ class ToolRunner:
             block_state.content_exec_output += result_display
             widget.update_output(block_state.content_output)
 
-        return results
+        return await self._run_scheduled(tool_calls, registry, execute, finish)
 
     async def process_agent_tools(
         self,
@@ -261,89 +374,46 @@ class ToolRunner:
         """Execute tools within a specific agent iteration."""
         from widgets.blocks import AIResponseBlock
 
-        results: list[ToolResult] = []
         ai_widget: AIResponseBlock | None = (
             widget if isinstance(widget, AIResponseBlock) else None
         )
 
-        for tc in tool_calls:
+        async def execute(tc: Any) -> _ToolOutcome | None:
             tool_call = ToolCall(id=tc.id, name=tc.name, arguments=tc.arguments)
             start_time = time.time()
-
-            # Create tool call state
-            tool_state = ToolCallState(
-                id=tc.id,
-                tool_name=tc.name,
-                arguments=json.dumps(tc.arguments, indent=2)
-                if isinstance(tc.arguments, dict)
-                else str(tc.arguments),
-                status="running",
-            )
-            block_state.tool_calls.append(tool_state)
-
-            # Add to accordion if available
-            if ai_widget:
-                ai_widget.add_tool_call(
-                    tool_id=tc.id,
-                    tool_name=tc.name,
-                    arguments=tool_state.arguments,
-                    status="running",
+            tool_state = self._start_tool_call(tc, block_state, ai_widget)
+
+            approval_result = await self._approve(tc, registry)
+            if approval_result == "cancel":
+                return None
+            if approval_result == "reject":
+                rejected = ToolResult(
+                    tc.id, "Tool execution rejected by user.", is_error=True
                 )
+                return _ToolOutcome(rejected, None, 0.0)
 
-            # Check if approval is needed
-            needs_approval = registry.requires_approval(tc.name)
-
-            if needs_approval:
-                approval_result = await self.request_approval([tc])
-
-                if approval_result == "cancel":
-                    self.app._ai_cancelled = True
-                    break
-                elif approval_result == "reject":
-                    results.append(
-                        ToolResult(
-                            tc.id, "Tool execution rejected by user.", is_error=True
-                        )
-                    )
-                    continue
-
-            is_run_command = tc.name == "run_command"
-
-            if is_run_command and ai_widget:
+            if tc.name == "run_command" and ai_widget:
                 result = await self.execute_streaming_command(
                     tool_call, registry, ai_widget, tc.id, tool_state
                 )
             else:
                 result = await registry.execute_tool(tool_call)
+            return _ToolOutcome(result, tool_state, time.time() - start_time)
 
-            results.append(result)
-            duration = time.time() - start_time
-
-            tool_state.status = "error" if result.is_error else "success"
-            tool_state.output = result.content
-            tool_state.duration = duration
+        def finish(tc: Any, outcome: _ToolOutcome) -> None:
+            if outcome.tool_state is None:
+                return
+            self._show_result(tc, outcome, ai_widget)
 
+            result = outcome.result
             self.app.agent_manager.record_tool_call(
                 tool_name=tc.name,
-                args=tool_state.arguments,
+                args=outcome.tool_state.arguments,
                 result=result.content[:500],
                 success=not result.is_error,
-                duration=duration,
+                duration=outcome.duration,
             )
 
-            if ai_widget:
-                content_preview = (
-                    result.content[:1000]
-                    if len(result.content) > 1000
-                    else result.content
-                )
-                ai_widget.update_tool_call(
-                    tool_id=tc.id,
-                    status=tool_state.status,
-                    output=content_preview,
-                    duration=duration,
-                )
-
             # Show the result
             result_display = f"\n**Result:**\n```\n{result.content[:1000]}\n```\n"
             if len(result.content) > 1000:
@@ -352,4 +422,4 @@ class ToolRunner:
             block_state.content_exec_output += result_display
             widget.update_output(block_state.content_output)
 
-        return results
+        return await self._run_scheduled(tool_calls, registry, execute, finish)
@@ -8,6 +8,7 @@ from typing import TYPE_CHECKING, cast
 from textual.css.query import NoMatches
 
 from ai.base import KNOWN_MODEL_CONTEXTS, Message, TokenUsage
+from ai.token_counter import TokenCounter
 from config import Config, get_settings
 from context import ContextManager
 from executor import ExecutionEngine
@@ -55,6 +56,7 @@ class AIExecutor(BaseExecutor):
     async def execute_ai(
         self, prompt: str, block_state: BlockState, widget: BaseBlockWidget
     ) -> None:
+        rag_task: asyncio.Task[Message | None] | None = None
         try:
             provider_name = Config.get("ai.provider") or ""
             model_override = None
@@ -79,6 +81,18 @@ class AIExecutor(BaseExecutor):
 
             model_name = ai_provider.model
 
+            settings = get_settings()
+            if settings.ai.use_rag:
+                # Start retrieval first so the query embedding overlaps
+                # prompt and context assembly
+                rag_task = asyncio.create_task(
+                    self._retrieve_rag_context(
+                        prompt, ai_provider, settings.ai.rag_top_k
+                    )
+                )
+                # Let it run up to its first I/O wait before assembly starts
+                await asyncio.sleep(0)
+
             active_key = Config.get("ai.active_prompt") or "default"
 
             prompt_manager = get_prompt_manager()
@@ -87,9 +101,24 @@ class AIExecutor(BaseExecutor):
             model_info = ai_provider.get_model_info()
             max_tokens = model_info.context_window
 
-            context_info = ContextManager.build_messages(
-                self.app.blocks[:-1], max_tokens=max_tokens, reserve_tokens=1024
-            )
+            history = self.app.blocks[:-1]
+            token_counter = TokenCounter(provider=provider_name, model=model_name)
+            if rag_task is not None:
+                # Build off the loop so retrieval makes progress meanwhile
+                context_info = await asyncio.to_thread(
+                    ContextManager.build_messages,
+                    history,
+                    max_tokens=max_tokens,
+                    reserve_tokens=1024,
+                    token_counter=token_counter,
+                )
+            else:
+                context_info = ContextManager.build_messages(
+                    history,
+                    max_tokens=max_tokens,
+                    reserve_tokens=1024,
+                    token_counter=token_counter,
+                )
 
             if model_name.lower() not in KNOWN_MODEL_CONTEXTS:
                 is_known = any(
@@ -130,10 +159,13 @@ class AIExecutor(BaseExecutor):
 
             messages = cast(list[Message], context_info.messages)
 
-            settings = get_settings()
-            if settings.ai.use_rag:
+            if rag_task is not None:
                 messages = await self._inject_rag_context(
-                    prompt, messages, ai_provider, settings.ai.rag_top_k
+                    prompt,
+                    messages,
+                    ai_provider,
+                    settings.ai.rag_top_k,
+                    retrieval=rag_task,
                 )
 
             if is_agent_block:
@@ -183,6 +215,9 @@ class AIExecutor(BaseExecutor):
             widget.update_output(error_msg)
             widget.set_loading(False)
             self.app._active_worker = None
+        finally:
+            if rag_task is not None and not rag_task.done():
+                rag_task.cancel()
 
     async def _execute_without_tools(
         self,
@@ -322,30 +357,35 @@ class AIExecutor(BaseExecutor):
         messages: list[Message],
         ai_provider,
         top_k: int = 3,
+        retrieval: asyncio.Task[Message | None] | None = None,
     ) -> list[Message]:
-        try:
-            from ai.rag import RAGManager
-
-            rag_manager = RAGManager()
-            stats = rag_manager.get_stats()
+        if retrieval is not None:
+            rag_message = await retrieval
+        else:
+            rag_message = await self._retrieve_rag_context(prompt, ai_provider, top_k)
+        if rag_message is None:
+            return messages
+        return [rag_message, *messages]
 
-            if stats.get("total_chunks", 0) == 0:
-                return messages
+    async def _retrieve_rag_context(
+        self, prompt: str, ai_provider, top_k: int = 3
+    ) -> Message | None:
+        try:
+            from ai.rag import get_rag_manager
 
-            chunks = await rag_manager.search(prompt, ai_provider, limit=top_k)
+            chunks = await get_rag_manager().search(prompt, ai_provider, limit=top_k)
             if not chunks:
-                return messages
+                return None
 
             rag_context = "## Relevant Context from Local Index:\n\n"
             for chunk in chunks:
                 rag_context += f"From {chunk.source}:\n```\n{chunk.content}\n```\n\n"
 
-            rag_message: Message = {"role": "user", "content": rag_context}
-            return [rag_message, *messages]
+            return {"role": "user", "content": rag_context}
 
         except Exception as e:
             self.app.log(f"RAG context injection failed: {e}")
-            return messages
+            return None
 
     def run_agent_command(
         self, command: str, ai_block: BlockState, ai_widget: BaseBlockWidget
@@ -354,8 +394,8 @@ class AIExecutor(BaseExecutor):
             try:
                 output_buffer: list[str] = []
 
-                def callback(line: str) -> None:
-                    output_buffer.append(line)
+                def callback(chunk: str) -> None:
+                    output_buffer.append(chunk)
                     current_text = "".join(output_buffer)
                     ai_block.content_exec_output = f"\n```text\n{current_text}\n```\n"
                     ai_widget.update_output("")
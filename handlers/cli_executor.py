@@ -3,9 +3,12 @@
 from __future__ import annotations
 
 import asyncio
+import os
 from typing import TYPE_CHECKING
 
+from config import get_settings
 from executor import ExecutionEngine
+from shell_session import ShellSession, shell_kind
 from widgets.blocks import CommandBlock
 
 from .base_executor import BaseExecutor, ExecutorContext
@@ -24,6 +27,11 @@ class CLIExecutor(BaseExecutor):
         self.app = app
         super().__init__(ExecutorContext.from_app(app))
         self._current_exec_task: asyncio.Task[int] | None = None
+        # Persistent shells by branch, when terminal.persistent_shell is on
+        self._shell_sessions: dict[str, ShellSession] = {}
+        self._shell_start_lock = asyncio.Lock()
+        # Shells that failed to reach a prompt; they aren't retried
+        self._failed_shells: set[str] = set()
 
     async def execute_cli(self, block: BlockState, widget: BaseBlockWidget) -> None:
         """Execute a CLI command and stream output."""
@@ -35,6 +43,76 @@ class CLIExecutor(BaseExecutor):
         """Execute a command and append output to existing CLI block."""
         await self._execute_cli_internal(cmd, block, widget, is_append=True)
 
+    def _persistent_shell(self) -> str | None:
+        """The shell to keep running, or None if commands run one-shot."""
+        terminal = get_settings().terminal
+        if not terminal.persistent_shell:
+            return None
+        shell = terminal.shell or os.environ.get("SHELL", "/bin/bash")
+        if shell_kind(shell) is None or shell in self._failed_shells:
+            return None
+        return shell
+
+    def runs_in_shell_session(self, cmd: str) -> bool:
+        """Whether ``cmd`` would run in a live persistent shell right now.
+
+        Commands that don't (no shell started yet, an unsupported or failed
+        shell, a busy session, an over-long line) run in a one-shot shell,
+        where builtins like `cd` have no lasting effect.
+        """
+        shell = self._persistent_shell()
+        if shell is None:
+            return False
+        session = self._shell_sessions.get(self.app.branch_manager.current_branch)
+        return (
+            session is not None
+            and session.shell == shell
+            and session.available
+            and session.encode(cmd) is not None
+        )
+
+    async def _get_shell_session(self) -> ShellSession | None:
+        """The persistent shell for the current branch, started on demand."""
+        shell = self._persistent_shell()
+        if shell is None:
+            return None
+
+        branch = self.app.branch_manager.current_branch
+        async with self._shell_start_lock:
+            session = self._shell_sessions.get(branch)
+            if session is not None and session.alive and session.shell == shell:
+                return session
+            if session is not None:
+                session.close()
+
+            session = ShellSession(shell, cwd=os.getcwd())
+            if not await session.start():
+                self._failed_shells.add(shell)
+                self._shell_sessions.pop(branch, None)
+                self.app.notify(
+                    f"Could not start a persistent {shell}; "
+                    "running commands one at a time",
+                    severity="warning",
+                )
+                return None
+            self._shell_sessions[branch] = session
+            return session
+
+    def _sync_cwd(self, session: ShellSession) -> None:
+        """Follow a `cd` run inside the persistent shell."""
+        try:
+            if session.cwd != os.getcwd():
+                os.chdir(session.cwd)
+                self.app._update_prompt()
+        except OSError:
+            pass  # the directory may be gone or unreadable
+
+    def close_shell_sessions(self) -> None:
+        """Stop every persistent shell."""
+        for session in self._shell_sessions.values():
+            session.close()
+        self._shell_sessions.clear()
+
     async def _execute_cli_internal(
         self,
         cmd: str,
@@ -42,8 +120,8 @@ class CLIExecutor(BaseExecutor):
         widget: BaseBlockWidget,
         is_append: bool = False,
     ) -> None:
-        def update_callback(line: str):
-            block.content_output += line
+        def update_callback(chunk: str):
+            block.content_output += chunk
             widget.update_output()
             # Ensure history scrolls when new content arrives
             if hasattr(self.app, "query_one"):
@@ -76,6 +154,7 @@ class CLIExecutor(BaseExecutor):
 
         executor = ExecutionEngine()
         ready_event = asyncio.Event()
+        session = await self._get_shell_session()
 
         exec_task = asyncio.create_task(
             executor.run_command_and_get_rc(
@@ -84,6 +163,7 @@ class CLIExecutor(BaseExecutor):
                 mode_callback=mode_callback,
                 raw_callback=raw_callback,
                 ready_event=ready_event,
+                session=session,
             )
         )
         self._current_exec_task = exec_task
@@ -103,6 +183,8 @@ class CLIExecutor(BaseExecutor):
         finally:
             buffer.stop()
             self.app.process_manager.unregister(block.id)
+            if session is not None and session.alive:
+                self._sync_cwd(session)
 
         if not is_append:
             if hasattr(widget, "set_exit_code"):
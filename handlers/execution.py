@@ -61,6 +61,10 @@ class ExecutionHandler:
         """Execute a command and append output to existing CLI block."""
         await self.cli_executor.execute_cli_append(cmd, block, widget)
 
+    def close_shell_sessions(self) -> None:
+        """Stop the persistent shells used for CLI commands."""
+        self.cli_executor.close_shell_sessions()
+
     async def cancel_tool(self, tool_id: str) -> None:
         """Cancel a running tool execution.
 
@@ -226,8 +226,9 @@ class InputHandler:
         """Handle shell builtins. Returns True if handled."""
         cmd_stripped = cmd.strip()
 
-        # Handle cd command
-        if cmd_stripped == "cd" or cmd_stripped.startswith("cd "):
+        # Handle cd command, unless a persistent shell runs it itself
+        is_cd = cmd_stripped == "cd" or cmd_stripped.startswith("cd ")
+        if is_cd and not self._shell_session_runs(cmd_stripped):
             await self._handle_cd(cmd_stripped)
             return True
 
@@ -248,6 +249,13 @@ class InputHandler:
 
         return False
 
+    def _shell_session_runs(self, cmd: str) -> bool:
+        """Whether a live persistent shell will run ``cmd`` itself."""
+        if not get_settings().terminal.persistent_shell:
+            return False
+        cli_executor = self.app.execution_handler.cli_executor
+        return cli_executor.runs_in_shell_session(cmd)
+
     async def _handle_cd(self, cmd: str):
         """Handle cd command."""
         # Reset CLI session
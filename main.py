@@ -1,8 +1,24 @@
-from app import NullApp
+import argparse
 
 
 def run():
     """Entry point for the application."""
+    parser = argparse.ArgumentParser(prog="null", description="Null terminal")
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="report the import time of each module loaded at startup and exit",
+    )
+    args = parser.parse_args()
+
+    if args.profile_startup:
+        from utils.startup_profile import format_report, measure_startup
+
+        print(format_report(measure_startup()))
+        return
+
+    from app import NullApp
+
     app = NullApp()
     app.run()
 
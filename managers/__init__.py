@@ -1,8 +1,25 @@
+"""Managers for agents, branches, processes, SSH and voice input."""
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
 from .agent import AgentManager, AgentSession, AgentState, AgentStats
 from .branch import BranchManager
 from .process import ProcessInfo, ProcessManager
-from .ssh import SSHConnectionInfo, SSHConnectionPool, SSHConnectionState
-from .voice import RecordingState, TranscriptionResult, VoiceManager
+
+if TYPE_CHECKING:
+    from .ssh import SSHConnectionInfo, SSHConnectionPool, SSHConnectionState
+    from .voice import RecordingState, TranscriptionResult, VoiceManager
+
+# Imported on first access: ssh pulls in asyncssh, which most sessions never use
+_LAZY_IMPORTS = {
+    "RecordingState": ".voice",
+    "SSHConnectionInfo": ".ssh",
+    "SSHConnectionPool": ".ssh",
+    "SSHConnectionState": ".ssh",
+    "TranscriptionResult": ".voice",
+    "VoiceManager": ".voice",
+}
 
 __all__ = [
     "AgentManager",
@@ -19,3 +36,12 @@ __all__ = [
     "TranscriptionResult",
     "VoiceManager",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_IMPORTS:
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
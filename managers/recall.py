@@ -5,7 +5,7 @@ from typing import Any
 
 from ai.factory import AIFactory
 from ai.rag import DocumentChunk, VectorStore
-from config.storage import StorageManager
+from config.storage import get_storage
 from models import BlockState
 
 logger = logging.getLogger(__name__)
@@ -15,7 +15,7 @@ class RecallManager:
     """Manages semantic recall of past interactions."""
 
     def __init__(self):
-        self.storage = StorageManager()
+        self.storage = get_storage()
         self.ai_factory = AIFactory()
         self.vector_store = VectorStore(Path.home() / ".null" / "history_index.json")
 
@@ -2,18 +2,50 @@
 
 import asyncio
 import json
+import logging
 import os
-from collections.abc import Callable
+import re
+import sys
+from collections import deque
+from collections.abc import Callable, Coroutine
 from dataclasses import dataclass
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from .config import MCPServerConfig
 
+if TYPE_CHECKING:
+    from .http_transport import StreamableHTTPTransport
+
+logger = logging.getLogger(__name__)
+
 # Reconnection constants
 MAX_RECONNECT_ATTEMPTS = 5
 INITIAL_BACKOFF_SECONDS = 1.0
 MAX_BACKOFF_SECONDS = 60.0
 
+# Request timeout for methods without a configured one
+DEFAULT_REQUEST_TIMEOUT = 30.0
+# Messages at least this large are decoded in a worker thread
+OFFLOAD_DECODE_BYTES = 256 * 1024
+# Methods that ask the server for progress notifications; each notification
+# restarts the request's timeout
+PROGRESS_METHODS = frozenset({"tools/call", "resources/read"})
+# Server log messages kept per client
+MAX_LOG_MESSAGES = 200
+# Bytes kept from a message over max_message_bytes, to tell what it was
+OVERSIZED_HEAD_BYTES = 256
+# The first key of a message, when it is "id" or "method" (after "jsonrpc")
+_MESSAGE_HEAD = re.compile(
+    rb'\s*\{\s*(?:"jsonrpc"\s*:\s*"2\.0"\s*,\s*)?"(id|method)"\s*:\s*(-?\d+)?'
+)
+
+
+async def decode_message(data: bytes) -> Any:
+    """Decode a JSON-RPC message, off the event loop if it is large."""
+    if len(data) >= OFFLOAD_DECODE_BYTES:
+        return await asyncio.to_thread(json.loads, data)
+    return json.loads(data)
+
 
 @dataclass
 class MCPTool:
@@ -23,6 +55,7 @@ class MCPTool:
     description: str
     input_schema: dict[str, Any]
     server_name: str
+    read_only: bool = False  # Server's readOnlyHint annotation
 
 
 @dataclass
@@ -37,7 +70,11 @@ class MCPResource:
 
 
 class MCPClient:
-    """Client for communicating with a single MCP server via stdio."""
+    """Client for communicating with a single MCP server.
+
+    Servers are spawned as a subprocess speaking stdio, or, with the "http"
+    transport, reached over streamable HTTP.
+    """
 
     def __init__(
         self,
@@ -45,15 +82,24 @@ class MCPClient:
         on_reconnect_attempt: Callable[[str, int, float], None] | None = None,
         on_reconnect_success: Callable[[str], None] | None = None,
         on_reconnect_failed: Callable[[str, int], None] | None = None,
+        on_progress: Callable[[str, float, float | None, str], None] | None = None,
+        on_log: Callable[[str, str, Any], None] | None = None,
     ):
         self.config = config
         self.process: asyncio.subprocess.Process | None = None
+        self._transport: StreamableHTTPTransport | None = None
         self.tools: list[MCPTool] = []
         self.resources: list[MCPResource] = []
         self._request_id = 0
         self._pending_requests: dict[int, asyncio.Future] = {}
         self._read_task: asyncio.Task | None = None
         self._connected = False
+        # Bumped whenever tools or resources change, so indexes can go stale
+        self.catalog_version = 0
+        self._refresh_tasks: set[asyncio.Task] = set()
+        # Requests that reported progress since their timeout last started
+        self._progressed: set[int] = set()
+        self.log_messages: deque[tuple[str, Any]] = deque(maxlen=MAX_LOG_MESSAGES)
 
         self._reconnect_task: asyncio.Task | None = None
         self._reconnect_attempts = 0
@@ -62,36 +108,32 @@ class MCPClient:
         self._on_reconnect_attempt = on_reconnect_attempt
         self._on_reconnect_success = on_reconnect_success
         self._on_reconnect_failed = on_reconnect_failed
+        self._on_progress = on_progress
+        self._on_log = on_log
 
     @property
     def is_connected(self) -> bool:
-        return self._connected and self.process is not None
+        return self._connected and self._can_write()
+
+    def _can_write(self) -> bool:
+        if self._transport is not None:
+            return True
+        return self.process is not None and self.process.stdin is not None
 
     async def connect(self) -> bool:
         """Start the MCP server process and initialize."""
         self._manual_disconnect = False
         try:
-            env = os.environ.copy()
-            env.update(self.config.env)
-
-            # Start the process
-            self.process = await asyncio.create_subprocess_exec(
-                self.config.command,
-                *self.config.args,
-                stdin=asyncio.subprocess.PIPE,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                env=env,
-            )
-
-            # Start reading responses
-            self._read_task = asyncio.create_task(self._read_loop())
+            if self.config.transport == "http":
+                await self._open_http()
+            else:
+                await self._open_stdio()
 
             # Initialize the connection
             result = await self._send_request(
                 "initialize",
                 {
-                    "protocolVersion": "2024-11-05",
+                    "protocolVersion": self._protocol_version(),
                     "capabilities": {"tools": {}, "resources": {}},
                     "clientInfo": {"name": "null-terminal", "version": "1.0.0"},
                 },
@@ -100,6 +142,8 @@ class MCPClient:
             if result:
                 # Send initialized notification
                 await self._send_notification("notifications/initialized", {})
+                if self._transport is not None:
+                    self._transport.listen()
 
                 # Discover tools
                 await self._discover_tools()
@@ -114,6 +158,41 @@ class MCPClient:
 
         return False
 
+    async def _open_stdio(self) -> None:
+        """Spawn the server process and start reading its stdout."""
+        env = os.environ.copy()
+        env.update(self.config.env)
+
+        self.process = await asyncio.create_subprocess_exec(
+            self.config.command,
+            *self.config.args,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env=env,
+            limit=self.config.max_message_bytes or sys.maxsize,
+        )
+        self._read_task = asyncio.create_task(self._read_loop())
+
+    async def _open_http(self) -> None:
+        """Attach to a shared server over streamable HTTP."""
+        from .http_transport import StreamableHTTPTransport
+
+        self._transport = StreamableHTTPTransport(
+            self.config.url,
+            self.config.headers,
+            self._handle_message,
+            self._fail_request,
+        )
+        await self._transport.start()
+
+    def _protocol_version(self) -> str:
+        if self._transport is not None:
+            from .http_transport import PROTOCOL_VERSION
+
+            return PROTOCOL_VERSION
+        return "2024-11-05"
+
     async def disconnect(self, manual: bool = True):
         """Disconnect from the MCP server."""
         self._connected = False
@@ -140,9 +219,19 @@ class MCPClient:
                 pass
             self.process = None
 
+        if self._transport:
+            await self._transport.close()
+            self._transport = None
+
+        for task in self._refresh_tasks:
+            task.cancel()
+        self._refresh_tasks.clear()
+
         self.tools = []
         self.resources = []
+        self.catalog_version += 1
         self._pending_requests.clear()
+        self._progressed.clear()
 
     def cancel_reconnect(self):
         """Cancel any pending reconnection attempts."""
@@ -156,17 +245,18 @@ class MCPClient:
         unexpected_disconnect = False
         try:
             while self.process and self.process.stdout:
-                line = await self.process.stdout.readline()
+                line = await self._read_line(self.process.stdout)
                 if not line:
                     if self._connected and not self._manual_disconnect:
                         unexpected_disconnect = True
                     break
 
                 try:
-                    message = json.loads(line.decode("utf-8"))
-                    await self._handle_message(message)
-                except json.JSONDecodeError:
+                    message = await decode_message(line)
+                except (json.JSONDecodeError, UnicodeDecodeError):
                     continue
+                if isinstance(message, dict):
+                    await self._handle_message(message)
 
         except asyncio.CancelledError:
             pass
@@ -179,6 +269,67 @@ class MCPClient:
                 self._connected = False
                 self._reconnect_task = asyncio.create_task(self._attempt_reconnect())
 
+    async def _read_line(self, stdout: asyncio.StreamReader) -> bytes:
+        """Read one message line; empty at EOF.
+
+        Lines over max_message_bytes are dropped, failing the request they
+        answer.
+        """
+        while True:
+            try:
+                return await stdout.readuntil(b"\n")
+            except asyncio.IncompleteReadError as e:
+                return e.partial
+            except asyncio.LimitOverrunError as e:
+                head = await self._discard_line(stdout, e.consumed)
+                self._fail_oversized(head)
+
+    @staticmethod
+    async def _discard_line(stdout: asyncio.StreamReader, consumed: int) -> bytes:
+        """Skip the rest of an over-long line; return its first bytes."""
+        head = b""
+        while True:
+            try:
+                chunk = await stdout.readexactly(consumed)
+                head += chunk[: OVERSIZED_HEAD_BYTES - len(head)]
+                await stdout.readuntil(b"\n")
+                return head
+            except asyncio.IncompleteReadError:
+                return head
+            except asyncio.LimitOverrunError as e:
+                consumed = e.consumed
+
+    def _fail_oversized(self, head: bytes) -> None:
+        """Fail the request(s) an oversized message may have answered."""
+        error = Exception(
+            f"MCP message exceeds max_message_bytes "
+            f"({self.config.max_message_bytes}); raise it in the server config"
+        )
+        match = _MESSAGE_HEAD.match(head)
+        if match is not None and match[1] == b"method":
+            logger.warning(
+                "Dropped oversized request or notification from %s", self.config.name
+            )
+            return
+        if match is not None and match[2] is not None:
+            request_id = int(match[2])
+            if request_id in self._pending_requests:
+                logger.warning(
+                    "Response %d from %s exceeds max_message_bytes",
+                    request_id,
+                    self.config.name,
+                )
+                self._fail_request(request_id, error)
+                return
+        # Can't tell which request it answered
+        logger.warning(
+            "Dropped oversized message from %s; failing %d pending requests",
+            self.config.name,
+            len(self._pending_requests),
+        )
+        for request_id in list(self._pending_requests):
+            self._fail_request(request_id, error)
+
     async def _attempt_reconnect(self):
         """Attempt to reconnect with exponential backoff."""
         self._reconnect_attempts = 0
@@ -219,11 +370,22 @@ class MCPClient:
 
     async def _handle_message(self, message: dict[str, Any]):
         """Handle incoming message from server."""
+        method = message.get("method")
+        if method is not None:
+            if "id" in message:
+                await self._handle_server_request(message)
+            else:
+                self._handle_notification(method, message.get("params") or {})
+            return
+
         if "id" in message:
             # Response to a request
             request_id = message["id"]
             if request_id in self._pending_requests:
                 future = self._pending_requests.pop(request_id)
+                self._progressed.discard(request_id)
+                if future.done():
+                    return
                 if "error" in message:
                     future.set_exception(
                         Exception(message["error"].get("message", "Unknown error"))
@@ -231,14 +393,88 @@ class MCPClient:
                 else:
                     future.set_result(message.get("result"))
 
-    async def _send_request(self, method: str, params: dict[str, Any]) -> Any:
-        """Send a request and wait for response."""
+    def _handle_notification(self, method: str, params: dict[str, Any]) -> None:
+        """Handle a notification from the server."""
+        if method == "notifications/tools/list_changed":
+            self._schedule_refresh(self._discover_tools())
+        elif method == "notifications/resources/list_changed":
+            self._schedule_refresh(self._discover_resources())
+        elif method == "notifications/progress":
+            token = params.get("progressToken")
+            if token in self._pending_requests:
+                self._progressed.add(token)
+            if self._on_progress:
+                self._on_progress(
+                    self.config.name,
+                    params.get("progress", 0),
+                    params.get("total"),
+                    params.get("message", ""),
+                )
+        elif method == "notifications/message":
+            level = params.get("level", "info")
+            data = params.get("data")
+            self.log_messages.append((level, data))
+            if self._on_log:
+                self._on_log(self.config.name, level, data)
+
+    async def _handle_server_request(self, message: dict[str, Any]) -> None:
+        """Answer a request sent by the server."""
+        response: dict[str, Any] = {"jsonrpc": "2.0", "id": message["id"]}
+        if message["method"] == "ping":
+            response["result"] = {}
+        else:
+            response["error"] = {
+                "code": -32601,
+                "message": f"Method not found: {message['method']}",
+            }
+        await self._write(response)
+
+    def _fail_request(self, request_id: Any, error: Exception) -> None:
+        """Fail a pending request whose reply can no longer arrive."""
+        future = self._pending_requests.pop(request_id, None)
+        if future is not None and not future.done():
+            future.set_exception(error)
+
+    async def _write(self, message: dict[str, Any]) -> None:
+        if self._transport is not None:
+            await self._transport.send(message)
+            return
         if not self.process or not self.process.stdin:
+            return
+        data = json.dumps(message) + "\n"
+        self.process.stdin.write(data.encode("utf-8"))
+        await self.process.stdin.drain()
+
+    def _schedule_refresh(self, refresh: Coroutine[Any, Any, None]) -> None:
+        """Run a re-discovery outside the read loop, which must keep reading."""
+        task = asyncio.create_task(refresh)
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    def _request_timeout(self, method: str) -> float:
+        """Configured timeout for a method, in seconds."""
+        timeouts = self.config.timeouts
+        return float(
+            timeouts.get(method, timeouts.get("default", DEFAULT_REQUEST_TIMEOUT))
+        )
+
+    async def _send_request(self, method: str, params: dict[str, Any]) -> Any:
+        """Send a request and wait for response.
+
+        The timeout is the one configured for the method. For methods in
+        PROGRESS_METHODS it restarts whenever the server reports progress,
+        so long-running calls only time out once they go quiet.
+        """
+        if not self._can_write():
             raise Exception("Not connected")
 
         self._request_id += 1
         request_id = self._request_id
 
+        if method in PROGRESS_METHODS:
+            meta = {**params.get("_meta", {}), "progressToken": request_id}
+            params = {**params, "_meta": meta}
+
         message = {
             "jsonrpc": "2.0",
             "id": request_id,
@@ -249,26 +485,28 @@ class MCPClient:
         future = asyncio.get_running_loop().create_future()
         self._pending_requests[request_id] = future
 
-        data = json.dumps(message) + "\n"
-        self.process.stdin.write(data.encode("utf-8"))
-        await self.process.stdin.drain()
+        await self._write(message)
 
+        timeout = self._request_timeout(method)
         try:
-            return await asyncio.wait_for(future, timeout=30.0)
+            while True:
+                try:
+                    return await asyncio.wait_for(asyncio.shield(future), timeout)
+                except TimeoutError:
+                    if request_id not in self._progressed:
+                        raise
+                    self._progressed.discard(request_id)
         except TimeoutError as e:
-            self._pending_requests.pop(request_id, None)
             raise Exception(f"Request timeout: {method}") from e
+        finally:
+            if not future.done():
+                future.cancel()
+            self._pending_requests.pop(request_id, None)
+            self._progressed.discard(request_id)
 
     async def _send_notification(self, method: str, params: dict[str, Any]):
         """Send a notification (no response expected)."""
-        if not self.process or not self.process.stdin:
-            return
-
-        message = {"jsonrpc": "2.0", "method": method, "params": params}
-
-        data = json.dumps(message) + "\n"
-        self.process.stdin.write(data.encode("utf-8"))
-        await self.process.stdin.drain()
+        await self._write({"jsonrpc": "2.0", "method": method, "params": params})
 
     async def _discover_tools(self):
         """Discover available tools from the server."""
@@ -282,8 +520,12 @@ class MCPClient:
                         description=tool_data.get("description", ""),
                         input_schema=tool_data.get("inputSchema", {}),
                         server_name=self.config.name,
+                        read_only=bool(
+                            (tool_data.get("annotations") or {}).get("readOnlyHint")
+                        ),
                     )
                 )
+            self.catalog_version += 1
         except Exception as e:
             print(f"Error discovering tools ({self.config.name}): {e}")
 
@@ -302,6 +544,7 @@ class MCPClient:
                         server_name=self.config.name,
                     )
                 )
+            self.catalog_version += 1
         except Exception:
             # Resources are optional, don't error
             pass
@@ -5,6 +5,9 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, ClassVar
 
+# Largest JSON-RPC message accepted from a server by default
+DEFAULT_MAX_MESSAGE_BYTES = 64 * 1024 * 1024
+
 
 @dataclass
 class MCPServerConfig:
@@ -15,6 +18,19 @@ class MCPServerConfig:
     args: list[str] = field(default_factory=list)
     env: dict[str, str] = field(default_factory=dict)
     enabled: bool = True
+    # Result cache policy: ttl/max_entries/max_bytes, with per-tool overrides
+    # under "tools" ("resources/read" covers resource reads)
+    cache: dict[str, Any] = field(default_factory=dict)
+    # Request timeouts in seconds by method ("tools/call", ...); "default"
+    # applies to methods not listed
+    timeouts: dict[str, float] = field(default_factory=dict)
+    # Largest message read from the server; 0 means unbounded
+    max_message_bytes: int = DEFAULT_MAX_MESSAGE_BYTES
+    # "stdio" spawns ``command``; "http" connects to a shared server at ``url``
+    # over the streamable HTTP transport
+    transport: str = "stdio"
+    url: str = ""
+    headers: dict[str, str] = field(default_factory=dict)
 
     @classmethod
     def from_dict(cls, name: str, data: dict[str, Any]) -> "MCPServerConfig":
@@ -24,15 +40,33 @@ class MCPServerConfig:
             args=data.get("args", []),
             env=data.get("env", {}),
             enabled=data.get("enabled", True),
+            cache=data.get("cache", {}),
+            timeouts=data.get("timeouts", {}),
+            max_message_bytes=data.get("max_message_bytes", DEFAULT_MAX_MESSAGE_BYTES),
+            transport=data.get("transport") or ("http" if data.get("url") else "stdio"),
+            url=data.get("url", ""),
+            headers=data.get("headers", {}),
         )
 
     def to_dict(self) -> dict[str, Any]:
-        return {
+        data: dict[str, Any] = {
             "command": self.command,
             "args": self.args,
             "env": self.env,
             "enabled": self.enabled,
         }
+        if self.cache:
+            data["cache"] = self.cache
+        if self.timeouts:
+            data["timeouts"] = self.timeouts
+        if self.max_message_bytes != DEFAULT_MAX_MESSAGE_BYTES:
+            data["max_message_bytes"] = self.max_message_bytes
+        if self.transport != "stdio":
+            data["transport"] = self.transport
+            data["url"] = self.url
+            if self.headers:
+                data["headers"] = self.headers
+        return data
 
 
 class MCPConfig:
@@ -0,0 +1,225 @@
+"""Streamable HTTP transport for shared MCP servers."""
+
+import asyncio
+import contextlib
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+
+from ai.connection_pool import get_pooled_client
+
+from .client import decode_message
+
+PROTOCOL_VERSION = "2025-03-26"
+SESSION_HEADER = "Mcp-Session-Id"
+# Times a dropped SSE stream is resumed before its request is failed
+MAX_RESUME_ATTEMPTS = 3
+
+
+@dataclass
+class _StreamState:
+    """Progress through one SSE stream, kept across resumptions."""
+
+    request_id: Any = None
+    last_event_id: str | None = None
+    answered: bool = False
+
+
+async def _iter_sse(response: httpx.Response) -> AsyncIterator[tuple[str | None, str]]:
+    """Yield (event id, data) for each event in a text/event-stream body."""
+    event_id: str | None = None
+    data: list[str] = []
+    async for line in response.aiter_lines():
+        if not line:
+            if data:
+                yield event_id, "\n".join(data)
+            event_id, data = None, []
+            continue
+        if line.startswith(":"):
+            continue
+        name, _, value = line.partition(":")
+        value = value.removeprefix(" ")
+        if name == "data":
+            data.append(value)
+        elif name == "id":
+            event_id = value
+    if data:
+        yield event_id, "\n".join(data)
+
+
+class StreamableHTTPTransport:
+    """JSON-RPC over MCP's streamable HTTP transport.
+
+    Every message is POSTed to the server URL on a pooled httpx client, so
+    requests from one session run concurrently over kept-alive connections.
+    Replies arrive as a JSON body or an SSE stream; a stream that drops
+    before its reply is resumed with ``Last-Event-ID``. The session id the
+    server hands out on initialize is sent with every later request.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        headers: dict[str, str],
+        on_message: Callable[[dict[str, Any]], Awaitable[None]],
+        on_error: Callable[[Any, Exception], None],
+    ):
+        self.url = url
+        self.headers = headers
+        self.session_id: str | None = None
+        self._on_message = on_message
+        self._on_error = on_error
+        self._http: httpx.AsyncClient | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def start(self) -> None:
+        """Attach to the pooled HTTP client for this server."""
+        self._http = await get_pooled_client(f"mcp:{self.url}")
+
+    def listen(self) -> None:
+        """Open the optional GET stream for server-initiated messages."""
+        self._spawn(self._listen())
+
+    async def send(self, message: dict[str, Any]) -> None:
+        """Send a message.
+
+        Requests return once posted; their replies are dispatched to
+        ``on_message`` (or ``on_error``) as they arrive. Notifications and
+        responses are awaited until the server accepts them.
+        """
+        if self._http is None:
+            raise Exception("Not connected")
+
+        if "method" in message and "id" in message:
+            self._spawn(self._post(message))
+        else:
+            await self._post(message)
+
+    async def close(self) -> None:
+        """Cancel in-flight streams and end the server session."""
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+
+        # The pooled client is shared, so only the session is torn down
+        if self._http is not None and self.session_id:
+            with contextlib.suppress(httpx.HTTPError):
+                await self._http.delete(self.url, headers=self._headers())
+        self.session_id = None
+        self._http = None
+
+    def _spawn(self, coro: Awaitable[None]) -> None:
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _headers(
+        self, accept: str = "application/json, text/event-stream"
+    ) -> dict[str, str]:
+        headers = {**self.headers, "Accept": accept}
+        if self.session_id:
+            headers[SESSION_HEADER] = self.session_id
+        return headers
+
+    async def _post(self, message: dict[str, Any]) -> None:
+        assert self._http is not None
+        is_request = "method" in message and "id" in message
+        try:
+            async with self._http.stream(
+                "POST", self.url, json=message, headers=self._headers()
+            ) as response:
+                if response.status_code == 404 and self.session_id:
+                    self.session_id = None
+                    raise Exception("MCP session expired")
+                response.raise_for_status()
+                session_id = response.headers.get(SESSION_HEADER)
+                if session_id:
+                    self.session_id = session_id
+                await self._read_reply(response, message.get("id"))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if not is_request:
+                raise
+            self._on_error(message["id"], e)
+
+    async def _read_reply(self, response: httpx.Response, request_id: Any) -> None:
+        content_type = response.headers.get("content-type", "")
+        if content_type.startswith("text/event-stream"):
+            await self._read_stream(response, _StreamState(request_id=request_id))
+        elif content_type.startswith("application/json"):
+            body = await decode_message(await response.aread())
+            for message in body if isinstance(body, list) else [body]:
+                await self._on_message(message)
+
+    async def _read_stream(self, response: httpx.Response, state: _StreamState):
+        """Dispatch a reply stream, resuming it if it ends before the reply."""
+        with contextlib.suppress(httpx.TransportError):
+            await self._dispatch_events(response, state)
+
+        attempts = 0
+        while (
+            state.request_id is not None
+            and not state.answered
+            and state.last_event_id
+            and attempts < MAX_RESUME_ATTEMPTS
+        ):
+            attempts += 1
+            with contextlib.suppress(httpx.TransportError):
+                await self._resume(state)
+
+        if state.request_id is not None and not state.answered:
+            raise Exception("MCP stream closed before the response arrived")
+
+    async def _resume(self, state: _StreamState) -> None:
+        assert self._http is not None and state.last_event_id is not None
+        headers = self._headers("text/event-stream")
+        headers["Last-Event-ID"] = state.last_event_id
+        async with self._http.stream("GET", self.url, headers=headers) as response:
+            response.raise_for_status()
+            await self._dispatch_events(response, state)
+
+    async def _dispatch_events(
+        self, response: httpx.Response, state: _StreamState
+    ) -> None:
+        async for event_id, data in _iter_sse(response):
+            if event_id:
+                state.last_event_id = event_id
+            try:
+                message = await decode_message(data.encode("utf-8"))
+            except ValueError:
+                continue
+            if not isinstance(message, dict):
+                continue
+            await self._on_message(message)
+            if (
+                state.request_id is not None
+                and message.get("id") == state.request_id
+                and ("result" in message or "error" in message)
+            ):
+                state.answered = True
+                return
+
+    async def _listen(self) -> None:
+        """Follow the server's GET stream, resuming it when it drops."""
+        assert self._http is not None
+        state = _StreamState()
+        while self._http is not None:
+            headers = self._headers("text/event-stream")
+            if state.last_event_id:
+                headers["Last-Event-ID"] = state.last_event_id
+            try:
+                async with self._http.stream(
+                    "GET", self.url, headers=headers
+                ) as response:
+                    if response.status_code != 200:
+                        # 405: the server has no standalone stream
+                        return
+                    await self._dispatch_events(response, state)
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(1.0)
@@ -7,7 +7,7 @@ from typing import Any
 from .client import MCPClient, MCPResource, MCPTool
 from .config import MCPConfig, MCPServerConfig
 from .health_check import HealthStatus, MCPHealthChecker, ServerHealth
-from .request_dedup import RequestDeduplicator
+from .request_dedup import RESOURCE_READ, RequestDeduplicator
 
 
 class MCPManager:
@@ -24,6 +24,15 @@ class MCPManager:
         self.config = MCPConfig()
         self.clients: dict[str, MCPClient] = {}
         self._initialized = False
+
+        # Lookup indexes over all clients' tools and resources, rebuilt when
+        # a client connects, disconnects or reports a changed catalog
+        self._all_tools: list[MCPTool] = []
+        self._all_resources: list[MCPResource] = []
+        self._tool_index: dict[str, MCPTool] = {}
+        self._resource_index: dict[str, str] = {}  # uri -> server name
+        self._index_signature: tuple = ()
+        self._tools_generation = 0
         self.deduplicator = RequestDeduplicator(
             enabled=dedup_enabled, dedup_window=dedup_window
         )
@@ -113,6 +122,7 @@ class MCPManager:
 
         if success:
             self.clients[name] = client
+            self.deduplicator.set_server_policy(name, server_config.cache)
             return True
 
         return False
@@ -123,6 +133,7 @@ class MCPManager:
             self.clients[name].cancel_reconnect()
             await self.clients[name].disconnect()
             del self.clients[name]
+            self.deduplicator.invalidate_server(name)
 
     async def disconnect_all(self):
         """Disconnect from all servers."""
@@ -136,34 +147,58 @@ class MCPManager:
         await self.disconnect_server(name)
         return await self.connect_server(name)
 
+    def _ensure_indexes(self) -> None:
+        """Rebuild the tool and resource indexes if any client changed."""
+        signature = tuple(
+            (name, id(client), client.catalog_version)
+            for name, client in self.clients.items()
+        )
+        if signature == self._index_signature:
+            return
+
+        self._all_tools = []
+        self._all_resources = []
+        self._tool_index = {}
+        self._resource_index = {}
+        for name, client in self.clients.items():
+            self._all_tools.extend(client.tools)
+            self._all_resources.extend(client.resources)
+            # First server wins on duplicate names, as with a linear scan
+            for tool in client.tools:
+                self._tool_index.setdefault(tool.name, tool)
+            for resource in client.resources:
+                self._resource_index.setdefault(resource.uri, name)
+
+        self._index_signature = signature
+        self._tools_generation += 1
+
+    @property
+    def tools_generation(self) -> int:
+        """Counter that changes whenever the set of available tools changes."""
+        self._ensure_indexes()
+        return self._tools_generation
+
     def get_all_tools(self) -> list[MCPTool]:
         """Get all available tools from all connected servers."""
-        tools = []
-        for client in self.clients.values():
-            tools.extend(client.tools)
-        return tools
+        self._ensure_indexes()
+        return list(self._all_tools)
 
     def get_all_resources(self) -> list[MCPResource]:
         """Get all available resources from all connected servers."""
-        resources = []
-        for client in self.clients.values():
-            resources.extend(client.resources)
-        return resources
+        self._ensure_indexes()
+        return list(self._all_resources)
 
     def get_tool(self, name: str) -> MCPTool | None:
         """Find a tool by name."""
-        for client in self.clients.values():
-            for tool in client.tools:
-                if tool.name == name:
-                    return tool
-        return None
+        self._ensure_indexes()
+        return self._tool_index.get(name)
 
     async def call_tool(self, tool_name: str, arguments: dict[str, Any]) -> Any:
-        """Call a tool by name."""
-        hit, cached_result = await self.deduplicator.get_cached(tool_name, arguments)
-        if hit:
-            return cached_result
+        """Call a tool by name.
 
+        Identical concurrent calls share one request, and results are cached
+        according to the server's cache policy.
+        """
         tool = self.get_tool(tool_name)
         if not tool:
             raise Exception(f"Tool not found: {tool_name}")
@@ -172,19 +207,27 @@ class MCPManager:
         if not client or not client.is_connected:
             raise Exception(f"Server not connected: {tool.server_name}")
 
-        result = await client.call_tool(tool_name, arguments)
-        await self.deduplicator.cache_result(tool_name, arguments, result)
-        return result
+        return await self.deduplicator.call(
+            tool_name,
+            arguments,
+            lambda: client.call_tool(tool_name, arguments),
+            server_name=tool.server_name,
+        )
 
     async def read_resource(self, uri: str) -> str:
         """Read a resource by URI."""
-        # Find the server that has this resource
-        for client in self.clients.values():
-            for resource in client.resources:
-                if resource.uri == uri:
-                    return await client.read_resource(uri)
-
-        raise Exception(f"Resource not found: {uri}")
+        self._ensure_indexes()
+        server_name = self._resource_index.get(uri)
+        client = self.clients.get(server_name) if server_name else None
+        if client is None:
+            raise Exception(f"Resource not found: {uri}")
+
+        return await self.deduplicator.call(
+            RESOURCE_READ,
+            {"uri": uri},
+            lambda: client.read_resource(uri),
+            server_name=server_name,
+        )
 
     def get_tools_schema(self) -> list[dict[str, Any]]:
         """Get tool schemas in format suitable for LLM tool use."""
@@ -1,12 +1,17 @@
-"""Request deduplication for MCP tool calls."""
+"""Request deduplication and result caching for MCP calls."""
 
 import asyncio
 import hashlib
 import json
 import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass, field
 from typing import Any
 
+# Pseudo tool name under which resources/read results are cached
+RESOURCE_READ = "resources/read"
+
 
 @dataclass
 class CachedResult:
@@ -15,20 +20,57 @@ class CachedResult:
     result: Any
     timestamp: float
     tool_name: str
+    server_name: str = ""
+    ttl: float | None = None  # None uses the deduplicator's dedup_window
+    size: int = 0
+    policy_key: str = ""
+
+
+@dataclass
+class CachePolicy:
+    """Caching limits for a server, or for one tool on a server.
+
+    A ttl of 0 disables caching; identical in-flight calls are still
+    coalesced.
+    """
+
+    ttl: float
+    max_entries: int = 128
+    max_bytes: int = 1024 * 1024
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any], base: "CachePolicy") -> "CachePolicy":
+        return cls(
+            ttl=float(data.get("ttl", base.ttl)),
+            max_entries=int(data.get("max_entries", base.max_entries)),
+            max_bytes=int(data.get("max_bytes", base.max_bytes)),
+        )
 
 
 @dataclass
 class RequestDeduplicator:
-    """Deduplicates MCP tool calls within a configurable time window.
+    """Deduplicates MCP tool calls and caches their results.
 
-    Tracks recent requests by hash (tool name + arguments) and returns
-    cached results for duplicate requests within the time window.
+    Identical calls (same tool name and arguments) that overlap share one
+    request to the server. Finished results are cached for ``dedup_window``
+    seconds unless a per-server or per-tool ``CachePolicy`` says otherwise.
+    Entries are evicted least recently used first, both within a policy's
+    limits and within the overall ``max_entries``/``max_bytes`` budget.
     """
 
     dedup_window: float = 1.0
     enabled: bool = True
-    _cache: dict[str, CachedResult] = field(default_factory=dict)
+    max_entries: int = 1024
+    max_bytes: int = 16 * 1024 * 1024
+    _cache: OrderedDict[str, CachedResult] = field(default_factory=OrderedDict)
     _lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    _policies: dict[str, CachePolicy] = field(default_factory=dict)
+    _in_flight: dict[str, asyncio.Future] = field(default_factory=dict)
+    _bytes: int = 0
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    evictions: int = 0
 
     def _make_key(self, tool_name: str, arguments: dict[str, Any]) -> str:
         """Create a hash key from tool name and arguments."""
@@ -37,6 +79,146 @@ class RequestDeduplicator:
         )
         return hashlib.sha256(payload.encode()).hexdigest()
 
+    def set_server_policy(self, server_name: str, config: dict[str, Any]) -> None:
+        """Configure caching for a server from its ``cache`` config section.
+
+        ``config`` may set ``ttl``, ``max_entries`` and ``max_bytes`` for the
+        whole server, and override them per tool under ``tools``.
+        """
+        self.clear_server_policy(server_name)
+        if not config:
+            return
+
+        default = CachePolicy(ttl=self.dedup_window)
+        server_policy = CachePolicy.from_dict(config, default)
+        self._policies[server_name] = server_policy
+        for tool_name, tool_config in (config.get("tools") or {}).items():
+            self._policies[f"{server_name}/{tool_name}"] = CachePolicy.from_dict(
+                tool_config, server_policy
+            )
+
+    def clear_server_policy(self, server_name: str) -> None:
+        """Drop a server's cache policies."""
+        prefix = f"{server_name}/"
+        for key in [
+            k for k in self._policies if k == server_name or k.startswith(prefix)
+        ]:
+            del self._policies[key]
+
+    def _get_policy(
+        self, tool_name: str, server_name: str
+    ) -> tuple[str, CachePolicy | None]:
+        """Most specific policy for a call, with the key it is stored under."""
+        tool_key = f"{server_name}/{tool_name}"
+        if tool_key in self._policies:
+            return tool_key, self._policies[tool_key]
+        if server_name in self._policies:
+            return server_name, self._policies[server_name]
+        return "", None
+
+    def _lookup(self, key: str, now: float) -> tuple[bool, Any]:
+        cached = self._cache.get(key)
+        if cached is None:
+            return False, None
+
+        ttl = self.dedup_window if cached.ttl is None else cached.ttl
+        if now - cached.timestamp <= ttl:
+            self._cache.move_to_end(key)
+            return True, cached.result
+
+        self._remove(key)
+        return False, None
+
+    def _remove(self, key: str) -> None:
+        cached = self._cache.pop(key)
+        self._bytes -= cached.size
+
+    def _store(
+        self,
+        key: str,
+        tool_name: str,
+        result: Any,
+        server_name: str = "",
+    ) -> None:
+        policy_key, policy = self._get_policy(tool_name, server_name)
+        ttl = None if policy is None else policy.ttl
+        if ttl is not None and ttl <= 0:
+            return
+
+        size = len(json.dumps(result, default=str))
+        if size > (policy.max_bytes if policy else self.max_bytes):
+            return
+
+        if key in self._cache:
+            self._remove(key)
+        self._cache[key] = CachedResult(
+            result=result,
+            timestamp=time.monotonic(),
+            tool_name=tool_name,
+            server_name=server_name,
+            ttl=ttl,
+            size=size,
+            policy_key=policy_key,
+        )
+        self._bytes += size
+
+        if policy is not None:
+            self._evict_policy(policy_key, policy)
+        while len(self._cache) > self.max_entries or self._bytes > self.max_bytes:
+            self._remove(next(iter(self._cache)))
+            self.evictions += 1
+
+    def _evict_policy(self, policy_key: str, policy: CachePolicy) -> None:
+        """Evict a policy's least recently used entries until it fits."""
+        entries = [k for k, v in self._cache.items() if v.policy_key == policy_key]
+        count = len(entries)
+        used = sum(self._cache[k].size for k in entries)
+        for key in entries:
+            if count <= policy.max_entries and used <= policy.max_bytes:
+                break
+            used -= self._cache[key].size
+            count -= 1
+            self._remove(key)
+            self.evictions += 1
+
+    async def call(
+        self,
+        tool_name: str,
+        arguments: dict[str, Any],
+        fetch: Callable[[], Awaitable[Any]],
+        server_name: str = "",
+    ) -> Any:
+        """Return a cached result, join an identical in-flight call, or fetch.
+
+        The fetch runs in its own task, so cancelling one caller does not
+        cancel the request for the others. Failed calls are not cached.
+        """
+        if not self.enabled:
+            return await fetch()
+
+        key = self._make_key(tool_name, arguments)
+        hit, result = self._lookup(key, time.monotonic())
+        if hit:
+            self.hits += 1
+            return result
+
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return await asyncio.shield(future)
+
+        self.misses += 1
+        future = asyncio.ensure_future(fetch())
+        self._in_flight[key] = future
+
+        def on_done(done: asyncio.Future) -> None:
+            self._in_flight.pop(key, None)
+            if not done.cancelled() and done.exception() is None:
+                self._store(key, tool_name, done.result(), server_name)
+
+        future.add_done_callback(on_done)
+        return await asyncio.shield(future)
+
     async def get_cached(
         self, tool_name: str, arguments: dict[str, Any]
     ) -> tuple[bool, Any]:
@@ -52,16 +234,20 @@ class RequestDeduplicator:
         now = time.monotonic()
 
         async with self._lock:
-            if key in self._cache:
-                cached = self._cache[key]
-                if now - cached.timestamp <= self.dedup_window:
-                    return True, cached.result
-                del self._cache[key]
+            hit, result = self._lookup(key, now)
 
-        return False, None
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return hit, result
 
     async def cache_result(
-        self, tool_name: str, arguments: dict[str, Any], result: Any
+        self,
+        tool_name: str,
+        arguments: dict[str, Any],
+        result: Any,
+        server_name: str = "",
     ) -> None:
         """Cache a tool call result."""
         if not self.enabled:
@@ -70,9 +256,7 @@ class RequestDeduplicator:
         key = self._make_key(tool_name, arguments)
 
         async with self._lock:
-            self._cache[key] = CachedResult(
-                result=result, timestamp=time.monotonic(), tool_name=tool_name
-            )
+            self._store(key, tool_name, result, server_name)
 
     async def cleanup_expired(self) -> int:
         """Remove expired cache entries. Returns count of removed entries."""
@@ -83,19 +267,44 @@ class RequestDeduplicator:
             expired_keys = [
                 k
                 for k, v in self._cache.items()
-                if now - v.timestamp > self.dedup_window
+                if now - v.timestamp > (self.dedup_window if v.ttl is None else v.ttl)
             ]
             for key in expired_keys:
-                del self._cache[key]
+                self._remove(key)
                 removed += 1
 
         return removed
 
+    def invalidate_server(self, server_name: str) -> int:
+        """Drop cached results from one server. Returns count removed."""
+        keys = [k for k, v in self._cache.items() if v.server_name == server_name]
+        for key in keys:
+            self._remove(key)
+        return len(keys)
+
     def clear(self) -> None:
         """Clear all cached entries."""
         self._cache.clear()
+        self._bytes = 0
 
     @property
     def cache_size(self) -> int:
         """Current number of cached entries."""
         return len(self._cache)
+
+    @property
+    def cache_bytes(self) -> int:
+        """Approximate size of the cached results, in bytes."""
+        return self._bytes
+
+    def get_stats(self) -> dict[str, int]:
+        """Cache counters for status displays."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "entries": len(self._cache),
+            "bytes": self._bytes,
+            "in_flight": len(self._in_flight),
+        }
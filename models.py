@@ -4,6 +4,7 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
+from typing import Any
 
 
 class BlockType(Enum):
@@ -15,6 +16,9 @@ class BlockType(Enum):
     TOOL_CALL = "tool_call"
 
 
+_UNSET = object()
+
+
 @dataclass
 class ToolCallState:
     """State for a single tool call in agent mode."""
@@ -123,6 +127,22 @@ class BlockState:
     tool_calls: list["ToolCallState"] = field(default_factory=list)
     iterations: list["AgentIteration"] = field(default_factory=list)
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        # Count reassignments so the session journal can skip unchanged blocks
+        if self.__dict__.get(name, _UNSET) is not value:
+            self.__dict__["_revision"] = self.__dict__.get("_revision", 0) + 1
+        super().__setattr__(name, value)
+
+    @property
+    def revision(self) -> int:
+        """Changes whenever a field is reassigned.
+
+        In-place edits of metadata, tool_calls or iterations don't count;
+        those happen while the block is running, and running blocks are
+        always saved.
+        """
+        return self.__dict__.get("_revision", 0)
+
     def to_dict(self) -> dict:
         """Serialize block to dictionary."""
         return {
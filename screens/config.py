@@ -293,6 +293,13 @@ class ConfigScreen(ModalScreen):
             Input(value=str(s.scrollback_lines), type="integer", id="scrollback_lines"),
         )
 
+        yield from self._setting_row(
+            "terminal.persistent_shell",
+            "Persistent Shell",
+            "Run commands in one long-lived bash/zsh per branch",
+            Switch(value=s.persistent_shell, id="persistent_shell"),
+        )
+
         yield from self._setting_row(
             "terminal.auto_save_session",
             "Auto Save Session",
@@ -628,6 +635,9 @@ class ConfigScreen(ModalScreen):
             scrollback_lines=int(
                 get_val(self.controls.get("terminal.scrollback_lines")) or 10000
             ),
+            persistent_shell=get_bool(
+                self.controls.get("terminal.persistent_shell"), False
+            ),
             auto_save_session=get_bool(
                 self.controls.get("terminal.auto_save_session"), True
             ),
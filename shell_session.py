@@ -0,0 +1,382 @@
+"""Long-lived interactive shell for running CLI commands without a fork each.
+
+The shell runs in its own PTY. After every command it prints an OSC 7
+sequence with its working directory and an OSC 133 ``D`` sequence with the
+exit code; :class:`PromptMarkers` strips both from the output and uses the
+``D`` marker to tell where one command's output ends.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import fcntl
+import logging
+import os
+import pty
+import secrets
+import select
+import signal
+import struct
+import termios
+import time
+from pathlib import Path
+
+from executor import shell_env
+
+logger = logging.getLogger(__name__)
+
+# Shells whose prompt hooks we know how to install
+SUPPORTED_SHELLS = ("bash", "zsh")
+
+# The PTY line discipline holds at most 4095 bytes of a pending input line;
+# longer commands run in a one-shot shell instead
+MAX_COMMAND_BYTES = 4000
+
+# How long rc files get before the shell is given up on
+STARTUP_TIMEOUT = 10.0
+
+# How long an exiting shell gets to be reaped before it is killed
+_REAP_GRACE = 0.5
+
+# An unterminated OSC sequence longer than this is passed through as output
+_MAX_OSC_BYTES = 4096
+
+_OSC = b"\x1b]"
+_BEL = b"\x07"
+_ST = b"\x1b\\"
+
+_INIT = {
+    "bash": (
+        "set +o emacs +o vi; unset HISTFILE; PS1=''; PS2=''; PS0=''; "
+        "__null_prompt() {{ printf '\\033]7;file://%s%s\\007"
+        "\\033]133;D;%s;aid={token}\\007' "
+        '"${{HOSTNAME:-}}" "$PWD" "$__null_rc"; }}; '
+        # Newlines, not ";", join the hooks: an existing PROMPT_COMMAND may
+        # already end with a separator
+        "__null_nl=$'\\n'; "
+        'PROMPT_COMMAND="__null_rc=\\$?$__null_nl'
+        '${{PROMPT_COMMAND:+$PROMPT_COMMAND$__null_nl}}__null_prompt"'
+    ),
+    "zsh": (
+        "unsetopt zle prompt_sp prompt_cr; unset HISTFILE; "
+        "PS1=''; PS2=''; RPS1=''; "
+        "__null_rc_save() {{ __null_rc=$?; }}; "
+        "__null_prompt() {{ printf '\\033]7;file://%s%s\\007"
+        "\\033]133;D;%s;aid={token}\\007' "
+        '"${{HOST:-}}" "$PWD" "$__null_rc"; }}; '
+        "precmd_functions=(__null_rc_save $precmd_functions __null_prompt)"
+    ),
+}
+
+
+def shell_kind(shell: str) -> str | None:
+    """The supported shell ``shell`` is, or None."""
+    name = Path(shell).name
+    return name if name in SUPPORTED_SHELLS else None
+
+
+def encode_command(command: str) -> bytes | None:
+    """Encode ``command`` as a single ``eval $'...'`` input line.
+
+    Everything the terminal would echo differently or treat as a control
+    character is escaped, so the echo is exactly the line that was sent.
+    Returns None when the line is too long for the PTY.
+    """
+    parts = ["eval $'"]
+    for ch in command:
+        if ch == "\\" or ch == "'":
+            parts.append("\\" + ch)
+        elif ch == "\n":
+            parts.append("\\n")
+        elif ch == "\t":
+            parts.append("\\t")
+        elif ord(ch) < 0x20 or ord(ch) == 0x7F:
+            parts.append(f"\\x{ord(ch):02x}")
+        else:
+            parts.append(ch)
+    parts.append("'\n")
+    line = "".join(parts).encode("utf-8", errors="surrogateescape")
+    if len(line) > MAX_COMMAND_BYTES:
+        return None
+    return line
+
+
+class PromptMarkers:
+    """Splits a command's output from the shell's prompt markers."""
+
+    def __init__(self, token: str) -> None:
+        self._aid = f"aid={token}".encode()
+        self._held = bytearray()
+        self._echo = b""
+        self.cwd: str | None = None
+        self.exit_code: int | None = None
+
+    def begin(self, echo: bytes = b"") -> None:
+        """Start a command whose input line the terminal will echo."""
+        self._held.clear()
+        self._echo = echo
+        self.exit_code = None
+
+    @property
+    def done(self) -> bool:
+        """Whether the end-of-command marker has been seen."""
+        return self.exit_code is not None
+
+    def feed(self, data: bytes) -> bytes:
+        """Consume PTY output; return the part that belongs to the command."""
+        if self.done:
+            return b""
+        buf = self._held + data
+        self._held.clear()
+
+        if self._echo:
+            expected = self._echo
+            n = min(len(buf), len(expected))
+            if buf[:n] != expected[:n]:
+                # Echo is off (or something printed first); show it all
+                self._echo = b""
+            elif n < len(expected):
+                self._echo = expected[n:]
+                return b""
+            else:
+                self._echo = b""
+                buf = buf[n:]
+
+        out = bytearray()
+        pos = 0
+        while True:
+            start = buf.find(_OSC, pos)
+            if start < 0:
+                if buf.endswith(b"\x1b"):
+                    out += buf[pos:-1]
+                    self._held += b"\x1b"
+                else:
+                    out += buf[pos:]
+                return bytes(out)
+
+            out += buf[pos:start]
+            end, term_len = self._find_terminator(buf, start + 2)
+            if end < 0:
+                if len(buf) - start > _MAX_OSC_BYTES:
+                    out += buf[start:]
+                else:
+                    self._held += buf[start:]
+                return bytes(out)
+
+            body = bytes(buf[start + 2 : end])
+            pos = end + term_len
+            if body.startswith(b"133;D;") and self._parse_exit(body):
+                # Whatever follows is the next prompt
+                return bytes(out)
+            if body.startswith(b"7;file://") and self._parse_cwd(body):
+                continue
+            out += buf[start:pos]
+
+    @staticmethod
+    def _find_terminator(buf: bytes | bytearray, start: int) -> tuple[int, int]:
+        bel = buf.find(_BEL, start)
+        st = buf.find(_ST, start)
+        if bel < 0 and st < 0:
+            return -1, 0
+        if st < 0 or 0 <= bel < st:
+            return bel, 1
+        return st, 2
+
+    def _parse_exit(self, body: bytes) -> bool:
+        fields = body.split(b";")
+        if len(fields) < 4 or self._aid not in fields[3:]:
+            return False  # someone else's marker, e.g. from `cat`ing a log
+        try:
+            self.exit_code = int(fields[2])
+        except ValueError:
+            self.exit_code = 0
+        return True
+
+    def _parse_cwd(self, body: bytes) -> bool:
+        location = body[len(b"7;file://") :]
+        slash = location.find(b"/")
+        if slash < 0:
+            return False
+        self.cwd = location[slash:].decode("utf-8", errors="surrogateescape")
+        return True
+
+
+class ShellSession:
+    """One interactive bash or zsh running in a PTY."""
+
+    def __init__(self, shell: str, cwd: str | None = None) -> None:
+        self.shell = shell
+        self.kind = shell_kind(shell)
+        self.cwd = cwd or os.getcwd()
+        self._token = secrets.token_hex(8)
+        self.markers = PromptMarkers(self._token)
+        self.busy = False
+        self._pid: int | None = None
+        self._master_fd: int | None = None
+        self._exit_status: int | None = None
+
+    @property
+    def pid(self) -> int | None:
+        """PID of the shell."""
+        return self._pid
+
+    @property
+    def master_fd(self) -> int | None:
+        """PTY master the shell's terminal is read and written through."""
+        return self._master_fd
+
+    @property
+    def alive(self) -> bool:
+        """Whether the shell is running."""
+        return self._master_fd is not None
+
+    @property
+    def available(self) -> bool:
+        """Whether a command can be sent now."""
+        return self.alive and not self.busy
+
+    def encode(self, command: str) -> bytes | None:
+        """The input line that runs ``command``, or None if it can't be sent."""
+        return encode_command(command)
+
+    async def start(self) -> bool:
+        """Spawn the shell and install the prompt hooks.
+
+        Returns False (with the shell closed) if the shell is unsupported or
+        doesn't reach its first prompt within ``STARTUP_TIMEOUT``.
+        """
+        if self.kind is None:
+            return False
+        try:
+            self._spawn()
+            self.markers.begin()
+            self.write(_INIT[self.kind].format(token=self._token) + "\n")
+            await asyncio.wait_for(self._wait_for_prompt(), STARTUP_TIMEOUT)
+        except Exception as e:
+            logger.debug("Persistent %s failed to start: %s", self.shell, e)
+            self.close()
+            return False
+        if not self.alive:
+            return False
+        if self.markers.cwd:
+            self.cwd = self.markers.cwd
+        return True
+
+    def _spawn(self) -> None:
+        master_fd, slave_fd = pty.openpty()
+        self._master_fd = master_fd
+        self.set_winsize(24, 120, fd=slave_fd)
+
+        pid = os.fork()
+        if pid == 0:
+            os.close(master_fd)
+            os.setsid()
+            fcntl.ioctl(slave_fd, termios.TIOCSCTTY, 0)
+            os.dup2(slave_fd, 0)
+            os.dup2(slave_fd, 1)
+            os.dup2(slave_fd, 2)
+            if slave_fd > 2:
+                os.close(slave_fd)
+            try:
+                os.chdir(self.cwd)
+            except OSError:
+                pass
+            os.execvpe(self.shell, [self.shell, "-i"], shell_env())
+
+        os.close(slave_fd)
+        self._pid = pid
+        flags = fcntl.fcntl(master_fd, fcntl.F_GETFL)
+        fcntl.fcntl(master_fd, fcntl.F_SETFL, flags | os.O_NONBLOCK)
+
+    async def _wait_for_prompt(self) -> None:
+        """Discard output up to the next end-of-command marker."""
+        loop = asyncio.get_running_loop()
+        fd = self._master_fd
+        assert fd is not None
+        readable = asyncio.Event()
+        loop.add_reader(fd, readable.set)
+        try:
+            while not self.markers.done:
+                readable.clear()
+                try:
+                    chunk = os.read(fd, 65536)
+                except BlockingIOError:
+                    await readable.wait()
+                    continue
+                except OSError:
+                    chunk = b""
+                if not chunk:
+                    raise EOFError("shell exited during startup")
+                self.markers.feed(chunk)
+        finally:
+            loop.remove_reader(fd)
+
+    def set_winsize(self, rows: int, cols: int, fd: int | None = None) -> None:
+        """Resize the shell's terminal."""
+        target = self._master_fd if fd is None else fd
+        if target is None:
+            return
+        try:
+            winsize = struct.pack("HHHH", rows, cols, 0, 0)
+            fcntl.ioctl(target, termios.TIOCSWINSZ, winsize)
+        except Exception as e:
+            logger.debug("Failed to set window size: %s", e)
+
+    def write(self, data: str | bytes) -> None:
+        """Write to the shell's terminal, waiting out a full PTY buffer."""
+        if isinstance(data, str):
+            data = data.encode("utf-8", errors="surrogateescape")
+        fd = self._master_fd
+        if fd is None:
+            raise OSError("shell session is closed")
+        view = memoryview(data)
+        while view:
+            try:
+                written = os.write(fd, view)
+            except BlockingIOError:
+                # Input is read as fast as the shell consumes it; this only
+                # happens mid-line, so a short blocking wait is fine
+                select.select([], [fd], [], 0.1)
+                continue
+            view = view[written:]
+
+    def interrupt(self) -> None:
+        """Send Ctrl+C to the shell's foreground job."""
+        try:
+            self.write(b"\x03")
+        except OSError as e:
+            logger.debug("Failed to interrupt shell: %s", e)
+
+    def close(self) -> int:
+        """Stop the shell; return its exit status as a shell would report it."""
+        if self._master_fd is not None:
+            try:
+                os.close(self._master_fd)
+            except OSError as e:
+                logger.debug("Failed to close master fd: %s", e)
+            self._master_fd = None
+        if self._pid is not None:
+            pid, self._pid = self._pid, None
+            self._exit_status = self._reap(pid)
+        return self._exit_status if self._exit_status is not None else 0
+
+    @staticmethod
+    def _reap(pid: int) -> int | None:
+        """Collect ``pid``, killing it if it hasn't exited."""
+        try:
+            deadline = time.monotonic() + _REAP_GRACE
+            done, status = os.waitpid(pid, os.WNOHANG)
+            while not done and time.monotonic() < deadline:
+                time.sleep(0.01)
+                done, status = os.waitpid(pid, os.WNOHANG)
+            if not done:
+                # Closing the PTY sent SIGHUP; make sure it's gone
+                os.kill(pid, signal.SIGKILL)
+                _, status = os.waitpid(pid, 0)
+        except (ChildProcessError, ProcessLookupError):
+            return None
+        if os.WIFEXITED(status):
+            return os.WEXITSTATUS(status)
+        if os.WIFSIGNALED(status):
+            return 128 + os.WTERMSIG(status)
+        return 255
@@ -49,10 +49,12 @@ def mock_storage(mock_home, monkeypatch):
     temp_db_path = mock_home / ".null" / "null.db"
     monkeypatch.setattr(storage_module, "DB_PATH", temp_db_path)
 
-    # Create fresh storage in temp directory
+    # Create fresh storage in temp directory and share it with Config
     storage = StorageManager()
+    storage_module.set_storage(storage)
     yield storage
     storage.close()
+    storage_module.reset_storage()
 
 
 @pytest.fixture
@@ -120,6 +122,20 @@ def reset_global_singletons():
     """Reset global singletons between tests to ensure isolation."""
     yield
 
+    try:
+        import config.storage as storage_mod
+
+        storage_mod.reset_storage()
+    except (ImportError, AttributeError):
+        pass
+
+    try:
+        import ai.rag as rag_mod
+
+        rag_mod.reset_rag_manager()
+    except (ImportError, AttributeError):
+        pass
+
     try:
         import security.sanitizer as sanitizer_mod
 
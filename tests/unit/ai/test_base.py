@@ -1,6 +1,9 @@
 """Tests for ai/base.py - TokenUsage, calculate_cost, StreamChunk, and related utilities."""
 
+import pytest
+
 from ai.base import (
+    LLMProvider,
     Message,
     ModelInfo,
     StreamChunk,
@@ -323,3 +326,32 @@ class TestMessage:
         }
         assert msg["role"] == "tool"
         assert msg["tool_call_id"] == "call_1"
+
+
+class _EchoProvider(LLMProvider):
+    """Minimal provider that embeds text as its length."""
+
+    async def embed_text(self, text: str) -> list[float] | None:
+        return [float(len(text))] if text else None
+
+    async def validate_connection(self) -> bool:
+        return True
+
+    async def generate(self, prompt, messages, system_prompt=None):
+        yield ""
+
+    async def list_models(self) -> list[str]:
+        return []
+
+
+class TestEmbedBatch:
+    """Tests for the default LLMProvider.embed_batch."""
+
+    @pytest.mark.asyncio
+    async def test_default_embeds_each_text_in_order(self):
+        provider = _EchoProvider()
+        assert await provider.embed_batch(["a", "", "abc"]) == [[1.0], None, [3.0]]
+
+    @pytest.mark.asyncio
+    async def test_default_empty(self):
+        assert await _EchoProvider().embed_batch([]) == []
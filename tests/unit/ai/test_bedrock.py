@@ -222,6 +222,53 @@ class TestBedrockProviderBuildClaudeMessages:
             assert tool_result_msg["content"][0]["tool_use_id"] == "call_1"
 
 
+class TestBedrockProviderBuildConverseMessages:
+    """Tests for _build_converse_messages method."""
+
+    def test_tool_round_trip_alternates_roles(self):
+        """Tool calls and their results should map to alternating messages."""
+        with patch("ai.bedrock.boto3"):
+            provider = BedrockProvider(region_name="us-east-1")
+
+        messages = [
+            {"role": "user", "content": "Find files"},
+            {
+                "role": "assistant",
+                "content": "",
+                "tool_calls": [
+                    {
+                        "id": "call_1",
+                        "function": {"name": "ls", "arguments": '{"path": "."}'},
+                    },
+                    {"id": "call_2", "function": {"name": "pwd", "arguments": "{}"}},
+                ],
+            },
+            {"role": "tool", "tool_call_id": "call_1", "content": "a.txt"},
+            {"role": "tool", "tool_call_id": "call_2", "content": "/tmp"},
+        ]
+
+        result = provider._build_converse_messages("", messages)
+
+        assert [m["role"] for m in result] == ["user", "assistant", "user"]
+        assert result[1]["content"][0]["toolUse"] == {
+            "toolUseId": "call_1",
+            "name": "ls",
+            "input": {"path": "."},
+        }
+        assert [b["toolResult"]["toolUseId"] for b in result[2]["content"]] == [
+            "call_1",
+            "call_2",
+        ]
+
+    def test_prompt_is_appended_as_text(self):
+        with patch("ai.bedrock.boto3"):
+            provider = BedrockProvider(region_name="us-east-1")
+
+        result = provider._build_converse_messages("Hi", [])
+
+        assert result == [{"role": "user", "content": [{"text": "Hi"}]}]
+
+
 class TestBedrockProviderGenerate:
     """Tests for generate method."""
 
@@ -311,7 +358,7 @@ class TestBedrockProviderGenerateWithTools:
 
     @pytest.mark.asyncio
     async def test_generate_with_tools_yields_text(self):
-        """Should yield text from content_block_delta events."""
+        """Should yield text from contentBlockDelta events."""
         with patch("ai.bedrock.boto3") as mock_boto3:
             mock_client = MagicMock()
             mock_boto3.client.return_value = mock_client
@@ -320,20 +367,12 @@ class TestBedrockProviderGenerateWithTools:
                 region_name="us-east-1", model="anthropic.claude-3-sonnet"
             )
 
-            chunk1 = {
-                "chunk": {
-                    "bytes": json.dumps(
-                        {
-                            "type": "content_block_delta",
-                            "delta": {"type": "text_delta", "text": "Hello"},
-                        }
-                    ).encode()
-                }
-            }
-            chunk2 = {"chunk": {"bytes": json.dumps({"type": "message_stop"}).encode()}}
-
-            mock_client.invoke_model_with_response_stream.return_value = {
-                "body": [chunk1, chunk2]
+            mock_client.converse_stream.return_value = {
+                "stream": [
+                    {"messageStart": {"role": "assistant"}},
+                    {"contentBlockDelta": {"delta": {"text": "Hello"}}},
+                    {"messageStop": {"stopReason": "end_turn"}},
+                ]
             }
 
             chunks = []
@@ -347,7 +386,7 @@ class TestBedrockProviderGenerateWithTools:
 
     @pytest.mark.asyncio
     async def test_generate_with_tools_handles_tool_use(self):
-        """Should collect tool calls from tool_use events."""
+        """Should assemble tool calls from toolUse start and input deltas."""
         with patch("ai.bedrock.boto3") as mock_boto3:
             mock_client = MagicMock()
             mock_boto3.client.return_value = mock_client
@@ -356,61 +395,60 @@ class TestBedrockProviderGenerateWithTools:
                 region_name="us-east-1", model="anthropic.claude-3-sonnet"
             )
 
-            events = [
-                {
-                    "chunk": {
-                        "bytes": json.dumps(
-                            {
-                                "type": "content_block_start",
-                                "content_block": {
-                                    "type": "tool_use",
-                                    "id": "call_1",
-                                    "name": "search",
-                                },
-                            }
-                        ).encode()
-                    }
-                },
-                {
-                    "chunk": {
-                        "bytes": json.dumps(
-                            {
-                                "type": "content_block_delta",
-                                "delta": {
-                                    "type": "input_json_delta",
-                                    "partial_json": '{"query": "test"}',
-                                },
-                            }
-                        ).encode()
-                    }
-                },
-                {
-                    "chunk": {
-                        "bytes": json.dumps({"type": "content_block_stop"}).encode()
-                    }
-                },
-                {"chunk": {"bytes": json.dumps({"type": "message_stop"}).encode()}},
-            ]
-
-            mock_client.invoke_model_with_response_stream.return_value = {
-                "body": events
+            mock_client.converse_stream.return_value = {
+                "stream": [
+                    {
+                        "contentBlockStart": {
+                            "start": {
+                                "toolUse": {"toolUseId": "call_1", "name": "search"}
+                            },
+                            "contentBlockIndex": 0,
+                        }
+                    },
+                    {"contentBlockDelta": {"delta": {"toolUse": {"input": '{"query'}}}},
+                    {
+                        "contentBlockDelta": {
+                            "delta": {"toolUse": {"input": '": "test"}'}}
+                        }
+                    },
+                    {"contentBlockStop": {"contentBlockIndex": 0}},
+                    {"messageStop": {"stopReason": "tool_use"}},
+                ]
             }
 
+            tools = [
+                {
+                    "type": "function",
+                    "function": {
+                        "name": "search",
+                        "description": "Search",
+                        "parameters": {"type": "object"},
+                    },
+                }
+            ]
             chunks = []
             async for chunk in provider.generate_with_tools(
-                prompt="Search for test", messages=[], tools=[]
+                prompt="Search for test", messages=[], tools=tools
             ):
                 chunks.append(chunk)
 
             final = chunks[-1]
             assert final.is_complete
             assert len(final.tool_calls) == 1
+            assert final.tool_calls[0].id == "call_1"
             assert final.tool_calls[0].name == "search"
             assert final.tool_calls[0].arguments == {"query": "test"}
 
+            request = mock_client.converse_stream.call_args.kwargs
+            assert request["toolConfig"]["tools"][0]["toolSpec"] == {
+                "name": "search",
+                "description": "Search",
+                "inputSchema": {"json": {"type": "object"}},
+            }
+
     @pytest.mark.asyncio
     async def test_generate_with_tools_handles_usage(self):
-        """Should capture token usage from events."""
+        """Should capture token usage from the metadata event."""
         with patch("ai.bedrock.boto3") as mock_boto3:
             mock_client = MagicMock()
             mock_boto3.client.return_value = mock_client
@@ -419,33 +457,19 @@ class TestBedrockProviderGenerateWithTools:
                 region_name="us-east-1", model="anthropic.claude-3-sonnet"
             )
 
-            events = [
-                {
-                    "chunk": {
-                        "bytes": json.dumps(
-                            {
-                                "type": "message_start",
-                                "message": {"usage": {"input_tokens": 100}},
+            mock_client.converse_stream.return_value = {
+                "stream": [
+                    {"messageStop": {"stopReason": "end_turn"}},
+                    {
+                        "metadata": {
+                            "usage": {
+                                "inputTokens": 100,
+                                "outputTokens": 50,
+                                "totalTokens": 150,
                             }
-                        ).encode()
-                    }
-                },
-                {
-                    "chunk": {
-                        "bytes": json.dumps(
-                            {
-                                "type": "message_delta",
-                                "delta": {},
-                                "usage": {"output_tokens": 50},
-                            }
-                        ).encode()
-                    }
-                },
-                {"chunk": {"bytes": json.dumps({"type": "message_stop"}).encode()}},
-            ]
-
-            mock_client.invoke_model_with_response_stream.return_value = {
-                "body": events
+                        }
+                    },
+                ]
             }
 
             chunks = []
@@ -469,9 +493,7 @@ class TestBedrockProviderGenerateWithTools:
             provider = BedrockProvider(
                 region_name="us-east-1", model="anthropic.claude-3-sonnet"
             )
-            mock_client.invoke_model_with_response_stream.side_effect = Exception(
-                "AWS error"
-            )
+            mock_client.converse_stream.side_effect = Exception("AWS error")
 
             chunks = []
             async for chunk in provider.generate_with_tools(
@@ -483,6 +505,29 @@ class TestBedrockProviderGenerateWithTools:
             assert "Error: AWS error" in chunks[0].text
             assert chunks[0].is_complete
 
+    @pytest.mark.asyncio
+    async def test_generate_with_tools_surfaces_stream_errors(self):
+        """Exceptions delivered as stream events should end the response."""
+        with patch("ai.bedrock.boto3") as mock_boto3:
+            mock_client = MagicMock()
+            mock_boto3.client.return_value = mock_client
+
+            provider = BedrockProvider(
+                region_name="us-east-1", model="anthropic.claude-3-sonnet"
+            )
+            mock_client.converse_stream.return_value = {
+                "stream": [{"throttlingException": {"message": "Slow down"}}]
+            }
+
+            chunks = []
+            async for chunk in provider.generate_with_tools(
+                prompt="Hi", messages=[], tools=[]
+            ):
+                chunks.append(chunk)
+
+            assert chunks[-1].text == "Error: Slow down"
+            assert chunks[-1].is_complete
+
     @pytest.mark.asyncio
     async def test_generate_with_tools_non_claude_falls_back(self):
         """Non-Claude models should fall back to regular generate."""
@@ -1,5 +1,9 @@
 """Tests for ai/factory.py - AIFactory provider creation and metadata."""
 
+import subprocess
+import sys
+from pathlib import Path
+
 import pytest
 
 from ai.factory import AIFactory
@@ -398,3 +402,43 @@ class TestProviderDescriptions:
         """Groq description should mention fast inference."""
         info = AIFactory.get_provider_info("groq")
         assert "fast" in info["description"].lower() or "Fast" in info["description"]
+
+
+class TestAIFactoryLazyLoading:
+    """Provider modules are imported only when a provider is created."""
+
+    def _run(self, code: str) -> str:
+        root = Path(__file__).resolve().parents[3]
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True,
+            text=True,
+            cwd=root,
+            check=True,
+        )
+        return result.stdout.strip()
+
+    def test_import_does_not_load_provider_sdks(self):
+        """Importing the factory should not import any provider module."""
+        loaded = self._run(
+            "import sys, ai.factory; "
+            "print(sorted(m for m in ('ai.bedrock', 'ai.azure', 'ai.openai_compat', "
+            "'openai', 'boto3') if m in sys.modules))"
+        )
+        assert loaded == "[]"
+
+    def test_get_provider_loads_only_its_module(self):
+        """Creating a provider should import just that provider's module."""
+        loaded = self._run(
+            "import sys; from ai.factory import AIFactory; "
+            "AIFactory.get_provider({'provider': 'ollama'}); "
+            "print('ai.ollama' in sys.modules, 'ai.bedrock' in sys.modules)"
+        )
+        assert loaded == "True False"
+
+    def test_provider_classes_still_importable(self):
+        """Provider classes remain importable from the factory module."""
+        from ai.factory import OllamaProvider
+        from ai.ollama import OllamaProvider as Direct
+
+        assert OllamaProvider is Direct
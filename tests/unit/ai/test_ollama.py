@@ -585,6 +585,67 @@ class TestOllamaProviderEmbedText:
         assert result is None
 
 
+class TestOllamaProviderEmbedBatch:
+    """Tests for embed_batch method."""
+
+    @pytest.mark.asyncio
+    async def test_embed_batch_single_request(self):
+        """Should embed all texts with one /api/embed call."""
+        provider = OllamaProvider(
+            endpoint="http://localhost:11434", model="nomic-embed-text"
+        )
+        client = MagicMock()
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"embeddings": [[0.1], [0.2]]}
+        client.post = AsyncMock(return_value=mock_response)
+        provider._client = client
+
+        result = await provider.embed_batch(["a", "b"])
+
+        assert result == [[0.1], [0.2]]
+        client.post.assert_awaited_once()
+        assert client.post.call_args[0][0] == "/api/embed"
+        assert client.post.call_args[1]["json"]["input"] == ["a", "b"]
+
+    @pytest.mark.asyncio
+    async def test_embed_batch_falls_back_on_404(self):
+        """Should fall back to per-text embeddings on older servers."""
+        provider = OllamaProvider(
+            endpoint="http://localhost:11434", model="nomic-embed-text"
+        )
+        not_found = MagicMock(status_code=404)
+        ok = MagicMock(status_code=200)
+        ok.json.return_value = {"embedding": [0.5]}
+        client = MagicMock()
+        client.post = AsyncMock(side_effect=[not_found, ok, ok])
+        provider._client = client
+
+        result = await provider.embed_batch(["a", "b"])
+
+        assert result == [[0.5], [0.5]]
+        assert client.post.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_embed_batch_error_returns_nones(self):
+        """Should return one None per text on failure."""
+        provider = OllamaProvider(
+            endpoint="http://localhost:11434", model="nomic-embed-text"
+        )
+        client = MagicMock()
+        client.post = AsyncMock(side_effect=Exception("Network error"))
+        provider._client = client
+
+        assert await provider.embed_batch(["a", "b"]) == [None, None]
+
+    @pytest.mark.asyncio
+    async def test_embed_batch_empty(self):
+        provider = OllamaProvider(
+            endpoint="http://localhost:11434", model="nomic-embed-text"
+        )
+        assert await provider.embed_batch([]) == []
+
+
 class TestOllamaProviderListModels:
     """Tests for list_models method."""
 
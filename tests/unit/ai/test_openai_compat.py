@@ -1196,3 +1196,33 @@ class TestOpenAICompatibleProviderToolErrorHandling:
         assert final.is_complete
         assert len(final.tool_calls) == 1
         assert final.tool_calls[0].name == "search"
+
+
+class TestOpenAICompatibleProviderEmbedBatch:
+    @pytest.mark.asyncio
+    async def test_embed_batch_single_request(self):
+        with patch("ai.openai_compat.openai.AsyncOpenAI"):
+            provider = OpenAICompatibleProvider(api_key="sk-test")
+
+        mock_response = MagicMock()
+        # Results may arrive out of order; index says where they belong
+        mock_response.data = [
+            MagicMock(embedding=[0.2], index=1),
+            MagicMock(embedding=[0.1], index=0),
+        ]
+        provider.client.embeddings.create = AsyncMock(return_value=mock_response)
+
+        result = await provider.embed_batch(["a", "b"])
+
+        assert result == [[0.1], [0.2]]
+        call_kwargs = provider.client.embeddings.create.call_args[1]
+        assert call_kwargs["input"] == ["a", "b"]
+
+    @pytest.mark.asyncio
+    async def test_embed_batch_error_returns_nones(self):
+        with patch("ai.openai_compat.openai.AsyncOpenAI"):
+            provider = OpenAICompatibleProvider(api_key="sk-test")
+
+        provider.client.embeddings.create = AsyncMock(side_effect=Exception("boom"))
+
+        assert await provider.embed_batch(["a", "b"]) == [None, None]
@@ -1,10 +1,24 @@
 """Test RAG system."""
 
+import asyncio
+import contextlib
+import os
+import subprocess
+import sys
+import threading
+from pathlib import Path
 from unittest.mock import AsyncMock
 
 import pytest
 
-from ai.rag import Chunker, DocumentChunk, RAGManager, VectorStore
+from ai.rag import (
+    Chunker,
+    DocumentChunk,
+    RAGManager,
+    VectorStore,
+    get_rag_manager,
+    reset_rag_manager,
+)
 
 
 def test_chunker():
@@ -60,3 +74,482 @@ async def test_rag_manager(tmp_path):
         results = await rag.search("query", provider)
         assert len(results) == 1
         assert "content" in results[0].content
+
+
+def test_vector_store_appends_without_rewrite(tmp_path):
+    store = VectorStore(tmp_path / "index.json")
+    store.add([DocumentChunk(id="1", content="a", source="a.txt", vector=[1.0, 0.0])])
+    size = store.vectors_path.stat().st_size
+
+    store.add([DocumentChunk(id="2", content="b", source="b.txt", vector=[0.0, 1.0])])
+
+    assert store.vectors_path.stat().st_size == size * 2
+    assert len(store.meta_path.read_text().splitlines()) == 2
+    assert store.stats()["total_vectors"] == 2
+
+
+def test_vector_store_chunk_without_vector(tmp_path):
+    store = VectorStore(tmp_path / "index.json")
+    store.add(
+        [
+            DocumentChunk(id="1", content="a", source="a.txt"),
+            DocumentChunk(id="2", content="b", source="b.txt", vector=[0.0, 1.0]),
+        ]
+    )
+
+    store2 = VectorStore(tmp_path / "index.json")
+    assert len(store2.chunks) == 2
+    results = store2.search([0.0, 1.0])
+    assert [r[0].id for r in results] == ["2"]
+
+
+def test_vector_store_migrates_legacy_json(tmp_path):
+    import json
+
+    path = tmp_path / "index.json"
+    path.write_text(
+        json.dumps(
+            [
+                {
+                    "id": "old",
+                    "content": "legacy",
+                    "source": "x.txt",
+                    "vector": [1.0, 0.0],
+                }
+            ]
+        )
+    )
+
+    store = VectorStore(path)
+
+    assert store.chunks[0].id == "old"
+    assert store.vectors_path.exists()
+    assert isinstance(json.loads(path.read_text()), dict)
+    assert store.search([1.0, 0.0])[0][0].id == "old"
+
+
+def test_vector_store_clear_removes_files(tmp_path):
+    store = VectorStore(tmp_path / "index.json")
+    store.add([DocumentChunk(id="1", content="a", source="a.txt", vector=[1.0, 0.0])])
+
+    store.clear()
+
+    assert not store.path.exists()
+    assert not store.vectors_path.exists()
+    assert not store.meta_path.exists()
+    assert store.search([1.0, 0.0]) == []
+
+
+@pytest.mark.asyncio
+async def test_index_directory_uses_embed_batch(tmp_path):
+    with pytest.MonkeyPatch.context() as m:
+        m.setattr("pathlib.Path.home", lambda: tmp_path)
+        rag = RAGManager(embed_batch_size=4, embed_concurrency=2)
+
+        d = tmp_path / "src"
+        d.mkdir()
+        for i in range(5):
+            (d / f"f{i}.txt").write_text(f"file {i} " + "word " * 400)
+
+        batches = []
+
+        async def embed_batch(texts):
+            batches.append(len(texts))
+            return [[1.0, float(len(t))] for t in texts]
+
+        provider = AsyncMock()
+        provider.embed_batch = embed_batch
+
+        count = await rag.index_directory(d, provider)
+
+        assert count == 5
+        assert max(batches) <= 4
+        assert sum(batches) == rag.get_stats()["total_vectors"]
+        provider.embed_text.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_index_directory_reports_progress_and_errors(tmp_path):
+    with pytest.MonkeyPatch.context() as m:
+        m.setattr("pathlib.Path.home", lambda: tmp_path)
+        rag = RAGManager()
+
+        d = tmp_path / "src"
+        d.mkdir()
+        (d / "a.txt").write_text("alpha")
+        (d / "b.txt").write_text("beta")
+
+        async def embed_batch(texts):
+            return [None if t == "beta" else [1.0, 0.0] for t in texts]
+
+        provider = AsyncMock()
+        provider.embed_batch = embed_batch
+        messages = []
+
+        count = await rag.index_directory(d, provider, status_callback=messages.append)
+
+        assert count == 2
+        assert rag.get_stats()["total_vectors"] == 1
+        assert any("2/2 files" in msg for msg in messages)
+        assert "embedding failures" in messages[-1]
+
+
+@pytest.mark.asyncio
+async def test_index_directory_batch_failure_counts_errors(tmp_path):
+    with pytest.MonkeyPatch.context() as m:
+        m.setattr("pathlib.Path.home", lambda: tmp_path)
+        rag = RAGManager()
+
+        d = tmp_path / "src"
+        d.mkdir()
+        (d / "a.txt").write_text("alpha")
+
+        provider = AsyncMock()
+        provider.embed_batch.side_effect = RuntimeError("boom")
+
+        count = await rag.index_directory(d, provider)
+
+        assert count == 1
+        assert rag.get_stats()["total_vectors"] == 0
+
+
+def test_vector_store_remove_sources(tmp_path):
+    store = VectorStore(tmp_path / "index.json")
+    store.add(
+        [
+            DocumentChunk(id="a0", content="a", source="a.txt", vector=[1.0, 0.0]),
+            DocumentChunk(id="b0", content="b", source="b.txt", vector=[0.0, 1.0]),
+            DocumentChunk(id="a1", content="a", source="a.txt"),
+        ]
+    )
+    store.mark_indexed_many([("a.txt", 1.0, "ha"), ("b.txt", 2.0, "hb")])
+
+    assert store.remove_sources(["a.txt"]) == 2
+
+    store2 = VectorStore(tmp_path / "index.json")
+    assert [c.id for c in store2.chunks] == ["b0"]
+    assert store2.search([0.0, 1.0])[0][0].id == "b0"
+    assert store2.stats()["total_vectors"] == 1
+    assert store2.get_indexed_files() == {"b.txt": (2.0, "hb")}
+
+
+def test_vector_store_search_during_concurrent_writes(tmp_path):
+    store = VectorStore(tmp_path / "index.json")
+    store.add(
+        [DocumentChunk(id="seed", content="s", source="s.txt", vector=[1.0, 0.0])]
+    )
+    stop = threading.Event()
+    errors = []
+
+    def writer():
+        i = 0
+        while not stop.is_set():
+            store.add(
+                [
+                    DocumentChunk(
+                        id=f"w{i}", content="w", source="w.txt", vector=[0.5, 0.5]
+                    )
+                ]
+            )
+            if i % 5 == 4:
+                store.remove_sources(["w.txt"])
+            i += 1
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        for _ in range(500):
+            try:
+                assert store.search([1.0, 0.0], 3)[0][0].id == "seed"
+                list(store.iter_chunks())
+                store.stats()
+            except Exception as e:
+                errors.append(e)
+    finally:
+        stop.set()
+        thread.join()
+
+    assert errors == []
+
+
+def _counting_provider(calls: list[str]):
+    async def embed_batch(texts):
+        calls.extend(texts)
+        return [[1.0, float(len(t))] for t in texts]
+
+    provider = AsyncMock()
+    provider.embed_batch = embed_batch
+    return provider
+
+
+@pytest.mark.asyncio
+async def test_index_directory_skips_unchanged_files(tmp_path):
+    with pytest.MonkeyPatch.context() as m:
+        m.setattr("pathlib.Path.home", lambda: tmp_path)
+        rag = RAGManager()
+
+        d = tmp_path / "src"
+        d.mkdir()
+        (d / "a.txt").write_text("alpha")
+        (d / "b.txt").write_text("beta")
+        calls: list[str] = []
+        provider = _counting_provider(calls)
+
+        assert await rag.index_directory(d, provider) == 2
+        calls.clear()
+        messages = []
+
+        count = await rag.index_directory(d, provider, status_callback=messages.append)
+
+        assert count == 0
+        assert calls == []
+        assert "2 unchanged" in messages[-1]
+        assert rag.get_stats()["total_chunks"] == 2
+
+
+@pytest.mark.asyncio
+async def test_index_directory_reindexes_changed_and_removes_deleted(tmp_path):
+    with pytest.MonkeyPatch.context() as m:
+        m.setattr("pathlib.Path.home", lambda: tmp_path)
+        rag = RAGManager()
+
+        d = tmp_path / "src"
+        d.mkdir()
+        (d / "a.txt").write_text("alpha")
+        (d / "b.txt").write_text("beta")
+        (d / "c.txt").write_text("gamma")
+        calls: list[str] = []
+        provider = _counting_provider(calls)
+        await rag.index_directory(d, provider)
+        calls.clear()
+
+        a_mtime = (d / "a.txt").stat().st_mtime
+        (d / "a.txt").write_text("alpha changed")
+        os.utime(d / "a.txt", (a_mtime + 1, a_mtime + 1))
+        # Touched without edits: only the recorded mtime is refreshed
+        b_mtime = (d / "b.txt").stat().st_mtime
+        os.utime(d / "b.txt", (b_mtime + 1, b_mtime + 1))
+        (d / "c.txt").unlink()
+
+        count = await rag.index_directory(d, provider)
+
+        assert count == 1
+        assert calls == ["alpha changed"]
+        assert sorted(c.content for c in rag.store.chunks) == ["alpha changed", "beta"]
+        indexed = rag.store.get_indexed_files()
+        assert str((d / "c.txt").resolve()) not in indexed
+        assert indexed[str((d / "b.txt").resolve())][0] == b_mtime + 1
+
+
+@pytest.mark.asyncio
+async def test_index_directory_retries_failed_files(tmp_path):
+    with pytest.MonkeyPatch.context() as m:
+        m.setattr("pathlib.Path.home", lambda: tmp_path)
+        rag = RAGManager()
+
+        d = tmp_path / "src"
+        d.mkdir()
+        (d / "a.txt").write_text("alpha")
+
+        provider = AsyncMock()
+        provider.embed_batch.side_effect = RuntimeError("boom")
+        await rag.index_directory(d, provider)
+        assert rag.store.get_indexed_files() == {}
+
+        calls: list[str] = []
+        count = await rag.index_directory(d, _counting_provider(calls))
+
+        assert count == 1
+        assert calls == ["alpha"]
+
+
+@pytest.mark.asyncio
+async def test_index_directory_full_rebuild(tmp_path):
+    with pytest.MonkeyPatch.context() as m:
+        m.setattr("pathlib.Path.home", lambda: tmp_path)
+        rag = RAGManager()
+
+        d = tmp_path / "src"
+        d.mkdir()
+        (d / "a.txt").write_text("alpha")
+        calls: list[str] = []
+        provider = _counting_provider(calls)
+        await rag.index_directory(d, provider)
+
+        count = await rag.index_directory(d, provider, incremental=False)
+
+        assert count == 1
+        assert calls == ["alpha", "alpha"]
+        assert rag.get_stats()["total_chunks"] == 1
+
+
+@pytest.mark.asyncio
+async def test_watch_directory_reindexes_on_change(tmp_path):
+    with pytest.MonkeyPatch.context() as m:
+        m.setattr("pathlib.Path.home", lambda: tmp_path)
+        rag = RAGManager()
+
+        d = tmp_path / "src"
+        d.mkdir()
+        (d / "a.txt").write_text("alpha")
+        calls: list[str] = []
+
+        task = asyncio.create_task(
+            rag.watch_directory(d, _counting_provider(calls), interval=0.01)
+        )
+        try:
+            for _ in range(200):
+                if calls:
+                    break
+                await asyncio.sleep(0.01)
+            (d / "b.txt").write_text("beta")
+            for _ in range(200):
+                if "beta" in calls:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+        assert calls == ["alpha", "beta"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_builds_do_not_duplicate_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr("pathlib.Path.home", lambda: tmp_path)
+    rag = RAGManager()
+    d = tmp_path / "src"
+    d.mkdir()
+    (d / "a.txt").write_text("alpha")
+    (d / "b.txt").write_text("beta")
+    calls: list[str] = []
+
+    first = asyncio.create_task(rag.index_directory(d, _counting_provider(calls)))
+    await asyncio.sleep(0)
+    assert rag.is_indexing
+    second = await rag.index_directory(d, _counting_provider(calls))
+
+    assert await first == 2
+    assert second == 0
+    assert sorted(calls) == ["alpha", "beta"]
+    assert len(rag.store.chunks) == 2
+    assert not rag.is_indexing
+
+
+@pytest.mark.asyncio
+async def test_index_directory_optimizes_store(tmp_path, monkeypatch):
+    monkeypatch.setattr("pathlib.Path.home", lambda: tmp_path)
+    rag = RAGManager()
+    calls = []
+    monkeypatch.setattr(rag.store, "optimize", lambda: calls.append(1) or 0)
+    d = tmp_path / "src"
+    d.mkdir()
+    (d / "a.txt").write_text("alpha")
+
+    await rag.index_directory(d, _counting_provider([]))
+    assert calls == [1]
+
+    # Nothing new embedded, nothing to optimize
+    await rag.index_directory(d, _counting_provider([]))
+    assert calls == [1]
+
+
+def test_get_rag_manager_is_shared(tmp_path, monkeypatch):
+    monkeypatch.setattr("pathlib.Path.home", lambda: tmp_path)
+
+    assert get_rag_manager() is get_rag_manager()
+
+    first = get_rag_manager()
+    reset_rag_manager()
+    assert get_rag_manager() is not first
+
+
+@pytest.mark.asyncio
+async def test_search_skips_embedding_for_empty_index(tmp_path, monkeypatch):
+    monkeypatch.setattr("pathlib.Path.home", lambda: tmp_path)
+    rag = RAGManager()
+    provider = AsyncMock()
+
+    assert await rag.search("query", provider) == []
+    provider.embed_text.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_search_caches_query_embeddings(tmp_path, monkeypatch):
+    monkeypatch.setattr("pathlib.Path.home", lambda: tmp_path)
+    rag = RAGManager()
+    rag.QUERY_CACHE_SIZE = 2
+    rag.store.add(
+        [DocumentChunk(id="1", content="a", source="a.txt", vector=[1.0, 0.0])]
+    )
+    provider = AsyncMock()
+    provider.embed_text.return_value = [1.0, 0.0]
+
+    await rag.search("one", provider)
+    await rag.search("one", provider)
+    assert provider.embed_text.await_count == 1
+
+    await rag.search("two", provider)
+    await rag.search("three", provider)
+    await rag.search("one", provider)
+    # "one" was evicted by the two newer queries
+    assert provider.embed_text.await_count == 4
+
+
+@pytest.mark.asyncio
+async def test_search_runs_store_search_off_the_event_loop(tmp_path, monkeypatch):
+    monkeypatch.setattr("pathlib.Path.home", lambda: tmp_path)
+    rag = RAGManager()
+    rag.store.add(
+        [DocumentChunk(id="1", content="a", source="a.txt", vector=[1.0, 0.0])]
+    )
+    provider = AsyncMock()
+    provider.embed_text.return_value = [1.0, 0.0]
+    search = rag.store.search
+    threads = []
+
+    def tracking_search(vector, limit):
+        threads.append(threading.get_ident())
+        return search(vector, limit)
+
+    monkeypatch.setattr(rag.store, "search", tracking_search)
+
+    results = await rag.search("query", provider)
+
+    assert [chunk.id for chunk in results] == ["1"]
+    assert threads and threads[0] != threading.get_ident()
+
+
+def test_vector_store_reload_if_changed(tmp_path):
+    path = tmp_path / "index.json"
+    store = VectorStore(path)
+    store.add([DocumentChunk(id="1", content="a", source="a.txt", vector=[1.0, 0.0])])
+
+    # Own writes do not trigger a reload
+    assert store.reload_if_changed() is False
+
+    other = VectorStore(path)
+    other.add([DocumentChunk(id="2", content="b", source="b.txt", vector=[0.0, 1.0])])
+
+    assert store.reload_if_changed() is True
+    assert [c.id for c in store.chunks] == ["1", "2"]
+    assert store.search([0.0, 1.0])[0][0].id == "2"
+    assert store.reload_if_changed() is False
+
+
+def test_import_does_not_load_numpy():
+    """Importing ai.rag should leave NumPy to the first index load."""
+    root = Path(__file__).resolve().parents[3]
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, ai.rag, commands.rag; print('numpy' in sys.modules)",
+        ],
+        capture_output=True,
+        text=True,
+        cwd=root,
+        check=True,
+    )
+    assert result.stdout.strip() == "False"
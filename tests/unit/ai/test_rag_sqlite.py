@@ -2,14 +2,19 @@
 
 import asyncio
 import json
+import os
+import sqlite3
 
-from ai.rag import DocumentChunk
+import pytest
+
+from ai.rag import DocumentChunk, VectorStore
 from ai.rag_sqlite import (
     Document,
     SemanticCache,
     SQLiteVectorStore,
     migrate_json_to_sqlite,
 )
+from ai.vector_index import unpack_vector
 
 
 class TestDocument:
@@ -170,8 +175,9 @@ class TestSQLiteVectorStoreAddEmbedding:
             row = cursor.fetchone()
 
         assert row is not None
-        stored_vector = json.loads(row[0].decode("utf-8"))
-        assert stored_vector == vector
+        stored_vector = unpack_vector(row[0])
+        assert stored_vector == pytest.approx(vector)
+        assert len(row[0]) == 3 * 4
         assert row[1] == "test-model"
 
     def test_add_embedding_replaces_existing(self, tmp_path):
@@ -456,9 +462,58 @@ class TestSQLiteVectorStoreFileIndex:
         store.mark_indexed(str(test_file), mtime, file_hash)
 
         test_file.write_text("modified content")
+        os.utime(test_file, (mtime + 1, mtime + 1))
 
         assert store.needs_reindex(str(test_file)) is True
 
+    def test_needs_reindex_touched_file(self, tmp_path):
+        """Should return False when only the mtime changed."""
+        store = SQLiteVectorStore(tmp_path / "test.db")
+
+        test_file = tmp_path / "test.txt"
+        test_file.write_text("content")
+
+        mtime = test_file.stat().st_mtime
+        store.mark_indexed(str(test_file), mtime, store._hash_file(test_file))
+        os.utime(test_file, (mtime + 1, mtime + 1))
+
+        assert store.needs_reindex(str(test_file)) is False
+
+    def test_get_indexed_files(self, tmp_path):
+        """Should return every recorded path with its mtime and hash."""
+        store = SQLiteVectorStore(tmp_path / "test.db")
+        store.mark_indexed_many([("/a.txt", 1.0, "ha"), ("/b.txt", 2.0, "hb")])
+
+        assert store.get_indexed_files() == {
+            "/a.txt": (1.0, "ha"),
+            "/b.txt": (2.0, "hb"),
+        }
+
+    def test_remove_sources(self, tmp_path):
+        """Should delete documents, embeddings, FTS rows and file entries."""
+        store = SQLiteVectorStore(tmp_path / "test.db")
+        store.add(
+            [
+                DocumentChunk(
+                    id="a:0", content="alpha one", source="/a.txt", vector=[1.0, 0.0]
+                ),
+                DocumentChunk(
+                    id="a:1", content="alpha two", source="/a.txt", vector=[0.9, 0.1]
+                ),
+                DocumentChunk(
+                    id="b:0", content="beta", source="/b.txt", vector=[0.0, 1.0]
+                ),
+            ]
+        )
+        store.mark_indexed_many([("/a.txt", 1.0, "ha"), ("/b.txt", 2.0, "hb")])
+
+        assert store.remove_sources(["/a.txt"]) == 2
+
+        assert store.search_fts("alpha") == []
+        assert [d.id for d, _ in store.search_vector([1.0, 0.0])] == ["b:0"]
+        assert store.stats()["total_vectors"] == 1
+        assert list(store.get_indexed_files()) == ["/b.txt"]
+
     def test_needs_reindex_nonexistent_file(self, tmp_path):
         """Should return False for nonexistent files."""
         store = SQLiteVectorStore(tmp_path / "test.db")
@@ -470,6 +525,20 @@ class TestSQLiteVectorStoreFileIndex:
         assert result == ""
 
 
+class TestSQLiteVectorStoreHasVectors:
+    """Tests for the has_vectors / reload_if_changed compatibility methods."""
+
+    def test_has_vectors(self, tmp_path):
+        """Should report whether any embedding is stored."""
+        store = SQLiteVectorStore(tmp_path / "test.db")
+        assert store.has_vectors() is False
+
+        store.add([DocumentChunk(id="1", content="a", source="a", vector=[1.0])])
+
+        assert store.has_vectors() is True
+        assert store.reload_if_changed() is False
+
+
 class TestSQLiteVectorStoreClear:
     """Tests for clearing the store."""
 
@@ -554,6 +623,295 @@ class TestSQLiteVectorStorePersistence:
         assert results[0][0].content == "persistent content"
 
 
+class TestSQLiteVectorStoreConnection:
+    """Tests for the persistent connection and batched writes."""
+
+    def test_uses_wal_mode(self, tmp_path):
+        store = SQLiteVectorStore(tmp_path / "test.db")
+        mode = store._conn.execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode == "wal"
+        store.close()
+
+    def test_bulk_add_single_transaction(self, tmp_path):
+        store = SQLiteVectorStore(tmp_path / "test.db")
+        statements = []
+        store._conn.set_trace_callback(statements.append)
+
+        store.add(
+            [
+                DocumentChunk(
+                    id=f"c{i}",
+                    content=f"text {i}",
+                    source="f.txt",
+                    vector=[1.0, float(i)],
+                )
+                for i in range(20)
+            ]
+        )
+
+        commits = [s for s in statements if s.strip().upper() == "COMMIT"]
+        assert len(commits) == 1
+        assert store.stats()["total_vectors"] == 20
+
+    def test_failed_batch_rolls_back(self, tmp_path):
+        store = SQLiteVectorStore(tmp_path / "test.db")
+
+        with pytest.raises(ValueError):
+            store.add(
+                [
+                    DocumentChunk(id="ok", content="ok", source="f.txt", vector=[1.0]),
+                    DocumentChunk(
+                        id="bad", content="bad", source="f.txt", vector=["x"]
+                    ),
+                ]
+            )
+
+        assert store.stats()["total_chunks"] == 0
+
+    def test_fts_updated_when_document_replaced(self, tmp_path):
+        store = SQLiteVectorStore(tmp_path / "test.db")
+        store.add_document(
+            Document(id="doc", source="f.txt", content="alpha words", chunk_index=0)
+        )
+        store.add_document(
+            Document(id="doc", source="f.txt", content="beta words", chunk_index=0)
+        )
+
+        assert store.search_fts("alpha") == []
+        assert [d.id for d in store.search_fts("beta")] == ["doc"]
+
+    def test_fts_matches_text_ids(self, tmp_path):
+        store = SQLiteVectorStore(tmp_path / "test.db")
+        store.add_documents(
+            [
+                Document(
+                    id="a.py:0", source="a.py", content="python code", chunk_index=0
+                ),
+                Document(
+                    id="b.js:0", source="b.js", content="javascript", chunk_index=0
+                ),
+            ]
+        )
+
+        assert [d.id for d in store.search_fts("python")] == ["a.py:0"]
+
+    def test_clear_resets_fts(self, tmp_path):
+        store = SQLiteVectorStore(tmp_path / "test.db")
+        store.add_document(
+            Document(id="doc", source="f", content="gamma", chunk_index=0)
+        )
+
+        store.clear()
+        store.add_document(
+            Document(id="new", source="f", content="delta", chunk_index=0)
+        )
+
+        assert store.search_fts("gamma") == []
+
+    @pytest.mark.asyncio
+    async def test_concurrent_thread_writes(self, tmp_path):
+        store = SQLiteVectorStore(tmp_path / "test.db")
+
+        await asyncio.gather(
+            *(
+                asyncio.to_thread(
+                    store.add,
+                    [
+                        DocumentChunk(
+                            id=f"t{i}", content="x", source="f", vector=[1.0, 0.0]
+                        )
+                    ],
+                )
+                for i in range(10)
+            )
+        )
+
+        assert store.stats()["total_chunks"] == 10
+
+
+class TestSQLiteVectorStoreSchemaMigration:
+    """Tests for migrating JSON-encoded embeddings to float32 BLOBs."""
+
+    def _create_v1_db(self, db_path):
+        with sqlite3.connect(db_path) as conn:
+            conn.executescript("""
+                CREATE TABLE documents (
+                    id TEXT PRIMARY KEY,
+                    source TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    chunk_index INTEGER,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+                CREATE TABLE embeddings (
+                    doc_id TEXT PRIMARY KEY REFERENCES documents(id),
+                    vector BLOB NOT NULL,
+                    model TEXT NOT NULL
+                );
+            """)
+            conn.execute(
+                "INSERT INTO documents (id, source, content, chunk_index) VALUES (?, ?, ?, ?)",
+                ("doc1", "file.txt", "legacy", 0),
+            )
+            conn.execute(
+                "INSERT INTO embeddings (doc_id, vector, model) VALUES (?, ?, ?)",
+                ("doc1", json.dumps([1.0, 0.0]).encode("utf-8"), "model"),
+            )
+
+    def test_migrates_json_vectors(self, tmp_path):
+        db_path = tmp_path / "test.db"
+        self._create_v1_db(db_path)
+
+        store = SQLiteVectorStore(db_path)
+
+        with sqlite3.connect(db_path) as conn:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            blob = conn.execute("SELECT vector FROM embeddings").fetchone()[0]
+        assert version == SQLiteVectorStore.SCHEMA_VERSION
+        assert unpack_vector(blob) == [1.0, 0.0]
+
+        results = store.search_vector([1.0, 0.0], limit=1)
+        assert results[0][0].id == "doc1"
+
+
+class TestSQLiteVectorStoreMatrixCache:
+    """Tests for the in-process embedding matrix cache."""
+
+    def _add(self, store, doc_id, vector):
+        store.add_document(
+            Document(id=doc_id, source=f"{doc_id}.txt", content=doc_id, chunk_index=0)
+        )
+        store.add_embedding(doc_id, vector, "model")
+
+    def test_matrix_reused_between_queries(self, tmp_path):
+        store = SQLiteVectorStore(tmp_path / "test.db")
+        self._add(store, "doc1", [1.0, 0.0])
+
+        store.search_vector([1.0, 0.0])
+        matrix = store._matrix
+        store.search_vector([0.0, 1.0])
+
+        assert store._matrix is matrix
+
+    def test_matrix_reloaded_after_write(self, tmp_path):
+        store = SQLiteVectorStore(tmp_path / "test.db")
+        self._add(store, "doc1", [1.0, 0.0])
+        store.search_vector([1.0, 0.0])
+
+        self._add(store, "doc2", [0.0, 1.0])
+        results = store.search_vector([0.0, 1.0], limit=1)
+
+        assert results[0][0].id == "doc2"
+
+    def test_matrix_reloaded_after_other_instance_writes(self, tmp_path):
+        db_path = tmp_path / "test.db"
+        store1 = SQLiteVectorStore(db_path)
+        store2 = SQLiteVectorStore(db_path)
+        self._add(store1, "doc1", [1.0, 0.0])
+        store1.search_vector([1.0, 0.0])
+
+        self._add(store2, "doc2", [0.0, 1.0])
+
+        assert store1.search_vector([0.0, 1.0], limit=1)[0][0].id == "doc2"
+
+    def test_mixed_dimensions_filtered_by_query(self, tmp_path):
+        store = SQLiteVectorStore(tmp_path / "test.db")
+        self._add(store, "small", [1.0, 0.0])
+        self._add(store, "large", [1.0, 0.0, 0.0])
+
+        results = store.search_vector([1.0, 0.0, 0.0], limit=5)
+
+        assert [doc.id for doc, _ in results] == ["large"]
+
+
+class TestSQLiteVectorStoreIVF:
+    """Tests for coarse IVF bucket pruning."""
+
+    def _populate(self, store):
+        # Two well separated clusters
+        for i in range(20):
+            store.add_document(
+                Document(id=f"x{i}", source="x.txt", content="x", chunk_index=i)
+            )
+            store.add_embedding(f"x{i}", [1.0, 0.01 * i, 0.0], "model")
+            store.add_document(
+                Document(id=f"y{i}", source="y.txt", content="y", chunk_index=i)
+            )
+            store.add_embedding(f"y{i}", [0.0, 0.01 * i, 1.0], "model")
+
+    def test_build_ivf_empty_store(self, tmp_path):
+        store = SQLiteVectorStore(tmp_path / "test.db")
+        assert store.build_ivf() == 0
+
+    def test_build_ivf_assigns_buckets(self, tmp_path):
+        store = SQLiteVectorStore(tmp_path / "test.db")
+        self._populate(store)
+
+        assert store.build_ivf(n_buckets=2) == 2
+
+        with sqlite3.connect(store.db_path) as conn:
+            buckets = conn.execute(
+                "SELECT DISTINCT bucket FROM embeddings WHERE doc_id LIKE 'x%'"
+            ).fetchall()
+        assert len(buckets) == 1
+
+    def test_search_scores_only_probed_buckets(self, tmp_path):
+        store = SQLiteVectorStore(tmp_path / "test.db", ivf_probes=1)
+        self._populate(store)
+        store.build_ivf(n_buckets=2)
+
+        results = store.search_vector([1.0, 0.0, 0.0], limit=5)
+        rows = store._candidate_rows(sqlite3.connect(store.db_path), [1.0, 0.0, 0.0], 5)
+
+        assert all(doc.id.startswith("x") for doc, _ in results)
+        assert len(rows) == 20
+
+    def test_new_embeddings_assigned_to_bucket(self, tmp_path):
+        store = SQLiteVectorStore(tmp_path / "test.db", ivf_probes=1)
+        self._populate(store)
+        store.build_ivf(n_buckets=2)
+
+        store.add_document(
+            Document(id="new", source="n.txt", content="n", chunk_index=0)
+        )
+        store.add_embedding("new", [0.0, -0.5, 1.0], "model")
+
+        results = store.search_vector([0.0, -0.5, 1.0], limit=1)
+        assert results[0][0].id == "new"
+
+    def test_optimize_skips_small_store(self, tmp_path):
+        store = SQLiteVectorStore(tmp_path / "test.db")
+        self._populate(store)
+
+        assert store.optimize() == 0
+        assert store._get_centroids(store._conn) is None
+
+    def test_optimize_builds_and_retrains_on_growth(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(SQLiteVectorStore, "IVF_MIN_EMBEDDINGS", 10)
+        store = SQLiteVectorStore(tmp_path / "test.db")
+        self._populate(store)
+
+        assert store.optimize() == 6  # sqrt(40)
+        assert store.optimize() == 0
+
+        for i in range(40):
+            store.add_document(
+                Document(id=f"z{i}", source="z.txt", content="z", chunk_index=i)
+            )
+            store.add_embedding(f"z{i}", [0.0, 1.0, 0.01 * i], "model")
+        assert store.optimize() == 8  # sqrt(80)
+
+    def test_clear_removes_centroids(self, tmp_path):
+        store = SQLiteVectorStore(tmp_path / "test.db")
+        self._populate(store)
+        store.build_ivf(n_buckets=2)
+
+        store.clear()
+
+        with sqlite3.connect(store.db_path) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM ivf_centroids").fetchone()[0] == 0
+        assert store._get_version(store._conn, "ivf_rows") == 0
+
+
 class TestSemanticCache:
     """Tests for SemanticCache."""
 
@@ -684,3 +1042,16 @@ class TestMigrateJsonToSqlite:
         count = migrate_json_to_sqlite(json_path, store)
 
         assert count == 3
+
+    def test_migrate_binary_vector_store(self, tmp_path):
+        """Should migrate an index written by the binary VectorStore."""
+        json_path = tmp_path / "index.json"
+        VectorStore(json_path).add(
+            [DocumentChunk(id="doc1", content="c", source="f.txt", vector=[1.0, 0.0])]
+        )
+
+        store = SQLiteVectorStore(tmp_path / "test.db")
+        count = migrate_json_to_sqlite(json_path, store)
+
+        assert count == 1
+        assert store.search_vector([1.0, 0.0], limit=1)[0][0].id == "doc1"
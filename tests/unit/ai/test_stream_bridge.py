@@ -0,0 +1,115 @@
+"""Tests for ai/stream_bridge.py - iterating blocking streams off the loop."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from ai.stream_bridge import iterate_in_thread
+
+
+class SlowStream:
+    """Blocking iterator standing in for an SDK event stream."""
+
+    def __init__(self, items, delay=0.0):
+        self.items = list(items)
+        self.delay = delay
+        self.produced = 0
+        self.closed = threading.Event()
+
+    def __iter__(self):
+        for item in self.items:
+            time.sleep(self.delay)
+            self.produced += 1
+            yield item
+
+    def close(self):
+        self.closed.set()
+
+
+class TestIterateInThread:
+    @pytest.mark.asyncio
+    async def test_yields_items_in_order(self):
+        stream = SlowStream(range(5))
+        items = [item async for item in iterate_in_thread(lambda: stream)]
+        assert items == [0, 1, 2, 3, 4]
+        assert stream.closed.is_set()
+
+    @pytest.mark.asyncio
+    async def test_does_not_block_the_event_loop(self):
+        stream = SlowStream(range(3), delay=0.05)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(ticker())
+        items = [item async for item in iterate_in_thread(lambda: stream)]
+        task.cancel()
+
+        assert items == [0, 1, 2]
+        assert ticks >= 5
+
+    @pytest.mark.asyncio
+    async def test_opening_errors_are_raised(self):
+        def open_stream():
+            raise RuntimeError("throttled")
+
+        with pytest.raises(RuntimeError, match="throttled"):
+            async for _ in iterate_in_thread(open_stream):
+                pass
+
+    @pytest.mark.asyncio
+    async def test_buffer_is_bounded(self):
+        stream = SlowStream(range(100))
+        events = iterate_in_thread(lambda: stream, max_buffer=4)
+
+        assert await anext(events) == 0
+        await asyncio.sleep(0.05)
+        # One item handed out, the buffer full, and one waiting for a slot
+        assert stream.produced <= 6
+        await events.aclose()
+
+    @pytest.mark.asyncio
+    async def test_early_exit_stops_and_closes_the_stream(self):
+        stream = SlowStream(range(100))
+        events = iterate_in_thread(lambda: stream, max_buffer=2)
+
+        async for item in events:
+            if item == 1:
+                break
+        await events.aclose()
+
+        assert await asyncio.to_thread(stream.closed.wait, 1)
+        produced = stream.produced
+        await asyncio.sleep(0.2)
+        assert stream.produced == produced
+
+    @pytest.mark.asyncio
+    async def test_stream_opened_after_exit_is_closed_unread(self):
+        stream = SlowStream(range(100))
+        opening = threading.Event()
+        release = threading.Event()
+
+        def open_stream():
+            opening.set()
+            release.wait(1)
+            return stream
+
+        async def consume():
+            async for _ in iterate_in_thread(open_stream):
+                pass
+
+        task = asyncio.create_task(consume())
+        assert await asyncio.to_thread(opening.wait, 1)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        release.set()
+
+        assert await asyncio.to_thread(stream.closed.wait, 1)
+        assert stream.produced == 0
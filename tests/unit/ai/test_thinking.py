@@ -3,10 +3,14 @@
 import pytest
 
 from ai.thinking import (
+    JSONLineStreamParser,
     JSONStructuredStrategy,
     MinimalThinkingStrategy,
     NativeThinkingStrategy,
+    PassthroughStreamParser,
+    ThinkingStreamParser,
     XMLTagStrategy,
+    XMLTagStreamParser,
     get_thinking_strategy,
     list_strategies,
 )
@@ -425,3 +429,93 @@ class TestEdgeCases:
         thinking, remaining = strategy.extract_thinking(text)
         assert "\u4e2d\u6587" in thinking
         assert remaining == "Response"
+
+
+def stream(parser: ThinkingStreamParser, text: str, step: int) -> tuple[str, str]:
+    """Feed text in fixed-size chunks and return the accumulated result."""
+    thinking_deltas: list[str] = []
+    answer_deltas: list[str] = []
+    for start in range(0, len(text), step):
+        thinking_delta, answer_delta = parser.feed(text[start : start + step])
+        thinking_deltas.append(thinking_delta)
+        answer_deltas.append(answer_delta)
+    thinking_delta, answer_delta = parser.finish()
+    thinking_deltas.append(thinking_delta)
+    answer_deltas.append(answer_delta)
+    assert "".join(thinking_deltas) == parser.thinking
+    assert "".join(answer_deltas) == parser.answer
+    return parser.thinking, parser.answer
+
+
+class TestStreamParsers:
+    """Tests for the push-based streaming parsers."""
+
+    XML_TEXTS = (
+        "<think>  plan it </think>  Hello <THINK>more</Think> world  ",
+        "<think>a</think>\n\n<think>b</think>answer",
+        "x < y and <thin not a tag",
+        "<think>if x < 10</think>Result",
+    )
+
+    JSON_TEXTS = (
+        '{"thinking": "a"}\nline1\n{"thinking": "b"} tail\n\n  line2',
+        '  {"thinking" broken\n{"thinking": "c"}\n',
+        "no thinking here\nat all",
+    )
+
+    def test_strategies_create_incremental_parsers(self):
+        assert isinstance(XMLTagStrategy().create_stream_parser(), XMLTagStreamParser)
+        assert isinstance(
+            NativeThinkingStrategy().create_stream_parser(), XMLTagStreamParser
+        )
+        assert isinstance(
+            JSONStructuredStrategy().create_stream_parser(), JSONLineStreamParser
+        )
+        assert isinstance(
+            MinimalThinkingStrategy().create_stream_parser(), PassthroughStreamParser
+        )
+
+    @pytest.mark.parametrize("text", XML_TEXTS)
+    @pytest.mark.parametrize("step", [1, 2, 5, 64])
+    def test_xml_parser_matches_extract(self, text, step):
+        strategy = XMLTagStrategy()
+        result = stream(strategy.create_stream_parser(), text, step)
+        assert result == strategy.extract_thinking(text)
+
+    @pytest.mark.parametrize("text", JSON_TEXTS)
+    @pytest.mark.parametrize("step", [1, 3, 64])
+    def test_json_parser_matches_extract(self, text, step):
+        strategy = JSONStructuredStrategy()
+        result = stream(strategy.create_stream_parser(), text, step)
+        assert result == strategy.extract_thinking(text)
+
+    def test_xml_parser_streams_open_think_block(self):
+        parser = XMLTagStreamParser()
+        assert parser.feed("<think>step one") == ("step one", "")
+        assert parser.feed(" and two") == (" and two", "")
+        assert parser.answer == ""
+
+    def test_xml_parser_holds_partial_tag(self):
+        parser = XMLTagStreamParser()
+        parser.feed("<think>reason</th")
+        assert parser.thinking == "reason"
+        assert parser.feed("ink>Done") == ("", "Done")
+
+    def test_json_parser_streams_answer_before_line_ends(self):
+        parser = JSONLineStreamParser()
+        assert parser.feed("Hello") == ("", "Hello")
+        assert parser.feed('\n{"think') == ("", "")
+        assert parser.feed('ing": "hmm"}\n') == ("hmm", "")
+
+    def test_base_parser_falls_back_to_extract(self):
+        class CustomStrategy(XMLTagStrategy):
+            def create_stream_parser(self):
+                return ThinkingStreamParser(self)
+
+        strategy = CustomStrategy()
+        parser = strategy.create_stream_parser()
+        text = "<think>a</think>b <think>c</think>"
+        for start in range(0, len(text), 3):
+            parser.feed(text[start : start + 3])
+        parser.finish()
+        assert (parser.thinking, parser.answer) == strategy.extract_thinking(text)
@@ -0,0 +1,118 @@
+"""Tests for ai/vector_index.py - float32 vector matrix and top-k search."""
+
+import pytest
+
+from ai.vector_index import VectorIndex, pack_vector, unpack_vector
+
+
+class TestHelpers:
+    def test_pack_roundtrip(self):
+        data = pack_vector([1.0, -2.5, 0.25])
+        assert len(data) == 12
+        assert unpack_vector(data) == [1.0, -2.5, 0.25]
+
+
+class TestVectorIndex:
+    def test_empty_search(self):
+        index = VectorIndex()
+        assert index.search([1.0, 0.0]) == []
+
+    def test_add_sets_dimension(self):
+        index = VectorIndex()
+        first = index.add([[1.0, 0.0, 0.0]])
+        assert first == 0
+        assert index.dim == 3
+        assert len(index) == 1
+
+    def test_add_dimension_mismatch_raises(self):
+        index = VectorIndex()
+        index.add([[1.0, 0.0]])
+        with pytest.raises(ValueError):
+            index.add([[1.0, 0.0, 0.0]])
+
+    def test_search_ranks_by_cosine(self):
+        index = VectorIndex()
+        index.add([[0.0, 1.0], [2.0, 0.0], [1.0, 1.0]])
+
+        results = index.search([1.0, 0.0], limit=2)
+
+        assert [row for row, _ in results] == [1, 2]
+        assert results[0][1] == pytest.approx(1.0)
+        assert results[1][1] == pytest.approx(0.7071, abs=1e-3)
+
+    def test_search_limit_larger_than_rows(self):
+        index = VectorIndex()
+        index.add([[1.0, 0.0], [0.0, 1.0]])
+        assert len(index.search([1.0, 1.0], limit=10)) == 2
+
+    def test_search_zero_query(self):
+        index = VectorIndex()
+        index.add([[1.0, 0.0]])
+        assert index.search([0.0, 0.0]) == []
+
+    def test_search_dimension_mismatch(self):
+        index = VectorIndex()
+        index.add([[1.0, 0.0]])
+        assert index.search([1.0, 0.0, 0.0]) == []
+
+    def test_file_backed_append(self, tmp_path):
+        path = tmp_path / "index.vectors"
+        index = VectorIndex(path)
+        index.add([[1.0, 0.0]])
+        index.add([[0.0, 1.0]])
+
+        assert path.stat().st_size == 2 * 2 * 4
+        results = index.search([0.0, 1.0], limit=1)
+        assert results[0][0] == 1
+
+    def test_file_backed_reload(self, tmp_path):
+        path = tmp_path / "index.vectors"
+        VectorIndex(path).add([[1.0, 0.0], [0.0, 1.0]])
+
+        index = VectorIndex(path, dim=2, rows=2)
+
+        assert len(index) == 2
+        assert index.search([1.0, 0.0], limit=1)[0][0] == 0
+
+    def test_reload_truncated_file(self, tmp_path):
+        path = tmp_path / "index.vectors"
+        VectorIndex(path).add([[1.0, 0.0]])
+
+        index = VectorIndex(path, dim=2, rows=5)
+
+        assert len(index) == 1
+
+    def test_append_overwrites_partial_rows(self, tmp_path):
+        path = tmp_path / "index.vectors"
+        VectorIndex(path).add([[1.0, 0.0], [0.0, 1.0]])
+
+        # Only the first row was committed
+        index = VectorIndex(path, dim=2, rows=1)
+        index.add([[1.0, 1.0]])
+
+        assert path.stat().st_size == 2 * 2 * 4
+        assert len(index) == 2
+
+    def test_compact_in_memory(self):
+        index = VectorIndex()
+        index.add([[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]])
+
+        index.compact([2, 0])
+
+        assert len(index) == 2
+        assert index.search([1.0, 1.0], limit=1)[0][0] == 0
+        assert index.row(1) == pytest.approx([1.0, 0.0])
+
+    def test_compact_file_backed(self, tmp_path):
+        path = tmp_path / "index.vectors"
+        index = VectorIndex(path)
+        index.add([[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]])
+
+        index.compact([1])
+
+        assert path.stat().st_size == 2 * 4
+        assert VectorIndex(path, dim=2, rows=1).row(0) == pytest.approx([0.0, 1.0])
+
+        index.compact([])
+        assert len(index) == 0
+        assert path.stat().st_size == 0
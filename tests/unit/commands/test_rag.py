@@ -30,6 +30,7 @@ def mock_rag_manager():
     }
     rag.clear = MagicMock()
     rag.index_directory = AsyncMock(return_value=5)
+    rag.is_indexing = False
     rag.search = AsyncMock(return_value=[])
     return rag
 
@@ -44,7 +45,7 @@ def mock_recall_manager():
 @pytest.fixture
 def rag_commands(mock_app, mock_rag_manager, mock_recall_manager):
     with (
-        patch("commands.rag.RAGManager", return_value=mock_rag_manager),
+        patch("commands.rag.get_rag_manager", return_value=mock_rag_manager),
         patch("commands.rag.RecallManager", return_value=mock_recall_manager),
     ):
         commands = RAGCommands(mock_app)
@@ -308,6 +309,19 @@ class TestBuildIndex:
         assert "/test/path" in mock_notify.call_args[0][0]
         assert "background" in mock_notify.call_args[0][0]
 
+    @pytest.mark.asyncio
+    async def test_build_index_notifies_queued(
+        self, rag_commands, mock_app, mock_rag_manager
+    ):
+        """Should say the build waits when another one is running."""
+        mock_rag_manager.is_indexing = True
+
+        with patch.object(rag_commands, "notify") as mock_notify:
+            await rag_commands._build_index(Path("/test"))
+
+        assert "after the running build" in mock_notify.call_args[0][0]
+        mock_app.run_worker.assert_called_once()
+
     @pytest.mark.asyncio
     async def test_build_index_starts_worker(self, rag_commands, mock_app):
         """Should start a background worker for indexing."""
@@ -316,6 +330,93 @@ class TestBuildIndex:
         mock_app.run_worker.assert_called_once()
 
 
+class TestWatchIndex:
+    """Tests for /index build --full and /index watch."""
+
+    @pytest.mark.asyncio
+    async def test_cmd_index_build_full(self, rag_commands):
+        """Should request a non-incremental build with --full."""
+        with patch.object(
+            rag_commands, "_build_index", new_callable=AsyncMock
+        ) as mock_build:
+            await rag_commands.cmd_index(["build", "--full", "/some/path"])
+
+        mock_build.assert_called_once_with(Path("/some/path"), incremental=False)
+
+    @pytest.mark.asyncio
+    async def test_build_index_passes_incremental(
+        self, rag_commands, mock_app, mock_rag_manager
+    ):
+        """Should forward the incremental flag to the RAG manager."""
+        await rag_commands._build_index(Path("/test"), incremental=False)
+
+        await mock_app.run_worker.call_args[0][0]
+
+        kwargs = mock_rag_manager.index_directory.call_args[1]
+        assert kwargs["incremental"] is False
+
+    @pytest.mark.asyncio
+    async def test_cmd_index_watch_starts_worker(
+        self, rag_commands, mock_app, mock_rag_manager
+    ):
+        """Should run watch_directory in a background worker."""
+        mock_rag_manager.watch_directory = MagicMock()
+
+        await rag_commands.cmd_index(["watch", "/some/path"])
+
+        mock_app.run_worker.assert_called_once()
+        assert mock_rag_manager.watch_directory.call_args[0][0] == Path("/some/path")
+        assert rag_commands._watch_worker is mock_app.run_worker.return_value
+
+    @pytest.mark.asyncio
+    async def test_cmd_index_watch_replaces_previous_watch(
+        self, rag_commands, mock_app, mock_rag_manager
+    ):
+        """Should cancel an existing watch before starting a new one."""
+        mock_rag_manager.watch_directory = MagicMock()
+        first, second = MagicMock(), MagicMock()
+        mock_app.run_worker.side_effect = [first, second]
+
+        await rag_commands.cmd_index(["watch", "/a"])
+        await rag_commands.cmd_index(["watch", "/b"])
+
+        first.cancel.assert_called_once()
+        assert rag_commands._watch_worker is second
+
+    @pytest.mark.asyncio
+    async def test_cmd_index_watch_stop(self, rag_commands, mock_app, mock_rag_manager):
+        """Should cancel the watch worker."""
+        mock_rag_manager.watch_directory = MagicMock()
+        await rag_commands.cmd_index(["watch", "/a"])
+        worker = rag_commands._watch_worker
+
+        with patch.object(rag_commands, "notify") as mock_notify:
+            await rag_commands.cmd_index(["watch", "stop"])
+
+        worker.cancel.assert_called_once()
+        assert rag_commands._watch_worker is None
+        assert "Stopped watching" in mock_notify.call_args[0][0]
+
+    @pytest.mark.asyncio
+    async def test_cmd_index_watch_stop_when_idle(self, rag_commands):
+        """Should report that nothing is being watched."""
+        with patch.object(rag_commands, "notify") as mock_notify:
+            await rag_commands.cmd_index(["watch", "stop"])
+
+        assert "Not watching" in mock_notify.call_args[0][0]
+
+    @pytest.mark.asyncio
+    async def test_cmd_index_watch_no_provider(self, rag_commands, mock_app):
+        """Should refuse to watch without an AI provider."""
+        mock_app.ai_provider = None
+
+        with patch.object(rag_commands, "notify") as mock_notify:
+            await rag_commands.cmd_index(["watch"])
+
+        mock_app.run_worker.assert_not_called()
+        assert mock_notify.call_args[1]["severity"] == "error"
+
+
 class TestSearchIndex:
     """Tests for _search_index helper."""
 
@@ -385,21 +486,22 @@ class TestRAGCommandsInitialization:
     """Tests for RAGCommands initialization."""
 
     def test_init_creates_managers(self, mock_app):
-        """Should create RAG and Recall managers."""
+        """Should use the shared RAG manager and create a Recall manager."""
         with (
-            patch("commands.rag.RAGManager") as mock_rag_class,
+            patch("commands.rag.get_rag_manager") as mock_get_rag,
             patch("commands.rag.RecallManager") as mock_recall_class,
         ):
             commands = RAGCommands(mock_app)
 
-        mock_rag_class.assert_called_once()
+        mock_get_rag.assert_called_once()
+        assert commands.rag is mock_get_rag.return_value
         mock_recall_class.assert_called_once()
         assert commands.app is mock_app
 
     def test_init_stores_app_reference(self, mock_app):
         """Should store app reference."""
         with (
-            patch("commands.rag.RAGManager"),
+            patch("commands.rag.get_rag_manager"),
             patch("commands.rag.RecallManager"),
         ):
             commands = RAGCommands(mock_app)
@@ -295,14 +295,20 @@ class TestConfigGetStorage:
         assert isinstance(storage, StorageManager)
         storage.close()
 
-    def test_get_storage_creates_new_instance(self, mock_home):
-        """_get_storage() should create new instance each call."""
+    def test_get_storage_reuses_instance(self, mock_storage):
+        """_get_storage() should return the same shared instance each call."""
         storage1 = Config._get_storage()
         storage2 = Config._get_storage()
-        # They should be different instances
-        assert storage1 is not storage2
-        storage1.close()
-        storage2.close()
+        assert storage1 is storage2
+        assert storage1 is mock_storage
+
+    def test_get_storage_recreates_after_close(self, mock_storage):
+        """_get_storage() should replace a closed shared instance."""
+        mock_storage.close()
+        storage = Config._get_storage()
+        assert storage is not mock_storage
+        assert not storage.closed
+        storage.close()
 
 
 class TestConfigIntegration:
@@ -101,17 +101,89 @@ class TestHistoryIndex:
         assert populated_index.count == 0
         assert populated_index.search("git") == []
 
-    def test_tokenize(self, index):
-        tokens = index._tokenize("git commit -m message")
-        assert "git" in tokens
-        assert "commit" in tokens
-        assert "message" in tokens
-
-    def test_tokenize_paths(self, index):
-        tokens = index._tokenize("cd /home/user/projects")
-        assert "home" in tokens
-        assert "user" in tokens
-        assert "projects" in tokens
+    def test_search_substring_inside_words(self, populated_index):
+        results = populated_index.search("tat")
+        assert [r.command for r in results] == ["git status"]
+
+    def test_search_short_query(self, populated_index):
+        results = populated_index.search("y")
+        assert [r.command for r in results] == ["python main.py"]
+
+    def test_search_spanning_tokens(self, populated_index):
+        results = populated_index.search("n ma")
+        assert [r.command for r in results] == [
+            "git push origin main",
+            "python main.py",
+        ]
+
+
+class TestHistoryIndexRanking:
+    def add(self, idx, entry_id, command, exit_code=0):
+        idx._add_to_index(HistoryEntry(entry_id, command, "", exit_code))
+
+    def test_repeated_command_returned_once(self, index):
+        self.add(index, 1, "make test")
+        self.add(index, 2, "ls")
+        self.add(index, 3, "make test")
+
+        results = index.search("make")
+        assert [r.id for r in results] == [3]
+        assert index.count == 3
+
+    def test_frequent_command_outranks_recent_one(self, index):
+        for i in range(1, 9):
+            self.add(index, i, "make build")
+        self.add(index, 9, "make clean")
+
+        results = index.search("make")
+        assert [r.command for r in results] == ["make build", "make clean"]
+
+    def test_failed_command_ranks_lower(self, index):
+        self.add(index, 1, "pytest tests")
+        self.add(index, 2, "pytest -x", exit_code=1)
+
+        results = index.search_prefix("pytest")
+        assert [r.command for r in results] == ["pytest tests", "pytest -x"]
+
+    def test_latest_run_is_returned(self, index):
+        self.add(index, 1, "npm start", exit_code=1)
+        self.add(index, 2, "npm start")
+
+        (result,) = index.search("npm")
+        assert result.id == 2
+        assert result.exit_code == 0
+
+    def test_search_paths_agree(self, index):
+        """Ranking candidates and walking the ranking agree."""
+        for i in range(1, 301):
+            self.add(index, i, f"git checkout feature-{i % 40}")
+        self.add(index, 301, "echo feature")
+
+        walked = index._walk("feature", False, 5)
+        ranked = index._rank(range(len(index._by_gid)), 5)
+        assert walked == ranked
+        assert index.search("feature", limit=5) == ranked
+        assert len(walked) == 5
+
+    def test_prefix_does_not_match_later_commands(self, index):
+        self.add(index, 1, "git")
+        self.add(index, 2, "gitk")
+        self.add(index, 3, "gh pr list")
+        self.add(index, 4, "grep git")
+
+        results = index.search_prefix("git")
+        assert [r.command for r in results] == ["gitk", "git"]
+
+    def test_search_handles_many_entries(self, index):
+        for i in range(5000):
+            self.add(index, i, f"cmd{i % 1000} --flag {i % 7}")
+
+        results = index.search("cmd99", limit=20)
+        assert {r.command.split()[0] for r in results} <= {
+            "cmd99",
+            *(f"cmd99{d}" for d in range(10)),
+        }
+        assert len(results) == 20
 
 
 class TestHistoryIndexWithStorage:
@@ -161,3 +233,14 @@ class TestHistoryIndexWithStorage:
         results = index_with_storage.search("git")
         assert len(results) == 1
         assert results[0].command == "git status"
+
+    def test_add_entry_uses_storage_entry(self, storage):
+        index = HistoryIndex.from_storage(storage)
+        entry_id = index.add_entry("make build", exit_code=2)
+
+        storage.flush_history()
+        cursor = storage.conn.cursor()
+        cursor.execute("SELECT id, exit_code FROM history WHERE command = 'make build'")
+        row = cursor.fetchone()
+        assert row["id"] == entry_id
+        assert index.search("make")[0].exit_code == row["exit_code"] == 2
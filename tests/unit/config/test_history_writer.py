@@ -0,0 +1,83 @@
+"""Tests for config/history_writer.py - batched history writes."""
+
+import sqlite3
+import threading
+
+import pytest
+
+from config.history_writer import HistoryWriter
+from config.storage import StorageManager
+
+
+@pytest.fixture
+def db_path(mock_home, tmp_path):
+    path = tmp_path / "history.db"
+    StorageManager(db_path=path).close()  # create the schema
+    return path
+
+
+def _rows(db_path) -> list[tuple[int, str]]:
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute("SELECT id, command FROM history ORDER BY id").fetchall()
+
+
+class TestHistoryWriter:
+    def test_rows_are_written_on_flush(self, db_path):
+        writer = HistoryWriter(db_path, limit=100)
+        writer.add([(1, "ls", "2024-01-01 00:00:00", 0)])
+        writer.add([(2, "pwd", "2024-01-01 00:00:01", 1)])
+        writer.flush()
+
+        assert _rows(db_path) == [(1, "ls"), (2, "pwd")]
+        writer.close()
+
+    def test_queued_rows_share_a_transaction(self, db_path, monkeypatch):
+        writer = HistoryWriter(db_path, limit=100)
+        batches = []
+        release = threading.Event()
+        write = HistoryWriter._write
+
+        def recording_write(self, conn, rows):
+            release.wait(1)
+            batches.append(len(rows))
+            write(self, conn, rows)
+
+        monkeypatch.setattr(HistoryWriter, "_write", recording_write)
+        writer.add([(1, "first", "", 0)])
+        for i in range(2, 6):
+            writer.add([(i, f"cmd {i}", "", 0)])
+        release.set()
+        writer.flush()
+
+        assert sum(batches) == 5
+        assert len(batches) <= 2
+        writer.close()
+
+    def test_trims_to_limit_by_id(self, db_path):
+        writer = HistoryWriter(db_path, limit=3)
+        writer.add([(i, f"cmd {i}", "", 0) for i in range(1, 6)])
+        writer.flush()
+        writer.add([(6, "cmd 6", "", 0)])
+        writer.flush()
+
+        assert [row[0] for row in _rows(db_path)] == [4, 5, 6]
+        writer.close()
+
+    def test_taken_ids_fall_back_to_autoincrement(self, db_path):
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("INSERT INTO history (id, command) VALUES (1, 'other')")
+        writer = HistoryWriter(db_path, limit=100)
+        writer.add([(1, "mine", "", 0)])
+        writer.flush()
+
+        assert _rows(db_path) == [(1, "other"), (2, "mine")]
+        assert writer.ids_stale
+        writer.close()
+
+    def test_close_writes_pending_rows(self, db_path):
+        writer = HistoryWriter(db_path, limit=100)
+        writer.add([(1, "ls", "", 0)])
+        writer.close()
+
+        assert _rows(db_path) == [(1, "ls")]
+        writer.close()  # closing twice is harmless
@@ -0,0 +1,180 @@
+"""Tests for config/session_journal.py - the current session journal."""
+
+import pytest
+
+from config import session_journal
+from config.session_journal import SessionJournal
+from models import BlockState, BlockType
+
+
+def _block(text: str) -> BlockState:
+    return BlockState(type=BlockType.COMMAND, content_input=text, is_running=False)
+
+
+@pytest.fixture
+def journal(tmp_path):
+    journal = SessionJournal(tmp_path / "current.journal")
+    yield journal
+    journal.close()
+
+
+def _reload(journal: SessionJournal) -> list[dict]:
+    journal.flush()
+    return SessionJournal(journal.path).load()
+
+
+class TestSessionJournal:
+    def test_round_trip(self, journal):
+        blocks = [_block("ls"), _block("pwd")]
+        journal.sync(blocks)
+
+        loaded = _reload(journal)
+
+        assert [b["content_input"] for b in loaded] == ["ls", "pwd"]
+
+    def test_only_changed_blocks_are_written(self, journal):
+        blocks = [_block("ls"), _block("pwd")]
+        assert journal.sync(blocks) == 2
+        assert journal.sync(blocks) == 0
+
+        blocks[1].content_output = "/home"
+        assert journal.sync(blocks) == 1
+
+        loaded = _reload(journal)
+        assert loaded[1]["content_output"] == "/home"
+
+    def test_running_blocks_are_always_written(self, journal):
+        block = BlockState(type=BlockType.AI_RESPONSE, content_input="hi")
+        block.metadata["tokens"] = "10"
+
+        assert journal.sync([block]) == 1
+        assert journal.sync([block]) == 1
+
+    def test_removed_blocks_are_deleted(self, journal):
+        blocks = [_block("ls"), _block("pwd")]
+        journal.sync(blocks)
+        journal.sync(blocks[1:])
+
+        assert [b["content_input"] for b in _reload(journal)] == ["pwd"]
+
+    def test_inserted_blocks_keep_session_order(self, journal):
+        blocks = [_block("first"), _block("last")]
+        journal.sync(blocks)
+        blocks.insert(1, _block("middle"))
+        journal.sync(blocks)
+
+        loaded = _reload(journal)
+
+        assert [b["content_input"] for b in loaded] == ["first", "middle", "last"]
+
+    def test_mark_saved_skips_loaded_blocks(self, journal):
+        journal.sync([_block("ls")])
+        reopened = SessionJournal(journal.path)
+        journal.flush()
+        blocks = [BlockState.from_dict(b) for b in reopened.load()]
+
+        reopened.mark_saved(blocks)
+
+        assert reopened.sync(blocks) == 0
+
+    def test_torn_tail_is_dropped(self, journal):
+        journal.sync([_block("ls")])
+        journal.close()
+        with open(journal.path, "ab") as f:
+            f.write(b"\x00\x00\x01\x00P\x00\x02id{")
+
+        reopened = SessionJournal(journal.path)
+        assert [b["content_input"] for b in reopened.load()] == ["ls"]
+        reopened.sync([BlockState.from_dict(reopened.load()[0]), _block("pwd")])
+
+        assert [b["content_input"] for b in _reload(reopened)] == ["ls", "pwd"]
+        reopened.close()
+
+    def test_compaction_drops_superseded_records(self, journal, monkeypatch):
+        monkeypatch.setattr(session_journal, "COMPACT_MIN_RECORDS", 4)
+        block = _block("ls")
+        journal.sync([block])
+        for i in range(10):
+            block.content_output = str(i)
+            journal.sync([block])
+        journal.flush()
+
+        assert journal._records <= 4
+        assert _reload(journal)[0]["content_output"] == "9"
+
+    def test_clear_deletes_the_journal(self, journal):
+        journal.sync([_block("ls")])
+        journal.clear()
+
+        assert not journal.path.exists()
+        assert journal.sync([_block("pwd")]) == 1
+        assert [b["content_input"] for b in _reload(journal)] == ["pwd"]
+
+    def test_load_limit_returns_most_recent(self, journal):
+        journal.sync([_block(str(i)) for i in range(5)])
+        journal.flush()
+        reopened = SessionJournal(journal.path)
+
+        recent = reopened.load(limit=2)
+
+        assert [b["content_input"] for b in recent] == ["3", "4"]
+        assert reopened.unloaded_count == 3
+        older = reopened.read_older(2)
+        assert [b["content_input"] for b in older] == ["1", "2"]
+        assert [b["content_input"] for b in reopened.read_older(2)] == ["0"]
+        assert reopened.unloaded_count == 0
+
+    def test_sync_keeps_unloaded_blocks(self, journal):
+        journal.sync([_block(str(i)) for i in range(3)])
+        journal.flush()
+        reopened = SessionJournal(journal.path)
+        blocks = [BlockState.from_dict(b) for b in reopened.load(limit=1)]
+        reopened.mark_saved(blocks)
+
+        blocks.append(_block("3"))
+        reopened.sync(blocks)
+
+        loaded = _reload(reopened)
+        assert [b["content_input"] for b in loaded] == ["0", "1", "2", "3"]
+        reopened.close()
+
+    def test_replaced_history_drops_unloaded_blocks(self, journal):
+        journal.sync([_block(str(i)) for i in range(3)])
+        journal.flush()
+        reopened = SessionJournal(journal.path)
+        reopened.mark_saved([BlockState.from_dict(b) for b in reopened.load(limit=1)])
+
+        reopened.sync([_block("new")])
+
+        assert [b["content_input"] for b in _reload(reopened)] == ["new"]
+        reopened.close()
+
+    def test_blocks_are_encrypted_individually(self, tmp_path):
+        from cryptography.fernet import Fernet
+
+        fernet = Fernet(Fernet.generate_key())
+
+        def encrypt(text):
+            return fernet.encrypt(text.encode()).decode()
+
+        def decrypt(text):
+            return fernet.decrypt(text.encode()).decode()
+
+        path = tmp_path / "current.journal"
+        journal = SessionJournal(path, encrypt=encrypt, decrypt=decrypt)
+        journal.sync([_block("secret-command"), _block("other")])
+        journal.close()
+
+        assert b"secret-command" not in path.read_bytes()
+        reopened = SessionJournal(path, decrypt=decrypt)
+        assert [b["content_input"] for b in reopened.load(limit=1)] == ["other"]
+        assert [b["content_input"] for b in reopened.read_older(1)] == [
+            "secret-command"
+        ]
+
+    def test_unrecognized_file_is_set_aside(self, tmp_path):
+        path = tmp_path / "current.journal"
+        path.write_bytes(b'{"blocks": []}')
+
+        assert SessionJournal(path).load() == []
+        assert path.with_suffix(".unreadable").exists()
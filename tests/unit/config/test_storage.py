@@ -11,6 +11,7 @@ from config.storage import (
     KEYRING_SERVICE_NAME,
     SecurityManager,
     StorageManager,
+    get_storage,
 )
 
 
@@ -231,6 +232,106 @@ class TestStorageManagerConfig:
             assert mock_storage.get_config(key) == value
 
 
+class TestStorageManagerConfigCache:
+    """Tests for the in-memory config cache and change notification."""
+
+    def test_get_config_served_from_cache(self, mock_storage):
+        """Reads after the first should not hit the database."""
+        mock_storage.set_config("theme", "dark")
+        mock_storage.get_config("theme")
+
+        # Change the row behind the cache's back
+        mock_storage.conn.execute(
+            "UPDATE config SET value = 'light' WHERE key = 'theme'"
+        )
+        assert mock_storage.get_config("theme") == "dark"
+
+        mock_storage.invalidate_config_cache()
+        assert mock_storage.get_config("theme") == "light"
+
+    def test_cached_value_matches_database_for_non_str(self, mock_storage):
+        """Non-str values should be cached as the database stores them."""
+        mock_storage.get_config("ai.agent_mode")  # warm the cache
+        events = []
+        mock_storage.add_config_listener(lambda k, v: events.append((k, v)))
+
+        mock_storage.set_config("ai.agent_mode", True)
+        mock_storage.set_config("ai.max_tokens", 2048)
+
+        warm = [mock_storage.get_config(k) for k in ("ai.agent_mode", "ai.max_tokens")]
+        mock_storage.invalidate_config_cache()
+        cold = [mock_storage.get_config(k) for k in ("ai.agent_mode", "ai.max_tokens")]
+        assert warm == cold == ["1", "2048"]
+        assert events == [("ai.agent_mode", "1"), ("ai.max_tokens", "2048")]
+
+    def test_sensitive_value_decrypted_once(self, mock_storage, monkeypatch):
+        """Sensitive values should be decrypted when the cache loads only."""
+        mock_storage.set_config("ai.openai.api_key", "sk-secret", is_sensitive=True)
+        mock_storage.invalidate_config_cache()
+
+        calls = []
+        original = mock_storage.security.decrypt
+        monkeypatch.setattr(
+            mock_storage.security,
+            "decrypt",
+            lambda token: calls.append(token) or original(token),
+        )
+        for _ in range(3):
+            assert mock_storage.get_config("ai.openai.api_key") == "sk-secret"
+        assert len(calls) == 1
+
+    def test_listener_notified_on_set_and_delete(self, mock_storage):
+        """Listeners should receive (key, value) for writes and deletes."""
+        events = []
+        mock_storage.add_config_listener(lambda k, v: events.append((k, v)))
+
+        mock_storage.set_config("theme", "dark")
+        mock_storage.delete_config("theme")
+
+        assert events == [("theme", "dark"), ("theme", None)]
+
+    def test_listener_notified_on_prefix_delete(self, mock_storage):
+        """delete_config_prefix() should notify each removed key."""
+        mock_storage.set_config("ai.openai.model", "gpt-4")
+        mock_storage.set_config("ai.openai.endpoint", "http://x")
+        events = []
+        mock_storage.add_config_listener(lambda k, v: events.append((k, v)))
+
+        mock_storage.delete_config_prefix("ai.openai.")
+
+        assert sorted(events) == [
+            ("ai.openai.endpoint", None),
+            ("ai.openai.model", None),
+        ]
+
+    def test_remove_listener(self, mock_storage):
+        """Removed listeners should not be called."""
+        events = []
+
+        def listener(k, v):
+            events.append(k)
+
+        mock_storage.add_config_listener(listener)
+        mock_storage.remove_config_listener(listener)
+        mock_storage.set_config("theme", "dark")
+        assert events == []
+
+    def test_failing_listener_does_not_break_write(self, mock_storage):
+        """A raising listener should not prevent the write."""
+
+        def listener(k, v):
+            raise RuntimeError("boom")
+
+        mock_storage.add_config_listener(listener)
+        mock_storage.set_config("theme", "dark")
+        assert mock_storage.get_config("theme") == "dark"
+
+    def test_get_storage_returns_shared_instance(self, mock_storage):
+        """get_storage() should reuse one long-lived instance."""
+        assert get_storage() is mock_storage
+        assert get_storage() is get_storage()
+
+
 class TestStorageManagerHistory:
     """Tests for StorageManager history operations."""
 
@@ -255,6 +356,7 @@ class TestStorageManagerHistory:
     def test_add_history_with_exit_code(self, mock_storage):
         """add_history() should store exit code."""
         mock_storage.add_history("failing command", exit_code=1)
+        mock_storage.flush_history()
         cursor = mock_storage.conn.cursor()
         cursor.execute(
             "SELECT exit_code FROM history WHERE command = ?", ("failing command",)
@@ -392,6 +494,137 @@ class TestStorageManagerHistory:
             assert cmd in history
 
 
+class TestStorageManagerHistoryWrites:
+    """Tests for write-behind history and interaction search."""
+
+    def test_add_history_returns_entry(self, mock_storage):
+        first = mock_storage.add_history("echo one", exit_code=2)
+        second = mock_storage.add_history("echo two")
+
+        assert first.command == "echo one"
+        assert first.exit_code == 2
+        assert second.id == first.id + 1
+
+        mock_storage.flush_history()
+        cursor = mock_storage.conn.cursor()
+        cursor.execute("SELECT id FROM history WHERE command = 'echo two'")
+        assert cursor.fetchone()["id"] == second.id
+
+    def test_add_history_does_not_write_on_caller_thread(self, mock_storage):
+        mock_storage.add_history("warm up")
+        mock_storage.flush_history()
+        statements = []
+        mock_storage.conn.set_trace_callback(statements.append)
+
+        mock_storage.add_history("echo hi")
+
+        mock_storage.conn.set_trace_callback(None)
+        assert statements == []
+
+    def test_ids_continue_after_clear(self, mock_storage):
+        before = mock_storage.add_history("before clear")
+        mock_storage.clear_history()
+
+        after = mock_storage.add_history("before clear")
+
+        assert after is not None
+        assert after.id > before.id
+
+    def test_ids_resync_after_another_writer(self, mock_storage):
+        mock_storage.add_history("mine 1")
+        mock_storage.flush_history()
+        other = StorageManager(db_path=mock_storage.db_path)
+        other.add_history("theirs")
+        other.close()
+
+        mock_storage.add_history("mine 2")
+        mock_storage.add_history("mine 3")
+
+        assert mock_storage.get_last_history(10) == [
+            "mine 1",
+            "theirs",
+            "mine 2",
+            "mine 3",
+        ]
+
+    def test_search_history_substring_case_insensitive(self, mock_storage):
+        mock_storage.add_history("docker compose up -d")
+        mock_storage.add_history("git status")
+        mock_storage.add_history("DOCKER ps")
+
+        assert mock_storage.search_history("ocker") == [
+            "DOCKER ps",
+            "docker compose up -d",
+        ]
+        assert mock_storage.search_history("POSE U") == ["docker compose up -d"]
+
+    def test_search_history_repeated_command_once(self, mock_storage):
+        mock_storage.add_history("make test")
+        mock_storage.add_history("ls")
+        mock_storage.add_history("make test")
+
+        assert mock_storage.search_history("make") == ["make test"]
+
+    def test_search_history_short_query(self, mock_storage):
+        mock_storage.add_history("ls -la")
+        mock_storage.add_history("pwd")
+
+        assert mock_storage.search_history("la") == ["ls -la"]
+
+    def test_search_history_quotes_in_query(self, mock_storage):
+        mock_storage.add_history('git commit -m "fix it"')
+
+        assert mock_storage.search_history('"fix') == ['git commit -m "fix it"']
+
+    def test_trim_keeps_newest(self, mock_storage, monkeypatch):
+        import config.storage as storage_module
+
+        monkeypatch.setattr(storage_module, "HISTORY_LIMIT", 2)
+        for command in ("old", "keep 1", "keep 2"):
+            mock_storage.add_history(command)
+
+        assert mock_storage.get_last_history(10) == ["keep 1", "keep 2"]
+
+    def test_search_interactions_full_text(self, mock_storage):
+        mock_storage.add_interaction("cli", "ls -la", "README.md")
+        mock_storage.add_interaction("ai", "explain", "The README describes")
+        mock_storage.add_interaction("ai", 'say "hi"', "hi")
+
+        assert mock_storage._interactions_fts
+        results = mock_storage.search_interactions("readme")
+        assert [r["input"] for r in results] == ["explain", "ls -la"]
+        assert [r["input"] for r in mock_storage.search_interactions('"hi')] == [
+            'say "hi"'
+        ]
+        assert len(mock_storage.search_interactions("hi")) == 1
+
+    def test_search_interactions_after_update(self, mock_storage):
+        row_id = mock_storage.add_interaction("cli", "ls", "before")
+        mock_storage.conn.execute(
+            "UPDATE interactions SET output = 'after' WHERE id = ?", (row_id,)
+        )
+
+        assert mock_storage.search_interactions("before") == []
+        assert len(mock_storage.search_interactions("after")) == 1
+
+    def test_search_table_built_for_existing_database(self, mock_home, tmp_path):
+        db_path = tmp_path / "old.db"
+        storage = StorageManager(db_path=db_path)
+        storage.add_interaction("cli", "existing input", "output")
+        storage.close()
+        with sqlite3.connect(db_path) as conn:
+            conn.executescript(
+                "DROP TABLE interactions_fts;"
+                "DROP TRIGGER interactions_fts_insert;"
+                "DROP TRIGGER interactions_fts_delete;"
+                "DROP TRIGGER interactions_fts_update;"
+            )
+
+        storage = StorageManager(db_path=db_path)
+        assert len(storage.search_interactions("xisting")) == 1
+        storage.close()
+
+
 class TestStorageManagerSSH:
     """Tests for StorageManager SSH host operations."""
 
@@ -527,9 +760,87 @@ class TestStorageManagerSession:
         blocks = [BlockState(type=BlockType.COMMAND, content_input="pwd")]
 
         mock_storage.save_current_session(blocks)
+        mock_storage.flush_session()
         current_file = mock_storage._get_current_session_file()
         assert current_file.exists()
 
+    def test_current_session_round_trip(self, mock_storage):
+        """load_session() should restore the auto-saved current session."""
+        from models import BlockState, BlockType
+
+        blocks = [
+            BlockState(type=BlockType.COMMAND, content_input="ls"),
+            BlockState(type=BlockType.COMMAND, content_input="pwd"),
+        ]
+        mock_storage.save_current_session(blocks)
+        blocks[1].content_output = "/home"
+        mock_storage.save_current_session(blocks[1:])
+        mock_storage.flush_session()
+
+        loaded = mock_storage.load_session()
+
+        assert [b.content_input for b in loaded] == ["pwd"]
+        assert loaded[0].content_output == "/home"
+
+    def test_current_session_loads_in_pages(self, mock_storage):
+        """load_session(limit=) should defer older blocks to load_older_blocks()."""
+        from models import BlockState, BlockType
+
+        blocks = [
+            BlockState(type=BlockType.COMMAND, content_input=f"cmd {i}")
+            for i in range(5)
+        ]
+        mock_storage.save_current_session(blocks)
+        mock_storage.flush_session()
+        storage = StorageManager()
+
+        recent = storage.load_session(limit=2)
+        assert [b.content_input for b in recent] == ["cmd 3", "cmd 4"]
+        assert storage.has_older_blocks()
+
+        older = storage.load_older_blocks(10)
+        assert [b.content_input for b in older] == ["cmd 0", "cmd 1", "cmd 2"]
+        assert not storage.has_older_blocks()
+        storage.close()
+
+    def test_save_session_after_paged_restore(self, mock_storage):
+        """save_session() should keep the blocks a paged restore left unloaded."""
+        from models import BlockState, BlockType
+
+        blocks = [
+            BlockState(type=BlockType.COMMAND, content_input=f"cmd {i}")
+            for i in range(120)
+        ]
+        mock_storage.save_current_session(blocks)
+        mock_storage.flush_session()
+        storage = StorageManager()
+
+        loaded = storage.load_session(limit=50)
+        storage.save_session(loaded, "mine")
+
+        saved = storage.load_session(name="mine")
+        assert [b.id for b in saved] == [b.id for b in blocks]
+        # The older blocks are still there to scroll back to
+        assert storage.has_older_blocks()
+        assert len(storage.load_older_blocks(100)) == 70
+        storage.close()
+
+    def test_legacy_current_session_migrated(self, mock_storage):
+        """load_session() should move an old current.json into the journal."""
+        import json
+
+        from models import BlockState, BlockType
+
+        block = BlockState(type=BlockType.COMMAND, content_input="ls")
+        legacy = mock_storage._get_legacy_session_file()
+        legacy.write_text(json.dumps({"blocks": [block.to_dict()]}))
+
+        loaded = mock_storage.load_session()
+
+        assert [b.id for b in loaded] == [block.id]
+        assert not legacy.exists()
+        assert [b.id for b in mock_storage.load_session()] == [block.id]
+
     def test_save_current_session_empty_blocks(self, mock_storage):
         """save_current_session() with empty blocks should do nothing."""
         mock_storage.save_current_session([])
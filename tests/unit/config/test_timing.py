@@ -13,8 +13,6 @@ from config.timing import (
 class TestTimingConfig:
     def test_default_values(self):
         config = TimingConfig()
-        assert config.executor_poll_interval == 0.01
-        assert config.executor_yield_interval == 0.0
         assert config.executor_cancel_grace_period == 0.1
         assert config.sidebar_update_interval == 2.0
         assert config.provider_model_load_delay == 0.5
@@ -27,12 +25,12 @@ class TestTimingConfig:
 
     def test_custom_values(self):
         config = TimingConfig(
-            executor_poll_interval=0.05,
+            executor_cancel_grace_period=0.05,
             sidebar_update_interval=5.0,
         )
-        assert config.executor_poll_interval == 0.05
+        assert config.executor_cancel_grace_period == 0.05
         assert config.sidebar_update_interval == 5.0
-        assert config.executor_yield_interval == 0.0
+        assert config.agent_loop_interval == 0.1
 
     def test_all_values_are_floats(self):
         config = TimingConfig()
@@ -51,7 +49,7 @@ class TestTimingConfigGlobal:
     def test_get_timing_config_returns_default(self):
         config = get_timing_config()
         assert isinstance(config, TimingConfig)
-        assert config.executor_poll_interval == 0.01
+        assert config.executor_cancel_grace_period == 0.1
 
     def test_get_timing_config_returns_same_instance(self):
         config1 = get_timing_config()
@@ -59,16 +57,16 @@ class TestTimingConfigGlobal:
         assert config1 is config2
 
     def test_set_timing_config(self):
-        custom = TimingConfig(executor_poll_interval=0.1)
+        custom = TimingConfig(executor_cancel_grace_period=0.5)
         set_timing_config(custom)
         config = get_timing_config()
-        assert config.executor_poll_interval == 0.1
+        assert config.executor_cancel_grace_period == 0.5
         assert config is custom
 
     def test_reset_timing_config(self):
-        custom = TimingConfig(executor_poll_interval=0.1)
+        custom = TimingConfig(executor_cancel_grace_period=0.5)
         set_timing_config(custom)
         reset_timing_config()
         config = get_timing_config()
-        assert config.executor_poll_interval == 0.01
+        assert config.executor_cancel_grace_period == 0.1
         assert config is not custom
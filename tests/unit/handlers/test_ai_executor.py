@@ -182,6 +182,111 @@ async def test_execute_ai_no_provider(ai_executor, mock_app):
     assert "not configured" in widget.update_output.call_args[0][0]
 
 
+class TestAIExecutorRAG:
+    @pytest.mark.asyncio
+    async def test_retrieval_overlaps_context_assembly(self, ai_executor, mock_app):
+        import asyncio
+
+        block = BlockState(type=BlockType.AI_RESPONSE, content_input="hi")
+        widget = MagicMock()
+        events = []
+        rag_message = {"role": "user", "content": "ctx"}
+
+        async def retrieve(prompt, provider, top_k):
+            events.append("retrieve")
+            await asyncio.sleep(0)
+            return rag_message
+
+        def build(*args, **kwargs):
+            events.append("build")
+            return MagicMock(
+                messages=[{"role": "user", "content": "old"}],
+                truncated=False,
+                summarized=False,
+                estimated_tokens=10,
+                message_count=1,
+            )
+
+        with (
+            patch("handlers.ai_executor.Config.get", return_value="test-provider"),
+            patch("handlers.ai_executor.get_settings") as mock_settings,
+            patch("prompts.get_prompt_manager") as mock_pm,
+            patch("context.ContextManager.build_messages", side_effect=build),
+            patch.object(ai_executor, "_retrieve_rag_context", side_effect=retrieve),
+            patch.object(
+                ai_executor, "_execute_without_tools", new_callable=AsyncMock
+            ) as mock_exec,
+        ):
+            mock_settings.return_value.ai.use_rag = True
+            mock_settings.return_value.ai.rag_top_k = 3
+            mock_pm.return_value.get_prompt_content.return_value = "System prompt"
+            await ai_executor.execute_ai("hi", block, widget)
+
+        assert events[0] == "retrieve"
+        messages = mock_exec.call_args[0][3]
+        assert messages[0] is rag_message
+        assert messages[1]["content"] == "old"
+
+    @pytest.mark.asyncio
+    async def test_retrieval_cancelled_on_error(self, ai_executor, mock_app):
+        import asyncio
+
+        block = BlockState(type=BlockType.AI_RESPONSE, content_input="hi")
+        widget = MagicMock()
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def retrieve(prompt, provider, top_k):
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        with (
+            patch("handlers.ai_executor.Config.get", return_value="test-provider"),
+            patch("handlers.ai_executor.get_settings") as mock_settings,
+            patch("prompts.get_prompt_manager") as mock_pm,
+            patch(
+                "context.ContextManager.build_messages",
+                side_effect=Exception("Build failed"),
+            ),
+            patch.object(ai_executor, "_retrieve_rag_context", side_effect=retrieve),
+        ):
+            mock_settings.return_value.ai.use_rag = True
+            mock_pm.return_value.get_prompt_content.return_value = "System prompt"
+            await ai_executor.execute_ai("hi", block, widget)
+            await asyncio.wait_for(cancelled.wait(), 1)
+
+        assert started.is_set()
+        assert "Error" in block.content_output
+
+    @pytest.mark.asyncio
+    async def test_retrieve_rag_context_uses_shared_manager(self, ai_executor):
+        chunk = MagicMock(source="a.py", content="code")
+        rag = MagicMock()
+        rag.search = AsyncMock(return_value=[chunk])
+
+        with patch("ai.rag.get_rag_manager", return_value=rag):
+            message = await ai_executor._retrieve_rag_context("q", MagicMock(), 2)
+
+        assert rag.search.call_args[1]["limit"] == 2
+        assert "From a.py" in message["content"]
+        assert "code" in message["content"]
+
+    @pytest.mark.asyncio
+    async def test_inject_rag_context_without_results(self, ai_executor):
+        rag = MagicMock()
+        rag.search = AsyncMock(return_value=[])
+        messages = [{"role": "user", "content": "old"}]
+
+        with patch("ai.rag.get_rag_manager", return_value=rag):
+            result = await ai_executor._inject_rag_context("q", messages, MagicMock())
+
+        assert result is messages
+
+
 class TestAIExecutorToolRegistry:
     def test_get_tool_registry_creates_once(self, ai_executor):
         registry1 = ai_executor._get_tool_registry()
@@ -331,6 +436,35 @@ class TestAIExecutorAgentMode:
 
         mock_app.agent_manager.start_session.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_agent_loop_splits_streamed_thinking(self, ai_executor, mock_app):
+        block = BlockState(type=BlockType.AGENT_RESPONSE, content_input="task")
+        widget = MagicMock()
+        mock_app.agent_manager = MagicMock()
+        mock_app.agent_manager.should_cancel.return_value = False
+        mock_app.agent_manager.should_pause.return_value = False
+        mock_app.agent_manager.end_session.return_value = None
+
+        async def mock_gen(*args, **kwargs):
+            for text in ["<thi", "nk>weigh ", "options</th", "ink>The ", "answer."]:
+                yield StreamChunk(text=text)
+            yield StreamChunk(text="", is_complete=True)
+
+        mock_app.ai_provider.generate_with_tools = mock_gen
+        finalize = MagicMock()
+
+        with (
+            patch("handlers.ai.agent_loop.Config.get", return_value="ollama"),
+            patch.object(ai_executor._tool_runner, "get_registry") as mock_reg,
+        ):
+            mock_reg.return_value.get_all_tools_schema.return_value = []
+            await ai_executor._agent_loop.run_loop(
+                "task", block, widget, [], "System", 100, finalize
+            )
+
+        assert block.content_output == "The answer."
+        assert finalize.call_args.args[2] == "The answer."
+
 
 class TestToolRunnerSessionApproval:
     def test_reset_session_approvals(self, ai_executor):
@@ -433,3 +567,101 @@ class TestToolRunnerSessionApproval:
 
         assert result == "approve"
         assert tool_runner.is_tool_session_approved("read_file") is True
+
+
+class TestToolRunnerScheduling:
+    """Read-only tool calls overlap; everything else stays in order."""
+
+    @pytest.fixture
+    def registry(self):
+        from tools import ToolRegistry
+
+        return ToolRegistry()
+
+    def _calls(self, *names):
+        return [
+            ToolCallData(id=f"call_{i}", name=name, arguments={})
+            for i, name in enumerate(names)
+        ]
+
+    def _track(self, registry, delays):
+        """Patch execute_tool to log start/end events with per-tool delays."""
+        import asyncio
+
+        events = []
+
+        async def execute_tool(tool_call):
+            events.append(("start", tool_call.id))
+            await asyncio.sleep(delays.get(tool_call.name, 0))
+            events.append(("end", tool_call.id))
+            return ToolResult(tool_call.id, f"out {tool_call.id}")
+
+        registry.execute_tool = execute_tool
+        return events
+
+    @pytest.mark.asyncio
+    async def test_read_only_calls_overlap_and_keep_order(self, ai_executor, registry):
+        events = self._track(registry, {"read_file": 0.02, "list_directory": 0.0})
+        block = BlockState(type=BlockType.AI_RESPONSE, content_input="hi")
+
+        results = await ai_executor._tool_runner.process_chat_tools(
+            self._calls("read_file", "list_directory", "read_file"),
+            block,
+            MagicMock(),
+            registry,
+        )
+
+        assert [r.tool_call_id for r in results] == ["call_0", "call_1", "call_2"]
+        assert events[:3] == [
+            ("start", "call_0"),
+            ("start", "call_1"),
+            ("start", "call_2"),
+        ]
+        assert [tc.status for tc in block.tool_calls] == ["success"] * 3
+        exec_output = block.content_exec_output
+        assert exec_output.index("out call_0") < exec_output.index("out call_1")
+
+    @pytest.mark.asyncio
+    async def test_mutating_call_waits_for_earlier_reads(
+        self, ai_executor, mock_app, registry
+    ):
+        events = self._track(registry, {"read_file": 0.01})
+        mock_app.agent_manager = MagicMock()
+        ai_executor._tool_runner.add_session_approved_tools(["write_file"])
+        block = BlockState(type=BlockType.AGENT_RESPONSE, content_input="hi")
+
+        results = await ai_executor._tool_runner.process_agent_tools(
+            self._calls("read_file", "write_file", "read_file"),
+            registry,
+            MagicMock(),
+            block,
+            MagicMock(),
+            False,
+        )
+
+        assert [r.tool_call_id for r in results] == ["call_0", "call_1", "call_2"]
+        assert events == [
+            ("start", "call_0"),
+            ("end", "call_0"),
+            ("start", "call_1"),
+            ("end", "call_1"),
+            ("start", "call_2"),
+            ("end", "call_2"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_parallelism_limit(self, ai_executor, mock_app, registry):
+        events = self._track(registry, {"read_file": 0.01})
+        mock_app.config.get.return_value = {"agent_tool_parallelism": 1}
+        block = BlockState(type=BlockType.AI_RESPONSE, content_input="hi")
+
+        await ai_executor._tool_runner.process_chat_tools(
+            self._calls("read_file", "read_file"), block, MagicMock(), registry
+        )
+
+        assert events == [
+            ("start", "call_0"),
+            ("end", "call_0"),
+            ("start", "call_1"),
+            ("end", "call_1"),
+        ]
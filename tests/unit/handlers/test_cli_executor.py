@@ -1,3 +1,4 @@
+import os
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -61,3 +62,84 @@ async def test_execute_cli_append(cli_executor, mock_app):
             # Should append exit code to output, not call set_exit_code
             assert "\n[exit: 1]\n" in block.content_output
             widget.update_output.assert_called()
+
+
+@pytest.mark.asyncio
+async def test_persistent_shell_is_passed_and_cwd_followed(
+    cli_executor, mock_app, tmp_path, monkeypatch
+):
+    monkeypatch.chdir(tmp_path)
+    block = BlockState(type=BlockType.COMMAND, content_input="cd /")
+    widget = MagicMock()
+    session = MagicMock(alive=True, shell="/bin/bash", cwd="/")
+    session.start = AsyncMock(return_value=True)
+    settings = MagicMock()
+    settings.terminal.persistent_shell = True
+    settings.terminal.shell = "/bin/bash"
+    mock_app.branch_manager.current_branch = "main"
+
+    with (
+        patch("handlers.cli_executor.get_settings", return_value=settings),
+        patch("handlers.cli_executor.ShellSession", return_value=session),
+        patch("handlers.cli_executor.ExecutionEngine") as MockEngine,
+    ):
+        engine_instance = MockEngine.return_value
+        engine_instance.run_command_and_get_rc = AsyncMock(return_value=0)
+        engine_instance.pid = None
+
+        with patch("asyncio.Event") as MockEvent:
+            MockEvent.return_value.wait = AsyncMock()
+            await cli_executor.execute_cli(block, widget)
+            await cli_executor.execute_cli(block, widget)
+
+    session.start.assert_awaited_once()
+    call = engine_instance.run_command_and_get_rc.call_args
+    assert call.kwargs["session"] is session
+    assert os.getcwd() == "/"
+    mock_app._update_prompt.assert_called()
+
+
+@pytest.mark.asyncio
+async def test_persistent_shell_start_failure_falls_back(cli_executor, mock_app):
+    settings = MagicMock()
+    settings.terminal.persistent_shell = True
+    settings.terminal.shell = "/bin/bash"
+    session = MagicMock()
+    session.start = AsyncMock(return_value=False)
+
+    with (
+        patch("handlers.cli_executor.get_settings", return_value=settings),
+        patch("handlers.cli_executor.ShellSession", return_value=session),
+    ):
+        assert await cli_executor._get_shell_session() is None
+        assert await cli_executor._get_shell_session() is None
+
+    session.start.assert_awaited_once()
+    mock_app.notify.assert_called_once()
+
+
+def test_runs_in_shell_session(cli_executor, mock_app):
+    settings = MagicMock()
+    settings.terminal.persistent_shell = True
+    settings.terminal.shell = "/bin/bash"
+    mock_app.branch_manager.current_branch = "main"
+    session = MagicMock(available=True, shell="/bin/bash")
+    session.encode.return_value = b"eval $'cd /tmp'\n"
+
+    with patch("handlers.cli_executor.get_settings", return_value=settings):
+        # Nothing started yet
+        assert not cli_executor.runs_in_shell_session("cd /tmp")
+
+        cli_executor._shell_sessions["main"] = session
+        assert cli_executor.runs_in_shell_session("cd /tmp")
+
+        session.available = False
+        assert not cli_executor.runs_in_shell_session("cd /tmp")
+
+        session.available = True
+        session.encode.return_value = None
+        assert not cli_executor.runs_in_shell_session("cd /tmp")
+
+        session.encode.return_value = b"line"
+        settings.terminal.shell = "/usr/bin/fish"
+        assert not cli_executor.runs_in_shell_session("cd /tmp")
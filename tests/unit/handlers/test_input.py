@@ -135,3 +135,28 @@ async def test_handle_builtin_pwd(input_handler, mock_app):
     success = await input_handler.handle_builtin("pwd")
     assert success is True
     mock_app._show_system_output.assert_called()
+
+
+@pytest.mark.asyncio
+async def test_handle_builtin_cd_left_to_persistent_shell(input_handler, mock_app):
+    settings = MagicMock()
+    settings.terminal.persistent_shell = True
+    cli_executor = mock_app.execution_handler.cli_executor
+    cli_executor.runs_in_shell_session.return_value = True
+    with patch("handlers.input.get_settings", return_value=settings):
+        with patch("os.chdir") as mock_chdir:
+            assert await input_handler.handle_builtin("cd /tmp") is False
+            mock_chdir.assert_not_called()
+    cli_executor.runs_in_shell_session.assert_called_once_with("cd /tmp")
+
+
+@pytest.mark.asyncio
+async def test_handle_builtin_cd_without_usable_shell_session(input_handler, mock_app):
+    settings = MagicMock()
+    settings.terminal.persistent_shell = True
+    cli_executor = mock_app.execution_handler.cli_executor
+    cli_executor.runs_in_shell_session.return_value = False
+    with patch("handlers.input.get_settings", return_value=settings):
+        with patch.object(input_handler, "_handle_cd", AsyncMock()) as mock_cd:
+            assert await input_handler.handle_builtin("cd /tmp") is True
+            mock_cd.assert_awaited_once_with("cd /tmp")
@@ -1,9 +1,10 @@
 import asyncio
+import json
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from mcp.client import MCPClient
+from mcp.client import MCPClient, decode_message
 from mcp.config import MCPServerConfig
 
 
@@ -92,6 +93,175 @@ async def test_read_resource(client):
         assert content == "data"
 
 
+@pytest.mark.asyncio
+async def test_tools_list_changed_rediscovers(client):
+    client.process = AsyncMock()
+    client.process.stdin.write = MagicMock()
+    client.process.stdin.drain = AsyncMock()
+    version = client.catalog_version
+
+    with patch.object(
+        client,
+        "_send_request",
+        AsyncMock(return_value={"tools": [{"name": "search"}]}),
+    ):
+        await client._handle_message(
+            {"jsonrpc": "2.0", "method": "notifications/tools/list_changed"}
+        )
+        await asyncio.gather(*client._refresh_tasks)
+
+    assert [tool.name for tool in client.tools] == ["search"]
+    assert client.catalog_version == version + 1
+
+
+def _connected_process(lines=(), limit=2**16):
+    """Mock process whose stdout yields the given lines, then blocks."""
+    process = MagicMock()
+    process.stdin.write = MagicMock()
+    process.stdin.drain = AsyncMock()
+    process.stdout = asyncio.StreamReader(limit=limit)
+    for line in lines:
+        process.stdout.feed_data(line)
+    return process
+
+
+def _response(request_id, result):
+    return (
+        json.dumps({"jsonrpc": "2.0", "id": request_id, "result": result}) + "\n"
+    ).encode()
+
+
+async def _run_read_loop(client, *futures):
+    with patch("mcp.client.asyncio.create_task") as create_task:
+        read_task = asyncio.ensure_future(client._read_loop())
+        results = await asyncio.wait_for(
+            asyncio.gather(*futures, return_exceptions=True), 1
+        )
+        read_task.cancel()
+        await asyncio.gather(read_task, return_exceptions=True)
+
+    create_task.assert_not_called()  # no reconnect was scheduled
+    return results
+
+
+@pytest.mark.asyncio
+async def test_read_loop_fails_request_with_oversized_response(client):
+    loop = asyncio.get_running_loop()
+    big, small = loop.create_future(), loop.create_future()
+    client._pending_requests = {1: big, 2: small}
+    client._connected = True
+    client.process = _connected_process(
+        [_response(1, {"data": "x" * 500}), _response(2, {"ok": True})], limit=128
+    )
+
+    error, result = await _run_read_loop(client, big, small)
+
+    assert "exceeds max_message_bytes" in str(error)
+    assert result == {"ok": True}
+
+
+@pytest.mark.asyncio
+async def test_read_loop_fails_all_pending_on_unattributable_message(client):
+    loop = asyncio.get_running_loop()
+    first, second = loop.create_future(), loop.create_future()
+    client._pending_requests = {1: first, 2: second}
+    client._connected = True
+    oversized = json.dumps({"result": "x" * 500, "jsonrpc": "2.0", "id": 1})
+    client.process = _connected_process([oversized.encode() + b"\n"], limit=128)
+
+    results = await _run_read_loop(client, first, second)
+
+    assert all("exceeds max_message_bytes" in str(r) for r in results)
+    assert client._pending_requests == {}
+
+
+@pytest.mark.asyncio
+async def test_read_loop_drops_oversized_notification(client):
+    pending = asyncio.get_running_loop().create_future()
+    client._pending_requests = {1: pending}
+    client._connected = True
+    notification = json.dumps(
+        {"jsonrpc": "2.0", "method": "notifications/message", "params": "x" * 500}
+    )
+    client.process = _connected_process(
+        [notification.encode() + b"\n", _response(1, {"ok": True})], limit=128
+    )
+
+    assert await _run_read_loop(client, pending) == [{"ok": True}]
+
+
+@pytest.mark.asyncio
+async def test_large_messages_decode_off_loop():
+    line = json.dumps({"data": "x" * 300_000}).encode()
+    with patch("mcp.client.asyncio.to_thread", wraps=asyncio.to_thread) as to_thread:
+        message = await decode_message(line)
+    assert len(message["data"]) == 300_000
+    to_thread.assert_called_once()
+
+    with patch("mcp.client.asyncio.to_thread") as to_thread:
+        assert await decode_message(b'{"a": 1}') == {"a": 1}
+    to_thread.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_server_ping_is_answered(client):
+    client.process = _connected_process([])
+    await client._handle_message({"jsonrpc": "2.0", "id": 7, "method": "ping"})
+
+    sent = json.loads(client.process.stdin.write.call_args[0][0])
+    assert sent == {"jsonrpc": "2.0", "id": 7, "result": {}}
+
+
+@pytest.mark.asyncio
+async def test_log_notifications_are_recorded(client):
+    on_log = MagicMock()
+    client._on_log = on_log
+    await client._handle_message(
+        {
+            "jsonrpc": "2.0",
+            "method": "notifications/message",
+            "params": {"level": "warning", "data": "disk low"},
+        }
+    )
+    assert list(client.log_messages) == [("warning", "disk low")]
+    on_log.assert_called_once_with("test_server", "warning", "disk low")
+
+
+@pytest.mark.asyncio
+async def test_request_uses_method_timeout(client):
+    client.config.timeouts = {"tools/list": 0.01}
+    client.process = _connected_process([])
+    with pytest.raises(Exception, match="Request timeout: tools/list"):
+        await client._send_request("tools/list", {})
+    assert client._pending_requests == {}
+
+
+@pytest.mark.asyncio
+async def test_progress_extends_request_timeout(client):
+    client.config.timeouts = {"tools/call": 0.05}
+    client.process = _connected_process([])
+
+    async def respond():
+        for _ in range(3):
+            await asyncio.sleep(0.03)
+            await client._handle_message(
+                {
+                    "jsonrpc": "2.0",
+                    "method": "notifications/progress",
+                    "params": {"progressToken": 1, "progress": 1},
+                }
+            )
+        await client._handle_message({"jsonrpc": "2.0", "id": 1, "result": "done"})
+
+    responder = asyncio.ensure_future(respond())
+    result = await client._send_request("tools/call", {"name": "slow"})
+    await responder
+
+    assert result == "done"
+    sent = json.loads(client.process.stdin.write.call_args_list[0][0][0])
+    assert sent["params"]["_meta"] == {"progressToken": 1}
+
+
 @pytest.mark.asyncio
 async def test_call_tool_not_connected(client):
     client._connected = False
@@ -0,0 +1,143 @@
+import asyncio
+import json
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from mcp.client import MCPClient
+from mcp.config import MCPServerConfig
+from mcp.http_transport import SESSION_HEADER
+
+URL = "http://mcp.test/mcp"
+
+
+class StandInServer:
+    """Minimal streamable HTTP MCP server for the transport tests."""
+
+    def __init__(self):
+        self.requests: list[httpx.Request] = []
+        self.calls_started = 0
+        self.both_started = asyncio.Event()
+        self.sse_calls = False
+
+    def sse(self, *events: tuple[str, dict]) -> httpx.Response:
+        body = "".join(
+            f"id: {event_id}\ndata: {json.dumps(message)}\n\n"
+            for event_id, message in events
+        )
+        return httpx.Response(
+            200, headers={"content-type": "text/event-stream"}, content=body
+        )
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if request.method == "DELETE":
+            return httpx.Response(200)
+        if request.method == "GET":
+            if request.headers.get("Last-Event-ID") == "1":
+                return self.sse(
+                    ("2", {"jsonrpc": "2.0", "id": 4, "result": {"resumed": True}})
+                )
+            return httpx.Response(405)
+
+        message = json.loads(request.content)
+        method = message.get("method")
+        if "id" not in message:
+            return httpx.Response(202)
+
+        reply: dict = {"jsonrpc": "2.0", "id": message["id"]}
+        headers = {}
+        if method == "initialize":
+            reply["result"] = {"protocolVersion": "2025-03-26"}
+            headers[SESSION_HEADER] = "session-1"
+        elif method == "tools/list":
+            reply["result"] = {"tools": [{"name": "search"}]}
+        elif method == "resources/list":
+            reply["result"] = {"resources": []}
+        elif method == "tools/call":
+            if self.sse_calls:
+                # Drop the stream before the reply; it is resumed from id 1
+                return self.sse(
+                    (
+                        "1",
+                        {
+                            "jsonrpc": "2.0",
+                            "method": "notifications/progress",
+                            "params": {"progressToken": message["id"]},
+                        },
+                    )
+                )
+            self.calls_started += 1
+            if self.calls_started == 2:
+                self.both_started.set()
+            await asyncio.wait_for(self.both_started.wait(), 1)
+            reply["result"] = {"content": [{"text": message["params"]["name"]}]}
+        return httpx.Response(200, json=reply, headers=headers)
+
+
+@pytest.fixture
+def server():
+    return StandInServer()
+
+
+@pytest.fixture
+def client(server):
+    http = httpx.AsyncClient(transport=httpx.MockTransport(server.handle))
+
+    async def pooled_client(key, **kwargs):
+        return http
+
+    config = MCPServerConfig(name="shared", command="", transport="http", url=URL)
+    with patch("mcp.http_transport.get_pooled_client", pooled_client):
+        yield MCPClient(config)
+
+
+@pytest.mark.asyncio
+async def test_connect_over_http(client, server):
+    assert await client.connect()
+
+    assert client.is_connected
+    assert [tool.name for tool in client.tools] == ["search"]
+    assert client._transport.session_id == "session-1"
+    # Every request after initialize carries the session id
+    assert all(
+        request.headers.get(SESSION_HEADER) == "session-1"
+        for request in server.requests[1:]
+    )
+
+    await client.disconnect()
+    assert server.requests[-1].method == "DELETE"
+    assert not client.is_connected
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests(client, server):
+    assert await client.connect()
+
+    results = await asyncio.gather(
+        client.call_tool("first", {}), client.call_tool("second", {})
+    )
+
+    assert [r["content"][0]["text"] for r in results] == ["first", "second"]
+    await client.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_dropped_stream_is_resumed(client, server):
+    assert await client.connect()
+    server.sse_calls = True
+
+    result = await client.call_tool("slow", {})
+
+    assert result == {"resumed": True}
+    resume = server.requests[-1]
+    assert resume.method == "GET"
+    assert resume.headers["Last-Event-ID"] == "1"
+    await client.disconnect()
+
+
+def test_http_transport_config():
+    config = MCPServerConfig.from_dict("shared", {"url": URL})
+    assert config.transport == "http"
+    assert config.to_dict()["url"] == URL
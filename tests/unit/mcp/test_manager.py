@@ -108,3 +108,96 @@ async def test_call_tool(manager):
 async def test_call_tool_not_found(manager):
     with pytest.raises(Exception, match="Tool not found"):
         await manager.call_tool("missing", {})
+
+
+@pytest.mark.asyncio
+async def test_call_tool_coalesces_concurrent_calls(manager):
+    import asyncio
+
+    async def slow_call(name, args):
+        await asyncio.sleep(0.01)
+        return "result"
+
+    client_mock = MagicMock()
+    client_mock.is_connected = True
+    client_mock.call_tool = AsyncMock(side_effect=slow_call)
+    tool_mock = MagicMock()
+    tool_mock.name = "search"
+    tool_mock.server_name = "test_server"
+    client_mock.tools = [tool_mock]
+    manager.clients["test_server"] = client_mock
+
+    results = await asyncio.gather(
+        manager.call_tool("search", {"q": "x"}),
+        manager.call_tool("search", {"q": "x"}),
+    )
+
+    assert results == ["result", "result"]
+    assert client_mock.call_tool.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_read_resource_is_cached(manager):
+    resource = MagicMock()
+    resource.uri = "file:///notes.txt"
+    client_mock = MagicMock()
+    client_mock.config.name = "files"
+    client_mock.resources = [resource]
+    client_mock.read_resource = AsyncMock(return_value="contents")
+    manager.clients["files"] = client_mock
+    manager.deduplicator.set_server_policy("files", {"ttl": 60})
+
+    assert await manager.read_resource("file:///notes.txt") == "contents"
+    assert await manager.read_resource("file:///notes.txt") == "contents"
+
+    client_mock.read_resource.assert_awaited_once_with("file:///notes.txt")
+    assert manager.deduplicator.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_connect_server_applies_cache_policy(manager, mock_config):
+    server = MCPServerConfig(
+        name="test", command="echo", cache={"ttl": 30, "tools": {"search": {}}}
+    )
+    mock_config.servers = {"test": server}
+
+    with patch("mcp.manager.MCPClient") as MockClient:
+        MockClient.return_value.connect = AsyncMock(return_value=True)
+        await manager.connect_server("test")
+
+    key, policy = manager.deduplicator._get_policy("search", "test")
+    assert key == "test/search"
+    assert policy.ttl == 30
+
+
+def test_tool_index_rebuilds_on_catalog_change(manager):
+    first = MagicMock()
+    first.name = "search"
+    client_mock = MagicMock()
+    client_mock.tools = [first]
+    client_mock.resources = []
+    client_mock.catalog_version = 1
+    manager.clients["test_server"] = client_mock
+
+    assert manager.get_tool("search") is first
+    generation = manager.tools_generation
+    assert manager.tools_generation == generation
+
+    second = MagicMock()
+    second.name = "fetch"
+    client_mock.tools = [second]
+    client_mock.catalog_version = 2
+
+    assert manager.get_tool("search") is None
+    assert manager.get_tool("fetch") is second
+    assert manager.tools_generation == generation + 1
+
+    del manager.clients["test_server"]
+    assert manager.get_all_tools() == []
+    assert manager.tools_generation == generation + 2
+
+
+@pytest.mark.asyncio
+async def test_read_resource_not_found(manager):
+    with pytest.raises(Exception, match="Resource not found"):
+        await manager.read_resource("file:///missing")
@@ -54,6 +54,28 @@ class TestMCPServerConfig:
         }
         assert "name" not in result
 
+    def test_cache_policy_round_trip(self):
+        cache = {"ttl": 30, "tools": {"search": {"ttl": 300}}}
+        config = MCPServerConfig.from_dict("srv", {"command": "x", "cache": cache})
+        assert config.cache == cache
+        assert config.to_dict()["cache"] == cache
+
+    def test_transport_limits_round_trip(self):
+        config = MCPServerConfig.from_dict(
+            "srv",
+            {
+                "command": "x",
+                "timeouts": {"tools/call": 120},
+                "max_message_bytes": 0,
+            },
+        )
+        assert config.timeouts == {"tools/call": 120}
+        assert config.max_message_bytes == 0
+        data = config.to_dict()
+        assert data["timeouts"] == {"tools/call": 120}
+        assert data["max_message_bytes"] == 0
+        assert "timeouts" not in MCPServerConfig("srv", "x").to_dict()
+
 
 class TestMCPConfig:
     @pytest.fixture
@@ -1,5 +1,6 @@
 import asyncio
 import time
+from unittest.mock import AsyncMock
 
 import pytest
 
@@ -119,3 +120,130 @@ class TestRequestDeduplicator:
 
         await asyncio.gather(writer(), reader())
         assert dedup.cache_size == 10
+
+
+class TestRequestCoalescing:
+    @pytest.mark.asyncio
+    async def test_identical_in_flight_calls_share_one_fetch(self):
+        dedup = RequestDeduplicator()
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"n": calls}
+
+        results = await asyncio.gather(
+            *(dedup.call("search", {"q": "x"}, fetch) for _ in range(3))
+        )
+
+        assert calls == 1
+        assert results == [{"n": 1}] * 3
+        assert dedup.misses == 1
+        assert dedup.coalesced == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_call_is_not_cached(self):
+        dedup = RequestDeduplicator()
+
+        async def fail():
+            raise RuntimeError("boom")
+
+        async def succeed():
+            return "ok"
+
+        with pytest.raises(RuntimeError):
+            await dedup.call("tool", {}, fail)
+        assert await dedup.call("tool", {}, succeed) == "ok"
+        assert dedup.get_stats()["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        dedup = RequestDeduplicator()
+        release = asyncio.Event()
+
+        async def fetch():
+            await release.wait()
+            return "done"
+
+        first = asyncio.create_task(dedup.call("tool", {}, fetch))
+        second = asyncio.create_task(dedup.call("tool", {}, fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        release.set()
+
+        assert await second == "done"
+
+    @pytest.mark.asyncio
+    async def test_disabled_always_fetches(self):
+        dedup = RequestDeduplicator(enabled=False)
+        fetch = AsyncMock(return_value="r")
+
+        await dedup.call("tool", {}, fetch)
+        await dedup.call("tool", {}, fetch)
+
+        assert fetch.await_count == 2
+
+
+class TestCachePolicies:
+    @pytest.mark.asyncio
+    async def test_tool_policy_overrides_server_ttl(self):
+        dedup = RequestDeduplicator(dedup_window=0.01)
+        dedup.set_server_policy("srv", {"ttl": 0, "tools": {"search": {"ttl": 60}}})
+
+        await dedup.cache_result("search", {}, "kept", server_name="srv")
+        await dedup.cache_result("write", {}, "skipped", server_name="srv")
+        await asyncio.sleep(0.02)
+
+        assert await dedup.get_cached("search", {}) == (True, "kept")
+        assert await dedup.get_cached("write", {}) == (False, None)
+
+    @pytest.mark.asyncio
+    async def test_policy_max_entries_evicts_least_recently_used(self):
+        dedup = RequestDeduplicator()
+        dedup.set_server_policy("srv", {"ttl": 60, "max_entries": 2})
+
+        await dedup.cache_result("t", {"i": 1}, "a", server_name="srv")
+        await dedup.cache_result("t", {"i": 2}, "b", server_name="srv")
+        await dedup.get_cached("t", {"i": 1})
+        await dedup.cache_result("t", {"i": 3}, "c", server_name="srv")
+
+        assert (await dedup.get_cached("t", {"i": 1}))[0] is True
+        assert (await dedup.get_cached("t", {"i": 2}))[0] is False
+        assert dedup.evictions == 1
+
+    @pytest.mark.asyncio
+    async def test_global_byte_budget(self):
+        dedup = RequestDeduplicator(max_bytes=20)
+
+        await dedup.cache_result("t", {"i": 1}, "x" * 10)
+        await dedup.cache_result("t", {"i": 2}, "y" * 10)
+
+        assert dedup.cache_size == 1
+        assert dedup.cache_bytes <= 20
+        assert (await dedup.get_cached("t", {"i": 2}))[0] is True
+
+    @pytest.mark.asyncio
+    async def test_oversized_result_not_cached(self):
+        dedup = RequestDeduplicator()
+        dedup.set_server_policy("srv", {"max_bytes": 8})
+
+        await dedup.cache_result("t", {}, "too large to keep", server_name="srv")
+
+        assert dedup.cache_size == 0
+
+    @pytest.mark.asyncio
+    async def test_invalidate_server(self):
+        dedup = RequestDeduplicator()
+        await dedup.cache_result("t", {"i": 1}, "a", server_name="one")
+        await dedup.cache_result("t", {"i": 2}, "b", server_name="two")
+
+        assert dedup.invalidate_server("one") == 1
+        assert dedup.cache_size == 1
+
+    def test_clear_server_policy(self):
+        dedup = RequestDeduplicator()
+        dedup.set_server_policy("srv", {"ttl": 5, "tools": {"search": {"ttl": 60}}})
+        dedup.clear_server_policy("srv")
+        assert dedup._get_policy("search", "srv") == ("", None)
@@ -224,6 +224,23 @@ class TestBlockState:
         assert restored.content_output == original.content_output
         assert restored.content_thinking == original.content_thinking
 
+    def test_revision_changes_on_assignment(self):
+        """Test revision tracks field reassignment."""
+        block = BlockState(type=BlockType.COMMAND, content_input="ls")
+        revision = block.revision
+
+        block.content_output += "file1"
+        assert block.revision > revision
+
+    def test_revision_ignores_same_value(self):
+        """Test assigning the same object leaves revision unchanged."""
+        block = BlockState(type=BlockType.COMMAND, content_input="ls")
+        block.is_running = False
+        revision = block.revision
+
+        block.is_running = False
+        assert block.revision == revision
+
 
 class TestExportToJson:
     def test_returns_valid_json_string(self):
@@ -59,6 +59,7 @@ def mock_managers():
     mock_storage.get_config.return_value = "true"  # disclaimer_accepted
     mock_storage.set_config = MagicMock()
     mock_storage.get_last_history.return_value = []
+    mock_storage.with_older_blocks.side_effect = list
     mocks["storage"] = mock_storage
 
     return mocks
@@ -351,6 +352,22 @@ class TestDoExport:
         mock_save.assert_called_once_with([mock_block], "md")
         assert "Exported to /tmp/export.md" in mock_notify.call_args[0][0]
 
+    def test_do_export_includes_unloaded_blocks(self, null_app_with_mocks, monkeypatch):
+        """_do_export should export blocks a paged restore left on disk."""
+        app, managers, _config, _settings = null_app_with_mocks
+
+        older, loaded = MagicMock(), MagicMock()
+        app.blocks = [loaded]
+        managers["storage"].with_older_blocks.side_effect = lambda b: [older, *b]
+
+        mock_save = MagicMock(return_value="/tmp/export.md")
+        monkeypatch.setattr("models.save_export", mock_save)
+        monkeypatch.setattr(app, "notify", MagicMock())
+
+        app._do_export("md")
+
+        mock_save.assert_called_once_with([older, loaded], "md")
+
     def test_do_export_handles_exception(self, null_app_with_mocks, monkeypatch):
         """_do_export should notify on exception."""
         app, _managers, _config, _settings = null_app_with_mocks
@@ -452,6 +469,23 @@ class TestActionQuickExport:
         mock_do_export.assert_called_once_with("md")
 
 
+class TestActionToggleAgentMode:
+    """Tests for NullApp.action_toggle_agent_mode() method."""
+
+    def test_toggle_reads_stored_strings(self, null_app_with_mocks, monkeypatch):
+        """Stored '1'/'0' values should toggle like booleans."""
+        app, _managers, config, _settings = null_app_with_mocks
+        monkeypatch.setattr(app, "notify", MagicMock())
+
+        config.get.return_value = "0"
+        app.action_toggle_agent_mode()
+        config.set.assert_called_with("ai.agent_mode", "true")
+
+        config.get.return_value = "1"
+        app.action_toggle_agent_mode()
+        config.set.assert_called_with("ai.agent_mode", "false")
+
+
 class TestActionClearHistory:
     """Tests for NullApp.action_clear_history() method."""
 
@@ -582,6 +616,40 @@ class TestPushScreenWait:
 # ---------------------------------------------------------------------------
 
 
+class TestLoadOlderBlocks:
+    """Tests for loading older session blocks on scroll-back."""
+
+    def test_reached_top_without_older_blocks(self, null_app_with_mocks):
+        """ReachedTop should do nothing when every block is loaded."""
+        app, managers, _config, _settings = null_app_with_mocks
+        managers["storage"].has_older_blocks.return_value = False
+        app.run_worker = MagicMock()
+
+        app.on_history_viewport_reached_top(MagicMock())
+
+        app.run_worker.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_older_blocks_are_prepended(self, null_app_with_mocks):
+        """_load_older_blocks should put the page before the loaded blocks."""
+        from models import BlockState, BlockType
+
+        app, managers, _config, _settings = null_app_with_mocks
+        older = BlockState(type=BlockType.COMMAND, content_input="old")
+        current = BlockState(type=BlockType.COMMAND, content_input="new")
+        app.blocks = [current]
+        managers["storage"].load_older_blocks.return_value = [older]
+        history = MagicMock()
+        history.prepend_blocks = AsyncMock()
+        app.query_one = MagicMock(return_value=history)
+
+        await app._load_older_blocks()
+
+        assert app.blocks == [older, current]
+        history.prepend_blocks.assert_awaited_once()
+        assert app._loading_older_blocks is False
+
+
 class TestPerformExit:
     """Tests for NullApp._perform_exit() method."""
 
@@ -609,7 +677,7 @@ class TestPerformExit:
 
         await app._perform_exit(clear_session=True)
 
-        managers["storage"].save_current_session.assert_called_with([])
+        managers["storage"].clear_current_session.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_perform_exit_calls_exit(self, null_app_with_mocks):
@@ -622,6 +690,17 @@ class TestPerformExit:
 
         app.exit.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_perform_exit_flushes_session(self, null_app_with_mocks):
+        """_perform_exit should wait for pending session writes."""
+        app, managers, _config, _settings = null_app_with_mocks
+
+        app.exit = MagicMock()
+
+        await app._perform_exit(clear_session=False)
+
+        managers["storage"].flush_session.assert_called_once()
+
 
 # ---------------------------------------------------------------------------
 # Test: Async Init Methods
@@ -1,6 +1,9 @@
 """Unit tests for context.py - ContextInfo and ContextManager."""
 
-from context import ContextInfo, ContextManager
+from unittest.mock import patch
+
+from ai.token_counter import TokenCounter
+from context import ContextIndex, ContextInfo, ContextManager
 from models import BlockState, BlockType
 
 
@@ -341,6 +344,131 @@ class TestContextManagerBuildMessages:
         assert len(info.messages) == 0
 
 
+def _finished(content_input: str) -> BlockState:
+    return BlockState(
+        type=BlockType.AI_QUERY, content_input=content_input, is_running=False
+    )
+
+
+class TestContextIndex:
+    """Tests for the incremental ContextIndex."""
+
+    def test_finished_blocks_converted_once(self):
+        index = ContextIndex()
+        blocks = [
+            _finished("first"),
+            _finished("second"),
+        ]
+        index.snapshot(blocks)
+        blocks.append(_finished("third"))
+
+        with patch.object(
+            ContextManager, "_block_to_message", wraps=ContextManager._block_to_message
+        ) as convert:
+            snapshot = index.snapshot(blocks)
+
+        assert convert.call_count == 1
+        assert [m["content"] for m in snapshot.messages] == [
+            "first",
+            "second",
+            "third",
+        ]
+        assert snapshot.chars == [0, 5, 11, 16]
+
+    def test_running_blocks_reconverted(self):
+        index = ContextIndex()
+        block = BlockState(type=BlockType.AI_RESPONSE, content_input="")
+        block.content_output = "partial"
+        assert index.snapshot([block]).messages[0]["content"] == "partial"
+
+        block.content_output = "partial answer"
+        assert index.snapshot([block]).messages[0]["content"] == "partial answer"
+
+    def test_edited_block_updates_prefix_sums(self):
+        index = ContextIndex()
+        blocks = [
+            _finished("aaaa"),
+            _finished("bb"),
+        ]
+        index.snapshot(blocks)
+        blocks[0].content_input = "a"
+
+        snapshot = index.snapshot(blocks)
+
+        assert snapshot.chars == [0, 1, 3]
+        assert snapshot.costs == [0, 1, 3]
+
+    def test_removed_blocks_dropped(self):
+        index = ContextIndex()
+        blocks = [
+            _finished("old"),
+            _finished("new"),
+        ]
+        index.snapshot(blocks)
+
+        snapshot = index.snapshot(blocks[1:])
+
+        assert [m["content"] for m in snapshot.messages] == ["new"]
+        assert set(index._entries) == {blocks[1].id}
+
+    def test_costs_use_token_counter(self):
+        index = ContextIndex()
+        counter = TokenCounter(provider="anthropic", model="claude")
+        message = {"role": "user", "content": "hello there"}
+        blocks = [_finished("hello there")]
+
+        snapshot = index.snapshot(blocks, counter)
+
+        assert snapshot.costs == [0, counter.count_message_tokens(message)]
+
+    def test_snapshot_messages_are_copies(self):
+        index = ContextIndex()
+        blocks = [_finished("keep")]
+        index.snapshot(blocks).messages[0]["content"] = "changed"
+
+        assert index.snapshot(blocks).messages[0]["content"] == "keep"
+
+    def test_fit_start_keeps_newest(self):
+        index = ContextIndex()
+        blocks = [_finished("x" * size) for size in (100, 50, 20, 10)]
+        snapshot = index.snapshot(blocks)
+
+        assert snapshot.fit_start(30) == 2
+        assert snapshot.fit_start(29) == 3
+        assert snapshot.fit_start(1000) == 0
+
+
+class TestContextManagerTokenCounter:
+    """Tests for build_messages with a TokenCounter."""
+
+    def test_estimated_tokens_from_counter(self):
+        counter = TokenCounter(provider="anthropic", model="claude")
+        blocks = [BlockState(type=BlockType.AI_QUERY, content_input="a" * 100)]
+
+        info = ContextManager.build_messages(blocks, token_counter=counter)
+
+        assert info.total_chars == 100
+        assert info.estimated_tokens == counter.count_message_tokens(
+            {"role": "user", "content": "a" * 100}
+        )
+
+    def test_fits_window_in_tokens(self):
+        counter = TokenCounter(provider="anthropic", model="claude")
+        blocks = [
+            BlockState(type=BlockType.AI_QUERY, content_input=f"OLD{i}" + "x" * 200)
+            for i in range(3)
+        ]
+        blocks.append(BlockState(type=BlockType.AI_QUERY, content_input="NEWEST"))
+
+        info = ContextManager.build_messages(
+            blocks, max_tokens=100, reserve_tokens=20, token_counter=counter
+        )
+
+        assert info.truncated is True
+        assert info.estimated_tokens <= 80
+        assert info.messages[-1]["content"] == "NEWEST"
+
+
 class TestContextManagerEstimateTotalTokens:
     """Tests for ContextManager.estimate_total_tokens()."""
 
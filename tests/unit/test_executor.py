@@ -0,0 +1,178 @@
+"""Unit tests for executor.py - PTY-backed ExecutionEngine."""
+
+import asyncio
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import executor
+from executor import ExecutionEngine, LineFramer
+
+
+@pytest.fixture(autouse=True)
+def sh_shell():
+    settings = MagicMock()
+    settings.terminal.shell = "/bin/sh"
+    with patch("executor.get_settings", return_value=settings):
+        yield
+
+
+@pytest.fixture(params=["pidfd", "thread"])
+def exit_watch(request, monkeypatch):
+    """Run each test with the pidfd and the waitpid-thread exit watchers."""
+    if request.param == "pidfd" and not hasattr(os, "pidfd_open"):
+        pytest.skip("pidfd_open not available")
+    if request.param == "thread":
+        monkeypatch.delattr(os, "pidfd_open", raising=False)
+    return request.param
+
+
+async def run(engine: ExecutionEngine, command: str) -> tuple[int, str]:
+    output: list[str] = []
+    rc = await asyncio.wait_for(
+        engine.run_command_and_get_rc(command, output.append), timeout=10
+    )
+    return rc, "".join(output)
+
+
+class TestLineFramer:
+    def test_feed_returns_complete_lines(self):
+        framer = LineFramer()
+
+        assert framer.feed(b"one\ntwo\nthr") == "one\ntwo\n"
+        assert framer.pending == b"thr"
+        assert framer.feed(b"ee\n") == "three\n"
+        assert framer.pending == b""
+
+    def test_feed_without_newline(self):
+        framer = LineFramer()
+
+        assert framer.feed(b"partial") == ""
+        assert framer.take_pending() == "partial"
+        assert framer.pending == b""
+
+    def test_strips_carriage_returns_before_newline(self):
+        framer = LineFramer()
+
+        assert framer.feed(b"a\r\nb\r\r\nc\rd\n") == "a\nb\nc\rd\n"
+
+    def test_multibyte_split_across_reads(self):
+        framer = LineFramer()
+        data = "héllo\n".encode()
+
+        assert framer.feed(data[:2]) == ""
+        assert framer.feed(data[2:]) == "héllo\n"
+
+    def test_large_burst(self):
+        framer = LineFramer()
+        data = b"".join(b"line %d\n" % i for i in range(100_000))
+
+        text = framer.feed(data[:-3]) + framer.feed(data[-3:])
+
+        assert text.count("\n") == 100_000
+
+    def test_reset_and_discard(self):
+        framer = LineFramer()
+        framer.feed(b"abc")
+        framer.discard()
+        assert framer.pending == b""
+
+        framer.feed(b"\xc3")
+        framer.reset()
+        assert framer.feed(b"x\n") == "x\n"
+
+
+class TestRunCommand:
+    @pytest.mark.asyncio
+    async def test_output_and_exit_code(self, exit_watch):
+        rc, output = await run(ExecutionEngine(), "echo hello; echo world")
+
+        assert rc == 0
+        assert output == "hello\nworld\n"
+
+    @pytest.mark.asyncio
+    async def test_nonzero_exit_code(self, exit_watch):
+        rc, _ = await run(ExecutionEngine(), "exit 3")
+        assert rc == 3
+
+    @pytest.mark.asyncio
+    async def test_output_written_just_before_exit(self, exit_watch):
+        rc, output = await run(ExecutionEngine(), "seq 1 5000")
+
+        assert rc == 0
+        assert output.splitlines() == [str(i) for i in range(1, 5001)]
+
+    @pytest.mark.asyncio
+    async def test_callback_receives_batched_lines(self, exit_watch):
+        calls: list[str] = []
+
+        rc = await asyncio.wait_for(
+            ExecutionEngine().run_command_and_get_rc("seq 1 20000", calls.append),
+            timeout=10,
+        )
+
+        assert rc == 0
+        assert "".join(calls).count("\n") == 20000
+        assert len(calls) < 1000
+
+    @pytest.mark.asyncio
+    async def test_background_child_keeps_pty_open(self, exit_watch):
+        """Should return when the shell exits even if a grandchild holds the PTY."""
+        rc, output = await run(ExecutionEngine(), "sleep 5 & echo done")
+
+        assert rc == 0
+        assert "done" in output
+
+    @pytest.mark.asyncio
+    async def test_partial_prompt_is_flushed(self, exit_watch):
+        rc, output = await run(ExecutionEngine(), "printf 'Password:'; sleep 0.2")
+
+        assert rc == 0
+        assert output == "Password:"
+
+    @pytest.mark.asyncio
+    async def test_state_reset_after_run(self, exit_watch):
+        engine = ExecutionEngine()
+        await run(engine, "true")
+
+        assert engine.pid is None
+        assert engine.master_fd is None
+        assert not engine.is_running
+
+
+class TestEventDrivenReads:
+    @pytest.mark.asyncio
+    async def test_idle_command_does_not_poll(self, exit_watch, monkeypatch):
+        reads = 0
+        real_read = os.read
+
+        def counting_read(fd, n):
+            nonlocal reads
+            reads += 1
+            return real_read(fd, n)
+
+        monkeypatch.setattr(executor.os, "read", counting_read)
+
+        rc, _ = await run(ExecutionEngine(), "sleep 0.5")
+
+        assert rc == 0
+        # A 10ms poll loop would have made ~50 reads
+        assert reads < 10
+
+    @pytest.mark.asyncio
+    async def test_cancel_wakes_idle_command(self, exit_watch):
+        engine = ExecutionEngine()
+        ready = asyncio.Event()
+        output: list[str] = []
+        task = asyncio.create_task(
+            engine.run_command_and_get_rc("sleep 30", output.append, ready_event=ready)
+        )
+        await asyncio.wait_for(ready.wait(), timeout=5)
+        await asyncio.sleep(0.05)
+
+        engine.cancel()
+        rc = await asyncio.wait_for(task, timeout=5)
+
+        assert rc == -1
+        assert "[Cancelled]" in "".join(output)
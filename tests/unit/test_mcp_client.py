@@ -271,7 +271,7 @@ class TestMCPClient:
         process.stdin.write = MagicMock()
         process.stdin.drain = AsyncMock()
         process.stdout = MagicMock()
-        process.stdout.readline = AsyncMock()
+        process.stdout.readuntil = AsyncMock()
         process.stderr = MagicMock()
         process.terminate = MagicMock()
         process.kill = MagicMock()
@@ -358,7 +358,7 @@ class TestMCPClient:
 
         call_count = 0
 
-        async def mock_readline():
+        async def mock_readuntil(separator=b"\n"):
             nonlocal call_count
             if call_count == 0:
                 call_count += 1
@@ -366,7 +366,7 @@ class TestMCPClient:
             await asyncio.sleep(10)
             return b""
 
-        mock_process.stdout.readline = mock_readline
+        mock_process.stdout.readuntil = mock_readuntil
 
         client._read_task = asyncio.create_task(client._read_loop())
 
@@ -0,0 +1,196 @@
+"""Unit tests for shell_session.py - persistent interactive shells."""
+
+import asyncio
+import shutil
+
+import pytest
+
+from executor import ExecutionEngine
+from shell_session import (
+    MAX_COMMAND_BYTES,
+    PromptMarkers,
+    ShellSession,
+    encode_command,
+    shell_kind,
+)
+
+BASH = shutil.which("bash")
+
+
+def marker(rc: int, token: str = "tok") -> bytes:
+    return f"\x1b]133;D;{rc};aid={token}\x07".encode()
+
+
+class TestEncodeCommand:
+    def test_simple_command(self):
+        assert encode_command("ls -la") == b"eval $'ls -la'\n"
+
+    def test_quotes_and_backslashes_are_escaped(self):
+        assert encode_command("echo 'a\\b'") == b"eval $'echo \\'a\\\\b\\''\n"
+
+    def test_control_characters_are_escaped(self):
+        line = encode_command("a\nb\tc\x1bd")
+        assert line == b"eval $'a\\nb\\tc\\x1bd'\n"
+        assert line.count(b"\n") == 1
+
+    def test_too_long_command(self):
+        assert encode_command("x" * MAX_COMMAND_BYTES) is None
+
+
+class TestShellKind:
+    def test_supported_shells(self):
+        assert shell_kind("/bin/bash") == "bash"
+        assert shell_kind("/usr/local/bin/zsh") == "zsh"
+
+    def test_unsupported_shell(self):
+        assert shell_kind("/usr/bin/fish") is None
+
+
+class TestPromptMarkers:
+    def test_strips_echo_and_stops_at_marker(self):
+        markers = PromptMarkers("tok")
+        markers.begin(echo=b"eval $'ls'\r\n")
+
+        out = markers.feed(b"eval $'ls'\r\nfile\r\n" + marker(0) + b"prompt")
+
+        assert out == b"file\r\n"
+        assert markers.exit_code == 0
+        assert markers.feed(b"late") == b""
+
+    def test_echo_split_across_reads(self):
+        markers = PromptMarkers("tok")
+        markers.begin(echo=b"eval $'ls'\r\n")
+
+        assert markers.feed(b"eval $") == b""
+        assert markers.feed(b"'ls'\r\nout") == b"out"
+
+    def test_missing_echo_is_passed_through(self):
+        markers = PromptMarkers("tok")
+        markers.begin(echo=b"eval $'ls'\r\n")
+
+        assert markers.feed(b"out\r\n") == b"out\r\n"
+
+    def test_marker_split_across_reads(self):
+        markers = PromptMarkers("tok")
+        markers.begin()
+        data = b"out" + marker(7)
+
+        assert markers.feed(data[:6]) == b"out"
+        assert not markers.done
+        assert markers.feed(data[6:]) == b""
+        assert markers.exit_code == 7
+
+    def test_cwd_is_tracked(self):
+        markers = PromptMarkers("tok")
+        markers.begin()
+
+        markers.feed(b"\x1b]7;file://host/tmp/a dir\x07" + marker(0))
+
+        assert markers.cwd == "/tmp/a dir"
+
+    def test_foreign_sequences_pass_through(self):
+        markers = PromptMarkers("tok")
+        markers.begin()
+        title = b"\x1b]0;title\x07"
+        spoofed = marker(1, token="other")
+
+        assert markers.feed(title + spoofed + b"x") == title + spoofed + b"x"
+        assert not markers.done
+
+
+@pytest.fixture
+async def session(tmp_path, monkeypatch):
+    if BASH is None:
+        pytest.skip("bash not available")
+    # Keep the user's rc files out of the test
+    monkeypatch.setenv("HOME", str(tmp_path))
+    session = ShellSession(BASH, cwd=str(tmp_path))
+    assert await session.start()
+    yield session
+    session.close()
+
+
+async def run(
+    engine: ExecutionEngine, session: ShellSession, command: str
+) -> tuple[int, str]:
+    output: list[str] = []
+    rc = await asyncio.wait_for(
+        engine.run_command_and_get_rc(command, output.append, session=session),
+        timeout=10,
+    )
+    return rc, "".join(output)
+
+
+class TestRunInSession:
+    @pytest.mark.asyncio
+    async def test_output_and_exit_code(self, session):
+        engine = ExecutionEngine()
+
+        assert await run(engine, session, "echo hello; echo world") == (
+            0,
+            "hello\nworld\n",
+        )
+        assert await run(engine, session, "false") == (1, "")
+        assert session.alive
+        assert not engine.is_running
+
+    @pytest.mark.asyncio
+    async def test_state_persists_between_commands(self, session, tmp_path):
+        engine = ExecutionEngine()
+        (tmp_path / "sub").mkdir()
+
+        await run(engine, session, "export NULL_TEST=kept; cd sub")
+        rc, output = await run(engine, session, 'echo "$NULL_TEST"; pwd')
+
+        assert rc == 0
+        assert output == f"kept\n{tmp_path / 'sub'}\n"
+        assert session.cwd == str(tmp_path / "sub")
+
+    @pytest.mark.asyncio
+    async def test_multiline_command(self, session):
+        rc, output = await run(
+            ExecutionEngine(), session, "for i in 1 2\ndo echo \"'$i'\"; done"
+        )
+
+        assert rc == 0
+        assert output == "'1'\n'2'\n"
+
+    @pytest.mark.asyncio
+    async def test_cancel_interrupts_the_command(self, session):
+        engine = ExecutionEngine()
+        output: list[str] = []
+        task = asyncio.create_task(
+            engine.run_command_and_get_rc("sleep 5", output.append, session=session)
+        )
+        await asyncio.sleep(0.2)
+        engine.cancel()
+
+        assert await asyncio.wait_for(task, timeout=3) == -1
+        assert "[Cancelled]" in "".join(output)
+        assert session.alive
+        assert await run(engine, session, "echo still") == (0, "still\n")
+
+    @pytest.mark.asyncio
+    async def test_exit_closes_the_session(self, session):
+        rc, _ = await run(ExecutionEngine(), session, "exit 3")
+
+        assert rc == 3
+        assert not session.alive
+
+    @pytest.mark.asyncio
+    async def test_busy_session_falls_back_to_one_shot(self, session):
+        session.busy = True
+
+        rc, output = await run(ExecutionEngine(), session, "echo $$")
+
+        assert rc == 0
+        assert output.strip() != str(session.pid)
+
+
+class TestShellSessionStart:
+    @pytest.mark.asyncio
+    async def test_unsupported_shell(self):
+        session = ShellSession("/bin/sh")
+
+        assert await session.start() is False
+        assert not session.alive
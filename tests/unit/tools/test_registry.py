@@ -139,6 +139,33 @@ class TestToolRegistryApproval:
         assert registry.requires_approval("unknown_tool") is True
 
 
+class TestToolRegistryReadOnly:
+    """Tests for read-only tool detection."""
+
+    def test_builtin_read_only_flags(self):
+        registry = ToolRegistry()
+        assert registry.is_read_only("read_file") is True
+        assert registry.is_read_only("list_directory") is True
+        assert registry.is_read_only("write_file") is False
+        assert registry.is_read_only("run_command") is False
+        assert registry.is_read_only("unknown_tool") is False
+
+    def test_mcp_read_only_hint(self):
+        mcp_manager = MagicMock()
+        mcp_manager.get_tool.side_effect = lambda name: {
+            "lookup": MagicMock(read_only=True),
+            "update": MagicMock(read_only=False),
+        }.get(name)
+        registry = ToolRegistry(mcp_manager=mcp_manager)
+
+        assert registry.is_read_only("mcp_lookup") is True
+        assert registry.is_read_only("mcp_update") is False
+        assert registry.is_read_only("mcp_missing") is False
+
+    def test_mcp_without_manager_is_not_read_only(self):
+        assert ToolRegistry().is_read_only("mcp_lookup") is False
+
+
 class TestToolRegistrySchema:
     """Tests for tool schema generation."""
 
@@ -195,6 +222,36 @@ class TestToolRegistrySchema:
         assert mcp_tools[0]["function"]["name"] == "mcp_fetch_data"
         assert "[MCP: test_server]" in mcp_tools[0]["function"]["description"]
 
+    def test_schema_is_memoized_per_generation(self):
+        """Should rebuild schemas only when the tool-set generation changes."""
+        mock_mcp = MagicMock()
+        mock_mcp.tools_generation = 1
+        mock_mcp.get_all_tools.return_value = []
+
+        registry = ToolRegistry(mcp_manager=mock_mcp)
+        first = registry.get_all_tools_schema()
+        assert registry.get_all_tools_schema() == first
+        assert mock_mcp.get_all_tools.call_count == 1
+
+        mock_tool = MagicMock()
+        mock_tool.name = "fetch_data"
+        mock_tool.description = ""
+        mock_tool.input_schema = {}
+        mock_tool.server_name = "test_server"
+        mock_mcp.get_all_tools.return_value = [mock_tool]
+        mock_mcp.tools_generation = 2
+
+        tools = registry.get_all_tools_schema()
+        assert len(tools) == len(first) + 1
+        assert mock_mcp.get_all_tools.call_count == 2
+
+    def test_schema_copies_are_independent(self):
+        """Mutating a returned schema list should not affect the cache."""
+        registry = ToolRegistry()
+        tools = registry.get_ollama_tools_schema()
+        tools.clear()
+        assert len(registry.get_ollama_tools_schema()) == len(BUILTIN_TOOLS)
+
 
 class TestToolRegistryExecution:
     """Tests for tool execution."""
@@ -0,0 +1,102 @@
+"""Tests for utils/markdown_stream.py - MarkdownStream."""
+
+from utils.markdown_stream import MarkdownStream
+
+
+def feed(stream: MarkdownStream, text: str, step: int = 3) -> None:
+    """Feed text in small chunks, the way a response streams in."""
+    for end in range(step, len(text) + step, step):
+        stream.update(text[:end])
+
+
+class TestMarkdownStreamBlocks:
+    def test_paragraphs_freeze_after_blank_line(self):
+        stream = MarkdownStream()
+        stream.update("First paragraph.\n\nSecond")
+        assert stream.blocks == ["First paragraph."]
+        assert stream.tail == "Second"
+
+    def test_open_paragraph_stays_in_tail(self):
+        stream = MarkdownStream()
+        stream.update("Line one\nline two\n\n")
+        assert stream.blocks == []
+        assert stream.tail == "Line one\nline two\n\n"
+
+    def test_heading_is_its_own_block(self):
+        stream = MarkdownStream()
+        stream.update("Intro\n# Title\nBody")
+        assert stream.blocks == ["Intro", "# Title"]
+        assert stream.tail == "Body"
+
+    def test_fence_keeps_blank_lines_and_freezes_on_close(self):
+        stream = MarkdownStream()
+        text = "```python\ndef f():\n\n    # not a heading\n    pass\n```\n"
+        stream.update(text)
+        assert stream.blocks == [text.strip("\n")]
+        assert stream.tail == ""
+
+    def test_fence_needs_matching_closer(self):
+        stream = MarkdownStream()
+        stream.update("````\n```\nstill code\n~~~\n")
+        assert stream.blocks == []
+        stream.update("````\n```\nstill code\n~~~\n````\n")
+        assert len(stream.blocks) == 1
+
+    def test_fence_interrupts_paragraph(self):
+        stream = MarkdownStream()
+        stream.update("Example:\n```\ncode\n")
+        assert stream.blocks == ["Example:"]
+        assert stream.tail == "```\ncode\n"
+
+    def test_loose_list_stays_one_block(self):
+        stream = MarkdownStream()
+        stream.update("- one\n\n- two\n\n    more two\n\nAfter\n")
+        assert stream.blocks == ["- one\n\n- two\n\n    more two"]
+        assert stream.tail == "After\n"
+
+    def test_incomplete_line_is_not_scanned(self):
+        stream = MarkdownStream()
+        stream.update("Para\n\n# Head")
+        assert stream.blocks == ["Para"]
+        assert stream.tail == "# Head"
+
+
+class TestMarkdownStreamUpdates:
+    def test_chunked_feed_matches_single_update(self):
+        text = (
+            "# Title\n\nSome *text*.\n\n```\nx = 1\n\ny = 2\n```\n\n"
+            "1. a\n2. b\n\n> quote\n\nend"
+        )
+        whole = MarkdownStream()
+        whole.update(text)
+        chunked = MarkdownStream()
+        feed(chunked, text)
+        assert chunked.blocks == whole.blocks
+        assert chunked.tail == whole.tail
+
+    def test_blocks_and_tail_cover_all_content(self):
+        text = "A\n\nB\n# C\n```\nD\n```\nE"
+        stream = MarkdownStream()
+        feed(stream, text, step=1)
+        joined = "".join(stream.blocks) + stream.tail
+        assert [c for c in joined if not c.isspace()] == [
+            c for c in text if not c.isspace()
+        ]
+
+    def test_extension_returns_true(self):
+        stream = MarkdownStream()
+        assert stream.update("Hello") is True
+        assert stream.update("Hello\n\nWorld") is True
+
+    def test_replaced_text_resets(self):
+        stream = MarkdownStream()
+        stream.update("Old paragraph.\n\nMore")
+        assert stream.update("New paragraph.\n\nMore") is False
+        assert stream.blocks == ["New paragraph."]
+
+    def test_shorter_text_resets(self):
+        stream = MarkdownStream()
+        stream.update("One\n\nTwo\n\nThree")
+        assert stream.update("One") is False
+        assert stream.blocks == []
+        assert stream.tail == "One"
@@ -0,0 +1,34 @@
+"""Tests for utils/startup_profile.py."""
+
+from utils.startup_profile import format_report, parse_importtime
+
+SAMPLE = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     textual.color
+import time:      3000 |       3120 |   textual.app
+import time:       500 |       3620 | app
+"""
+
+
+class TestParseImporttime:
+    def test_parses_rows_and_depth(self):
+        timings = parse_importtime(SAMPLE)
+
+        assert [t.module for t in timings] == ["textual.color", "textual.app", "app"]
+        assert [t.depth for t in timings] == [2, 1, 0]
+        assert timings[1].self_us == 3000
+        assert timings[2].cumulative_us == 3620
+
+    def test_ignores_other_output(self):
+        assert parse_importtime("Traceback (most recent call last):\n") == []
+
+
+class TestFormatReport:
+    def test_sorts_by_self_time(self):
+        report = format_report(parse_importtime(SAMPLE), limit=2)
+        lines = report.splitlines()
+
+        assert lines[0] == "Startup imports: 3 modules, 4 ms total"
+        assert lines[3].endswith("textual.app")
+        assert lines[4].endswith("app")
+        assert len(lines) == 5
@@ -1060,3 +1060,27 @@ class TestWidgetExistence:
         # tool_accordion doesn't take block
         assert widget.response_widget.block is block
         assert widget.footer_widget.block is block
+
+
+class TestAIResponseBlockStreamingThink:
+    """Test <think> parsing across streamed updates."""
+
+    def test_tags_split_across_updates(self):
+        block = BlockState(type=BlockType.AI_RESPONSE, content_input="q")
+        widget = AIResponseBlock(block)
+        text = "<THINK>pondering</Think>The answer."
+        for end in range(1, len(text) + 1):
+            block.content_output = text[:end]
+            widget.update_output()
+        assert widget.thinking_widget.thinking_text == "pondering"
+        assert widget.response_widget.content_text == "The answer."
+
+    def test_replaced_output_rescans(self):
+        block = BlockState(type=BlockType.AI_RESPONSE, content_input="q")
+        widget = AIResponseBlock(block)
+        block.content_output = "<think>a</think>b"
+        widget.update_output()
+        block.content_output = "plain"
+        widget.update_output()
+        assert widget.thinking_widget.thinking_text == ""
+        assert widget.response_widget.content_text == "plain"
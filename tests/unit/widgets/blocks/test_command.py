@@ -100,6 +100,17 @@ class TestCommandBlockUpdateOutput:
 
         assert widget.body_widget.content_text == "updated output"
 
+    def test_update_output_defers_viz_check(self):
+        """update_output does not parse the output as JSON while streaming."""
+        block = BlockState(type=BlockType.COMMAND, content_input="cat x")
+        widget = CommandBlock(block)
+
+        block.content_output = '{"a": 1}'
+        with patch.object(widget, "_check_for_viz") as check:
+            widget.update_output()
+
+        check.assert_not_called()
+
     def test_update_output_ignores_tui_mode(self):
         """update_output does nothing in TUI mode."""
         block = BlockState(
@@ -471,6 +482,32 @@ class TestCommandBlockSetLoading:
                 # Should not raise
                 widget.set_loading(True)
 
+    def test_set_loading_false_checks_for_viz(self):
+        """JSON detection runs once the command finishes."""
+        block = BlockState(
+            type=BlockType.COMMAND, content_input="cat x", content_output='{"a": 1}'
+        )
+        widget = CommandBlock(block)
+
+        with patch.object(widget.footer_widget, "remove"):
+            with patch.object(widget, "mount"):
+                with patch.object(widget, "_check_for_viz") as check:
+                    widget.set_loading(False)
+
+        check.assert_called_once_with('{"a": 1}')
+
+    def test_set_loading_true_skips_viz_check(self):
+        """No JSON detection while the command is still running."""
+        block = BlockState(type=BlockType.COMMAND, content_input="cat x")
+        widget = CommandBlock(block)
+
+        with patch.object(widget.footer_widget, "remove"):
+            with patch.object(widget, "mount"):
+                with patch.object(widget, "_check_for_viz") as check:
+                    widget.set_loading(True)
+
+        check.assert_not_called()
+
 
 class TestCommandBlockInheritance:
     """Tests for CommandBlock inheritance from BaseBlockWidget."""
@@ -3,6 +3,7 @@
 from unittest.mock import MagicMock
 
 from rich.text import Text
+from textual.app import App, ComposeResult
 
 from models import BlockState, BlockType
 from widgets.blocks.parts import (
@@ -14,6 +15,7 @@ from widgets.blocks.parts import (
     BlockHeader,
     BlockMeta,
     StopButton,
+    StreamingBlockBody,
     VizButton,
 )
 
@@ -839,6 +841,124 @@ class TestBlockBodySetViewMode:
         body.set_view_mode("table")
 
 
+class TestStreamingBlockBodySync:
+    def test_splits_finished_lines_from_tail(self):
+        body = StreamingBlockBody()
+        body._sync("one\ntwo\nthr")
+        assert [line.plain for line in body._lines] == ["one", "two"]
+        assert body._tail == "thr"
+        assert body._total_lines == 3
+
+    def test_append_only_styles_new_lines(self):
+        body = StreamingBlockBody()
+        body._sync("one\ntw")
+        first = body._lines[0]
+        body._sync("one\ntwo\nthree\n")
+        assert body._lines[0] is first
+        assert [line.plain for line in body._lines] == ["one", "two", "three"]
+        assert body._tail == ""
+        assert body._unwrapped == 3
+
+    def test_unchanged_text_is_noop(self):
+        body = StreamingBlockBody()
+        body._sync("one\n")
+        lines = list(body._lines)
+        body._sync("one\n")
+        assert list(body._lines) == lines
+
+    def test_replaced_text_resets(self):
+        body = StreamingBlockBody()
+        body._sync("first output\nmore\n")
+        body._sync("other output\n")
+        assert [line.plain for line in body._lines] == ["other output"]
+
+    def test_shorter_text_resets(self):
+        body = StreamingBlockBody()
+        body._sync("a\nb\nc\n")
+        body._sync("a\n")
+        assert [line.plain for line in body._lines] == ["a"]
+        assert body._dropped == 0
+
+    def test_keeps_last_max_lines(self):
+        body = StreamingBlockBody(max_lines=2)
+        body._sync("1\n2\n3\n4\n5")
+        assert [line.plain for line in body._lines] == ["3", "4"]
+        assert body._dropped == 2
+        assert body._truncated is True
+        assert body._total_lines == 5
+        assert "2 lines truncated" in body._indicator()
+
+    def test_ansi_style_carries_across_lines(self):
+        body = StreamingBlockBody()
+        body._sync("\x1b[31mred\nstill red\x1b[0m\nplain\n")
+        assert [line.plain for line in body._lines] == ["red", "still red", "plain"]
+        assert body._lines[1].spans
+        assert not body._lines[2].spans
+
+    def test_tail_does_not_advance_ansi_state(self):
+        body = StreamingBlockBody()
+        body._sync("\x1b[31mpartial")
+        assert body._tail_plain() == "partial"
+        assert not body._decoder.style
+
+    def test_prompt_lines_are_styled(self):
+        body = StreamingBlockBody()
+        body._sync("$ ls\n")
+        assert any("green" in str(span.style) for span in body._lines[0].spans)
+
+
+class _StreamingApp(App):
+    def compose(self) -> ComposeResult:
+        yield StreamingBlockBody(max_lines=3)
+
+
+class TestStreamingBlockBodyRender:
+    async def test_renders_lines_and_tail(self):
+        app = _StreamingApp()
+        async with app.run_test(size=(20, 10)) as pilot:
+            body = app.query_one(StreamingBlockBody)
+            body.content_text = "alpha\nbeta\nga"
+            await pilot.pause()
+            rows = [body.render_line(y).text.rstrip() for y in range(3)]
+            assert rows == ["alpha", "beta", "ga"]
+
+    async def test_wraps_long_lines_and_shows_indicator(self):
+        app = _StreamingApp()
+        async with app.run_test(size=(10, 10)) as pilot:
+            body = app.query_one(StreamingBlockBody)
+            body.content_text = "a\nb\nc\n" + "x" * 15 + "\n"
+            await pilot.pause()
+            assert body.size.height == 5
+            assert body.render_line(0).text.startswith("...")
+            assert body.render_line(1).text.rstrip() == "b"
+            assert body.render_line(3).text == "x" * 10
+            assert body.render_line(4).text.rstrip() == "x" * 5
+
+    async def test_rewraps_on_width_change(self):
+        app = _StreamingApp()
+        async with app.run_test(size=(10, 10)) as pilot:
+            body = app.query_one(StreamingBlockBody)
+            body.content_text = "x" * 15 + "\n"
+            await pilot.pause()
+            assert body.size.height == 2
+            await pilot.resize_terminal(20, 10)
+            await pilot.pause()
+            assert body.size.height == 1
+
+    async def test_json_view_mode(self):
+        app = _StreamingApp()
+        async with app.run_test(size=(30, 10)) as pilot:
+            body = app.query_one(StreamingBlockBody)
+            body.content_text = '{"key": 1}'
+            await pilot.pause()
+            body.set_view_mode("json")
+            await pilot.pause()
+            assert body.size.height == 3
+            body.set_view_mode("text")
+            await pilot.pause()
+            assert body.size.height == 1
+
+
 class TestBlockFooterInit:
     def test_initializes_with_block_state(self):
         block = BlockState(type=BlockType.COMMAND, content_input="ls")
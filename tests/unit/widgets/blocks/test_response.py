@@ -312,3 +312,38 @@ class TestResponseWidgetBlockTypes:
         block = BlockState(type=BlockType.SYSTEM_MSG, content_input="system")
         widget = ResponseWidget(block)
         assert widget.block.type == BlockType.SYSTEM_MSG
+
+
+class TestResponseWidgetStreaming:
+    """Test incremental rendering of streamed content."""
+
+    async def test_completed_blocks_are_mounted_once(self):
+        from textual.app import App
+
+        block = BlockState(type=BlockType.AI_RESPONSE, content_input="test")
+        widget = ResponseWidget(block)
+
+        class ResponseApp(App):
+            def compose(self):
+                yield widget
+
+        async with ResponseApp().run_test() as pilot:
+            widget.content_text = "First.\n\nSecond"
+            await pilot.pause()
+            first_parts = list(widget._parts)
+            assert len(first_parts) == 1
+
+            widget.content_text = "First.\n\nSecond.\n\nThird"
+            await pilot.pause()
+            assert widget._parts[0] is first_parts[0]
+            assert len(widget._parts) == 2
+            assert widget._tail.display
+
+            widget.content_text = "Replaced"
+            await pilot.pause()
+            assert widget._parts == []
+            assert len(widget.query(".response-part")) == 1
+
+            widget.content_text = ""
+            await pilot.pause()
+            assert widget.has_class("hidden")
@@ -306,6 +306,17 @@ class TestHistoryViewportOnKey:
 
         assert viewport._auto_scroll is False
 
+    def test_pageup_at_top_requests_older_blocks(self):
+        """pageup with nothing to scroll should post ReachedTop."""
+        viewport = HistoryViewport()
+        mock_event = MagicMock()
+        mock_event.key = "pageup"
+
+        with patch.object(viewport, "post_message") as mock_post:
+            viewport.on_key(mock_event)
+
+        assert isinstance(mock_post.call_args[0][0], HistoryViewport.ReachedTop)
+
     def test_k_disables_auto_scroll(self):
         """k key should disable auto_scroll."""
         viewport = HistoryViewport()
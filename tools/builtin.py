@@ -51,6 +51,7 @@ class BuiltinTool:
     input_schema: dict[str, Any]
     handler: Callable[..., Awaitable[str]]
     requires_approval: bool = True  # Whether to ask user before executing
+    read_only: bool = False  # No side effects, safe to run alongside other calls
 
 
 async def run_command(
@@ -424,6 +425,7 @@ BUILTIN_TOOLS: list[BuiltinTool] = [
         },
         handler=read_file,
         requires_approval=False,
+        read_only=True,
     ),
     BuiltinTool(
         name="write_file",
@@ -461,6 +463,7 @@ BUILTIN_TOOLS: list[BuiltinTool] = [
         },
         handler=list_directory,
         requires_approval=False,
+        read_only=True,
     ),
     BuiltinTool(
         name="todo_list",
@@ -472,6 +475,7 @@ BUILTIN_TOOLS: list[BuiltinTool] = [
         },
         handler=todo_list,
         requires_approval=False,
+        read_only=True,
     ),
     BuiltinTool(
         name="todo_add",
@@ -536,6 +540,7 @@ BUILTIN_TOOLS: list[BuiltinTool] = [
         },
         handler=agent_status,
         requires_approval=False,
+        read_only=True,
     ),
     BuiltinTool(
         name="agent_history",
@@ -552,6 +557,7 @@ BUILTIN_TOOLS: list[BuiltinTool] = [
         },
         handler=agent_history,
         requires_approval=False,
+        read_only=True,
     ),
     BuiltinTool(
         name="agent_stats",
@@ -563,6 +569,7 @@ BUILTIN_TOOLS: list[BuiltinTool] = [
         },
         handler=agent_stats,
         requires_approval=False,
+        read_only=True,
     ),
 ]
 
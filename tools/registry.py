@@ -33,9 +33,35 @@ class ToolRegistry:
     def __init__(self, mcp_manager: Optional["MCPManager"] = None):
         self.mcp_manager = mcp_manager
         self._builtin_tools = {t.name: t for t in BUILTIN_TOOLS}
+        # Schemas per provider format, keyed by the tool-set generation
+        self._schema_cache: dict[str, tuple[int, list[dict[str, Any]]]] = {}
+
+    def _tools_generation(self) -> int:
+        """Current tool-set generation; changes when MCP tools change."""
+        return self.mcp_manager.tools_generation if self.mcp_manager else 0
+
+    def _cached_schema(self, fmt: str) -> list[dict[str, Any]] | None:
+        cached = self._schema_cache.get(fmt)
+        if cached is not None and cached[0] == self._tools_generation():
+            return list(cached[1])
+        return None
+
+    def _store_schema(
+        self, fmt: str, tools: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        self._schema_cache[fmt] = (self._tools_generation(), tools)
+        return list(tools)
+
+    def invalidate_schema_cache(self) -> None:
+        """Drop memoized schemas so the next request rebuilds them."""
+        self._schema_cache.clear()
 
     def get_all_tools_schema(self) -> list[dict[str, Any]]:
         """Get all tool schemas in OpenAI-compatible format."""
+        cached = self._cached_schema("openai")
+        if cached is not None:
+            return cached
+
         tools = []
 
         # Add built-in tools
@@ -65,10 +91,14 @@ class ToolRegistry:
                     }
                 )
 
-        return tools
+        return self._store_schema("openai", tools)
 
     def get_ollama_tools_schema(self) -> list[dict[str, Any]]:
         """Get tool schemas in Ollama format."""
+        cached = self._cached_schema("ollama")
+        if cached is not None:
+            return cached
+
         tools = []
 
         for tool in BUILTIN_TOOLS:
@@ -96,7 +126,7 @@ class ToolRegistry:
                     }
                 )
 
-        return tools
+        return self._store_schema("ollama", tools)
 
     def get_tool(self, name: str) -> BuiltinTool | None:
         """Get a built-in tool by name."""
@@ -115,6 +145,17 @@ class ToolRegistry:
         tool = self.get_tool(name)
         return tool.requires_approval if tool else True
 
+    def is_read_only(self, name: str) -> bool:
+        """Check if a tool declares that it has no side effects."""
+        if self.is_mcp_tool(name):
+            if not self.mcp_manager:
+                return False
+            mcp_tool = self.mcp_manager.get_tool(name[4:])
+            return bool(mcp_tool and mcp_tool.read_only)
+
+        tool = self.get_tool(name)
+        return tool.read_only if tool else False
+
     async def execute_tool(self, tool_call: ToolCall) -> ToolResult:
         """Execute a tool and return the result."""
         name = tool_call.name
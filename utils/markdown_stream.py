@@ -0,0 +1,147 @@
+"""Incremental splitting of streamed Markdown into top-level blocks."""
+
+import re
+
+# Opening or closing code fence: up to 3 spaces, then ``` or ~~~
+FENCE_PATTERN = re.compile(r"^ {0,3}(`{3,}|~{3,})")
+HEADING_PATTERN = re.compile(r"^ {0,3}#{1,6}(\s|$)")
+LIST_ITEM_PATTERN = re.compile(r"^ {0,3}([-+*]|\d{1,9}[.)])(\s|$)")
+
+
+class MarkdownStream:
+    """Split append-only Markdown into completed blocks and an open tail.
+
+    Completed top-level blocks (paragraphs, closed code fences, lists,
+    headings) never change once later text has started another block, so
+    they can be rendered once and cached. Only complete lines are scanned,
+    and each line is scanned once, so an update costs O(appended text).
+
+    Blocks are split heuristically: a blank line ends a block unless the next
+    line continues a list or an indented code block, a fence runs until its
+    closing fence, and an ATX heading is a block on its own. Constructs that
+    span blocks, such as reference-style link definitions, are not resolved
+    across the split.
+    """
+
+    # Characters remembered from the end of the fed text, used to check that
+    # new text extends it rather than replacing it
+    _PROBE_SIZE = 64
+
+    def __init__(self):
+        self.blocks: list[str] = []
+        self._reset_state()
+
+    def _reset_state(self) -> None:
+        self.blocks.clear()
+        self._text = ""
+        self._probe = ""
+        # Start of the open block and of the next unscanned line
+        self._block_start = 0
+        self._scan_pos = 0
+        # Kind of the open block: None (empty), "para", "list", "code",
+        # "fence" or "quote"
+        self._kind: str | None = None
+        self._fence = ""
+        self._blank = False
+
+    @property
+    def tail(self) -> str:
+        """Source of the block that is still open."""
+        return self._text[self._block_start :]
+
+    def update(self, text: str) -> bool:
+        """Consume the full text streamed so far.
+
+        Returns:
+            False if ``text`` does not extend the previous text, in which case
+            the stream starts over and ``blocks`` is rebuilt from scratch.
+        """
+        fed = len(self._text)
+        extends = len(text) >= fed and text.startswith(
+            self._probe, fed - len(self._probe)
+        )
+        if not extends:
+            self._reset_state()
+        self._text = text
+        self._probe = text[-self._PROBE_SIZE :]
+
+        while (end := text.find("\n", self._scan_pos)) != -1:
+            self._scan_line(self._scan_pos, end + 1)
+            self._scan_pos = end + 1
+
+        # Nothing continues a paragraph or quote past a blank line, so there
+        # is no need to wait for the partial line to complete
+        if (
+            self._blank
+            and self._kind in ("para", "quote")
+            and text[self._scan_pos :].strip()
+        ):
+            self._freeze(self._scan_pos)
+        return extends
+
+    def _freeze(self, end: int) -> None:
+        """Close the open block at ``end`` and start a new one there."""
+        source = self._text[self._block_start : end].strip("\n")
+        if source.strip():
+            self.blocks.append(source)
+        self._block_start = end
+        self._kind = None
+        self._blank = False
+
+    def _scan_line(self, start: int, end: int) -> None:
+        line = self._text[start:end].rstrip("\n")
+
+        if self._kind == "fence":
+            match = FENCE_PATTERN.match(line)
+            if (
+                match
+                and match.group(1)[0] == self._fence[0]
+                and len(match.group(1)) >= len(self._fence)
+                and not line[match.end() :].strip()
+            ):
+                self._freeze(end)
+            return
+
+        if not line.strip():
+            if self._kind is None:
+                # Leading blank lines belong to no block
+                self._block_start = end
+            else:
+                self._blank = True
+            return
+
+        indented = line.startswith(("    ", "\t"))
+        if self._blank:
+            # A blank line ends the block unless this line continues it
+            continues = (
+                self._kind == "list"
+                and (indented or bool(LIST_ITEM_PATTERN.match(line)))
+            ) or (self._kind == "code" and indented)
+            if continues:
+                self._blank = False
+            else:
+                self._freeze(start)
+
+        fence = FENCE_PATTERN.match(line)
+        if fence:
+            if self._kind is not None:
+                self._freeze(start)
+            self._kind = "fence"
+            self._fence = fence.group(1)
+            return
+
+        if HEADING_PATTERN.match(line) and not (self._kind == "list" and indented):
+            if self._kind is not None:
+                self._freeze(start)
+            self._freeze(end)
+            return
+
+        if self._kind is None:
+            if LIST_ITEM_PATTERN.match(line):
+                self._kind = "list"
+            elif indented:
+                self._kind = "code"
+            elif line.lstrip().startswith(">"):
+                self._kind = "quote"
+            else:
+                self._kind = "para"
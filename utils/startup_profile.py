@@ -0,0 +1,75 @@
+"""Import-time profiling for ``null --profile-startup``."""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+# Module whose import is measured; importing it loads everything the app
+# needs before the first frame
+STARTUP_MODULE = "app"
+
+
+@dataclass
+class ImportTiming:
+    """Time spent importing one module, in microseconds."""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(output: str) -> list[ImportTiming]:
+    """Parse the stderr of ``python -X importtime``."""
+    timings = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:") :].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # the header row
+        name = parts[2].rstrip()
+        module = name.lstrip()
+        timings.append(
+            ImportTiming(
+                module=module,
+                self_us=int(parts[0]),
+                cumulative_us=int(parts[1]),
+                depth=(len(name) - len(module) - 1) // 2,
+            )
+        )
+    return timings
+
+
+def measure_startup(module: str = STARTUP_MODULE) -> list[ImportTiming]:
+    """Import ``module`` in a fresh interpreter and collect its timings."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        cwd=Path(__file__).resolve().parent.parent,
+        check=False,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return parse_importtime(result.stderr)
+
+
+def format_report(timings: list[ImportTiming], limit: int = 30) -> str:
+    """Render the slowest imports, by time spent in the module itself."""
+    top_level = [t for t in timings if t.depth == 0]
+    total_ms = sum(t.cumulative_us for t in top_level) / 1000
+    lines = [
+        f"Startup imports: {len(timings)} modules, {total_ms:.0f} ms total",
+        "",
+        f"{'self ms':>9} {'cumul ms':>9}  module",
+    ]
+    for timing in sorted(timings, key=lambda t: t.self_us, reverse=True)[:limit]:
+        lines.append(
+            f"{timing.self_us / 1000:9.1f} {timing.cumulative_us / 1000:9.1f}"
+            f"  {timing.module}"
+        )
+    return "\n".join(lines)
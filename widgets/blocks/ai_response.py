@@ -16,6 +16,9 @@ from .response import ResponseWidget
 from .thinking import ThinkingWidget
 from .tool_accordion import ToolAccordion
 
+THINK_OPEN = "<think>"
+THINK_CLOSE = "</think>"
+
 
 class AIResponseBlock(BaseBlockWidget):
     """Block widget for simple chat mode AI responses.
@@ -47,6 +50,12 @@ class AIResponseBlock(BaseBlockWidget):
 
         self.footer_widget = BlockFooter(block)
 
+        # Cached <think> tag positions in block.content_output
+        self._think_open = -1
+        self._think_close = -1
+        self._think_scanned = 0
+        self._think_probe = ""
+
         # Apply chat mode class
         self.add_class("mode-chat")
 
@@ -88,26 +97,21 @@ class AIResponseBlock(BaseBlockWidget):
         reasoning = ""
         final_answer = full_text
 
-        lower_text = full_text.lower()
-        if "<think>" in lower_text:
-            if "</think>" in lower_text:
+        think_open, think_close = self._find_think_tags(full_text)
+        if think_open != -1:
+            if think_close != -1:
                 # Completed reasoning
-                parts = full_text.split("</think>", 1)
-                reasoning_raw = parts[0]
-                final_answer = parts[1].strip()
+                reasoning_raw = full_text[:think_close]
+                final_answer = full_text[think_close + len(THINK_CLOSE) :].strip()
 
-                if "<think>" in reasoning_raw:
-                    reasoning = reasoning_raw.split("<think>", 1)[1].strip()
+                if think_open < think_close:
+                    reasoning = reasoning_raw[think_open + len(THINK_OPEN) :].strip()
                 else:
                     reasoning = reasoning_raw
             else:
                 # Still streaming reasoning
                 final_answer = ""
-                parts = full_text.split("<think>", 1)
-                if len(parts) > 1:
-                    reasoning = parts[1].strip()
-                else:
-                    reasoning = full_text
+                reasoning = full_text[think_open + len(THINK_OPEN) :].strip()
 
         # Update widgets
         if self.thinking_widget:
@@ -142,6 +146,35 @@ class AIResponseBlock(BaseBlockWidget):
 
             self.response_widget.set_simple(is_simple)
 
+    def _find_think_tags(self, text: str) -> tuple[int, int]:
+        """Return the positions of the first <think> and </think>, or -1.
+
+        Tag positions are cached between streaming updates, so only text
+        appended since the last call is scanned.
+        """
+        scanned = self._think_scanned
+        if len(text) < scanned or not text.startswith(
+            self._think_probe, scanned - len(self._think_probe)
+        ):
+            self._think_open = self._think_close = -1
+            scanned = 0
+
+        # Back up far enough to catch a tag split across updates
+        start = max(0, scanned - len(THINK_CLOSE) + 1)
+        window = text[start:].lower()
+        if self._think_open == -1:
+            found = window.find(THINK_OPEN)
+            if found != -1:
+                self._think_open = start + found
+        if self._think_close == -1:
+            found = window.find(THINK_CLOSE)
+            if found != -1:
+                self._think_close = start + found
+
+        self._think_scanned = len(text)
+        self._think_probe = text[-len(THINK_CLOSE) :]
+        return self._think_open, self._think_close
+
     def update_metadata(self):
         """Refresh the metadata widget and action bar."""
         try:
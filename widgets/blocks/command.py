@@ -6,7 +6,7 @@ from textual.widgets import Label
 from models import BlockState
 
 from .base import BaseBlockWidget
-from .parts import BlockBody, BlockFooter, BlockHeader, VizButton
+from .parts import BlockFooter, BlockHeader, StreamingBlockBody, VizButton
 from .terminal import TerminalBlock
 
 
@@ -16,7 +16,7 @@ class CommandBlock(BaseBlockWidget):
     def __init__(self, block: BlockState):
         super().__init__(block)
         self.header = BlockHeader(block)
-        self.body_widget = BlockBody(block.content_output or "")
+        self.body_widget = StreamingBlockBody(block.content_output or "")
         self.footer_widget = BlockFooter(block)
         self._mode = "line"  # "line" or "tui"
         self._terminal_widget: TerminalBlock | None = None
@@ -33,10 +33,13 @@ class CommandBlock(BaseBlockWidget):
         return self._mode
 
     def update_output(self, new_content: str = ""):
-        """Update the command output display."""
+        """Update the command output display.
+
+        The body only renders what was appended since the last update; JSON
+        detection for the viz button waits until the command finishes.
+        """
         if self.body_widget and self._mode == "line":
             self.body_widget.content_text = self.block.content_output
-            self._check_for_viz(self.block.content_output)
 
     def _check_for_viz(self, content: str):
         if not content or len(content) < 10:
@@ -144,3 +147,6 @@ class CommandBlock(BaseBlockWidget):
         self.footer_widget = BlockFooter(self.block)
         if self.footer_widget._has_content():
             self.mount(self.footer_widget)
+
+        if not loading and self._mode == "line":
+            self._check_for_viz(self.block.content_output)
@@ -1,12 +1,19 @@
 import json
 import re
+from collections import deque
+from itertools import islice
 
+from rich.ansi import AnsiDecoder
+from rich.console import RenderableType
 from rich.json import JSON
+from rich.segment import Segment
 from rich.table import Table
 from rich.text import Text
 from textual.app import ComposeResult
 from textual.message import Message
 from textual.reactive import reactive
+from textual.selection import Selection
+from textual.strip import Strip
 from textual.widgets import Label, Static
 
 from models import BlockState, BlockType
@@ -239,12 +246,16 @@ class BlockBody(Static):
         except Exception:
             return
 
+        content.update(self._view_renderable(mode))
+
+    def _view_renderable(self, mode: str) -> RenderableType:
+        """Build the renderable shown for a view mode."""
         if mode == "json":
             try:
                 data = json.loads(self.content_text)
-                content.update(JSON.from_data(data))
+                return JSON.from_data(data)
             except Exception:
-                content.update(Text("Invalid JSON", style="red"))
+                return Text("Invalid JSON", style="red")
         elif mode == "table":
             try:
                 data = json.loads(self.content_text)
@@ -259,13 +270,13 @@ class BlockBody(Static):
                         table.add_column(str(key))
                     for item in data:
                         table.add_row(*[str(item.get(k, "")) for k in keys])
-                    content.update(table)
+                    return table
                 else:
-                    content.update(Text("Data is not a list of objects", style="red"))
+                    return Text("Data is not a list of objects", style="red")
             except Exception:
-                content.update(Text("Invalid Data for Table", style="red"))
+                return Text("Invalid Data for Table", style="red")
         else:
-            content.update(self._make_links_clickable(self.content_text))
+            return self._make_links_clickable(self.content_text)
 
     def _truncate_output(self, text: str) -> tuple[str, bool, int]:
         """Truncate output to max lines, keeping the most recent lines.
@@ -361,6 +372,249 @@ class BlockBody(Static):
                 result.append(line)
 
 
+class StreamingBlockBody(BlockBody):
+    """Append-only BlockBody for streaming command output.
+
+    Finished lines are styled once and their wrapped strips are kept until the
+    width changes, so an update only renders the newly appended lines and the
+    unfinished tail instead of re-rendering the whole output.
+    """
+
+    # Characters remembered from the end of the rendered text, used to check
+    # that new content extends it rather than replacing it
+    _PROBE_SIZE = 64
+
+    def __init__(self, text: str = "", max_lines: int = MAX_OUTPUT_LINES):
+        self._decoder = AnsiDecoder()
+        # Styled finished lines (at most max_lines) and their plain text
+        self._lines: deque[Text] = deque()
+        self._tail = ""
+        self._fed_len = 0
+        self._probe = ""
+        self._dropped = 0
+        # Wrapped rows of the finished lines at _wrap_width: each row is
+        # (strip, line number, column of the first character). The last
+        # _unwrapped lines have no rows yet; _heights holds the row count of
+        # every wrapped line.
+        self._rows: list[tuple[Strip, int, int]] = []
+        self._heights: deque[int] = deque()
+        self._unwrapped = 0
+        self._wrap_width = 0
+        self._tail_rows: list[tuple[Strip, int, int]] | None = None
+        self._view: RenderableType | None = None
+        self._view_rows: list[Strip] = []
+        self._view_width = 0
+        super().__init__(text, max_lines)
+
+    def compose(self) -> ComposeResult:
+        yield from ()
+
+    def watch_content_text(self, new_text: str):
+        self._sync(new_text or "")
+
+    def _sync(self, text: str) -> None:
+        """Render whatever ``text`` adds to the already rendered output."""
+        fed = self._fed_len
+        if len(text) < fed or not text.startswith(self._probe, fed - len(self._probe)):
+            self._reset()
+            fed = 0
+        if len(text) == fed:
+            return
+
+        self._fed_len = len(text)
+        self._probe = text[-self._PROBE_SIZE :]
+        *finished, self._tail = (self._tail + text[fed:]).split("\n")
+        self._tail_rows = None
+        if finished:
+            self._append_lines(finished)
+        self._total_lines = self._dropped + len(self._lines) + (1 if self._tail else 0)
+        self.refresh(layout=True)
+
+    def _append_lines(self, lines: list[str]) -> None:
+        for line in lines:
+            self._lines.append(self._style_line(line))
+        self._unwrapped += len(lines)
+
+        excess = len(self._lines) - self._max_lines
+        if excess <= 0:
+            return
+        drop_rows = 0
+        for _ in range(excess):
+            self._lines.popleft()
+            if self._heights:
+                drop_rows += self._heights.popleft()
+            else:
+                self._unwrapped -= 1
+        del self._rows[:drop_rows]
+        self._dropped += excess
+        self._truncated = True
+
+    def _reset(self) -> None:
+        self._decoder = AnsiDecoder()
+        self._lines.clear()
+        self._tail = ""
+        self._fed_len = 0
+        self._probe = ""
+        self._dropped = 0
+        self._truncated = False
+        self._total_lines = 0
+        self._rows.clear()
+        self._heights.clear()
+        self._unwrapped = 0
+        self._tail_rows = None
+
+    def _style_line(self, line: str, decoder: AnsiDecoder | None = None) -> Text:
+        """Style one line of output.
+
+        ANSI colours carry over from earlier lines like in a terminal, so the
+        decoder state is shared across calls.
+        """
+        decoder = decoder or self._decoder
+        if not decoder.style and "\x1b" not in line:
+            return self._make_links_clickable(line)
+        text = decoder.decode_line(line)
+        for match in URL_PATTERN.finditer(text.plain):
+            text.stylize(f"link {match.group(0)} underline", match.start(), match.end())
+        return text
+
+    def _render_rows(
+        self, text: Text, line_no: int, width: int
+    ) -> list[tuple[Strip, int, int]]:
+        console = self.app.console
+        options = console.options.update_width(width)
+        rows = []
+        column = 0
+        for segments in console.render_lines(text, options, pad=False):
+            strip = Strip(segments)
+            rows.append((strip, line_no, column))
+            column += strip.cell_length
+        return rows
+
+    def _wrap(self, width: int) -> None:
+        """Bring the cached rows up to date for ``width``."""
+        if width != self._wrap_width:
+            self._wrap_width = width
+            self._rows.clear()
+            self._heights.clear()
+            self._unwrapped = len(self._lines)
+            self._tail_rows = None
+
+        if self._unwrapped:
+            first = len(self._lines) - self._unwrapped
+            for line_no, text in enumerate(
+                islice(self._lines, first, None), start=first
+            ):
+                rows = self._render_rows(text, line_no + self._dropped, width)
+                self._rows.extend(rows)
+                self._heights.append(len(rows))
+            self._unwrapped = 0
+
+        if self._tail_rows is None:
+            if self._tail:
+                # Styling the tail must not advance the shared ANSI state
+                decoder = AnsiDecoder()
+                decoder.style = self._decoder.style
+                tail = self._style_line(self._tail, decoder)
+                line_no = self._dropped + len(self._lines)
+                self._tail_rows = self._render_rows(tail, line_no, width)
+            else:
+                self._tail_rows = []
+
+    def _indicator(self) -> str:
+        if not self._dropped:
+            return ""
+        return (
+            f"... ({self._dropped:,} lines truncated, "
+            f"showing last {self._max_lines:,}) ..."
+        )
+
+    def get_content_height(self, container, viewport, width: int) -> int:
+        if self._view is not None:
+            return len(self._get_view_rows(width))
+        self._wrap(width)
+        assert self._tail_rows is not None
+        return (1 if self._dropped else 0) + len(self._rows) + len(self._tail_rows)
+
+    def render_line(self, y: int) -> Strip:
+        width = self.size.width
+        style = self.rich_style
+        if self._view is not None:
+            rows = self._get_view_rows(width)
+            strip = rows[y] if y < len(rows) else Strip.blank(width)
+            return strip.apply_style(style).crop_extend(0, width, style)
+
+        self._wrap(width)
+        assert self._tail_rows is not None
+        if self._dropped:
+            if y == 0:
+                return Strip([Segment(self._indicator())]).crop_extend(0, width, style)
+            y -= 1
+        if y < len(self._rows):
+            strip, line_no, column = self._rows[y]
+        elif y - len(self._rows) < len(self._tail_rows):
+            strip, line_no, column = self._tail_rows[y - len(self._rows)]
+        else:
+            return Strip.blank(width, style)
+
+        line_no -= self._dropped
+        selection = self.text_selection
+        if selection is not None:
+            strip = self._highlight(strip, selection, line_no, column)
+        strip = strip.apply_style(style).crop_extend(0, width, style)
+        return strip.apply_offsets(column, line_no)
+
+    def _highlight(
+        self, strip: Strip, selection: Selection, line_no: int, column: int
+    ) -> Strip:
+        span = selection.get_span(line_no)
+        if span is None:
+            return strip
+        start, end = span
+        length = strip.cell_length
+        start = max(start - column, 0)
+        end = length if end == -1 else min(end - column, length)
+        if start >= end:
+            return strip
+        before, selected, after = strip.divide([start, end, length])
+        selected = selected.apply_style(
+            self.screen.get_component_rich_style("screen--selection")
+        )
+        return Strip.join([before, selected, after])
+
+    def get_selection(self, selection: Selection) -> tuple[str, str] | None:
+        if self._view is not None:
+            return None
+        lines = [text.plain for text in self._lines]
+        if self._tail:
+            lines.append(self._tail_plain())
+        return selection.extract("\n".join(lines)), "\n"
+
+    def _tail_plain(self) -> str:
+        decoder = AnsiDecoder()
+        decoder.style = self._decoder.style
+        return self._style_line(self._tail, decoder).plain
+
+    def selection_updated(self, selection: Selection | None) -> None:
+        self.refresh()
+
+    def set_view_mode(self, mode: str):
+        """Switch display mode (text, json, table)."""
+        self._view = None if mode == "text" else self._view_renderable(mode)
+        self._view_width = 0
+        self.refresh(layout=True)
+
+    def _get_view_rows(self, width: int) -> list[Strip]:
+        if width != self._view_width:
+            self._view_width = width
+            console = self.app.console
+            options = console.options.update_width(width)
+            self._view_rows = [
+                Strip(segments)
+                for segments in console.render_lines(self._view, options, pad=False)
+            ]
+        return self._view_rows
+
+
 class BlockFooter(Static):
     """Footer showing exit code/status."""
 
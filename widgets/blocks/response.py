@@ -1,19 +1,28 @@
+from rich.markdown import Markdown
 from textual.app import ComposeResult
-from textual.containers import Container
+from textual.containers import Container, Vertical
 from textual.reactive import reactive
 from textual.widgets import Label, Static
 
 from models import BlockState
+from utils.markdown_stream import MarkdownStream
 
 
 class ResponseWidget(Static):
-    """Widget for the final AI response content."""
+    """Widget for the final AI response content.
+
+    Streamed text is split into Markdown blocks. Completed blocks are rendered
+    once into their own Static; only the open tail is re-parsed per update.
+    """
 
     content_text = reactive("")
 
     def __init__(self, block: BlockState):
         super().__init__()
         self.block = block
+        self._stream = MarkdownStream()
+        self._parts: list[Static] = []
+        self._tail = Static(classes="response-part response-tail")
 
     def compose(self) -> ComposeResult:
         with Container(classes="response-container"):
@@ -21,22 +30,47 @@ class ResponseWidget(Static):
                 yield Label("󱜙", classes="response-icon")
                 yield Label("Final Answer", classes="response-title")
 
-            yield Static(id="response-content")
+            with Vertical(id="response-content"):
+                yield self._tail
 
     def watch_content_text(self, new_text: str):
         try:
-            content = self.query_one("#response-content", Static)
-            if new_text:
-                self.remove_class("hidden")
-                from rich.markdown import Markdown
-
-                content.update(Markdown(new_text, code_theme="monokai"))
-            else:
+            content = self.query_one("#response-content", Vertical)
+            if not new_text:
                 self.add_class("hidden")
-                content.update("")
+                self._stream.update("")
+                self._clear_parts()
+                self._tail.update("")
+                return
+
+            self.remove_class("hidden")
+            if not self._stream.update(new_text):
+                self._clear_parts()
+
+            new_blocks = self._stream.blocks[len(self._parts) :]
+            if new_blocks:
+                parts = [
+                    Static(
+                        Markdown(source, code_theme="monokai"),
+                        classes="response-part",
+                    )
+                    for source in new_blocks
+                ]
+                self._parts.extend(parts)
+                content.mount_all(parts, before=self._tail)
+
+            tail = self._stream.tail.strip()
+            self._tail.update(Markdown(tail, code_theme="monokai") if tail else "")
+            self._tail.display = bool(tail)
         except Exception:
             pass
 
+    def _clear_parts(self) -> None:
+        """Remove the widgets of blocks the stream no longer has."""
+        for part in self._parts:
+            part.remove()
+        self._parts.clear()
+
     def set_simple(self, simple: bool):
         """Toggle simple display mode (no header/border)."""
         try:
@@ -1,6 +1,7 @@
 from typing import ClassVar
 
 from textual.binding import Binding, BindingType
+from textual.message import Message
 from textual.widget import Widget
 from textual.widgets import ListItem, ListView
 
@@ -28,6 +29,9 @@ class HistoryViewport(ListView):
         Binding("G", "scroll_end", "Bottom", show=False),
     ]
 
+    class ReachedTop(Message):
+        """Sent when the user scrolls to the top, so older blocks can load."""
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._auto_scroll = True
@@ -37,12 +41,35 @@ class HistoryViewport(ListView):
         if self._auto_scroll:
             self.scroll_end(animate=False)
 
+    async def prepend_blocks(self, widgets: list[Widget]):
+        """Insert older blocks above the others, keeping the view in place."""
+        if not widgets:
+            return
+        from_end = self.max_scroll_y - self.scroll_y
+        index = self.index
+        await self.insert(0, [ListItem(widget) for widget in widgets])
+        if index is not None:
+            self.index = index + len(widgets)
+
+        def restore() -> None:
+            self.scroll_to(y=self.max_scroll_y - from_end, animate=False)
+
+        self.call_after_refresh(restore)
+
+    def watch_scroll_y(self, old_value: float, new_value: float) -> None:
+        super().watch_scroll_y(old_value, new_value)
+        if new_value <= 0 < old_value:
+            self.post_message(self.ReachedTop())
+
     def on_mount(self):
         self.call_later(self.scroll_end, animate=False)
 
     def on_key(self, event) -> None:
         if event.key in ("pageup", "home", "k"):
             self._auto_scroll = False
+            if self.scroll_y <= 0:
+                # Nothing to scroll, so watch_scroll_y won't fire
+                self.post_message(self.ReachedTop())
         elif event.key in ("down", "pagedown", "end", "j"):
             if self.index == len(self.children) - 1:
                 self._auto_scroll = True